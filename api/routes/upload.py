@@ -11,10 +11,11 @@ from minio import Minio
 from minio.error import S3Error
 from datetime import datetime
 import logging
-import io
 import asyncio
 import os
 
+from api.utils.object_storage import ObjectDownloader, StreamingUploader, select_changed, staging_lock
+
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/upload", tags=["upload"])
 
@@ -99,7 +100,8 @@ def get_minio_client() -> Minio:
 async def trigger_ingestion(customer_id: str, bucket_name: str, selected_mcps: List[str] = None):
     """
     Background task: Trigger ingestion for uploaded files
-    Downloads files from MinIO and runs ingestion pipeline
+    Downloads new/changed files from MinIO concurrently and streams each one
+    into the ingestion pipeline as soon as it is on disk
     """
     try:
         logger.info(f"🚀 Starting background ingestion for customer: {customer_id}")
@@ -116,158 +118,187 @@ async def trigger_ingestion(customer_id: str, bucket_name: str, selected_mcps: L
         })
 
         # Import ingestion components
-        from ingestion.orchestrator import IngestionOrchestrator, FolderConfig
-        from pathlib import Path
-        import tempfile
+        from ingestion.orchestrator import IngestionOrchestrator
+        from ingestion.manifest import IngestionManifest
+        from core.paths import CustomerPaths
         import shutil
 
-        # Create temp directory for downloads
-        temp_dir = Path(tempfile.mkdtemp(prefix=f"ingestion_{customer_id}_"))
-        logger.info(f"Created temp directory: {temp_dir}")
+        lakehouse_path = CustomerPaths.get_lakehouse_path(customer_id)
+        logger.info(f"Using persistent lakehouse path: {lakehouse_path}")
 
-        try:
-            # Download files from MinIO to temp dir
-            minio = get_minio_client()
-            objects = minio.list_objects(bucket_name=bucket_name, recursive=True)
+        # Stable download location: the same object always lands on the same
+        # path, so a changed object replaces its earlier version in the lakehouse.
+        # Runs for one bucket share it, so they take turns (across API workers).
+        staging_dir = (lakehouse_path / "staging" / bucket_name).resolve()
 
-            total_files = sum(1 for _ in minio.list_objects(bucket_name=bucket_name, recursive=True))
+        async with staging_lock(staging_dir):
+            staging_dir.mkdir(parents=True, exist_ok=True)
 
-            await send_progress_update(customer_id, {
-                "type": "ingestion",
-                "progress": 10,
-                "message": f"{total_files} Dateien werden heruntergeladen...",
-                "phase": "downloading",
-                "explanation": f"Wir bereiten {total_files} Dateien für die Analyse vor."
-            })
+            try:
+                # One listing; skip objects whose ETag was already ingested
+                minio = get_minio_client()
+                objects = await asyncio.to_thread(
+                    lambda: list(minio.list_objects(bucket_name=bucket_name, recursive=True))
+                )
+                manifest = IngestionManifest.for_customer(lakehouse_path, customer_id)
+                to_fetch, unchanged = select_changed(objects, manifest.etags(), staging_dir)
+                total_files = len(to_fetch)
 
-            downloaded_count = 0
-            for obj in objects:
-                file_path = temp_dir / obj.object_name
-                file_path.parent.mkdir(parents=True, exist_ok=True)
+                # Objects deleted from the bucket are tombstoned by the run
+                present = [staging_dir / obj.object_name for obj in to_fetch + unchanged]
+                deleted = manifest.vanished(present, [staging_dir])
 
-                minio.fget_object(
-                    bucket_name=bucket_name,
-                    object_name=obj.object_name,
-                    file_path=str(file_path)
+                logger.info(
+                    f"📦 {len(objects)} objects in {bucket_name}: {total_files} new/changed, "
+                    f"{len(unchanged)} unchanged, {len(deleted)} deleted"
                 )
-                downloaded_count += 1
-                logger.info(f"Downloaded: {obj.object_name}")
 
-                # Send progress
-                download_progress = 10 + int((downloaded_count / total_files) * 10)
                 await send_progress_update(customer_id, {
                     "type": "ingestion",
-                    "progress": download_progress,
-                    "message": f"{downloaded_count}/{total_files} Dateien heruntergeladen",
-                    "phase": "downloading"
+                    "progress": 10,
+                    "message": f"{total_files} Dateien werden heruntergeladen und verarbeitet...",
+                    "phase": "downloading",
+                    "explanation": f"Wir bereiten {total_files} Dateien für die Analyse vor."
+                                   + (f" {len(unchanged)} unveränderte Dateien werden übersprungen." if unchanged else ""),
+                    "files_skipped": len(unchanged)
                 })
 
-            logger.info(f"✓ Downloaded {downloaded_count} files from MinIO")
-
-            # Determine MCP assignment
-            mcp_assignment = selected_mcps[0] if selected_mcps else "general"
-
-            # Create folder config
-            folder_configs = [FolderConfig(
-                path=temp_dir,
-                mcp_assignment=mcp_assignment,
-                recursive=True
-            )]
-
-            # Initialize orchestrator with persistent path
-            from core.paths import CustomerPaths
+                if not to_fetch and not deleted:
+                    await send_progress_update(customer_id, {
+                        "type": "ingestion",
+                        "progress": 100,
+                        "message": "✓ Keine neuen oder geänderten Dateien",
+                        "phase": "complete",
+                        "explanation": "Alle Dateien sind bereits verarbeitet und durchsuchbar.",
+                        "files_processed": 0,
+                        "files_skipped": len(unchanged)
+                    })
+                    return {
+                        "success": True,
+                        "customer_id": customer_id,
+                        "files_processed": 0,
+                        "files_failed": 0,
+                        "files_skipped": len(unchanged),
+                        "stats_by_mcp": {}
+                    }
+
+                # Determine MCP assignment
+                mcp_assignment = selected_mcps[0] if selected_mcps else "general"
+
+                orchestrator = IngestionOrchestrator(
+                    lakehouse_path=lakehouse_path,
+                    vllm_url="http://localhost:4030",
+                    embedding_model="intfloat/multilingual-e5-large",
+                    claude_api_key=os.getenv("ANTHROPIC_API_KEY"),  # Enable intelligent extraction
+                    batch_size=128,
+                    max_workers=4
+                )
 
-            lakehouse_path = CustomerPaths.get_lakehouse_path(customer_id)
-            logger.info(f"Using persistent lakehouse path: {lakehouse_path}")
+                downloader = ObjectDownloader(minio)
+                downloaded = 0
+
+                # Files enter the pipeline as soon as their download completes
+                async def downloaded_files():
+                    nonlocal downloaded
+                    async for item in downloader.download(bucket_name, to_fetch, staging_dir):
+                        downloaded += 1
+                        logger.info(f"Downloaded: {item.object_name}")
+                        file_info = orchestrator.crawler.describe(item.path)
+                        if file_info is None:
+                            continue
+                        file_info.source_etag = item.etag
+                        file_info.assigned_mcp = mcp_assignment
+                        yield file_info
+
+                # Progress callback with WebSocket streaming
+                async def stream_progress(progress):
+                    logger.info(
+                        f"Ingestion progress: {progress.status.value} - "
+                        f"{progress.progress_percent:.1f}% - {progress.current_phase}"
+                    )
+
+                    # Map phase to human-friendly message with details
+                    phase_messages = {
+                        "crawling": f"Dateien werden eingelesen ({progress.processed_files}/{progress.total_files})",
+                        "extracting": f"Text wird extrahiert ({progress.processed_files}/{progress.total_files} Dateien)",
+                        "classifying": f"Dokumente werden kategorisiert ({progress.processed_files}/{progress.total_files})",
+                        "chunking": f"Texte werden in Abschnitte aufgeteilt ({progress.processed_files}/{progress.total_files})",
+                        "embedding": f"Vektoren werden generiert ({progress.processed_files}/{progress.total_files} Dateien)",
+                        "loading": f"Daten werden geladen ({progress.processed_files}/{progress.total_files} Dateien)",
+                    }
+
+                    # Generate AI explanation using Claude
+                    explanation = await generate_ai_explanation(
+                        f"Phase: {progress.current_phase}, Dateien: {progress.processed_files}/{progress.total_files}, Status: {progress.status.value}"
+                    )
+
+                    await send_progress_update(customer_id, {
+                        "type": "ingestion",
+                        "progress": 20 + int(progress.progress_percent * 0.7),  # 20-90%
+                        "message": phase_messages.get(progress.current_phase, f"{progress.current_phase} ({progress.processed_files}/{progress.total_files})"),
+                        "phase": progress.current_phase,
+                        "explanation": explanation,
+                        "files_processed": progress.processed_files,
+                        "files_downloaded": downloaded,
+                        "files_total": progress.total_files,
+                        "current_file": getattr(progress, 'current_file', None)
+                    })
+
+                orchestrator.on_progress(lambda p: asyncio.create_task(stream_progress(p)))
+
+                # Run ingestion while downloads are still in flight
+                logger.info(f"Running ingestion pipeline for {customer_id}...")
 
-            orchestrator = IngestionOrchestrator(
-                lakehouse_path=lakehouse_path,
-                vllm_url="http://localhost:4030",
-                embedding_model="intfloat/multilingual-e5-large",
-                claude_api_key=os.getenv("ANTHROPIC_API_KEY"),  # Enable intelligent extraction
-                batch_size=128,
-                max_workers=4
-            )
+                await send_progress_update(customer_id, {
+                    "type": "ingestion",
+                    "progress": 20,
+                    "message": "Datenanalyse startet...",
+                    "phase": "starting",
+                    "explanation": "Jetzt beginnt die intelligente Verarbeitung Ihrer Dokumente."
+                })
 
-            # Progress callback with WebSocket streaming
-            async def stream_progress(progress):
-                logger.info(
-                    f"Ingestion progress: {progress.status.value} - "
-                    f"{progress.progress_percent:.1f}% - {progress.current_phase}"
+                result = await orchestrator.ingest_stream(
+                    downloaded_files(),
+                    customer_id=customer_id,
+                    total_files=total_files,
+                    roots=[staging_dir],
+                    present=present
                 )
+                result.failed_files += len(downloader.failed)
+                result.skipped_files = len(unchanged)
 
-                # Map phase to human-friendly message with details
-                phase_messages = {
-                    "crawling": f"Dateien werden eingelesen ({progress.processed_files}/{progress.total_files})",
-                    "extracting": f"Text wird extrahiert ({progress.processed_files}/{progress.total_files} Dateien)",
-                    "classifying": f"Dokumente werden kategorisiert ({progress.processed_files}/{progress.total_files})",
-                    "chunking": f"Texte werden in Abschnitte aufgeteilt ({progress.processed_files}/{progress.total_files})",
-                    "embedding": f"Vektoren werden generiert ({progress.processed_files}/{progress.total_files} Dateien)",
-                    "loading": f"Daten werden geladen ({progress.processed_files}/{progress.total_files} Dateien)",
-                }
-
-                # Generate AI explanation using Claude
-                explanation = await generate_ai_explanation(
-                    f"Phase: {progress.current_phase}, Dateien: {progress.processed_files}/{progress.total_files}, Status: {progress.status.value}"
+                logger.info(
+                    f"✓ Ingestion complete for {customer_id}: "
+                    f"{result.processed_files} files processed, "
+                    f"{result.failed_files} failures, {result.skipped_files} unchanged"
                 )
 
+                # Send completion
                 await send_progress_update(customer_id, {
                     "type": "ingestion",
-                    "progress": 20 + int(progress.progress_percent * 0.7),  # 20-90%
-                    "message": phase_messages.get(progress.current_phase, f"{progress.current_phase} ({progress.processed_files}/{progress.total_files})"),
-                    "phase": progress.current_phase,
-                    "explanation": explanation,
-                    "files_processed": progress.processed_files,
-                    "files_total": progress.total_files,
-                    "current_file": getattr(progress, 'current_file', None)
+                    "progress": 100,
+                    "message": f"✓ {result.processed_files} Dateien verarbeitet!",
+                    "phase": "complete",
+                    "explanation": f"Perfekt! {result.processed_files} Dokumente wurden analysiert und sind jetzt durchsuchbar. Die KI kann jetzt auf Ihre Daten zugreifen und Fragen beantworten.",
+                    "files_processed": result.processed_files,
+                    "files_total": result.processed_files + result.failed_files,
+                    "files_failed": result.failed_files,
+                    "stats": f"{result.processed_files} erfolgreich, {result.failed_files} Fehler"
                 })
 
-            orchestrator.on_progress(lambda p: asyncio.create_task(stream_progress(p)))
-
-            # Run ingestion
-            logger.info(f"Running ingestion pipeline for {customer_id}...")
-
-            await send_progress_update(customer_id, {
-                "type": "ingestion",
-                "progress": 20,
-                "message": "Datenanalyse startet...",
-                "phase": "starting",
-                "explanation": "Jetzt beginnt die intelligente Verarbeitung Ihrer Dokumente."
-            })
-
-            result = await orchestrator.ingest(folder_configs, customer_id=customer_id)
-
-            logger.info(
-                f"✓ Ingestion complete for {customer_id}: "
-                f"{result.processed_files} files processed, "
-                f"{result.failed_files} failures"
-            )
-
-            # Send completion
-            await send_progress_update(customer_id, {
-                "type": "ingestion",
-                "progress": 100,
-                "message": f"✓ {result.processed_files} Dateien verarbeitet!",
-                "phase": "complete",
-                "explanation": f"Perfekt! {result.processed_files} Dokumente wurden analysiert und sind jetzt durchsuchbar. Die KI kann jetzt auf Ihre Daten zugreifen und Fragen beantworten.",
-                "files_processed": result.processed_files,
-                "files_total": result.processed_files + result.failed_files,
-                "files_failed": result.failed_files,
-                "stats": f"{result.processed_files} erfolgreich, {result.failed_files} Fehler"
-            })
-
-            return {
-                "success": True,
-                "customer_id": customer_id,
-                "files_processed": result.processed_files,
-                "files_failed": result.failed_files,
-                "stats_by_mcp": result.stats_by_mcp
-            }
+                return {
+                    "success": True,
+                    "customer_id": customer_id,
+                    "files_processed": result.processed_files,
+                    "files_failed": result.failed_files,
+                    "files_skipped": result.skipped_files,
+                    "stats_by_mcp": result.stats_by_mcp
+                }
 
-        finally:
-            # Cleanup temp directory
-            shutil.rmtree(temp_dir, ignore_errors=True)
-            logger.info(f"Cleaned up temp dir: {temp_dir}")
+            finally:
+                # Downloaded copies are only needed while ingesting
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                logger.info(f"Cleaned up staging dir: {staging_dir}")
 
     except Exception as e:
         logger.error(f"Background ingestion failed for {customer_id}: {e}", exc_info=True)
@@ -313,8 +344,6 @@ async def upload_files(
             logger.error(f"Unexpected error checking bucket: {e}")
             # Continue anyway - bucket might exist
 
-        uploaded_files = []
-
         logger.info(f"Processing {len(files)} files...")
 
         # Import progress updates
@@ -322,50 +351,60 @@ async def upload_files(
 
         total_files = len(files)
 
-        for idx, file in enumerate(files):
-            logger.info(f"  [{idx+1}/{len(files)}] Processing: {file.filename}")
-
-            # Send upload progress
-            upload_progress = int(((idx + 1) / total_files) * 100)
-            await send_progress_update(customer_id, {
-                "type": "upload",
-                "progress": upload_progress,
-                "message": f"{idx + 1}/{total_files} Dateien hochgeladen",
-                "phase": "uploading",
-                "current_file": file.filename,
-                "explanation": f"Datei '{file.filename}' wird in den sicheren Speicher übertragen."
-            })
+        # Stream each file from its upload spool into a multipart upload
+        # (off the event loop, bounded parts/files in flight), hashing on the fly
+        uploader = StreamingUploader(minio)
+        known_hashes = {} if is_first_upload else await uploader.known_hashes(customer_bucket)
+        completed = 0
 
-            # Read file content
-            file_content = await file.read()
-            file_size = len(file_content)
-            logger.info(f"      Read {file_size} bytes")
+        async def upload_one(file: UploadFile) -> dict:
+            nonlocal completed
 
             # Create object name with timestamp
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             object_name = f"{timestamp}_{file.filename}"
 
-            # Upload to customer's bucket in MinIO
             logger.info(f"      Uploading to MinIO: {customer_bucket}/{object_name}")
-            minio.put_object(
-                bucket_name=customer_bucket,
-                object_name=object_name,
-                data=io.BytesIO(file_content),
-                length=file_size,
-                content_type=file.content_type or "application/octet-stream"
-            )
-            logger.info(f"      ✓ Uploaded successfully!")
+            info = await uploader.upload(file.file, customer_bucket, object_name, file.content_type)
+            logger.info(f"      ✓ Uploaded {file.filename} ({info['size']} bytes, sha256 {info['sha256'][:12]})")
 
-            uploaded_files.append({
+            entry = {
                 "filename": file.filename,
-                "size": file_size,
+                "size": info["size"],
+                "sha256": info["sha256"],
+                "etag": info["etag"],
+                "verified": info["verified"],
                 "path": f"s3://{customer_bucket}/{object_name}",
                 "object_name": object_name,
                 "content_type": file.content_type,
                 "bucket": customer_bucket
+            }
+
+            # Same content already stored - keep the existing object only
+            duplicate_of = known_hashes.get(info["sha256"])
+            if duplicate_of:
+                await asyncio.to_thread(minio.remove_object, bucket_name=customer_bucket, object_name=object_name)
+                entry["duplicate_of"] = duplicate_of
+                entry["path"] = f"s3://{customer_bucket}/{duplicate_of}"
+                logger.info(f"      ↺ {file.filename} duplicates {duplicate_of} - not stored twice")
+            else:
+                known_hashes[info["sha256"]] = object_name
+
+            completed += 1
+            await send_progress_update(customer_id, {
+                "type": "upload",
+                "progress": int((completed / total_files) * 100),
+                "message": f"{completed}/{total_files} Dateien hochgeladen",
+                "phase": "uploading",
+                "current_file": file.filename,
+                "explanation": f"Datei '{file.filename}' wurde in den sicheren Speicher übertragen."
             })
+            return entry
+
+        uploaded_files = list(await asyncio.gather(*(upload_one(file) for file in files)))
+        duplicates = sum(1 for f in uploaded_files if f.get("duplicate_of"))
 
-        logger.info(f"✓ All {len(uploaded_files)} files uploaded to MinIO")
+        logger.info(f"✓ All {len(uploaded_files)} files uploaded to MinIO ({duplicates} duplicates)")
 
         # Final upload complete notification
         await send_progress_update(customer_id, {
@@ -387,6 +426,7 @@ async def upload_files(
             "success": True,
             "message": f"{len(uploaded_files)} files uploaded. Ingestion started in background.",
             "files": uploaded_files,
+            "duplicates": duplicates,
             "bucket": customer_bucket,
             "ingestion_triggered": True,
             "selected_mcps": mcp_list
@@ -0,0 +1,391 @@
+"""
+Streaming object storage helpers (MinIO / S3)
+
+Uploads are streamed part by part from the uploaded file's spool into a
+multipart upload, in a worker thread, with several parts in flight at once.
+Nothing is read into memory beyond the parts being sent, and the event loop
+stays free for other requests.
+
+SHA-256 and the per-part MD5s are computed while the parts are read. The
+part MD5s give the ETag S3 must report for the upload (integrity check); the
+SHA-256 is stored as object metadata, which gives duplicate detection (same
+content already in the bucket) and a content id for downstream ingestion.
+
+Downloads for ingestion run the other way round: a bounded pool of workers
+fetches objects concurrently and hands each one over as soon as it is on
+disk, so ingestion starts with the first file instead of after the last.
+
+Usage:
+    uploader = StreamingUploader(minio)
+    known = await uploader.known_hashes(bucket)
+    info = await uploader.upload(file.file, bucket, object_name, file.content_type)
+    if info["sha256"] in known: ...
+
+    downloader = ObjectDownloader(minio, workers=8)
+    async with staging_lock(staging_dir):  # One run per staging dir, across workers
+        async for item in downloader.download(bucket, objects, staging_dir):
+            ...  # item.path is complete
+"""
+
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows: staging runs are only serialized within the process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+SHA256_METADATA_KEY = "sha256"
+PART_SIZE = 16 * 1024 * 1024  # S3 minimum is 5 MiB
+PARALLEL_PARTS = 4
+MAX_CONCURRENT_FILES = 2
+DOWNLOAD_WORKERS = 8
+DOWNLOAD_BUFFER = 16  # Downloaded files waiting for the consumer before workers pause
+LOCK_POLL_SECONDS = 0.5
+
+_DONE = object()
+
+
+class HashingReader:
+    """
+    File-like wrapper that hashes everything read through it.
+
+    Multipart uploaders read parts sequentially (and only upload them in
+    parallel), so the digests match the uploaded byte stream.
+    """
+
+    def __init__(self, stream: BinaryIO, part_size: int = PART_SIZE):
+        self._stream = stream
+        self._part_size = part_size
+        self._sha256 = hashlib.sha256()
+        self._part_md5 = hashlib.md5()
+        self._part_bytes = 0
+        self._part_digests = []
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._stream.read(size)
+        if data:
+            self._sha256.update(data)
+            self.bytes_read += len(data)
+            view = memoryview(data)
+            while view:
+                take = min(len(view), self._part_size - self._part_bytes)
+                self._part_md5.update(view[:take])
+                self._part_bytes += take
+                view = view[take:]
+                if self._part_bytes == self._part_size:
+                    self._part_digests.append(self._part_md5.digest())
+                    self._part_md5 = hashlib.md5()
+                    self._part_bytes = 0
+        return data
+
+    @property
+    def sha256(self) -> str:
+        return self._sha256.hexdigest()
+
+    @property
+    def expected_etag(self) -> str:
+        """ETag S3 reports for this stream (single PUT below one part, else multipart)"""
+        digests = list(self._part_digests)
+        if self._part_bytes or not digests:
+            digests.append(self._part_md5.digest())
+        if len(digests) == 1:
+            return digests[0].hex()
+        return f"{hashlib.md5(b''.join(digests)).hexdigest()}-{len(digests)}"
+
+
+def object_sha256(obj: Any) -> Optional[str]:
+    """SHA-256 stored in a listed/stat'ed object's user metadata"""
+    metadata = getattr(obj, "metadata", None) or {}
+    for key, value in metadata.items():
+        if key.lower() in (SHA256_METADATA_KEY, f"x-amz-meta-{SHA256_METADATA_KEY}"):
+            return value[0] if isinstance(value, (list, tuple)) else value
+    return None
+
+
+class StreamingUploader:
+    """
+    Streams files into MinIO with bounded parallelism.
+    """
+
+    def __init__(
+        self,
+        client,
+        part_size: int = PART_SIZE,
+        parallel_parts: int = PARALLEL_PARTS,
+        max_concurrent_files: int = MAX_CONCURRENT_FILES
+    ):
+        """
+        Args:
+            client: minio.Minio client
+            part_size: Multipart part size in bytes
+            parallel_parts: Parts uploaded concurrently per file
+            max_concurrent_files: Files uploaded concurrently
+                (memory bound ≈ files × parallel parts × part size)
+        """
+        self.client = client
+        self.part_size = part_size
+        self.parallel_parts = parallel_parts
+        self._file_slots = asyncio.Semaphore(max_concurrent_files)
+
+    async def known_hashes(self, bucket_name: str) -> Dict[str, str]:
+        """SHA-256 → object name for objects already in a bucket (one listing)"""
+        def _list():
+            hashes = {}
+            for obj in self.client.list_objects(bucket_name=bucket_name, recursive=True, include_user_meta=True):
+                sha256 = object_sha256(obj)
+                if sha256:
+                    hashes.setdefault(sha256, obj.object_name)
+            return hashes
+
+        return await asyncio.to_thread(_list)
+
+    async def upload(
+        self,
+        stream: BinaryIO,
+        bucket_name: str,
+        object_name: str,
+        content_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Stream one file into a multipart upload.
+
+        Args:
+            stream: Readable binary file (e.g. ``UploadFile.file``)
+            bucket_name: Target bucket
+            object_name: Target object name
+            content_type: MIME type
+
+        Returns:
+            Dict with size, sha256, the ETag MinIO assigned and whether it
+            matches the ETag computed from the bytes read (``verified``)
+        """
+        async with self._file_slots:
+            return await asyncio.to_thread(self._upload, stream, bucket_name, object_name, content_type)
+
+    def _upload(self, stream, bucket_name, object_name, content_type) -> Dict[str, Any]:
+        reader = HashingReader(stream, self.part_size)
+        result = self.client.put_object(
+            bucket_name=bucket_name,
+            object_name=object_name,
+            data=reader,
+            length=-1,  # Unknown length: multipart, part by part
+            content_type=content_type or "application/octet-stream",
+            part_size=self.part_size,
+            num_parallel_uploads=self.parallel_parts,
+        )
+
+        etag = (getattr(result, "etag", None) or "").strip('"')
+        verified = etag == reader.expected_etag
+        if not verified:
+            logger.error(
+                f"ETag mismatch for {bucket_name}/{object_name}: "
+                f"got {etag}, expected {reader.expected_etag}"
+            )
+
+        # Object metadata can only be set at creation and the digest is known
+        # only now - attach it with a same-object copy, which MinIO applies
+        # as a metadata-only update
+        self._set_sha256(bucket_name, object_name, reader.sha256, content_type)
+
+        return {
+            "size": reader.bytes_read,
+            "sha256": reader.sha256,
+            "etag": etag,
+            "verified": verified,
+        }
+
+    def _set_sha256(self, bucket_name: str, object_name: str, sha256: str, content_type: Optional[str]):
+        from minio.commonconfig import CopySource, REPLACE
+        from minio.error import S3Error
+        from urllib3.exceptions import HTTPError
+
+        # REPLACE drops the existing headers, so Content-Type is sent again
+        # alongside the user metadata (the client maps it to the header)
+        metadata = {
+            SHA256_METADATA_KEY: sha256,
+            "Content-Type": content_type or "application/octet-stream",
+        }
+        try:
+            self.client.copy_object(
+                bucket_name,
+                object_name,
+                CopySource(bucket_name, object_name),
+                metadata=metadata,
+                metadata_directive=REPLACE,
+            )
+        except (S3Error, HTTPError) as e:
+            # Only dedup depends on it - the upload itself succeeded
+            logger.warning(f"Could not store sha256 for {bucket_name}/{object_name}: {e}")
+
+
+# =============================================================================
+# DOWNLOADS
+# =============================================================================
+
+def normalize_etag(etag: Optional[str]) -> Optional[str]:
+    return etag.strip('"') if etag else etag
+
+
+_staging_locks: Dict[str, asyncio.Lock] = {}
+
+
+@asynccontextmanager
+async def staging_lock(staging_dir: Path, poll_seconds: float = LOCK_POLL_SECONDS):
+    """
+    Hold a staging directory exclusively, across processes (API workers).
+
+    The lock is an flock on ``<staging_dir>.lock``. Waiting polls a
+    non-blocking attempt, so the event loop stays free meanwhile.
+    """
+    staging_dir = Path(staging_dir)
+    if fcntl is None:
+        async with _staging_locks.setdefault(str(staging_dir), asyncio.Lock()):
+            yield
+        return
+
+    staging_dir.parent.mkdir(parents=True, exist_ok=True)
+    with open(staging_dir.with_name(f"{staging_dir.name}.lock"), "a") as f:
+        waiting = False
+        while True:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if not waiting:
+                    logger.info(f"Waiting for the running ingestion of {staging_dir.name} to finish")
+                    waiting = True
+                await asyncio.sleep(poll_seconds)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+@dataclass
+class DownloadedObject:
+    """An object fetched to local disk"""
+    object_name: str
+    path: Path
+    etag: Optional[str]
+    size: int
+
+
+def select_changed(
+    objects: List[Any],
+    ingested_etags: Dict[str, str],
+    dest_dir: Path
+) -> Tuple[List[Any], List[Any]]:
+    """
+    Split listed objects into (to fetch, unchanged since last ingestion).
+
+    Args:
+        objects: Objects from ``list_objects``
+        ingested_etags: Local path → ETag of the version ingested last
+            (``IngestionManifest.etags()``)
+        dest_dir: Directory objects are downloaded to (object name = relative path)
+
+    Returns:
+        Tuple of object lists; directory markers are dropped
+    """
+    dest_dir = Path(dest_dir).resolve()
+    changed, unchanged = [], []
+    for obj in objects:
+        if obj.object_name.endswith("/"):
+            continue
+        ingested = ingested_etags.get(str(dest_dir / obj.object_name))
+        if ingested and ingested == normalize_etag(obj.etag):
+            unchanged.append(obj)
+        else:
+            changed.append(obj)
+    return changed, unchanged
+
+
+class ObjectDownloader:
+    """
+    Fetches objects with a bounded worker pool, yielding them as they complete.
+    """
+
+    def __init__(self, client, workers: int = DOWNLOAD_WORKERS, buffer: int = DOWNLOAD_BUFFER):
+        """
+        Args:
+            client: minio.Minio client
+            workers: Concurrent downloads
+            buffer: Completed downloads held for a slow consumer before
+                workers pause (backpressure)
+        """
+        self.client = client
+        self.workers = workers
+        self.buffer = buffer
+        self.failed: List[Tuple[str, str]] = []  # (object name, error)
+
+    async def download(
+        self,
+        bucket_name: str,
+        objects: List[Any],
+        dest_dir: Path
+    ) -> AsyncIterator[DownloadedObject]:
+        """
+        Download objects into ``dest_dir`` (keeping their key as relative path).
+
+        Yields:
+            DownloadedObject in completion order; failed downloads are
+            logged, recorded in ``failed`` and skipped
+        """
+        dest_dir = Path(dest_dir).resolve()
+        pending: asyncio.Queue = asyncio.Queue()
+        for obj in objects:
+            pending.put_nowait(obj)
+        done: asyncio.Queue = asyncio.Queue(maxsize=self.buffer)
+
+        async def worker():
+            while True:
+                try:
+                    obj = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    path = dest_dir / obj.object_name
+                    if not path.resolve().is_relative_to(dest_dir):
+                        raise ValueError("object key escapes the download directory")
+                    await asyncio.to_thread(self._fetch, bucket_name, obj.object_name, path)
+                except Exception as e:
+                    logger.warning(f"Download failed for {obj.object_name}: {e}")
+                    self.failed.append((obj.object_name, str(e)))
+                    continue
+                await done.put(DownloadedObject(
+                    object_name=obj.object_name,
+                    path=path,
+                    etag=normalize_etag(obj.etag),
+                    size=obj.size or 0,
+                ))
+
+        async def run_workers():
+            await asyncio.gather(*(worker() for _ in range(min(self.workers, len(objects)) or 1)))
+            await done.put(_DONE)
+
+        runner = asyncio.create_task(run_workers())
+        try:
+            while True:
+                item = await done.get()
+                if item is _DONE:
+                    break
+                yield item
+            await runner
+        finally:
+            if not runner.done():
+                runner.cancel()
+                await asyncio.gather(runner, return_exceptions=True)
+
+    def _fetch(self, bucket_name: str, object_name: str, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.client.fget_object(bucket_name=bucket_name, object_name=object_name, file_path=str(path))
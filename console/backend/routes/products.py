@@ -291,16 +291,21 @@ async def list_products(
     product_family: Optional[str] = Query(default=None),
     color_temperature: Optional[str] = Query(default=None),
     limit: int = Query(default=100, le=1000),
-    offset: int = Query(default=0)
+    offset: int = Query(default=0),
+    cursor: Optional[str] = Query(default=None)
 ):
     """
     List products with optional filters.
 
+    Filtering and pagination run inside the customer lakehouse
+    (/products/page), so only the requested page crosses the network.
+
     Filters:
     - product_family: Filter by family (e.g., "Caleo", "Matric")
     - color_temperature: Filter by temp (e.g., "3000K", "4000K")
     - limit: Max products to return
-    - offset: Pagination offset
+    - offset: Pagination offset (first page only)
+    - cursor: next_cursor from the previous response (preferred over offset)
     """
     from core.customer_registry import get_registry, initialize_registry
 
@@ -329,37 +334,32 @@ async def list_products(
         if not deployment:
             raise HTTPException(status_code=404, detail=f"Customer {customer_id} not found")
 
-        # Query lakehouse products with filters
+        # Query lakehouse products with filters (pushed down into the scan)
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        elif offset:
+            params["offset"] = offset
+        if product_family:
+            params["product_family"] = product_family
+        if color_temperature and color_temperature != 'Other':
+            params["color_temperature"] = color_temperature
+
         async with httpx.AsyncClient(timeout=60.0) as client:
             response = await client.get(
-                f"{deployment.lakehouse_url}/products",
-                params={"limit": 10000}  # Use /products endpoint instead
+                f"{deployment.lakehouse_url}/products/page",
+                params=params
             )
+            if response.status_code == 400:
+                raise HTTPException(status_code=400, detail=response.json().get("detail"))
             response.raise_for_status()
             data = response.json()
 
-        products = data.get("products", [])
-
-        # Apply filters
-        if product_family:
-            # Filter by family using same extract logic
-            def matches_family(p):
-                product_name = (p.get('product_name', '') or '').lower()
-                short_desc = (p.get('short_description', '') or '').lower()
-                search_text = f"{product_name} {short_desc}"
-                return product_family.lower() in search_text
-
-            products = [p for p in products if matches_family(p)]
-
-        if color_temperature and color_temperature != 'Other':
-            products = [p for p in products if (p.get('color_temperature', '') or '') == color_temperature]
-
-        total = len(products)
-        products = products[offset:offset+limit]
-
         return {
-            "products": products,
-            "total": total,
+            "products": data.get("products", []),
+            "total": data.get("total"),
+            "total_is_estimate": data.get("total_is_estimate", False),
+            "next_cursor": data.get("next_cursor"),
             "limit": limit,
             "offset": offset,
             "filters": {
@@ -14,6 +14,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
+import httpx
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends, Query, Request
 from pydantic import BaseModel
 from minio import Minio
@@ -21,7 +22,8 @@ from minio import Minio
 from ..auth.dependencies import get_current_user
 from ..auth.models import CustomerContext
 from ..config import config
-from .products import query_lakehouse_products
+from core.product_matching import MatcherCache, ProductIndex, catalog_version, fetch_catalog
+from core.retrieval import ContextRetriever
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -84,6 +86,54 @@ class QuoteGenerationResponse(BaseModel):
 # In-memory storage (replace with database in production)
 rfp_storage: Dict[str, Dict[str, Any]] = {}
 
+# Product indexes per customer, keyed by lakehouse catalog version
+product_matchers = MatcherCache()
+_embeddings = ContextRetriever()
+
+
+def _embed_with(embeddings_url: str):
+    async def embed(texts: List[str]) -> List[List[float]]:
+        return await _embeddings.embed_texts(texts, embeddings_url)
+    return embed
+
+
+async def get_product_index(customer_id: str):
+    """
+    Product index for a customer's lakehouse catalog.
+
+    Rebuilt only when the product table has a new Delta version; products
+    are embedded once per build (BM25 only if the embeddings service fails).
+
+    Returns:
+        Tuple of (ProductIndex, deployment)
+    """
+    from core.customer_registry import get_registry, initialize_registry
+
+    registry = get_registry()
+    if not registry._initialized:
+        await initialize_registry()
+
+    deployment = registry.get_deployment(customer_id)
+    if not deployment:
+        raise HTTPException(status_code=404, detail=f"No deployment found for customer: {customer_id}")
+
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        version = await catalog_version(client, deployment.lakehouse_url)
+
+        async def build() -> ProductIndex:
+            products = await fetch_catalog(client, deployment.lakehouse_url)
+            index = ProductIndex(products, version=version)
+            if products:
+                try:
+                    await index.embed(_embed_with(deployment.embeddings_url))
+                except Exception as e:
+                    logger.warning(f"Product embedding failed, matching on BM25 only: {e}")
+            return index
+
+        index = await product_matchers.get(customer_id, version, build)
+
+    return index, deployment
+
 
 # ============================================================================
 # HELPER FUNCTIONS - REAL DATA EXTRACTION
@@ -638,23 +688,19 @@ async def match_products(
         if not rfp.get('requirements'):
             raise HTTPException(status_code=400, detail="RFP not analyzed yet")
 
-        # Query REAL products from customer lakehouse
-        logger.info(f"Querying lakehouse for products (customer: {request.customer_id})...")
-
+        # Index of the customer's REAL lakehouse catalog (rebuilt per Delta version)
         try:
-            lakehouse_data = await query_lakehouse_products(
-                customer_id=request.customer_id,
-                limit=10000  # Get all products
-            )
-            products = lakehouse_data.get("products", [])
-            logger.info(f"✓ Found {len(products)} products in lakehouse")
+            index, deployment = await get_product_index(request.customer_id)
+            logger.info(f"✓ Product index ready: {len(index)} products (version {index.version})")
 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Failed to query lakehouse: {e}")
             # Return empty list if lakehouse unavailable
-            products = []
+            index = None
 
-        if not products:
+        if index is None or not len(index):
             logger.warning("No products found in lakehouse - cannot match")
             rfp['matchedProducts'] = []
             return ProductMatchResponse(
@@ -668,66 +714,23 @@ async def match_products(
         muss_requirements = rfp_requirements.get('muss', [])
         soll_requirements = rfp_requirements.get('soll', [])
 
-        # Match products using REAL data
+        # Score all requirements against all products in one pass
+        # (BM25 over the inverted index + embedding similarity when available)
+        embed = _embed_with(deployment.embeddings_url) if index.vectors is not None else None
+        matches = await index.match(muss_requirements, soll_requirements, embed=embed, limit=20)
+
         matched_products = []
-        for product in products:
-            confidence = 0.0
-            match_reasons = []
-
-            # 1. ETIM class match (strong signal)
-            etim_class = product.get('etim_class', '')
-            if etim_class and etim_class != 'EC000000':
-                confidence += 0.3
-                match_reasons.append(f"ETIM: {etim_class}")
-
-            # 2. Keyword matching against requirements
-            product_text = f"{product.get('product_name', '')} {product.get('short_description', '')} {product.get('keyword', '')}".lower()
-
-            # Check Muss requirements (must-have) - high weight
-            for req in muss_requirements:
-                req_keywords = req.lower().split()
-                if any(keyword in product_text for keyword in req_keywords if len(keyword) > 3):
-                    confidence += 0.4
-                    match_reasons.append(f"Muss: {req[:30]}")
-                    break
-
-            # Check Soll requirements (should-have) - medium weight
-            for req in soll_requirements:
-                req_keywords = req.lower().split()
-                if any(keyword in product_text for keyword in req_keywords if len(keyword) > 3):
-                    confidence += 0.2
-                    match_reasons.append(f"Soll: {req[:30]}")
-                    break
-
-            # 3. Category-specific bonus
-            supplier_pid = (product.get('supplier_pid', '') or '').lower()
-            if 'ups' in product_text or '5e' in supplier_pid or '5sc' in supplier_pid:
-                confidence += 0.1
-                match_reasons.append("UPS category")
-            elif 'led' in product_text or 'light' in product_text:
-                confidence += 0.1
-                match_reasons.append("Lighting category")
-
-            # Only include products with confidence >= 0.5
-            if confidence >= 0.5:
-                # Extract REAL price from product data
-                price_eur = extract_price_from_product(product)
-
-                matched_products.append({
-                    'product_id': product.get('supplier_pid'),
-                    'product_name': product.get('product_name'),
-                    'short_description': product.get('short_description'),
-                    'confidence': min(confidence, 0.99),  # Cap at 99%
-                    'price_eur': price_eur,  # REAL price!
-                    'etim_class': etim_class,
-                    'match_reason': ' + '.join(match_reasons[:3])  # Top 3 reasons
-                })
-
-        # Sort by confidence descending
-        matched_products.sort(key=lambda x: x['confidence'], reverse=True)
-
-        # Take top 20 matches
-        matched_products = matched_products[:20]
+        for match in matches:
+            product = index.products[match.index]
+            matched_products.append({
+                'product_id': product.get('supplier_pid'),
+                'product_name': product.get('product_name'),
+                'short_description': product.get('short_description'),
+                'confidence': min(match.confidence, 0.99),  # Cap at 99%
+                'price_eur': extract_price_from_product(product),  # REAL price!
+                'etim_class': product.get('etim_class', ''),
+                'match_reason': ' + '.join(match.reasons[:3])  # Top 3 reasons
+            })
 
         logger.info(f"✓ Matched {len(matched_products)} products with confidence >= 0.5")
 
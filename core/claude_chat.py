@@ -38,7 +38,9 @@ class ClaudeChat:
         message: str,
         context_documents: List[Dict[str, Any]] = None,
         customer_id: str = None,
-        system_prompt: str = None
+        system_prompt: str = None,
+        max_documents: int = 5,
+        max_chars_per_document: Optional[int] = 2000
     ) -> Dict[str, Any]:
         """
         Send a chat message with optional RAG context.
@@ -48,6 +50,9 @@ class ClaudeChat:
             context_documents: Relevant documents from lakehouse
             customer_id: Customer ID (for personalization)
             system_prompt: Optional custom system prompt
+            max_documents: Documents included in the context
+            max_chars_per_document: Per-document text limit (None for
+                context that was already packed to a token budget)
 
         Returns:
             Dict with answer, confidence, sources
@@ -58,9 +63,9 @@ class ClaudeChat:
 
         if context_documents:
             rag_context = "\n\n<documents>\n"
-            for i, doc in enumerate(context_documents[:5], 1):
+            for i, doc in enumerate(context_documents[:max_documents], 1):
                 filename = doc.get("filename", f"Document {i}")
-                text = doc.get("text", doc.get("snippet", ""))[:2000]  # Limit per doc
+                text = doc.get("text", doc.get("snippet", ""))[:max_chars_per_document]  # Limit per doc
 
                 rag_context += f"\n<document id=\"{i}\" filename=\"{filename}\">\n"
                 rag_context += text
@@ -37,6 +37,16 @@ class PlatformConfig(BaseSettings):
     core_mcps: List[str] = ["ctax", "law", "tender"]
     auto_load_core_mcps: bool = True
 
+    # Query routing (embedding centroids; keyword scoring as fallback)
+    routing_min_similarity: float = 0.75
+    routing_min_margin: float = 0.005
+
+    # RAG retrieval (Platform.query)
+    retrieval_top_k: int = 20                  # Candidate chunks from vector search
+    retrieval_token_budget: int = 6000         # Context tokens sent to Claude
+    retrieval_max_chunks_per_document: int = 3
+    retrieval_rerank: bool = True
+
     # Ingestion
     default_chunk_size: int = 1000
     default_chunk_overlap: int = 200
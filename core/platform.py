@@ -91,6 +91,8 @@ class Platform:
         self._lakehouse = None
         self._ingestion = None
         self._customer_registry = None
+        self._retriever = None
+        self._router = None
         self._initialized = False
 
         logger.info(f"Platform initialized with lakehouse at {self._config.lakehouse_path}")
@@ -253,13 +255,19 @@ class Platform:
         customer_id = context.get("customer_id", "default") if context else "default"
         user_id = context.get("user_id") if context else None
 
-        # Determine which MCP to use
-        target_mcp = mcp or await self._route_query(question)
+        # Get customer deployment (for routing to customer containers)
+        deployment = self._customer_registry.get_deployment(customer_id)
+        embeddings_url = deployment.embeddings_url if deployment else self._config.embedding_url
+
+        # Determine which MCP to use (the question embedding is reused for retrieval)
+        query_vector = None
+        if mcp:
+            target_mcp = mcp
+        else:
+            target_mcp, query_vector = await self._route(question, embeddings_url)
 
         logger.info(f"Routing query to MCP: {target_mcp} for customer: {customer_id}")
 
-        # Get customer deployment (for routing to customer containers)
-        deployment = self._customer_registry.get_deployment(customer_id)
         if deployment:
             logger.info(f"Using customer deployment: {deployment.vllm_url}, {deployment.lakehouse_url}")
             # Create customer-specific lakehouse client
@@ -271,13 +279,31 @@ class Platform:
             customer_lakehouse_url = None
             customer_vllm_url = self._config.vllm_url
 
-        # Get relevant documents for RAG
-        documents_result = await self.browse_documents(
-            customer_id=customer_id,
-            page=1,
-            page_size=10  # Get top 10 documents for context
-        )
-        context_documents = documents_result.get("documents", [])
+        # Get relevant chunks for RAG (semantic top-k, packed to a token budget)
+        retrieval = None
+        context_documents = []
+        if deployment:
+            retrieval = await self._get_retriever().retrieve(
+                question,
+                lakehouse_url=deployment.lakehouse_url,
+                embeddings_url=deployment.embeddings_url,
+                mcp=target_mcp,
+                query_vector=query_vector
+            )
+            context_documents = retrieval.as_documents()
+
+            if mcp and retrieval.query_vector and self._router:
+                # Explicit MCP choices teach the router
+                self._router.record(mcp, retrieval.query_vector)
+
+            if not context_documents:
+                # No embeddings yet (or search unavailable): first documents, as before
+                documents_result = await self.browse_documents(
+                    customer_id=customer_id,
+                    page=1,
+                    page_size=5
+                )
+                context_documents = documents_result.get("documents", [])
 
         # Use Claude Sonnet 4.5 for chat (bypasses MCP/vLLM complexity)
         from core.claude_chat import get_claude_chat
@@ -289,7 +315,10 @@ class Platform:
             message=question,
             context_documents=context_documents,
             customer_id=customer_id,
-            system_prompt=None  # Use default
+            system_prompt=None,  # Use default
+            # Retrieved context is already packed to the token budget
+            max_documents=len(context_documents) if retrieval and retrieval.chunks else 5,
+            max_chars_per_document=None if retrieval and retrieval.chunks else 2000
         )
 
         # Convert Claude response to QueryResult format
@@ -298,7 +327,8 @@ class Platform:
             **claude_response.get('metadata', {}),
             'suggested_questions': claude_response.get('suggested_questions', []),
             'usage': claude_response.get('usage', {}),
-            'model': claude_response.get('model', 'unknown')
+            'model': claude_response.get('model', 'unknown'),
+            'retrieval': retrieval.summary() if retrieval else None
         }
 
         response = type('obj', (object,), {
@@ -330,13 +360,79 @@ class Platform:
             metadata=metadata
         )
 
+    def _get_retriever(self):
+        """Shared context retriever (one HTTP client for all queries)"""
+        if self._retriever is None:
+            from core.retrieval import ContextRetriever
+
+            self._retriever = ContextRetriever(
+                top_k=self._config.retrieval_top_k,
+                token_budget=self._config.retrieval_token_budget,
+                max_chunks_per_document=self._config.retrieval_max_chunks_per_document,
+                rerank=self._config.retrieval_rerank
+            )
+        return self._retriever
+
+    def _get_router(self):
+        """Embedding router following the MCP registry (None before initialization)"""
+        if self._router is None and self._registry is not None:
+            from core.routing import EmbeddingRouter
+
+            self._router = EmbeddingRouter(
+                min_similarity=self._config.routing_min_similarity,
+                min_margin=self._config.routing_min_margin,
+                history_path=Path(self._config.lakehouse_path) / "routing" / "history.npz"
+            )
+            self._router.attach(self._registry)
+        return self._router
+
+    async def _route(
+        self,
+        question: str,
+        embeddings_url: Optional[str] = None
+    ) -> tuple[str, Optional[List[float]]]:
+        """
+        Route a question by embedding similarity to MCP centroids.
+
+        Falls back to keyword scoring when the embeddings service is
+        unavailable or no MCP is a clear match.
+
+        Returns:
+            Tuple of (mcp_id, question embedding or None)
+        """
+        router = self._get_router()
+        if router is None or not embeddings_url:
+            return self._keyword_route(question), None
+
+        async def embed(texts: List[str]) -> List[List[float]]:
+            return await self._get_retriever().embed_texts(texts, embeddings_url)
+
+        try:
+            decision = await router.route(question, embed)
+        except Exception as e:
+            logger.warning(f"Embedding routing unavailable, using keywords: {e}")
+            return self._keyword_route(question), None
+
+        if decision.mcp:
+            # Not recorded: only explicit choices teach the router, otherwise
+            # its own guesses would pull centroids further toward themselves
+            logger.debug(f"Embedding route → {decision.mcp} (sim {decision.similarity:.3f}, margin {decision.margin:.3f})")
+            return decision.mcp, decision.query_vector
+
+        return self._keyword_route(question), decision.query_vector
+
     async def _route_query(self, question: str) -> str:
         """
         Route query to appropriate MCP based on content.
 
-        Uses simple keyword matching for now.
-        TODO: Use embeddings for smarter routing.
+        Uses embedding similarity to MCP centroids, with keyword scoring as
+        fallback (see _route).
         """
+        mcp_id, _ = await self._route(question, self._config.embedding_url if self._initialized else None)
+        return mcp_id
+
+    def _keyword_route(self, question: str) -> str:
+        """Keyword scoring (fallback when embeddings can't decide)"""
         question_lower = question.lower()
 
         # Tax keywords
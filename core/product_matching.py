@@ -0,0 +1,532 @@
+"""
+Product Matching - Hybrid BM25 + embedding matcher for tender requirements
+
+Scores every Muss/Soll requirement of an RFP against every catalog product
+in one vectorized pass instead of substring-scanning product texts per
+requirement:
+
+    catalog → tokens → inverted index (BM25 weight per posting)
+            → embedding matrix (optional)
+    requirements → bincount over postings (BM25) + matrix product (cosine)
+                 → best Muss / Soll relevance per product → confidence
+
+A requirement counts as met by a product, as in the original per-product
+scan, when any of its words of 4+ characters occurs in the product text
+(substring: "schutz" hits "überspannungsschutz"). Those hits are resolved
+against the index vocabulary instead of the product texts. Embeddings add
+matches without shared words only above an absolute cosine threshold; the
+per-requirement rescaled hybrid relevance ranks products but never decides
+whether a requirement is met (the best product of any requirement, however
+unrelated, would score 1).
+
+The index is built once per catalog version (Delta commit of the product
+table) and cached; a new commit produces a new version and a rebuild. If
+the version is unknown, a built index is reused for a short TTL.
+
+Usage:
+    index = await matchers.get(customer_id, version, build)   # MatcherCache
+    matches = await index.match(muss, soll, embed=embed)
+    for m in matches:
+        product = index.products[m.index]
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+from collections import Counter, OrderedDict
+import asyncio
+import logging
+import re
+import time
+
+import httpx
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+EmbedFn = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+# Fields kept per product (matching, response and price extraction)
+PRODUCT_FIELDS = (
+    "supplier_pid", "product_name", "short_description", "keyword",
+    "etim_class", "price", "specifications",
+)
+
+# Confidence weights (a product needs >= MIN_CONFIDENCE to be returned)
+ETIM_WEIGHT = 0.3
+MUSS_WEIGHT = 0.4
+SOLL_WEIGHT = 0.2
+CATEGORY_WEIGHT = 0.1
+MIN_CONFIDENCE = 0.5
+
+# Requirement words shorter than this never count as a hit
+MIN_KEYWORD_LENGTH = 4
+
+# Raw cosine at which a requirement without a word hit counts as met
+# (multilingual-e5: unrelated texts stay below, paraphrases reach it)
+MIN_SIMILARITY = 0.85
+
+# Reuse of an index whose catalog version is unknown (seconds)
+UNKNOWN_VERSION_TTL = 60.0
+
+_TOKEN_PATTERN = re.compile(r"\w{4,}", re.UNICODE)
+
+
+def _project(product: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: product[k] for k in PRODUCT_FIELDS if k in product}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased words of 4+ characters (shorter ones carry no signal here)"""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def keywords(requirement: str) -> List[str]:
+    """Whitespace-separated words of a requirement that can count as a hit"""
+    return [k for k in requirement.lower().split() if len(k) >= MIN_KEYWORD_LENGTH]
+
+
+def product_text(product: Dict[str, Any]) -> str:
+    return " ".join(
+        str(product.get(key) or "") for key in ("product_name", "short_description", "keyword")
+    )
+
+
+def _category(product: Dict[str, Any], text: str) -> Optional[str]:
+    supplier_pid = (product.get("supplier_pid") or "").lower()
+    if "ups" in text or "5e" in supplier_pid or "5sc" in supplier_pid:
+        return "UPS category"
+    if "led" in text or "light" in text:
+        return "Lighting category"
+    return None
+
+
+@dataclass
+class ProductMatch:
+    """One matched product"""
+    index: int  # Position in ProductIndex.products
+    confidence: float
+    relevance: float  # Best Muss + best Soll relevance (tie-breaker)
+    reasons: List[str] = field(default_factory=list)
+
+
+class ProductIndex:
+    """
+    Inverted BM25 index plus optional embedding matrix over a product catalog.
+    """
+
+    def __init__(
+        self,
+        products: List[Dict[str, Any]],
+        version: Optional[int] = None,
+        k1: float = 1.2,
+        b: float = 0.75
+    ):
+        """
+        Args:
+            products: Catalog rows (only PRODUCT_FIELDS are kept)
+            version: Catalog version the index was built from
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+        """
+        self.products = [_project(p) for p in products]
+        self.version = version
+        self.vectors: Optional[np.ndarray] = None  # (products, dim), unit rows
+
+        vocab: Dict[str, int] = {}
+        term_ids: List[int] = []
+        doc_ids: List[int] = []
+        tfs: List[int] = []
+        categories: List[Optional[str]] = []
+        self.texts: List[str] = []
+
+        for doc, product in enumerate(self.products):
+            text = product_text(product).lower()
+            self.texts.append(text)
+            categories.append(_category(product, text))
+            for token, tf in Counter(_TOKEN_PATTERN.findall(text)).items():
+                term_ids.append(vocab.setdefault(token, len(vocab)))
+                doc_ids.append(doc)
+                tfs.append(tf)
+
+        self.vocab = vocab
+        self.categories = categories
+
+        # Vocabulary as one string for substring lookups (term id = position)
+        self._vocab_blob = "\n".join(vocab)
+        self._vocab_starts = np.cumsum([0] + [len(t) + 1 for t in vocab], dtype=np.int64)
+        self._keyword_docs: Dict[str, np.ndarray] = {}
+        self.etim = np.array(
+            [bool(p.get("etim_class")) and p.get("etim_class") != "EC000000" for p in self.products],
+            dtype=bool
+        )
+        self.category_mask = np.array([c is not None for c in categories], dtype=bool)
+
+        n_docs = max(len(self.products), 1)
+        terms = np.asarray(term_ids, dtype=np.int64)
+        docs = np.asarray(doc_ids, dtype=np.int64)
+        tf = np.asarray(tfs, dtype=np.float32)
+
+        doc_len = np.bincount(docs, weights=tf, minlength=n_docs).astype(np.float32)
+        avg_len = float(doc_len.mean()) or 1.0
+        df = np.bincount(terms, minlength=len(vocab)).astype(np.float32)
+        self.idf = np.log(1.0 + (n_docs - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+        weights = self.idf[terms] * tf * (k1 + 1) / (tf + k1 * (1 - b + b * doc_len[docs] / avg_len))
+
+        # CSR by term: postings of term t are docs/weights[indptr[t]:indptr[t + 1]]
+        order = np.argsort(terms, kind="stable")
+        self.posting_docs = docs[order]
+        self.posting_weights = weights[order].astype(np.float32)
+        self.indptr = np.concatenate(([0], np.cumsum(np.bincount(terms, minlength=len(vocab)))))
+
+        logger.info(
+            f"🔎 Built product index: {len(self.products)} products, "
+            f"{len(vocab)} terms, {len(self.posting_docs)} postings (version {version})"
+        )
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    # =========================================================================
+    # EMBEDDINGS
+    # =========================================================================
+
+    async def embed(self, embed: EmbedFn, batch_size: int = 256, max_chars: int = 512):
+        """Embed all products (name/description/keywords) into a unit-row matrix."""
+        texts = [product_text(p)[:max_chars] or " " for p in self.products]
+        vectors = []
+        for start in range(0, len(texts), batch_size):
+            vectors.extend(await embed(texts[start:start + batch_size]))
+        self.vectors = _unit_rows(np.asarray(vectors, dtype=np.float32))
+
+    # =========================================================================
+    # SCORING
+    # =========================================================================
+
+    def keyword_docs(self, keyword: str) -> np.ndarray:
+        """
+        Products whose text contains ``keyword`` (cached per keyword).
+
+        Word-only keywords are looked up in the vocabulary: every maximal
+        word run of 4+ characters is a term, so "keyword in text" holds
+        exactly when some term contains it. Keywords with punctuation
+        ("30ma,") fall back to scanning the product texts.
+        """
+        docs = self._keyword_docs.get(keyword)
+        if docs is not None:
+            return docs
+
+        if _TOKEN_PATTERN.fullmatch(keyword):
+            parts = []
+            pos = self._vocab_blob.find(keyword)
+            while pos != -1:
+                term = int(np.searchsorted(self._vocab_starts, pos, side="right")) - 1
+                parts.append(self.posting_docs[self.indptr[term]:self.indptr[term + 1]])
+                pos = self._vocab_blob.find(keyword, int(self._vocab_starts[term + 1]))
+            docs = np.unique(np.concatenate(parts)) if parts else np.zeros(0, dtype=np.int64)
+        else:
+            docs = np.array([d for d, text in enumerate(self.texts) if keyword in text], dtype=np.int64)
+
+        if len(self._keyword_docs) >= 10_000:
+            self._keyword_docs.clear()
+        self._keyword_docs[keyword] = docs
+        return docs
+
+    def keyword_hits(self, requirements: Sequence[str]) -> np.ndarray:
+        """
+        Whether any keyword of each requirement occurs in each product text.
+
+        Returns:
+            (requirements, products) boolean matrix
+        """
+        hits = np.zeros((len(requirements), len(self.products)), dtype=bool)
+        for row, requirement in enumerate(requirements):
+            for keyword in keywords(requirement):
+                hits[row, self.keyword_docs(keyword)] = True
+        return hits
+
+    def bm25(self, requirements: Sequence[str]) -> np.ndarray:
+        """
+        BM25 of each requirement against every product, normalized by the
+        requirement's ideal score (sum of its term idfs) and capped at 1.
+
+        Returns:
+            (requirements, products) matrix
+        """
+        n_products = len(self.products)
+        queries = [
+            np.fromiter({self.vocab[t] for t in tokenize(r) if t in self.vocab}, dtype=np.int64)
+            for r in requirements
+        ]
+
+        rows, docs, weights = [], [], []
+        for row, terms in enumerate(queries):
+            for t in terms:
+                start, end = self.indptr[t], self.indptr[t + 1]
+                rows.append(np.full(end - start, row, dtype=np.int64))
+                docs.append(self.posting_docs[start:end])
+                weights.append(self.posting_weights[start:end])
+
+        scores = np.zeros(len(requirements) * n_products, dtype=np.float32)
+        if rows:
+            flat = np.concatenate(rows) * n_products + np.concatenate(docs)
+            scores = np.bincount(
+                flat, weights=np.concatenate(weights), minlength=len(requirements) * n_products
+            ).astype(np.float32)
+        scores = scores.reshape(len(requirements), n_products)
+
+        ideal = np.array([self.idf[terms].sum() for terms in queries], dtype=np.float32)
+        return np.minimum(scores / np.maximum(ideal, 1e-6)[:, None], 1.0)
+
+    def cosine(self, requirement_vectors: np.ndarray) -> np.ndarray:
+        """Raw cosine similarity (requirements × products)"""
+        return _unit_rows(requirement_vectors) @ self.vectors.T
+
+    @staticmethod
+    def _rescale(cos: np.ndarray) -> np.ndarray:
+        mean = cos.mean(axis=1, keepdims=True)
+        top = cos.max(axis=1, keepdims=True)
+        return np.clip((cos - mean) / np.maximum(top - mean, 1e-6), 0.0, 1.0)
+
+    def similarity(self, requirement_vectors: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity rescaled per requirement so the catalog average is 0
+        and the best product is 1 (raw cosines of one model sit in a narrow band).
+        For ranking only: every requirement has a product at 1.
+        """
+        return self._rescale(self.cosine(requirement_vectors))
+
+    def relevance(
+        self,
+        requirements: Sequence[str],
+        requirement_vectors: Optional[np.ndarray] = None,
+        bm25_weight: float = 0.5
+    ) -> np.ndarray:
+        """Hybrid relevance (requirements × products) in [0, 1], for ranking"""
+        scores = self.bm25(requirements)
+        if requirement_vectors is not None and self.vectors is not None:
+            scores = bm25_weight * scores + (1 - bm25_weight) * self.similarity(requirement_vectors)
+        return scores
+
+    def _best(
+        self,
+        requirements: Sequence[str],
+        vectors: Optional[np.ndarray],
+        bm25_weight: float,
+        min_relevance: float,
+        min_similarity: float,
+        block_size: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Best hybrid relevance per product over ``requirements`` and the first
+        requirement the product meets (-1: none)
+        """
+        best = np.zeros(len(self.products), dtype=np.float32)
+        met_idx = np.full(len(self.products), -1, dtype=np.int64)
+
+        # Blocks bound the dense (block × products) matrix
+        for start in range(0, len(requirements), block_size):
+            block = requirements[start:start + block_size]
+            bm25 = self.bm25(block)
+            met = self.keyword_hits(block) | (bm25 >= min_relevance)
+            relevance = bm25
+            if vectors is not None and self.vectors is not None:
+                cos = self.cosine(vectors[start:start + block_size])
+                met |= cos >= min_similarity
+                relevance = bm25_weight * bm25 + (1 - bm25_weight) * self._rescale(cos)
+
+            best = np.maximum(best, relevance.max(axis=0))
+            first = (met_idx < 0) & met.any(axis=0)
+            met_idx[first] = met.argmax(axis=0)[first] + start
+
+        return best, met_idx
+
+    async def match(
+        self,
+        muss: Sequence[str],
+        soll: Sequence[str],
+        embed: Optional[EmbedFn] = None,
+        min_relevance: float = 0.3,
+        min_similarity: float = MIN_SIMILARITY,
+        bm25_weight: float = 0.5,
+        limit: int = 20,
+        block_size: int = 64
+    ) -> List[ProductMatch]:
+        """
+        Match products to RFP requirements.
+
+        Confidence per product: ETIM class 0.3, any Muss requirement met 0.4,
+        any Soll requirement met 0.2, UPS/lighting category 0.1; products
+        below 0.5 are dropped. Ties rank by relevance.
+
+        A requirement is met if one of its words (4+ characters) occurs in
+        the product text, its normalized BM25 reaches ``min_relevance`` or its
+        raw cosine reaches ``min_similarity``. The reason names the first
+        requirement met.
+
+        Args:
+            muss: Must-have requirements
+            soll: Should-have requirements
+            embed: Embeds requirement texts (vector similarity only if the
+                products were embedded too)
+            min_relevance: Normalized BM25 at which a requirement counts as met
+            min_similarity: Raw cosine at which a requirement counts as met
+            bm25_weight: Share of BM25 in the hybrid relevance
+            limit: Maximum matches returned
+            block_size: Requirements scored per dense block
+
+        Returns:
+            Matches, best first
+        """
+        if not self.products:
+            return []
+
+        muss, soll = list(muss), list(soll)
+        vectors = None
+        if embed is not None and self.vectors is not None and (muss or soll):
+            try:
+                vectors = np.asarray(await embed(muss + soll), dtype=np.float32)
+            except Exception as e:
+                logger.warning(f"Requirement embedding failed, matching on BM25 only: {e}")
+
+        groups = {}
+        for name, texts, offset in (("muss", muss, 0), ("soll", soll, len(muss))):
+            if texts:
+                group_vectors = vectors[offset:offset + len(texts)] if vectors is not None else None
+                groups[name] = self._best(
+                    texts, group_vectors, bm25_weight, min_relevance, min_similarity, block_size
+                )
+            else:
+                groups[name] = (np.zeros(len(self.products), dtype=np.float32),
+                                np.full(len(self.products), -1, dtype=np.int64))
+
+        muss_best, muss_idx = groups["muss"]
+        soll_best, soll_idx = groups["soll"]
+        muss_met = muss_idx >= 0
+        soll_met = soll_idx >= 0
+
+        confidence = (
+            ETIM_WEIGHT * self.etim
+            + MUSS_WEIGHT * muss_met
+            + SOLL_WEIGHT * soll_met
+            + CATEGORY_WEIGHT * self.category_mask
+        ).round(4)
+        relevance = muss_best * muss_met + soll_best * soll_met
+
+        candidates = np.flatnonzero(confidence >= MIN_CONFIDENCE)
+        order = candidates[np.lexsort((-relevance[candidates], -confidence[candidates]))][:limit]
+
+        matches = []
+        for i in order:
+            reasons = []
+            if self.etim[i]:
+                reasons.append(f"ETIM: {self.products[i]['etim_class']}")
+            if muss_met[i]:
+                reasons.append(f"Muss: {muss[muss_idx[i]][:30]}")
+            if soll_met[i]:
+                reasons.append(f"Soll: {soll[soll_idx[i]][:30]}")
+            if self.categories[i]:
+                reasons.append(self.categories[i])
+            matches.append(ProductMatch(
+                index=int(i),
+                confidence=float(confidence[i]),
+                relevance=round(float(relevance[i]), 4),
+                reasons=reasons
+            ))
+        return matches
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    return matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+
+
+# =============================================================================
+# CATALOG + CACHE
+# =============================================================================
+
+async def catalog_version(client: httpx.AsyncClient, lakehouse_url: str) -> Optional[int]:
+    """Current version of the lakehouse product table (None if unknown)"""
+    try:
+        response = await client.get(f"{lakehouse_url}/products/version")
+        response.raise_for_status()
+        return response.json().get("version")
+    except (httpx.HTTPError, ValueError) as e:
+        logger.warning(f"Could not read product catalog version: {e}")
+        return None
+
+
+async def fetch_catalog(
+    client: httpx.AsyncClient,
+    lakehouse_url: str,
+    page_size: int = 1000
+) -> List[Dict[str, Any]]:
+    """Read the full product catalog page by page (cursor pins one version)"""
+    products: List[Dict[str, Any]] = []
+    cursor = None
+    while True:
+        params = {"limit": page_size}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get(f"{lakehouse_url}/products/page", params=params)
+        response.raise_for_status()
+        page = response.json()
+        products.extend(_project(p) for p in page.get("products", []))
+        cursor = page.get("next_cursor")
+        if not cursor:
+            return products
+
+
+class MatcherCache:
+    """
+    Product indexes per customer, rebuilt when the catalog version changes.
+    """
+
+    def __init__(self, max_entries: int = 8, unknown_version_ttl: float = UNKNOWN_VERSION_TTL):
+        """
+        Args:
+            max_entries: Customers kept (LRU)
+            unknown_version_ttl: Seconds an index is reused while the catalog
+                version cannot be read
+        """
+        self.max_entries = max_entries
+        self.unknown_version_ttl = unknown_version_ttl
+        self._entries: "OrderedDict[str, ProductIndex]" = OrderedDict()
+        self._built_at: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.builds = 0
+
+    async def get(
+        self,
+        key: str,
+        version: Optional[int],
+        build: Callable[[], Awaitable[ProductIndex]]
+    ) -> ProductIndex:
+        """
+        Cached index for ``key`` at ``version``; ``build`` runs on a miss.
+
+        Concurrent requests for the same key wait for one build. With an
+        unknown version (None), the cached index is reused until it is
+        ``unknown_version_ttl`` seconds old.
+        """
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            index = self._entries.get(key)
+            if index is not None:
+                if version is None:
+                    fresh = time.monotonic() - self._built_at[key] < self.unknown_version_ttl
+                else:
+                    fresh = index.version == version
+                if fresh:
+                    self._entries.move_to_end(key)
+                    return index
+
+            index = await build()
+            self.builds += 1
+            self._entries[key] = index
+            self._built_at[key] = time.monotonic()
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._built_at.pop(evicted, None)
+            return index
@@ -0,0 +1,305 @@
+"""
+Context Retrieval - Semantic top-k chunks for RAG answers
+
+Builds the context Claude sees for a question:
+
+    question → embeddings service → Lance top-k (MCP-filtered)
+             → re-rank (vector rank + keyword overlap, RRF)
+             → at most N chunks per document → pack to a token budget
+
+Instead of shipping whole documents, only the chunks relevant to the
+question are sent, grouped per source file.
+
+Usage:
+    retriever = ContextRetriever(top_k=20, token_budget=6000)
+    result = await retriever.retrieve(question, lakehouse_url, embeddings_url, mcp="ctax")
+    context_documents = result.as_documents()
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import logging
+import math
+import re
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+# Document categories (ingestion classifier output) relevant to each MCP.
+# Chunks are also stored under the MCP id itself when folders are assigned
+# explicitly, and 'general' documents are always eligible.
+MCP_DOCUMENT_CATEGORIES = {
+    "ctax": ["tax"],
+    "law": ["legal"],
+    "tender": ["legal", "products", "correspondence"],
+    "market": ["products"],
+    "publish": ["products"],
+    "syndicate": ["products"],
+}
+
+RRF_K = 60
+_TOKEN_PATTERN = re.compile(r"\w{3,}", re.UNICODE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 chars per token)"""
+    return max(1, len(text) // 4)
+
+
+def mcp_categories(mcp: Optional[str]) -> Optional[List[str]]:
+    """Lance ``mcp`` values to search for an MCP (None = no filter)"""
+    if not mcp:
+        return None
+    return [mcp, *MCP_DOCUMENT_CATEGORIES.get(mcp, []), "general"]
+
+
+@dataclass
+class RetrievedChunk:
+    """One chunk returned by vector search"""
+    filename: str
+    text: str
+    mcp: Optional[str] = None
+    chunk_index: int = 0
+    distance: float = 0.0
+    score: float = 0.0  # After re-ranking (higher is better)
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+@dataclass
+class RetrievalResult:
+    """Packed context plus what it took to build it"""
+    chunks: List[RetrievedChunk] = field(default_factory=list)
+    query_vector: Optional[List[float]] = None
+    candidates: int = 0
+    filtered: bool = False
+    error: Optional[str] = None
+
+    @property
+    def tokens(self) -> int:
+        return sum(c.tokens for c in self.chunks)
+
+    def as_documents(self) -> List[Dict[str, Any]]:
+        """
+        Group packed chunks by source file (best file first, chunks in
+        document order) in the shape ClaudeChat expects.
+        """
+        by_file: Dict[str, List[RetrievedChunk]] = {}
+        for chunk in self.chunks:
+            by_file.setdefault(chunk.filename, []).append(chunk)
+
+        documents = []
+        for filename, chunks in by_file.items():
+            chunks = sorted(chunks, key=lambda c: c.chunk_index)
+            documents.append({
+                "filename": filename,
+                "text": "\n\n[...]\n\n".join(c.text for c in chunks),
+                "mcp": chunks[0].mcp,
+                "chunk_indices": [c.chunk_index for c in chunks],
+                "score": round(max(c.score for c in chunks), 6),
+            })
+        return documents
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "candidates": self.candidates,
+            "chunks": len(self.chunks),
+            "documents": len({c.filename for c in self.chunks}),
+            "context_tokens": self.tokens,
+            "mcp_filtered": self.filtered,
+            "error": self.error,
+        }
+
+
+def rerank(question: str, chunks: List[RetrievedChunk]) -> List[RetrievedChunk]:
+    """
+    Re-rank by reciprocal rank fusion of vector rank and keyword overlap.
+
+    Keyword overlap is idf-weighted over the candidate set, so exact terms
+    (SKUs, paragraph numbers, names) lift chunks the embedding ranked lower.
+    """
+    terms = set(_TOKEN_PATTERN.findall(question.lower()))
+    if not chunks or not terms:
+        for rank, chunk in enumerate(chunks):
+            chunk.score = 1.0 / (RRF_K + rank + 1)
+        return chunks
+
+    chunk_terms = [set(_TOKEN_PATTERN.findall(c.text.lower())) & terms for c in chunks]
+    df = {t: sum(1 for ct in chunk_terms if t in ct) for t in terms}
+    idf = {t: math.log(1 + len(chunks) / df[t]) for t in terms if df[t]}
+    keyword = [sum(idf[t] for t in ct) for ct in chunk_terms]
+
+    keyword_rank = {i: r for r, i in enumerate(sorted(range(len(chunks)), key=lambda i: -keyword[i]))}
+    for vector_rank, chunk in enumerate(chunks):
+        chunk.score = 1.0 / (RRF_K + vector_rank + 1)
+        if keyword[vector_rank] > 0:
+            chunk.score += 1.0 / (RRF_K + keyword_rank[vector_rank] + 1)
+
+    return sorted(chunks, key=lambda c: -c.score)
+
+
+def pack(
+    chunks: List[RetrievedChunk],
+    token_budget: int,
+    max_chunks_per_document: int
+) -> List[RetrievedChunk]:
+    """
+    Greedily take ranked chunks until the token budget is spent.
+
+    Chunks that don't fit are skipped (a smaller one further down may);
+    only the very first chunk is truncated if it alone exceeds the budget.
+    """
+    packed: List[RetrievedChunk] = []
+    per_document: Dict[str, int] = {}
+    remaining = token_budget
+
+    for chunk in chunks:
+        if per_document.get(chunk.filename, 0) >= max_chunks_per_document:
+            continue
+        if chunk.tokens > remaining:
+            if packed:
+                continue
+            chunk.text = chunk.text[:remaining * 4]
+        packed.append(chunk)
+        per_document[chunk.filename] = per_document.get(chunk.filename, 0) + 1
+        remaining -= chunk.tokens
+        if remaining <= 0:
+            break
+
+    return packed
+
+
+class ContextRetriever:
+    """
+    Embeds a question, searches the customer's Lance embeddings and packs the result.
+    """
+
+    def __init__(
+        self,
+        top_k: int = 20,
+        token_budget: int = 6000,
+        max_chunks_per_document: int = 3,
+        rerank: bool = True,
+        min_filtered_results: int = 3,
+        embedding_model: str = "multilingual-e5-large",
+        client: Optional[httpx.AsyncClient] = None
+    ):
+        """
+        Args:
+            top_k: Candidates fetched from vector search
+            token_budget: Context size sent to the LLM
+            max_chunks_per_document: Diversity cap per source file
+            rerank: Fuse vector rank with keyword overlap
+            min_filtered_results: Fewer MCP-filtered hits than this → search unfiltered
+            embedding_model: Model name sent to the embeddings service
+            client: Shared HTTP client (keeps connections alive across queries)
+        """
+        self.top_k = top_k
+        self.token_budget = token_budget
+        self.max_chunks_per_document = max_chunks_per_document
+        self.rerank = rerank
+        self.min_filtered_results = min_filtered_results
+        self.embedding_model = embedding_model
+        self._client = client or httpx.AsyncClient(timeout=30.0)
+
+    async def embed_texts(self, texts: List[str], embeddings_url: str) -> List[List[float]]:
+        """Embed texts via the OpenAI-compatible embeddings endpoint"""
+        response = await self._client.post(
+            f"{embeddings_url}/v1/embeddings",
+            json={"input": texts, "model": self.embedding_model}
+        )
+        response.raise_for_status()
+        return [item["embedding"] for item in response.json()["data"]]
+
+    async def embed_query(self, question: str, embeddings_url: str) -> List[float]:
+        """Embed a single question"""
+        return (await self.embed_texts([question], embeddings_url))[0]
+
+    async def search(
+        self,
+        lakehouse_url: str,
+        question: str,
+        vector: List[float],
+        categories: Optional[List[str]] = None
+    ) -> List[RetrievedChunk]:
+        """Top-k vector search on the lakehouse's Lance embeddings table"""
+        response = await self._client.post(
+            f"{lakehouse_url}/lance/search",
+            json={
+                "query": question,
+                "vector": vector,
+                "limit": self.top_k,
+                "mcp_filter": categories,
+            }
+        )
+        response.raise_for_status()
+        return [
+            RetrievedChunk(
+                filename=r.get("filename") or "unknown",
+                text=r.get("text") or "",
+                mcp=r.get("mcp"),
+                chunk_index=r.get("chunk_index") or 0,
+                distance=r.get("score") or 0.0,
+            )
+            for r in response.json().get("results", [])
+        ]
+
+    async def retrieve(
+        self,
+        question: str,
+        lakehouse_url: str,
+        embeddings_url: str,
+        mcp: Optional[str] = None,
+        query_vector: Optional[List[float]] = None
+    ) -> RetrievalResult:
+        """
+        Build packed RAG context for a question.
+
+        Args:
+            question: User question
+            lakehouse_url: Customer lakehouse HTTP API
+            embeddings_url: Customer embeddings service
+            mcp: Target MCP (restricts search to its document categories)
+            query_vector: Precomputed question embedding (skips the embed call)
+
+        Returns:
+            RetrievalResult (empty with ``error`` set if retrieval failed)
+        """
+        result = RetrievalResult(query_vector=query_vector)
+        try:
+            if result.query_vector is None:
+                result.query_vector = await self.embed_query(question, embeddings_url)
+
+            categories = mcp_categories(mcp)
+            candidates = await self.search(lakehouse_url, question, result.query_vector, categories)
+            result.filtered = categories is not None
+            if categories and len(candidates) < self.min_filtered_results:
+                # Too little under this MCP's categories - widen to everything
+                candidates = await self.search(lakehouse_url, question, result.query_vector)
+                result.filtered = False
+
+        except (httpx.HTTPError, KeyError, IndexError, ValueError) as e:
+            logger.warning(f"Context retrieval failed: {e}")
+            result.error = str(e)
+            return result
+
+        result.candidates = len(candidates)
+        if self.rerank:
+            candidates = rerank(question, candidates)
+        else:
+            for rank, chunk in enumerate(candidates):
+                chunk.score = 1.0 / (RRF_K + rank + 1)
+        result.chunks = pack(candidates, self.token_budget, self.max_chunks_per_document)
+
+        logger.info(
+            f"Retrieved {len(result.chunks)}/{result.candidates} chunks "
+            f"(~{result.tokens} tokens) for RAG context"
+        )
+        return result
+
+    async def close(self):
+        await self._client.aclose()
@@ -0,0 +1,253 @@
+"""
+Query Routing - Embedding-centroid router for Platform.query
+
+Each routable MCP gets a centroid vector built from its description, its
+``routing_examples`` and the questions previously routed to it. A question
+is embedded once, compared against the centroid matrix with one matrix-vector
+product, and sent to the closest MCP if it is close enough and clearly ahead
+of the runner-up. The same question vector is then reused for retrieval.
+
+Only questions sent to an explicitly chosen MCP are recorded, and the
+history is normalized and weighted against the profile, so it can shift a
+centroid but never outvote the MCP's own description.
+
+Centroids follow the MCP registry: installing an MCP (``register`` /
+``register_class``) or removing it marks the matrix stale; the new profile is
+embedded on the next routed question.
+
+Usage:
+    router = EmbeddingRouter()
+    router.attach(registry)
+    decision = await router.route(question, embed)   # embed: texts -> vectors
+    if decision.mcp: ...
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+import logging
+import os
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+EmbedFn = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+
+def profile_texts(mcp: Any) -> List[str]:
+    """Routing texts for an MCP instance or class (empty = not routable)"""
+    texts = []
+    description = getattr(mcp, "description", "")
+    if isinstance(description, str) and description:
+        texts.append(description)
+    texts.extend(getattr(mcp, "routing_examples", None) or [])
+    return texts
+
+
+@dataclass
+class RouteDecision:
+    """Outcome of routing one question"""
+    mcp: Optional[str]  # None: not confident, caller falls back
+    similarity: float = 0.0
+    margin: float = 0.0
+    query_vector: Optional[List[float]] = None
+    scores: Dict[str, float] = field(default_factory=dict)
+
+
+class EmbeddingRouter:
+    """
+    Routes questions to the MCP with the most similar centroid.
+    """
+
+    def __init__(
+        self,
+        min_similarity: float = 0.75,
+        min_margin: float = 0.005,
+        history_decay: float = 0.99,
+        history_weight: float = 0.5,
+        history_path: Optional[Union[str, Path]] = None,
+        save_every: int = 20
+    ):
+        """
+        Args:
+            min_similarity: Cosine similarity the best MCP must reach
+            min_margin: Lead the best MCP needs over the runner-up
+            history_decay: Weight kept by older routed questions per new one
+                (0.99 ≈ the last ~100 questions per MCP shape its centroid)
+            history_weight: Weight of the (normalized) history relative to the
+                (normalized) profile in the centroid
+            history_path: .npz file persisting routed-question history
+            save_every: Persist history after this many recorded questions
+        """
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        self.history_decay = history_decay
+        self.history_weight = history_weight
+        self.history_path = Path(history_path) if history_path else None
+        self.save_every = save_every
+
+        self._profiles: Dict[str, List[str]] = {}  # mcp -> texts to embed
+        self._profile_vectors: Dict[str, np.ndarray] = {}  # mcp -> sum of unit vectors
+        self._history: Dict[str, np.ndarray] = {}  # mcp -> decayed sum of routed questions
+        self._pending: set = set()  # Profiles not embedded yet
+        self._ids: List[str] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._unsaved = 0
+
+        self._load_history()
+
+    # =========================================================================
+    # PROFILES
+    # =========================================================================
+
+    def attach(self, registry):
+        """Build profiles from a registry and follow its changes."""
+        for mcp_id, definition in registry.definitions().items():
+            self.set_profile(mcp_id, profile_texts(definition))
+        registry.add_listener(self._on_registry_change)
+
+    def _on_registry_change(self, mcp_id: str, definition: Any):
+        if definition is None:
+            self.remove(mcp_id)
+        else:
+            self.set_profile(mcp_id, profile_texts(definition))
+
+    def set_profile(self, mcp_id: str, texts: List[str]):
+        """Set the routing texts of an MCP (embedded lazily)."""
+        if not texts:
+            self.remove(mcp_id)
+            return
+        if self._profiles.get(mcp_id) == texts and mcp_id in self._profile_vectors:
+            return
+        self._profiles[mcp_id] = list(texts)
+        self._profile_vectors.pop(mcp_id, None)
+        self._pending.add(mcp_id)
+        self._matrix = None
+
+    def remove(self, mcp_id: str):
+        self._profiles.pop(mcp_id, None)
+        self._profile_vectors.pop(mcp_id, None)
+        self._pending.discard(mcp_id)
+        self._matrix = None
+
+    @property
+    def mcps(self) -> List[str]:
+        return sorted(self._profiles)
+
+    async def refresh(self, embed: EmbedFn):
+        """Embed pending profiles (one batched call) and rebuild the matrix."""
+        if self._pending:
+            pending = sorted(self._pending)
+            texts = [t for mcp_id in pending for t in self._profiles[mcp_id]]
+            vectors = np.asarray(await embed(texts), dtype=np.float32)
+
+            offset = 0
+            for mcp_id in pending:
+                count = len(self._profiles[mcp_id])
+                unit = np.stack([_normalize(v) for v in vectors[offset:offset + count]])
+                self._profile_vectors[mcp_id] = unit.sum(axis=0)
+                offset += count
+            self._pending.clear()
+            self._matrix = None
+            logger.info(f"🧭 Embedded routing profiles for {', '.join(pending)}")
+
+        if self._matrix is None and self._profile_vectors:
+            self._ids = sorted(self._profile_vectors)
+            self._matrix = np.stack([self._centroid(mcp_id) for mcp_id in self._ids])
+
+    def _centroid(self, mcp_id: str) -> np.ndarray:
+        vector = _normalize(self._profile_vectors[mcp_id])
+        history = self._history.get(mcp_id)
+        if history is not None and history.shape == vector.shape:
+            vector = vector + self.history_weight * _normalize(history)
+        return _normalize(vector)
+
+    # =========================================================================
+    # ROUTING
+    # =========================================================================
+
+    async def route(
+        self,
+        question: str,
+        embed: EmbedFn,
+        query_vector: Optional[List[float]] = None
+    ) -> RouteDecision:
+        """
+        Route a question.
+
+        Args:
+            question: User question
+            embed: Embeds a list of texts (used for the question and new profiles)
+            query_vector: Precomputed question embedding
+
+        Returns:
+            RouteDecision; ``mcp`` is None when no MCP is close enough or the
+            top two are too close to call
+        """
+        if query_vector is None:
+            query_vector = (await embed([question]))[0]
+        decision = RouteDecision(mcp=None, query_vector=list(query_vector))
+
+        await self.refresh(embed)
+        if self._matrix is None:
+            return decision
+
+        sims = self._matrix @ _normalize(np.asarray(query_vector, dtype=np.float32))
+        order = np.argsort(-sims)
+        best = float(sims[order[0]])
+        second = float(sims[order[1]]) if len(order) > 1 else -1.0
+
+        decision.scores = {mcp_id: round(float(s), 4) for mcp_id, s in zip(self._ids, sims)}
+        decision.similarity = best
+        decision.margin = best - second
+        if best >= self.min_similarity and decision.margin >= self.min_margin:
+            decision.mcp = self._ids[int(order[0])]
+        return decision
+
+    def record(self, mcp_id: str, query_vector: List[float]):
+        """Fold a question explicitly sent to ``mcp_id`` into its centroid."""
+        if mcp_id not in self._profiles:
+            return
+        vector = _normalize(np.asarray(query_vector, dtype=np.float32))
+        history = self._history.get(mcp_id)
+        if history is None or history.shape != vector.shape:
+            history = np.zeros_like(vector)
+        self._history[mcp_id] = history * self.history_decay + vector
+        self._matrix = None
+
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            self.save_history()
+
+    # =========================================================================
+    # PERSISTENCE
+    # =========================================================================
+
+    def _load_history(self):
+        if not self.history_path or not self.history_path.exists():
+            return
+        try:
+            data = np.load(self.history_path, allow_pickle=False)
+            self._history = {str(k): data["vectors"][i] for i, k in enumerate(data["mcps"])}
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Could not load routing history from {self.history_path}: {e}")
+
+    def save_history(self):
+        """Write routed-question history atomically."""
+        self._unsaved = 0
+        if not self.history_path or not self._history:
+            return
+        mcps = sorted(self._history)
+        try:
+            self.history_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.history_path.with_suffix(".tmp.npz")
+            np.savez(tmp, mcps=np.array(mcps), vectors=np.stack([self._history[m] for m in mcps]))
+            os.replace(tmp, self.history_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not save routing history to {self.history_path}: {e}")
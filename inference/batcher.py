@@ -0,0 +1,211 @@
+"""
+Micro-Batcher - Dynamic request batching for the embedding server
+
+Concurrent /v1/embeddings calls are queued and coalesced: the batcher waits
+up to ``max_wait_ms`` (or until ``max_batch_texts`` texts are queued), runs a
+single encode in a worker thread, and fans the vectors back out to the
+waiting requests. The event loop never blocks on ``model.encode`` and small
+query-time requests from many users share one GPU/CPU pass.
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingRequest:
+    texts: List[str]
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+@dataclass
+class BatcherMetrics:
+    """Counters exposed on /metrics"""
+    requests: int = 0
+    texts: int = 0
+    batches: int = 0
+    errors: int = 0
+    encode_seconds: float = 0.0
+    wait_seconds: float = 0.0
+    max_batch_texts_seen: int = 0
+    batch_size_histogram: Counter = field(default_factory=Counter)
+
+    def to_dict(self, queue_depth: int, queued_texts: int) -> dict:
+        return {
+            "queue_depth": queue_depth,
+            "queued_texts": queued_texts,
+            "requests": self.requests,
+            "texts": self.texts,
+            "batches": self.batches,
+            "errors": self.errors,
+            "avg_batch_texts": round(self.texts / self.batches, 2) if self.batches else 0.0,
+            "avg_requests_per_batch": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            "max_batch_texts": self.max_batch_texts_seen,
+            "avg_encode_ms": round(self.encode_seconds / self.batches * 1000, 2) if self.batches else 0.0,
+            "avg_queue_wait_ms": round(self.wait_seconds / self.requests * 1000, 2) if self.requests else 0.0,
+            "batch_size_histogram": {
+                str(k): v for k, v in sorted(self.batch_size_histogram.items())
+            },
+        }
+
+
+def _bucket(size: int) -> int:
+    """Power-of-two histogram bucket (1, 2, 4, 8, ...)"""
+    bucket = 1
+    while bucket < size:
+        bucket *= 2
+    return bucket
+
+
+class MicroBatcher:
+    """
+    Collects embedding requests and runs them as shared batches.
+
+    Args:
+        encode_fn: Blocking function mapping a list of texts to a list of vectors
+        max_batch_texts: Flush once this many texts are queued
+        max_wait_ms: Flush at the latest this long after the first request arrived
+        max_queue: Maximum queued requests before submit() applies backpressure
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str]], List[List[float]]],
+        max_batch_texts: int = 64,
+        max_wait_ms: float = 5.0,
+        max_queue: int = 1024
+    ):
+        self.encode_fn = encode_fn
+        self.max_batch_texts = max_batch_texts
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._queued_texts = 0
+        self._carry: Optional[_PendingRequest] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.metrics = BatcherMetrics()
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self):
+        """Start the background batching loop."""
+        if not self.running:
+            self._worker = asyncio.create_task(self._run())
+            logger.info(
+                f"Micro-batcher started (max_batch_texts={self.max_batch_texts}, "
+                f"max_wait_ms={self.max_wait * 1000:.1f})"
+            )
+
+    async def stop(self):
+        """Stop the loop and fail any requests still waiting."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        pending = [self._carry] if self._carry else []
+        self._carry = None
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for request in pending:
+            if not request.future.done():
+                request.future.set_exception(RuntimeError("Embedding batcher stopped"))
+
+    async def submit(self, texts: List[str]) -> List[List[float]]:
+        """
+        Queue texts for embedding and wait for their vectors.
+
+        Returns:
+            One vector per input text, in order
+        """
+        if not texts:
+            return []
+        if not self.running:
+            await self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingRequest(texts=list(texts), future=future))
+        self._queued_texts += len(texts)
+        return await future
+
+    async def _next_request(self, timeout: Optional[float]) -> Optional[_PendingRequest]:
+        if self._carry is not None:
+            request, self._carry = self._carry, None
+            return request
+        if timeout is None:
+            return await self._queue.get()
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=max(timeout, 0))
+        except asyncio.TimeoutError:
+            return None
+
+    async def _collect(self) -> List[_PendingRequest]:
+        """Block for the first request, then gather more until size or time limit."""
+        first = await self._next_request(timeout=None)
+        batch = [first]
+        size = len(first.texts)
+        deadline = time.perf_counter() + self.max_wait
+
+        while size < self.max_batch_texts:
+            request = await self._next_request(timeout=deadline - time.perf_counter())
+            if request is None:
+                break
+            if size + len(request.texts) > self.max_batch_texts:
+                # Doesn't fit - it opens the next batch
+                self._carry = request
+                break
+            batch.append(request)
+            size += len(request.texts)
+
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            texts = [t for request in batch for t in request.texts]
+            self._queued_texts -= len(texts)
+
+            started = time.perf_counter()
+            try:
+                vectors = await asyncio.to_thread(self.encode_fn, texts)
+            except Exception as e:
+                self.metrics.errors += 1
+                logger.error(f"Batched encode of {len(texts)} texts failed: {e}")
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+                continue
+
+            self._record(batch, len(texts), started)
+
+            # Fan results back out in submission order
+            offset = 0
+            for request in batch:
+                count = len(request.texts)
+                if not request.future.done():
+                    request.future.set_result(vectors[offset:offset + count])
+                offset += count
+
+    def _record(self, batch: List[_PendingRequest], text_count: int, started: float):
+        m = self.metrics
+        m.batches += 1
+        m.requests += len(batch)
+        m.texts += text_count
+        m.encode_seconds += time.perf_counter() - started
+        m.wait_seconds += sum(started - r.enqueued_at for r in batch)
+        m.max_batch_texts_seen = max(m.max_batch_texts_seen, text_count)
+        m.batch_size_histogram[_bucket(text_count)] += 1
+
+    def get_metrics(self) -> dict:
+        return self.metrics.to_dict(self._queue.qsize() + (1 if self._carry else 0), self._queued_texts)
@@ -29,6 +29,10 @@ class InferenceConfig(BaseSettings):
     embedding_model: str = "intfloat/multilingual-e5-large"
     embedding_device: str = "cuda"
     embedding_batch_size: int = 32
+    embedding_max_batch_texts: int = 64  # Micro-batcher flush size
+    embedding_max_wait_ms: float = 5.0   # Micro-batcher flush deadline
+    embedding_cache_path: Optional[Path] = Path("/root/.cache/embeddings")  # None disables
+    embedding_cache_memory_entries: int = 10000
 
     # Paths
     model_cache_path: Path = Path("/root/.cache/huggingface")
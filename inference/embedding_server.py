@@ -19,6 +19,9 @@ from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from sentence_transformers import SentenceTransformer
 
+from ingestion.processor.embedding_cache import EmbeddingCache
+
+from .batcher import MicroBatcher
 from .config import config
 
 logger = logging.getLogger(__name__)
@@ -59,6 +62,7 @@ class EmbeddingService:
         self.device = device or config.embedding_device
         self.model: SentenceTransformer = None
         self.batch_size = config.embedding_batch_size
+        self.cache: EmbeddingCache = None
 
     def load_model(self):
         """Load the embedding model"""
@@ -77,6 +81,16 @@ class EmbeddingService:
 
         logger.info(f"Embedding model loaded on {self.device}")
 
+        if config.embedding_cache_path:
+            try:
+                self.cache = EmbeddingCache.shared(
+                    config.embedding_cache_path,
+                    self.model_name,
+                    max_memory_entries=config.embedding_cache_memory_entries
+                )
+            except OSError as e:
+                logger.warning(f"Embedding cache disabled: {e}")
+
     def embed(self, texts: Union[str, List[str]]) -> List[List[float]]:
         """
         Generate embeddings for text(s).
@@ -96,11 +110,17 @@ class EmbeddingService:
 
         # Add e5 prefix for better performance
         # See: https://huggingface.co/intfloat/multilingual-e5-large
-        prefixed_texts = [f"query: {text}" for text in texts]
+        prefix = "query: "
+
+        if self.cache is not None:
+            # Repeated queries are served from the content-hash cache
+            return self.cache.encode_through(texts, prefix, self._encode).tolist()
+        return self._encode([f"{prefix}{text}" for text in texts]).tolist()
 
-        # Generate embeddings
+    def _encode(self, prefixed_texts: List[str]):
+        """Run the model on already-prefixed texts"""
         with torch.no_grad():
-            embeddings = self.model.encode(
+            return self.model.encode(
                 prefixed_texts,
                 batch_size=self.batch_size,
                 show_progress_bar=False,
@@ -108,8 +128,6 @@ class EmbeddingService:
                 normalize_embeddings=True  # L2 normalization
             )
 
-        return embeddings.tolist()
-
     def get_dimension(self) -> int:
         """Get embedding dimension"""
         if self.model is None:
@@ -119,6 +137,7 @@ class EmbeddingService:
 
 # Global service instance
 _embedding_service: EmbeddingService = None
+_batcher: MicroBatcher = None
 
 
 def get_embedding_service() -> EmbeddingService:
@@ -129,13 +148,27 @@ def get_embedding_service() -> EmbeddingService:
     return _embedding_service
 
 
+def get_batcher() -> MicroBatcher:
+    """Get the request micro-batcher singleton"""
+    global _batcher
+    if _batcher is None:
+        _batcher = MicroBatcher(
+            get_embedding_service().embed,
+            max_batch_texts=config.embedding_max_batch_texts,
+            max_wait_ms=config.embedding_max_wait_ms
+        )
+    return _batcher
+
+
 # FastAPI Application
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Load model on startup"""
     service = get_embedding_service()
     service.load_model()
+    await get_batcher().start()
     yield
+    await get_batcher().stop()
     logger.info("Embedding server shutting down")
 
 
@@ -160,13 +193,11 @@ async def create_embeddings(request: EmbeddingRequest):
         }
     """
     try:
-        service = get_embedding_service()
-
         # Handle single string or list
         texts = request.input if isinstance(request.input, list) else [request.input]
 
-        # Generate embeddings
-        embeddings = service.embed(texts)
+        # Generate embeddings (batched with concurrent requests, off the event loop)
+        embeddings = await get_batcher().submit(texts)
 
         # Format response
         data = [
@@ -207,6 +238,17 @@ async def health_check():
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    """Micro-batcher queue depth and batch size metrics"""
+    return {
+        "batcher": get_batcher().get_metrics(),
+        "cache": get_embedding_service().cache.stats() if get_embedding_service().cache else None,
+        "max_batch_texts": config.embedding_max_batch_texts,
+        "max_wait_ms": config.embedding_max_wait_ms
+    }
+
+
 @app.get("/v1/models")
 async def list_models():
     """List available embedding models"""
@@ -0,0 +1,171 @@
+"""
+Centroid Classifier - Nearest-centroid classification on embeddings
+
+Keeps one running mean embedding per category, learned from documents whose
+label is trusted (Claude classifications, user assignments). A new document
+is assigned to the closest centroid when it is both
+
+- inside that category's usual radius: its similarity is no more than
+  ``max_z`` standard deviations below the members' mean similarity, and
+- clearly closer to it than to any other category (softmax over
+  similarities, see ``temperature``).
+
+This works on single-category shares too: once a few product sheets are
+labeled, further product sheets resolve locally instead of going to the LLM.
+
+Layout:
+    <lakehouse>/classifier/centroids_<model>.npz
+"""
+
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+import logging
+import os
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class CentroidClassifier:
+    """
+    Online nearest-centroid classifier over normalized embeddings.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        min_examples: int = 5,
+        temperature: float = 0.02,
+        max_z: float = 2.0
+    ):
+        """
+        Args:
+            path: .npz file to persist centroids (None keeps them in memory)
+            min_examples: Labeled examples a category needs before it predicts
+            temperature: Softmax temperature over cosine similarities
+                (embedding similarities are compressed; 0.02 separates 0.85
+                from 0.80 at ~92%)
+            max_z: How far below the members' mean similarity a document may be
+        """
+        self.path = Path(path) if path else None
+        self.min_examples = min_examples
+        self.temperature = temperature
+        self.max_z = max_z
+
+        self._sums: Dict[str, np.ndarray] = {}
+        self._counts: Dict[str, int] = {}
+        # Running mean / M2 (Welford) of member similarity to the centroid
+        self._sim_mean: Dict[str, float] = {}
+        self._sim_m2: Dict[str, float] = {}
+
+        if self.path:
+            self.load()
+
+    @property
+    def dimension(self) -> Optional[int]:
+        for vector in self._sums.values():
+            return vector.shape[0]
+        return None
+
+    def centroid(self, category: str) -> np.ndarray:
+        vector = self._sums[category]
+        return vector / max(np.linalg.norm(vector), 1e-12)
+
+    def add(self, category: str, vector: np.ndarray):
+        """Add one labeled example."""
+        vector = np.asarray(vector, dtype=np.float32)
+        vector = vector / max(np.linalg.norm(vector), 1e-12)
+
+        if self.dimension is not None and vector.shape[0] != self.dimension:
+            raise ValueError(f"Expected {self.dimension}-d vector, got {vector.shape[0]}")
+
+        if category in self._sums:
+            sim = float(self.centroid(category) @ vector)
+            count = self._counts[category]
+            delta = sim - self._sim_mean[category]
+            self._sim_mean[category] += delta / (count + 1)
+            self._sim_m2[category] += delta * (sim - self._sim_mean[category])
+            self._sums[category] += vector
+            self._counts[category] = count + 1
+        else:
+            self._sums[category] = vector.copy()
+            self._counts[category] = 1
+            self._sim_mean[category] = 1.0
+            self._sim_m2[category] = 0.0
+
+    def predict(self, vector: np.ndarray) -> Tuple[Optional[str], float]:
+        """
+        Classify an embedding.
+
+        Returns:
+            Tuple of (category, confidence); (None, 0.0) if no category is
+            trained or the document lies outside the best category's radius
+        """
+        ready = [c for c, n in self._counts.items() if n >= self.min_examples]
+        if not ready:
+            return None, 0.0
+
+        vector = np.asarray(vector, dtype=np.float32)
+        vector = vector / max(np.linalg.norm(vector), 1e-12)
+
+        centroids = np.stack([self.centroid(c) for c in ready])
+        sims = centroids @ vector
+        best = int(np.argmax(sims))
+        category = ready[best]
+
+        # Outside the category's usual spread: not a typical member
+        count = self._counts[category]
+        std = max(np.sqrt(self._sim_m2[category] / max(count - 1, 1)), 0.01)
+        if sims[best] < self._sim_mean[category] - self.max_z * std:
+            return None, 0.0
+
+        weights = np.exp((sims - sims[best]) / self.temperature)
+        return category, round(float(weights[best] / weights.sum()), 4)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            category: {
+                "examples": self._counts[category],
+                "mean_similarity": round(self._sim_mean[category], 4),
+            }
+            for category in self._counts
+        }
+
+    # =========================================================================
+    # PERSISTENCE
+    # =========================================================================
+
+    def load(self):
+        if not self.path or not self.path.exists():
+            return
+        try:
+            data = np.load(self.path, allow_pickle=False)
+            categories = [str(c) for c in data["categories"]]
+            for i, category in enumerate(categories):
+                self._sums[category] = data["sums"][i].astype(np.float32)
+                self._counts[category] = int(data["counts"][i])
+                self._sim_mean[category] = float(data["sim_mean"][i])
+                self._sim_m2[category] = float(data["sim_m2"][i])
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Could not load centroids from {self.path}, starting fresh: {e}")
+            self._sums, self._counts, self._sim_mean, self._sim_m2 = {}, {}, {}, {}
+            return
+        logger.info(f"🎯 Loaded {len(self._sums)} category centroids from {self.path}")
+
+    def save(self):
+        """Write centroids atomically."""
+        if not self.path or not self._sums:
+            return
+        categories = list(self._sums)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp.npz")
+        np.savez(
+            tmp,
+            categories=np.array(categories),
+            sums=np.stack([self._sums[c] for c in categories]),
+            counts=np.array([self._counts[c] for c in categories]),
+            sim_mean=np.array([self._sim_mean[c] for c in categories]),
+            sim_m2=np.array([self._sim_m2[c] for c in categories]),
+        )
+        os.replace(tmp, self.path)
@@ -1,31 +1,56 @@
 """
 Document Classifier - Determines which MCP should handle a document
 
-Two-stage classification:
-1. Rule-based (fast, pattern matching on path/filename)
-2. LLM-based (for uncertain cases, uses content)
+Cheap-first cascade, each stage answering only when confident:
+1. Rule-based (single-pass keyword match on path + content head)
+2. Embedding centroids (nearest category centroid, learned from LLM labels)
+3. LLM-based (Claude, or vLLM as fallback) for the remaining uncertain cases
 """
 
 import asyncio
+from collections import Counter
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 import logging
 import httpx
 
+from .centroids import CentroidClassifier
 from .rules import RuleBasedClassifier
 from .prompts import build_classification_prompt
+from ..llm_cache import LLMResponseCache
+from ..llm_gateway import LLMGateway, get_llm_gateway
+
+if TYPE_CHECKING:
+    from ..processor.embedder import Embedder
 
 logger = logging.getLogger(__name__)
 
 
+# Characters of content embedded for the centroid stage
+CENTROID_SAMPLE_CHARS = 1500
+
+
+@dataclass
+class ClassificationResult:
+    """Category plus which cascade stage decided it"""
+    category: str
+    confidence: float
+    source: str  # assigned | rules | centroid | llm | fallback
+
+
 class DocumentClassifier:
     """
     Classifies documents to determine target MCP.
 
     Strategy:
     1. Try rule-based classification (fast, free)
-    2. If uncertain, use Claude classification (accurate, costs tokens)
-    3. Fall back to 'general' if all else fails
+    2. If uncertain, try embedding centroids (one embedding, no tokens)
+    3. If still uncertain, use Claude classification (accurate, costs tokens)
+    4. Fall back to 'general' if all else fails
+
+    Claude's labels train the centroids, so on homogeneous shares the LLM is
+    only needed for the first few documents of each kind.
     """
 
     MCP_CATEGORIES = ['tax', 'legal', 'products', 'hr', 'correspondence', 'general']
@@ -34,24 +59,36 @@ class DocumentClassifier:
         self,
         vllm_url: str = "http://localhost:8001",
         confidence_threshold: float = 0.6,
-        claude_api_key: Optional[str] = None
+        claude_api_key: Optional[str] = None,
+        response_cache: Optional[LLMResponseCache] = None,
+        embedder: Optional["Embedder"] = None,
+        centroids: Optional[CentroidClassifier] = None,
+        centroid_threshold: float = 0.8
     ):
         """
         Args:
             vllm_url: URL of vLLM inference server (fallback)
             confidence_threshold: Minimum confidence for rule-based classification
             claude_api_key: Anthropic API key for Claude classification
+            response_cache: Persistent cache for deterministic Claude responses
+            embedder: Embedder for the centroid stage (disabled if None)
+            centroids: Category centroids (in-memory ones are created if None)
+            centroid_threshold: Minimum confidence for centroid classification
         """
         self.vllm_url = vllm_url
         self.confidence_threshold = confidence_threshold
         self.rule_classifier = RuleBasedClassifier()
         self._client = httpx.AsyncClient(timeout=30.0)
-
-        # Initialize Claude client if API key provided
-        self.claude_client = None
+        self.response_cache = response_cache
+        self.embedder = embedder
+        self.centroids = centroids if centroids is not None else CentroidClassifier()
+        self.centroid_threshold = centroid_threshold
+        self.decisions: Counter = Counter()  # source -> count
+
+        # Shared async Claude gateway if API key provided
+        self.llm: Optional[LLMGateway] = None
         if claude_api_key:
-            import anthropic
-            self.claude_client = anthropic.Anthropic(api_key=claude_api_key)
+            self.llm = get_llm_gateway(claude_api_key)
             logger.info("Claude classifier initialized")
 
     async def classify(
@@ -61,41 +98,98 @@ class DocumentClassifier:
         assigned_mcp: Optional[str] = None
     ) -> str:
         """
-        Classify a document using Claude-first strategy.
+        Classify a document through the cheap-first cascade.
 
         Args:
             file_path: Path to the document
-            content_sample: Optional text sample for LLM classification
+            content_sample: Optional text sample for content-based stages
             assigned_mcp: Optional pre-assigned MCP (from user)
 
         Returns:
             MCP category: 'tax', 'legal', 'products', 'hr', 'correspondence', or 'general'
         """
+        result = await self.classify_with_confidence(file_path, content_sample, assigned_mcp)
+        return result.category
+
+    async def classify_with_confidence(
+        self,
+        file_path: Path,
+        content_sample: Optional[str] = None,
+        assigned_mcp: Optional[str] = None
+    ) -> ClassificationResult:
+        """
+        Classify a document and report which stage decided.
+
+        Args:
+            file_path: Path to the document
+            content_sample: Optional text sample for content-based stages
+            assigned_mcp: Optional pre-assigned MCP (from user)
+
+        Returns:
+            ClassificationResult
+        """
+        result = await self._cascade(file_path, content_sample, assigned_mcp)
+        self.decisions[result.source] += 1
+        return result
+
+    async def _cascade(
+        self,
+        file_path: Path,
+        content_sample: Optional[str],
+        assigned_mcp: Optional[str]
+    ) -> ClassificationResult:
         # If user pre-assigned, use that
         if assigned_mcp and assigned_mcp in self.MCP_CATEGORIES:
             logger.debug(f"Using pre-assigned MCP for {file_path.name}: {assigned_mcp}")
-            return assigned_mcp
-
-        # CLAUDE-FIRST: Use AI classification if we have content and Claude available
-        if content_sample and self.claude_client:
-            logger.debug(f"🤖 Using Claude to classify: {file_path.name}")
-            category = await self._llm_classify(file_path.name, content_sample)
-            if category:
-                return category
-
-        # Fallback to rule-based classification
-        category, confidence = self.rule_classifier.classify_with_confidence(file_path)
+            return ClassificationResult(assigned_mcp, 1.0, "assigned")
 
+        # 1. Keywords in path and content head
+        category, confidence = self.rule_classifier.classify_text(file_path, content_sample)
         if category and confidence >= self.confidence_threshold:
             logger.debug(
                 f"Rule-based classification: {file_path.name} → {category} "
                 f"(confidence: {confidence:.2f})"
             )
-            return category
+            return ClassificationResult(category, confidence, "rules")
+
+        if not content_sample:
+            logger.debug(f"Defaulting to 'general' for {file_path.name}")
+            return ClassificationResult('general', 0.0, "fallback")
+
+        # 2. Nearest category centroid
+        vector = await self._embed_sample(content_sample)
+        if vector is not None:
+            category, confidence = self.centroids.predict(vector)
+            if category and confidence >= self.centroid_threshold:
+                logger.debug(
+                    f"Centroid classification: {file_path.name} → {category} "
+                    f"(confidence: {confidence:.2f})"
+                )
+                return ClassificationResult(category, confidence, "centroid")
+
+        # 3. LLM for what is still uncertain
+        logger.debug(f"🤖 Using LLM to classify: {file_path.name}")
+        category = await self._llm_classify(file_path.name, content_sample)
+        if category:
+            if vector is not None:
+                self.centroids.add(category, vector)
+            return ClassificationResult(category, 1.0, "llm")
 
         # Final fallback to general
         logger.debug(f"Defaulting to 'general' for {file_path.name}")
-        return 'general'
+        return ClassificationResult('general', 0.0, "fallback")
+
+    async def _embed_sample(self, content: str):
+        """Embed the content head for the centroid stage (None if unavailable)"""
+        if self.embedder is None:
+            return None
+        try:
+            vectors = await self.embedder.embed_batch([content[:CENTROID_SAMPLE_CHARS]])
+            return vectors[0]
+        except Exception as e:
+            logger.warning(f"Centroid stage disabled, embedding failed: {e}")
+            self.embedder = None
+            return None
 
     async def _llm_classify(self, filename: str, content: str) -> Optional[str]:
         """
@@ -109,7 +203,7 @@ class DocumentClassifier:
             Category name, or None if classification fails
         """
         # Try Claude first if available (better accuracy)
-        if self.claude_client:
+        if self.llm:
             return await self._claude_classify(filename, content)
 
         # Fall back to vLLM
@@ -193,16 +287,17 @@ Content (first 3000 chars):
 
 **Important:** Respond with ONLY valid JSON, no markdown, no explanation."""
 
-            response = self.claude_client.messages.create(
+            response_text = await self.llm.complete(
+                prompt,
                 model="claude-haiku-3-5-20250514",  # Fast and cheap for classification
                 max_tokens=500,  # More tokens for JSON response
                 temperature=0.0,
-                messages=[{"role": "user", "content": prompt}]
+                cache=self.response_cache
             )
 
             # Parse JSON response
             import json
-            response_text = response.content[0].text.strip()
+            response_text = response_text.strip()
 
             # Remove markdown code blocks if present
             if response_text.startswith('```'):
@@ -255,34 +350,22 @@ Content (first 3000 chars):
         """
         classifications = {}
 
-        # Try rule-based for all first
-        uncertain_docs = []
-
         for file_path, content in documents:
-            category, confidence = self.rule_classifier.classify_with_confidence(
-                file_path
-            )
-
-            if category and confidence >= self.confidence_threshold:
-                classifications[file_path] = category
-            else:
-                uncertain_docs.append((file_path, content))
-
-        # For uncertain docs with content, use LLM
-        if uncertain_docs:
-            logger.info(
-                f"Using LLM classification for {len(uncertain_docs)} uncertain documents"
-            )
-
-            for file_path, content in uncertain_docs:
-                if content:
-                    category = await self._llm_classify(file_path.name, content)
-                    classifications[file_path] = category or 'general'
-                else:
-                    classifications[file_path] = 'general'
+            classifications[file_path] = await self.classify(file_path, content)
 
+        escalated = self.decisions["llm"]
+        logger.info(f"Classified {len(documents)} documents ({escalated} LLM calls so far)")
         return classifications
 
+    def get_statistics(self) -> dict:
+        """Decisions per cascade stage and centroid training state"""
+        total = sum(self.decisions.values())
+        return {
+            "decisions": dict(self.decisions),
+            "llm_rate": round(self.decisions["llm"] / total, 4) if total else 0.0,
+            "centroids": self.centroids.stats(),
+        }
+
     def get_category_description(self, category: str) -> str:
         """Get human-readable description of a category"""
         descriptions = {
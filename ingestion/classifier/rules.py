@@ -3,16 +3,69 @@ Rule-Based Classifier - Fast classification using pattern matching
 
 Uses filename patterns and path heuristics to classify documents.
 This is the first-pass, fast classification before LLM classification.
+
+MultiPatternMatcher merges all category patterns into a single compiled
+regex, so scoring a path plus a content sample is one scan instead of one
+search per pattern.
 """
 
 import re
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Set
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# Only the head of a document is scanned for content keywords
+CONTENT_SCAN_CHARS = 20_000
+
+
+class MultiPatternMatcher:
+    """
+    All category patterns merged into one alternation, scanned in a single pass.
+
+    Each distinct pattern becomes a named group; a match reports which
+    categories the pattern belongs to. Matches are leftmost and
+    non-overlapping, so a pattern nested inside a longer match at the same
+    position (``steuer`` in ``umsatzsteuer``) is not counted separately.
+    """
+
+    def __init__(self, patterns: Dict[str, List[str]]):
+        self._categories: List[List[str]] = []  # group index -> categories
+        index: Dict[str, int] = {}
+
+        for category, category_patterns in patterns.items():
+            for pattern in category_patterns:
+                if pattern not in index:
+                    index[pattern] = len(self._categories)
+                    self._categories.append([])
+                if category not in self._categories[index[pattern]]:
+                    self._categories[index[pattern]].append(category)
+
+        # Longest patterns first so specific terms win at the same position
+        ordered = sorted(index.items(), key=lambda item: -len(item[0]))
+        self._regex = re.compile(
+            "|".join(f"(?P<p{i}>{pattern})" for pattern, i in ordered),
+            re.IGNORECASE
+        )
+        self.categories = list(patterns)
+
+    def match(self, text: str) -> Dict[str, Set[int]]:
+        """
+        Scan ``text`` once.
+
+        Returns:
+            Category -> IDs of the distinct patterns that matched
+        """
+        hits: Dict[str, Set[int]] = {}
+        for m in self._regex.finditer(text):
+            pattern_id = int(m.lastgroup[1:])
+            for category in self._categories[pattern_id]:
+                hits.setdefault(category, set()).add(pattern_id)
+        return hits
+
+
 class RuleBasedClassifier:
     """
     Rule-based document classifier.
@@ -177,6 +230,8 @@ class RuleBasedClassifier:
                 for pattern in patterns
             ]
 
+        self._matcher = MultiPatternMatcher(self.PATTERNS)
+
     def classify(self, file_path: Path) -> Optional[str]:
         """
         Classify a document based on its path and filename.
@@ -261,3 +316,41 @@ class RuleBasedClassifier:
         confidence = min(best_score / 10.0, 1.0)
 
         return best_category, confidence
+
+    def classify_text(
+        self,
+        file_path: Path,
+        content: Optional[str] = None,
+        min_score: int = 6
+    ) -> tuple[Optional[str], float]:
+        """
+        Classify from path and content keywords with a margin-based confidence.
+
+        Distinct patterns matching the path score 2, in the content 1.
+        Confidence is the best category's lead over the runner-up relative to
+        its score, scaled down while the best score is below ``min_score``,
+        so a single stray keyword never yields a confident answer.
+
+        Args:
+            file_path: Path to document
+            content: Optional extracted text (only the head is scanned)
+            min_score: Score needed for full confidence
+
+        Returns:
+            Tuple of (category, confidence) where confidence is 0-1
+        """
+        scores = {category: 0 for category in self._matcher.categories}
+
+        for category, hits in self._matcher.match(str(file_path)).items():
+            scores[category] += 2 * len(hits)
+        if content:
+            for category, hits in self._matcher.match(content[:CONTENT_SCAN_CHARS]).items():
+                scores[category] += len(hits)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        (best_category, best_score), (_, second_score) = ranked[0], ranked[1]
+        if best_score == 0:
+            return None, 0.0
+
+        confidence = (best_score - second_score) / best_score * min(best_score / min_score, 1.0)
+        return best_category, round(confidence, 4)
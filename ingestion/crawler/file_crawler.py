@@ -29,6 +29,9 @@ class FileInfo:
     modified: datetime
     mime_type: Optional[str]
 
+    # Object-store ETag when the file was downloaded from a bucket
+    source_etag: Optional[str] = None
+
     # Metadata added during processing
     assigned_mcp: Optional[str] = None
     classification: Optional[str] = None
@@ -104,14 +107,9 @@ class FileCrawler:
         logger.info(f"Starting crawl of {folder}")
 
         files = []
-        supported_exts = get_supported_extensions()
 
         for file_info in self._walk_files(folder, recursive, max_depth):
-            # Check if we have a handler for this file
-            if file_info.extension not in supported_exts:
-                self.unknown_formats.add(file_info.extension)
-                file_info.extraction_status = "unknown_format"
-
+            # describe() already flagged formats without a handler
             files.append(file_info)
 
             # Progress callback
@@ -147,32 +145,10 @@ class FileCrawler:
                     continue
 
                 if entry.is_file():
-                    try:
-                        stat = entry.stat()
-
-                        # Skip files that are too large
-                        if stat.st_size > self.max_file_size:
-                            logger.warning(
-                                f"Skipping large file: {entry} "
-                                f"({stat.st_size / (1024*1024):.1f}MB)"
-                            )
-                            continue
-
-                        # Create FileInfo
-                        file_info = FileInfo(
-                            path=entry,
-                            name=entry.name,
-                            extension=entry.suffix.lower(),
-                            size_bytes=stat.st_size,
-                            modified=datetime.fromtimestamp(stat.st_mtime),
-                            mime_type=mimetypes.guess_type(str(entry))[0]
-                        )
-
+                    file_info = self.describe(entry)
+                    if file_info is not None:
                         yield file_info
 
-                    except (OSError, PermissionError) as e:
-                        logger.warning(f"Cannot access {entry}: {e}")
-
                 elif entry.is_dir() and recursive:
                     yield from self._walk_files(
                         entry, recursive, max_depth, current_depth + 1
@@ -181,6 +157,40 @@ class FileCrawler:
         except PermissionError:
             logger.warning(f"Permission denied: {folder}")
 
+    def describe(self, path: Path) -> Optional[FileInfo]:
+        """
+        Build FileInfo for a single file (None if inaccessible or too large).
+
+        Used by the crawl and by callers that feed files one by one
+        (e.g. as they finish downloading).
+        """
+        try:
+            stat = path.stat()
+        except (OSError, PermissionError) as e:
+            logger.warning(f"Cannot access {path}: {e}")
+            return None
+
+        # Skip files that are too large
+        if stat.st_size > self.max_file_size:
+            logger.warning(
+                f"Skipping large file: {path} "
+                f"({stat.st_size / (1024*1024):.1f}MB)"
+            )
+            return None
+
+        file_info = FileInfo(
+            path=path,
+            name=path.name,
+            extension=path.suffix.lower(),
+            size_bytes=stat.st_size,
+            modified=datetime.fromtimestamp(stat.st_mtime),
+            mime_type=mimetypes.guess_type(str(path))[0]
+        )
+        if file_info.extension not in get_supported_extensions():
+            self.unknown_formats.add(file_info.extension)
+            file_info.extraction_status = "unknown_format"
+        return file_info
+
     async def extract_text(self, file_info: FileInfo) -> Optional[str]:
         """
         Extract text content from a file.
@@ -19,6 +19,8 @@ import pyarrow as pa
 from deltalake import DeltaTable, write_deltalake
 import lancedb
 
+from lakehouse.vector.chunk_text import attach_chunk_text
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,7 +48,10 @@ class ProductImageLinker:
         """Load Vision API metadata from LanceDB"""
         db = lancedb.connect(str(self.lance_path))
         table = db.open_table('embeddings')
-        df = table.to_pandas()
+        columns = [c for c in table.schema.names if c != 'vector']
+        chunks = table.to_lance().to_table(columns=columns)
+        # Tables stored without text reference the Delta chunk tables
+        df = attach_chunk_text(chunks, self.lance_path.parent / "delta").to_pandas()
 
         # Filter to images only
         images = df[df['filename'].str.contains('\.jpg|\.png', case=False, na=False)].copy()
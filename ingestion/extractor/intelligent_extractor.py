@@ -26,6 +26,9 @@ except ImportError:
     ANTHROPIC_AVAILABLE = False
     anthropic = None
 
+from ..llm_cache import LLMResponseCache
+from ..llm_gateway import get_llm_gateway
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,18 +43,24 @@ class IntelligentExtractor:
     4. Returning structured records ready for Delta Lake
     """
 
-    def __init__(self, claude_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        claude_api_key: Optional[str] = None,
+        response_cache: Optional[LLMResponseCache] = None
+    ):
         """
         Initialize intelligent extractor.
 
         Args:
             claude_api_key: Anthropic API key for Claude access
+            response_cache: Persistent cache for deterministic Claude responses
         """
         self.claude_api_key = claude_api_key
+        self.response_cache = response_cache
         self.client = None
 
         if claude_api_key and ANTHROPIC_AVAILABLE:
-            self.client = anthropic.Anthropic(api_key=claude_api_key)
+            self.client = get_llm_gateway(claude_api_key)
             logger.info("✅ Intelligent Extractor initialized with Claude Sonnet 4.5")
         else:
             if not ANTHROPIC_AVAILABLE:
@@ -269,19 +278,15 @@ Return ONLY valid JSON. No markdown, no explanation, just the JSON object.
             Claude's response text
         """
         try:
-            # Use synchronous client (anthropic SDK doesn't have async)
-            message = self.client.messages.create(
+            # Async gateway: bounded concurrency, rate limits and retries shared with classification
+            return await self.client.complete(
+                prompt,
                 model="claude-sonnet-4-20250514",  # Claude Sonnet 4.5
                 max_tokens=4096,
-                temperature=0.0,  # Deterministic for data extraction
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }]
+                temperature=0.0,  # Deterministic for data extraction (and cacheable)
+                cache=self.response_cache
             )
 
-            return message.content[0].text
-
         except Exception as e:
             logger.error(f"Claude API call failed: {e}")
             raise
@@ -0,0 +1,172 @@
+"""
+LLM Response Cache - Disk-backed cache for deterministic LLM calls
+
+Re-running ingestion over the same files re-issues the same classification,
+metadata and extraction prompts. Responses to temperature-0 requests are
+stored in SQLite keyed by a fingerprint of (model, temperature, max_tokens,
+system, prompt), so repeat runs and crash-resumes are answered locally.
+
+- TTL: entries older than ``ttl_seconds`` are treated as misses and purged
+- Size bound: least recently used entries are evicted past ``max_bytes``
+
+Layout:
+    <lakehouse>/llm_cache/responses.sqlite
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def prompt_fingerprint(
+    prompt: str,
+    model: str,
+    max_tokens: int,
+    temperature: float,
+    system: Optional[str] = None
+) -> str:
+    """sha256 over everything that determines a deterministic response"""
+    h = hashlib.sha256()
+    for part in (model, repr(float(temperature)), str(max_tokens), system or "", prompt):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed response cache with TTL and LRU size eviction.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        """
+        Args:
+            cache_dir: Directory for the SQLite file
+            ttl_seconds: Entry lifetime
+            max_bytes: Total response size budget
+        """
+        self.path = Path(cache_dir) / "responses.sqlite"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a fresh cached response or None."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at, size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            response, created_at, size = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._bytes -= size
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return response
+
+    def put(self, key: str, response: str, model: Optional[str] = None):
+        """Store a response, evicting least recently used entries past max_bytes."""
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now)
+            )
+            self._bytes += size - (old[0] if old else 0)
+
+            if self._bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop expired entries, then LRU entries until under budget (lock held)."""
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total > self.max_bytes:
+            # Free down to 90% so eviction doesn't run on every put
+            target = int(self.max_bytes * 0.9)
+            freed = 0
+            keys = []
+            for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+                if total - freed <= target:
+                    break
+                keys.append((key,))
+                freed += size
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", keys)
+            self.evictions += len(keys)
+            total -= freed
+
+        self._bytes = total
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,288 @@
+"""
+LLM Gateway - Shared async access to Claude for ingestion
+
+All ingestion LLM calls (classification, metadata extraction, structured
+extraction) go through one gateway per API key, which provides:
+
+- Async client: calls never block the event loop (progress websockets keep
+  streaming while hundreds of requests are in flight)
+- Bounded concurrency: at most ``max_concurrency`` requests in flight
+- Token-bucket rate limiting on requests/minute and input tokens/minute
+- Retries with full-jitter exponential backoff on 429/5xx/529/connection
+  errors (honouring ``retry-after``)
+- Request coalescing: identical concurrent requests share one API call
+- Response caching: temperature-0 requests are answered from an
+  LLMResponseCache when the caller passes one
+
+Configuration (environment):
+    LLM_MAX_CONCURRENCY            default 8
+    LLM_REQUESTS_PER_MINUTE        default 1000
+    LLM_INPUT_TOKENS_PER_MINUTE    default 400000
+    ANTHROPIC_BASE_URL             point at a local stub server for benchmarks
+
+Usage:
+    gateway = get_llm_gateway(api_key)
+    text = await gateway.complete(prompt, model="claude-haiku-3-5-20250514", max_tokens=200)
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+import asyncio
+import logging
+import os
+import random
+import time
+
+from .llm_cache import LLMResponseCache, prompt_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_REQUESTS_PER_MINUTE = 1000
+DEFAULT_INPUT_TOKENS_PER_MINUTE = 400_000
+
+# HTTP status codes worth retrying (rate limit, overload, transient server errors)
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate for rate limiting (~4 chars per token)"""
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    """
+    Async token bucket: ``capacity`` tokens, refilled at ``rate`` tokens/second.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until ``tokens`` are available and take them."""
+        # Requests larger than the bucket would never fit - cap them
+        tokens = min(tokens, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+@dataclass
+class GatewayMetrics:
+    """Counters exposed via LLMGateway.get_metrics()"""
+    requests: int = 0
+    api_calls: int = 0
+    coalesced: int = 0
+    cache_hits: int = 0
+    retries: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    latency_seconds: float = 0.0
+    throttled_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "api_calls": self.api_calls,
+            "coalesced": self.coalesced,
+            "cache_hits": self.cache_hits,
+            "retries": self.retries,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "avg_latency_ms": round(self.latency_seconds / self.api_calls * 1000, 1) if self.api_calls else 0.0,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+        }
+
+
+class LLMGateway:
+    """
+    Concurrency-bounded, rate-limited, retrying async Claude client.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        client: Any = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        input_tokens_per_minute: float = DEFAULT_INPUT_TOKENS_PER_MINUTE,
+        max_retries: int = 5,
+        base_backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        base_url: Optional[str] = None
+    ):
+        """
+        Args:
+            api_key: Anthropic API key (ignored if ``client`` is given)
+            client: Pre-built async client exposing ``messages.create``
+            max_concurrency: Maximum requests in flight
+            requests_per_minute: Request rate limit
+            input_tokens_per_minute: Estimated input-token rate limit
+            max_retries: Retries per request on retryable errors
+            base_backoff: First backoff ceiling in seconds (doubles per attempt)
+            max_backoff: Backoff ceiling in seconds
+            base_url: API base URL (e.g. a local stub server)
+        """
+        if client is None:
+            import anthropic
+            client = anthropic.AsyncAnthropic(
+                api_key=api_key,
+                base_url=base_url or os.getenv("ANTHROPIC_BASE_URL") or None,
+                max_retries=0  # Retries are handled here, with jitter and shared limits
+            )
+
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._request_bucket = TokenBucket(requests_per_minute / 60.0, capacity=max(1.0, requests_per_minute / 60.0))
+        self._token_bucket = TokenBucket(input_tokens_per_minute / 60.0, capacity=input_tokens_per_minute / 6.0)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.metrics = GatewayMetrics()
+
+    async def complete(
+        self,
+        prompt: str,
+        model: str,
+        max_tokens: int,
+        temperature: float = 0.0,
+        system: Optional[str] = None,
+        cache: Optional[LLMResponseCache] = None
+    ) -> str:
+        """
+        Send a single-turn prompt and return the response text.
+
+        Identical concurrent requests are coalesced into one API call.
+
+        Args:
+            cache: Response cache consulted (and filled) when temperature is 0
+
+        Raises:
+            The last API error once retries are exhausted
+        """
+        self.metrics.requests += 1
+        key = prompt_fingerprint(prompt, model, max_tokens, temperature, system)
+        use_cache = cache is not None and temperature == 0
+
+        if use_cache:
+            cached = await asyncio.to_thread(cache.get, key)
+            if cached is not None:
+                self.metrics.cache_hits += 1
+                return cached
+
+        shared = self._inflight.get(key)
+        if shared is not None:
+            self.metrics.coalesced += 1
+            return await asyncio.shield(shared)
+
+        task = asyncio.ensure_future(self._call(prompt, model, max_tokens, temperature, system))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        response = await asyncio.shield(task)
+
+        if use_cache:
+            await asyncio.to_thread(cache.put, key, response, model)
+        return response
+
+    async def _call(self, prompt, model, max_tokens, temperature, system) -> str:
+        kwargs = {
+            "model": model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if system:
+            kwargs["system"] = system
+
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                throttle_start = time.monotonic()
+                await self._request_bucket.acquire()
+                await self._token_bucket.acquire(estimate_tokens(prompt) + estimate_tokens(system or ""))
+                self.metrics.throttled_seconds += time.monotonic() - throttle_start
+
+                self.metrics.in_flight += 1
+                started = time.monotonic()
+                try:
+                    response = await self.client.messages.create(**kwargs)
+                    self.metrics.api_calls += 1
+                    self.metrics.latency_seconds += time.monotonic() - started
+                    return response.content[0].text
+                except Exception as e:
+                    error = e
+                finally:
+                    self.metrics.in_flight -= 1
+
+            if attempt >= self.max_retries or not self._is_retryable(error):
+                self.metrics.errors += 1
+                raise error
+
+            delay = self._backoff(attempt, error)
+            attempt += 1
+            self.metrics.retries += 1
+            logger.warning(f"LLM call failed ({type(error).__name__}), retry {attempt}/{self.max_retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        status = getattr(error, "status_code", None)
+        if status is not None:
+            return status in RETRYABLE_STATUS
+        # Connection errors and timeouts carry no status code
+        return type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, at least the server's retry-after"""
+        ceiling = min(self.max_backoff, self.base_backoff * (2 ** attempt))
+        delay = random.uniform(0, ceiling)
+
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        return delay
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return self.metrics.to_dict()
+
+
+_gateways: Dict[str, LLMGateway] = {}
+
+
+def get_llm_gateway(api_key: str) -> LLMGateway:
+    """
+    Get the process-wide gateway for an API key.
+
+    Limits are shared by every caller using the same key.
+    """
+    gateway = _gateways.get(api_key)
+    if gateway is None:
+        gateway = LLMGateway(
+            api_key=api_key,
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)),
+            requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE", DEFAULT_REQUESTS_PER_MINUTE)),
+            input_tokens_per_minute=float(os.getenv("LLM_INPUT_TOKENS_PER_MINUTE", DEFAULT_INPUT_TOKENS_PER_MINUTE)),
+        )
+        _gateways[api_key] = gateway
+    return gateway
@@ -0,0 +1,265 @@
+"""
+Ingestion Manifest - Per-customer record of what has been ingested
+
+Maps each source file to the fingerprint it had when it was last ingested
+(path, size, mtime, sha256) and to what it produced (document_id, chunk_ids,
+classification). On the next run the orchestrator diffs the crawl against
+the manifest and only extracts, classifies, chunks, embeds and loads files
+that are new or changed.
+
+Change detection is two-step: size + mtime equal → unchanged without
+reading the file; otherwise the content hash decides (a ``touch`` or a copy
+with identical bytes is not a modification).
+
+Files downloaded from an object store also keep the object's ETag, so the
+next download can skip objects that were already ingested unchanged.
+
+Layout:
+    <lakehouse>/manifests/<customer_id>.json
+"""
+
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Union
+import asyncio
+import hashlib
+import json
+import logging
+import os
+
+if TYPE_CHECKING:
+    from .crawler.file_crawler import FileInfo
+
+logger = logging.getLogger(__name__)
+
+
+MANIFEST_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: Union[str, Path]) -> str:
+    """Streaming sha256 of a file's contents"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    """What a source file looked like and produced at its last ingestion"""
+    path: str
+    size: int
+    mtime: float
+    content_hash: str
+    document_id: Optional[str] = None
+    chunk_ids: List[str] = field(default_factory=list)
+    classification: Optional[str] = None
+    ingested_at: Optional[str] = None
+    deleted_at: Optional[str] = None  # Set when the file vanished (tombstone)
+    etag: Optional[str] = None  # Object-store ETag of the ingested version
+
+    @property
+    def is_deleted(self) -> bool:
+        return self.deleted_at is not None
+
+
+@dataclass
+class ManifestDiff:
+    """Result of comparing a crawl against the manifest"""
+    new: List["FileInfo"] = field(default_factory=list)
+    modified: List["FileInfo"] = field(default_factory=list)
+    unchanged: List["FileInfo"] = field(default_factory=list)
+    vanished: List[ManifestEntry] = field(default_factory=list)
+
+    @property
+    def changed(self) -> List["FileInfo"]:
+        return self.new + self.modified
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "new": len(self.new),
+            "modified": len(self.modified),
+            "unchanged": len(self.unchanged),
+            "vanished": len(self.vanished),
+        }
+
+
+class IngestionManifest:
+    """
+    Persistent file manifest for one customer.
+    """
+
+    def __init__(self, manifest_path: Union[str, Path]):
+        """
+        Args:
+            manifest_path: JSON file holding the manifest
+        """
+        self.manifest_path = Path(manifest_path)
+        self.entries: Dict[str, ManifestEntry] = {}
+        # Content hashes computed during diff(), reused by record()
+        self._hashes: Dict[str, str] = {}
+        self.load()
+
+    @classmethod
+    def for_customer(cls, lakehouse_path: Union[str, Path], customer_id: Optional[str]) -> "IngestionManifest":
+        return cls(Path(lakehouse_path) / "manifests" / f"{customer_id or 'default'}.json")
+
+    # =========================================================================
+    # PERSISTENCE
+    # =========================================================================
+
+    def load(self):
+        try:
+            with open(self.manifest_path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except json.JSONDecodeError as e:
+            logger.warning(f"Corrupt manifest {self.manifest_path}, starting fresh: {e}")
+            return
+
+        self.entries = {
+            path: ManifestEntry(**entry) for path, entry in data.get("files", {}).items()
+        }
+        logger.info(f"📒 Loaded manifest with {len(self.entries)} files from {self.manifest_path}")
+
+    def save(self):
+        """Write the manifest atomically."""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump({
+                "version": MANIFEST_VERSION,
+                "updated_at": datetime.now().isoformat(),
+                "files": {path: asdict(entry) for path, entry in self.entries.items()},
+            }, f)
+        os.replace(tmp, self.manifest_path)
+
+    # =========================================================================
+    # DIFF
+    # =========================================================================
+
+    async def diff(self, files: List["FileInfo"], roots: Iterable[Path]) -> ManifestDiff:
+        """
+        Classify crawled files as new / modified / unchanged and find vanished ones.
+
+        Args:
+            files: Files returned by the crawler
+            roots: Crawled folders; only entries below them can vanish
+
+        Returns:
+            ManifestDiff
+        """
+        result = ManifestDiff()
+        self._hashes.clear()
+        to_hash: List["FileInfo"] = []
+
+        for file_info in files:
+            entry = self.entries.get(str(file_info.path))
+            if entry is None or entry.is_deleted:
+                to_hash.append(file_info)
+            elif entry.size == file_info.size_bytes and entry.mtime == file_info.modified.timestamp():
+                result.unchanged.append(file_info)
+            else:
+                to_hash.append(file_info)
+
+        # Hash only candidates, off the event loop
+        hashes = await asyncio.gather(*[
+            asyncio.to_thread(hash_file, f.path) for f in to_hash
+        ], return_exceptions=True)
+
+        for file_info, content_hash in zip(to_hash, hashes):
+            key = str(file_info.path)
+            entry = self.entries.get(key)
+
+            if isinstance(content_hash, Exception):
+                logger.warning(f"Could not hash {key}: {content_hash}")
+                content_hash = None
+            else:
+                self._hashes[key] = content_hash
+
+            if entry is None or entry.is_deleted:
+                result.new.append(file_info)
+            elif content_hash is not None and content_hash == entry.content_hash:
+                # Touched but identical: refresh the stat fingerprint only
+                entry.size = file_info.size_bytes
+                entry.mtime = file_info.modified.timestamp()
+                result.unchanged.append(file_info)
+            else:
+                result.modified.append(file_info)
+
+        result.vanished = self.vanished((f.path for f in files), roots)
+        return result
+
+    def vanished(self, present: Iterable[Union[str, Path]], roots: Iterable[Path]) -> List[ManifestEntry]:
+        """
+        Live entries below ``roots`` whose file is no longer present.
+
+        Args:
+            present: Paths currently in the source (crawl or bucket listing)
+            roots: Crawled folders; only entries below them can vanish
+        """
+        seen = {str(p) for p in present}
+        roots = [str(Path(r)) for r in roots]
+        return [
+            entry for path, entry in self.entries.items()
+            if not entry.is_deleted and path not in seen
+            and any(path == r or path.startswith(r.rstrip(os.sep) + os.sep) for r in roots)
+        ]
+
+    # =========================================================================
+    # UPDATES
+    # =========================================================================
+
+    def record(self, file_info: "FileInfo", doc: Optional[dict] = None):
+        """
+        Record a successfully ingested file.
+
+        Args:
+            file_info: Crawled file
+            doc: Processed document (None if the file produced no chunks)
+        """
+        key = str(file_info.path)
+        content_hash = self._hashes.get(key)
+        if content_hash is None:
+            content_hash = hash_file(file_info.path)
+
+        chunk_ids = [f"{doc['id']}_{i}" for i in range(len(doc.get("chunks", [])))] if doc else []
+
+        self.entries[key] = ManifestEntry(
+            path=key,
+            size=file_info.size_bytes,
+            mtime=file_info.modified.timestamp(),
+            content_hash=content_hash,
+            document_id=doc["id"] if doc else None,
+            chunk_ids=chunk_ids,
+            classification=file_info.classification,
+            ingested_at=datetime.now().isoformat(),
+            etag=getattr(file_info, "source_etag", None),
+        )
+
+    def tombstone(self, entry: ManifestEntry):
+        """Mark a vanished file as deleted (kept so the deletion is auditable)."""
+        entry.deleted_at = datetime.now().isoformat()
+        entry.chunk_ids = []
+
+    def etags(self) -> Dict[str, str]:
+        """Path → ETag of live entries that came from an object store"""
+        return {
+            path: entry.etag for path, entry in self.entries.items()
+            if entry.etag and not entry.is_deleted
+        }
+
+    def get(self, path: Union[str, Path]) -> Optional[ManifestEntry]:
+        return self.entries.get(str(path))
+
+    def stats(self) -> Dict[str, int]:
+        deleted = sum(1 for e in self.entries.values() if e.is_deleted)
+        return {
+            "files": len(self.entries) - deleted,
+            "tombstones": deleted,
+            "chunks": sum(len(e.chunk_ids) for e in self.entries.values()),
+        }
@@ -7,16 +7,22 @@ Provides progress tracking, error handling, and statistics.
 
 import asyncio
 from pathlib import Path
-from typing import List, Dict, Optional, Callable
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, List, Dict, Optional, Callable, Sequence, Union
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 import logging
+import sqlite3
 
 from .crawler.file_crawler import FileCrawler, FileInfo
+from .classifier.centroids import CentroidClassifier
 from .classifier.document_classifier import DocumentClassifier
 from .processor.chunker import SmartChunker
 from .processor.embedder import Embedder
+from .llm_cache import LLMResponseCache
+from .processor.embedding_cache import EmbeddingCache
+from .manifest import IngestionManifest, ManifestEntry
+from .pipeline import Stage, StagePipeline
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +46,10 @@ class IngestionProgress:
     total_files: int = 0
     processed_files: int = 0
     failed_files: int = 0
+    skipped_files: int = 0   # Unchanged since the last run (manifest)
+    deleted_files: int = 0   # Vanished since the last run (tombstoned)
+    llm_cache_hits: int = 0  # LLM responses served from the response cache
+    llm_cache_misses: int = 0
     current_file: Optional[str] = None
     current_phase: str = ""
     started_at: Optional[datetime] = None
@@ -61,6 +71,10 @@ class IngestionProgress:
             "total_files": self.total_files,
             "processed_files": self.processed_files,
             "failed_files": self.failed_files,
+            "skipped_files": self.skipped_files,
+            "deleted_files": self.deleted_files,
+            "llm_cache_hits": self.llm_cache_hits,
+            "llm_cache_misses": self.llm_cache_misses,
             "current_file": self.current_file,
             "current_phase": self.current_phase,
             "progress_percent": round(self.progress_percent, 1),
@@ -79,6 +93,36 @@ class FolderConfig:
     recursive: bool = True
 
 
+@dataclass
+class PipelineConfig:
+    """Concurrency and batching of the streaming ingestion pipeline"""
+    extract_concurrency: int = 4
+    classify_concurrency: int = 8     # LLM stages; the LLM gateway bounds total concurrency
+    process_concurrency: int = 8
+    embed_batch_chunks: int = 256     # Chunks per embedding call
+    load_batch_docs: int = 100        # Documents per Delta/Lance flush
+    structured_flush_records: int = 1000  # Products per standard-table upsert
+    queue_size: int = 32              # Items buffered between stages
+
+
+@dataclass
+class _IngestionRun:
+    """Mutable state shared by the stages of one ingest() call"""
+    manifest: IngestionManifest
+    modified: Dict[str, ManifestEntry]
+    deployment_context: Optional[Dict] = None
+    pending_files: Dict[str, FileInfo] = field(default_factory=dict)
+    classifications: Dict[str, int] = field(default_factory=dict)
+    structured: Dict[str, List[dict]] = field(default_factory=lambda: {
+        "products": [], "syndication_products": [], "data_quality": []
+    })
+    structured_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    graph_writer: Optional[Any] = None  # GraphBatchWriter, accumulates across documents
+    loaded_docs: int = 0
+    graph_entities: int = 0
+    graph_relationships: int = 0
+
+
 class IngestionOrchestrator:
     """
     Main orchestrator for the ingestion pipeline.
@@ -90,6 +134,10 @@ class IngestionOrchestrator:
     4. Process - Chunk text and extract entities
     5. Embed - Generate vector embeddings
     6. Load - Store in Delta tables and Lance indices
+
+    Stages 2-6 stream: each runs concurrently behind a bounded queue, and
+    embeddings/loads are flushed in batches, so memory stays constant in
+    the size of the share.
     """
 
     def __init__(
@@ -99,7 +147,8 @@ class IngestionOrchestrator:
         embedding_model: str = "intfloat/multilingual-e5-large",
         claude_api_key: Optional[str] = None,
         batch_size: int = 32,
-        max_workers: int = 4
+        max_workers: int = 4,
+        pipeline_config: Optional[PipelineConfig] = None
     ):
         """
         Args:
@@ -109,26 +158,39 @@ class IngestionOrchestrator:
             claude_api_key: API key for Claude (handler generation)
             batch_size: Batch size for embeddings
             max_workers: Max concurrent workers
+            pipeline_config: Stage concurrency and batching (defaults use max_workers)
         """
         self.lakehouse_path = Path(lakehouse_path)
         self.vllm_url = vllm_url
         self.embedding_model = embedding_model
         self.batch_size = batch_size
         self.max_workers = max_workers
+        self.pipeline_config = pipeline_config or PipelineConfig(extract_concurrency=max_workers)
+        self._run: Optional[_IngestionRun] = None
+        self._llm_cache_baseline = (0, 0)
 
         # Initialize components
         self.claude_api_key = claude_api_key
+        self.llm_cache = self._open_llm_cache()
         self.crawler = FileCrawler(
             claude_api_key=claude_api_key,
             auto_generate_handlers=True,
             customer_id=None  # Will be set in ingest()
         )
+        self.chunker = SmartChunker()
+        self.embedder = Embedder(
+            model_name=embedding_model,
+            cache=self._open_embedding_cache(embedding_model)
+        )
         self.classifier = DocumentClassifier(
             vllm_url=vllm_url,
-            claude_api_key=claude_api_key  # Pass Claude for better classification
+            claude_api_key=claude_api_key,  # Pass Claude for better classification
+            response_cache=self.llm_cache,
+            embedder=self.embedder,  # Centroid stage before escalating to Claude
+            centroids=CentroidClassifier(
+                self.lakehouse_path / "classifier" / f"centroids_{embedding_model.replace('/', '_')}.npz"
+            )
         )
-        self.chunker = SmartChunker()
-        self.embedder = Embedder(model_name=embedding_model)
 
         # Entity extractor for graph database
         self.entity_extractor = None
@@ -143,7 +205,10 @@ class IngestionOrchestrator:
         self.intelligent_extractor = None
         if claude_api_key:
             from ingestion.extractor.intelligent_extractor import IntelligentExtractor
-            self.intelligent_extractor = IntelligentExtractor(claude_api_key=claude_api_key)
+            self.intelligent_extractor = IntelligentExtractor(
+                claude_api_key=claude_api_key,
+                response_cache=self.llm_cache
+            )
             logger.info("✅ Intelligent Extractor initialized")
 
         # Loaders will be initialized when needed
@@ -204,59 +269,96 @@ class IngestionOrchestrator:
                 self._graph_loader = None
         return self._graph_loader
 
+    def _open_embedding_cache(self, embedding_model: str) -> Optional[EmbeddingCache]:
+        """
+        Open the content-hash embedding cache next to the lakehouse.
+
+        EMBEDDING_CACHE_DIR overrides the location; set it to "off" to disable.
+        """
+        import os
+        cache_dir = os.getenv("EMBEDDING_CACHE_DIR", str(self.lakehouse_path / "embedding_cache"))
+        if cache_dir.lower() == "off":
+            return None
+        try:
+            return EmbeddingCache.shared(cache_dir, embedding_model)
+        except OSError as e:
+            logger.warning(f"Embedding cache unavailable at {cache_dir}: {e}")
+            return None
+
+    def _open_llm_cache(self) -> Optional[LLMResponseCache]:
+        """
+        Open the persistent LLM response cache next to the lakehouse.
+
+        LLM_CACHE_DIR overrides the location; set it to "off" to disable.
+        """
+        import os
+        cache_dir = os.getenv("LLM_CACHE_DIR", str(self.lakehouse_path / "llm_cache"))
+        if cache_dir.lower() == "off":
+            return None
+        try:
+            return LLMResponseCache(cache_dir)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"LLM response cache unavailable at {cache_dir}: {e}")
+            return None
+
     def on_progress(self, callback: Callable[[IngestionProgress], None]):
         """Register progress callback"""
         self._progress_callbacks.append(callback)
 
     def _notify_progress(self):
         """Notify all progress listeners"""
+        if self.llm_cache:
+            hits, misses = self._llm_cache_baseline
+            self.progress.llm_cache_hits = self.llm_cache.hits - hits
+            self.progress.llm_cache_misses = self.llm_cache.misses - misses
+
         for callback in self._progress_callbacks:
             try:
                 callback(self.progress)
             except Exception as e:
                 logger.error(f"Progress callback error: {e}")
 
-    async def ingest(self, folders: List[FolderConfig], customer_id: Optional[str] = None) -> IngestionProgress:
+    async def ingest(
+        self,
+        folders: List[FolderConfig],
+        customer_id: Optional[str] = None,
+        incremental: bool = True
+    ) -> IngestionProgress:
         """
         Run the complete ingestion pipeline.
 
         Args:
             folders: List of folder configurations to ingest
             customer_id: Customer ID for handler persistence
+            incremental: Skip files unchanged since the last run (per-customer
+                manifest); False re-ingests everything
 
         Returns:
             Final ingestion progress
         """
-        # Phase 0: Read deployment context (if exists)
-        deployment_context = None
-        if customer_id:
-            deployment_context = await self._read_deployment_context(customer_id)
-            if deployment_context:
-                logger.info(f"📋 Read deployment context for {customer_id}")
-                logger.info(f"   Company: {deployment_context.get('company_name', 'Unknown')}")
-                logger.info(f"   Industry: {deployment_context.get('industry', 'Unknown')}")
-                logger.info(f"   Expected format: {deployment_context.get('source_format', 'Unknown')}")
-
-        # Update crawler with customer_id for handler persistence
-        if customer_id and customer_id != self.crawler.customer_id:
-            self.crawler = FileCrawler(
-                claude_api_key=self.claude_api_key,
-                auto_generate_handlers=True,
-                customer_id=customer_id
-            )
-            logger.info(f"🎯 Initialized crawler for customer: {customer_id}")
-
-        self.progress = IngestionProgress(
-            status=IngestionStatus.CRAWLING,
-            started_at=datetime.now()
-        )
-        self._notify_progress()
+        deployment_context = await self._start_run(customer_id)
 
         try:
             # Phase 1: Crawl all folders
             logger.info(f"Starting crawl of {len(folders)} folders for customer: {customer_id or 'default'}")
             all_files = await self._crawl_folders(folders)
 
+            # Phase 1.5: Diff against the manifest - only new/modified files continue
+            manifest = IngestionManifest.for_customer(self.lakehouse_path, customer_id)
+            modified_entries: List[ManifestEntry] = []
+            if incremental:
+                diff = await manifest.diff(all_files, [f.path for f in folders])
+                logger.info(f"📒 Manifest diff: {diff.summary()}")
+
+                modified_entries = [manifest.get(f.path) for f in diff.modified]
+                self.progress.skipped_files = len(diff.unchanged)
+                await self._tombstone(manifest, diff.vanished)
+
+                all_files = diff.changed
+            else:
+                # Full re-ingest: replace whatever earlier runs loaded for these files
+                modified_entries = [e for e in (manifest.get(f.path) for f in all_files) if e]
+
             self.progress.total_files = len(all_files)
             logger.info(f"Found {len(all_files)} files to process")
 
@@ -267,205 +369,198 @@ class IngestionOrchestrator:
                 self._notify_progress()
                 return self.progress
 
-            # Phase 2: Extract text from files
-            logger.info("Extracting text from files")
-            extracted_files = await self._extract_batch(all_files)
-
-            # Phase 3: Classify documents
-            self.progress.status = IngestionStatus.CLASSIFYING
-            self.progress.current_phase = "Classifying documents with AI"
-            self._notify_progress()
-
-            classified_files = await self._classify_batch(extracted_files)
+            await self._run_pipeline(all_files, manifest, modified_entries, deployment_context, customer_id)
 
-            # Log classification summary
-            classification_summary = {}
-            for file in classified_files:
-                cat = file.classification or "unknown"
-                classification_summary[cat] = classification_summary.get(cat, 0) + 1
-
-            logger.info(f"✓ Classification complete: {classification_summary}")
+        except Exception as e:
+            logger.error(f"Ingestion failed: {e}", exc_info=True)
+            self.progress.status = IngestionStatus.FAILED
+            self.progress.errors.append(str(e))
 
-            # Stream classification results to frontend
-            self.progress.current_phase = f"Klassifiziert: {len(classified_files)} Dokumente"
-            self._notify_progress()
+        self._notify_progress()
+        return self.progress
 
-            # Phase 3.5: INTELLIGENT EXTRACTION (NEW!)
-            # Extract structured data using deployment context
-            if deployment_context and self.intelligent_extractor:
-                logger.info("🧠 Starting intelligent data extraction")
+    async def ingest_stream(
+        self,
+        files: AsyncIterable[FileInfo],
+        customer_id: Optional[str] = None,
+        total_files: Optional[int] = None,
+        roots: Sequence[Path] = (),
+        present: Iterable[Union[str, Path]] = ()
+    ) -> IngestionProgress:
+        """
+        Run the pipeline on files as they become available (e.g. while they
+        are still being downloaded), without crawling or diffing first.
 
-                self.progress.status = IngestionStatus.PROCESSING
-                self.progress.current_phase = "Intelligent data extraction"
-                self._notify_progress()
+        The caller decides what needs ingesting; files that were ingested
+        before under the same path replace their earlier version. Files below
+        ``roots`` that are missing from ``present`` (deleted at the source)
+        are removed from the lakehouse and tombstoned first.
 
-                # Extract structured data from all classified files
-                all_extracted = {
-                    "products": [],
-                    "syndication_products": [],
-                    "data_quality": []
-                }
-
-                for i, file_info in enumerate(classified_files, 1):
-                    if not file_info.extracted_text:
-                        continue
-
-                    # Stream progress
-                    self.progress.current_file = file_info.name
-                    self.progress.current_phase = f"📊 Extrahiere Struktur: {file_info.name} ({i}/{len(classified_files)})"
-                    self._notify_progress()
-
-                    try:
-                        # Claude extracts structured fields per deployment rules
-                        extracted = await self.intelligent_extractor.extract_to_standard_schema(
-                            file_content=file_info.extracted_text,
-                            deployment_context=deployment_context,
-                            classification=file_info.classification,
-                            filename=file_info.name
-                        )
-
-                        # Merge records
-                        for table_name in all_extracted.keys():
-                            if table_name in extracted:
-                                all_extracted[table_name].extend(extracted[table_name])
-
-                        if extracted.get("products"):
-                            logger.info(f"  ✓ Extracted {len(extracted['products'])} products from {file_info.name}")
-
-                    except Exception as e:
-                        logger.error(f"  ✗ Extraction failed for {file_info.name}: {e}")
-                        continue
-
-                # Save to standard tables
-                if all_extracted["products"]:
-                    logger.info(f"💾 Saving {len(all_extracted['products'])} products to standard schema")
-
-                    try:
-                        # Save to Delta tables
-                        await self.multi_table_loader.upsert_products(all_extracted["products"])
-                        await self.multi_table_loader.upsert_syndication_products(all_extracted["syndication_products"])
-                        await self.multi_table_loader.upsert_data_quality(all_extracted["data_quality"])
-
-                        logger.info("✅ Standard tables created with structured data")
-
-                        # Add to progress stats
-                        self.progress.stats_by_mcp["products_extracted"] = len(all_extracted["products"])
-
-                    except Exception as e:
-                        logger.error(f"Failed to save extracted data: {e}", exc_info=True)
-
-            # Phase 4: Process documents (chunk)
-            self.progress.status = IngestionStatus.PROCESSING
-            self._notify_progress()
+        Args:
+            files: Async stream of files (FileCrawler.describe() + assigned_mcp)
+            customer_id: Customer ID for handler persistence and manifest
+            total_files: Expected number of files (counted as they arrive if None)
+            roots: Local directories the source maps to (e.g. staging dir)
+            present: Local paths of everything currently in the source
 
-            processed_docs = []
-            for i, file_info in enumerate(classified_files):
-                self.progress.current_file = file_info.name
-                self.progress.current_phase = f"Processing ({i+1}/{len(classified_files)})"
-                self._notify_progress()
+        Returns:
+            Final ingestion progress
+        """
+        deployment_context = await self._start_run(customer_id)
 
-                try:
-                    doc = await self._process_file(file_info)
-                    if doc:
-                        processed_docs.append(doc)
-                        self.progress.processed_files += 1
-
-                        # Update MCP stats
-                        mcp = doc.get("mcp", "unknown")
-                        self.progress.stats_by_mcp[mcp] = \
-                            self.progress.stats_by_mcp.get(mcp, 0) + 1
-                except Exception as e:
-                    logger.error(f"Failed to process {file_info.path}: {e}")
-                    self.progress.failed_files += 1
-                    self.progress.errors.append(f"{file_info.name}: {str(e)}")
+        try:
+            manifest = IngestionManifest.for_customer(self.lakehouse_path, customer_id)
+            if roots:
+                await self._tombstone(manifest, manifest.vanished(present, roots))
+            self.progress.total_files = total_files or 0
+            await self._run_pipeline(
+                self._track_streamed(files, manifest, count=total_files is None),
+                manifest, [], deployment_context, customer_id
+            )
 
-                self._notify_progress()
+        except Exception as e:
+            logger.error(f"Ingestion failed: {e}", exc_info=True)
+            self.progress.status = IngestionStatus.FAILED
+            self.progress.errors.append(str(e))
 
-            # Phase 4.5: Extract entities and relationships (NEW!)
-            if self.entity_extractor and self.graph_loader:
-                logger.info("🕸️  Starting entity extraction for knowledge graph")
-                self.progress.current_phase = "Extracting entities for knowledge graph"
-                self._notify_progress()
+        self._notify_progress()
+        return self.progress
 
-                # Set customer_id in graph loader
-                if customer_id:
-                    self.graph_loader.customer_id = customer_id
-
-                total_entities = 0
-                total_relationships = 0
-
-                for i, doc in enumerate(processed_docs, 1):
-                    self.progress.current_file = doc.get("filename", "unknown")
-                    self.progress.current_phase = f"📊 Graph extraction ({i}/{len(processed_docs)})"
-                    self._notify_progress()
-
-                    try:
-                        # Extract entities and relationships from document text
-                        full_text = doc.get("text", "")
-                        if not full_text:
-                            continue
-
-                        entities, relationships = self.entity_extractor.extract(
-                            text=full_text,
-                            doc_id=doc.get("id"),
-                            extract_relationships=True
-                        )
-
-                        # Load to Neo4j
-                        if entities:
-                            stats = self.graph_loader.load_entities_from_extraction(
-                                doc_id=doc.get("id"),
-                                filename=doc.get("filename"),
-                                mcp=doc.get("mcp", "general"),
-                                entities=[e.to_dict() for e in entities],
-                                relationships=[r.to_dict() for r in relationships]
-                            )
-
-                            total_entities += stats["entities"]
-                            total_relationships += stats["relationships"]
-
-                            logger.info(f"  ✓ Loaded {stats['entities']} entities, {stats['relationships']} relationships")
-
-                    except Exception as e:
-                        logger.error(f"  ✗ Entity extraction failed for {doc.get('filename')}: {e}")
-                        continue
-
-                logger.info(f"✅ Graph extraction complete: {total_entities} entities, {total_relationships} relationships")
-                self.progress.stats_by_mcp["graph_entities"] = total_entities
-                self.progress.stats_by_mcp["graph_relationships"] = total_relationships
-
-            # Phase 5: Generate embeddings
-            self.progress.status = IngestionStatus.EMBEDDING
-            self.progress.current_phase = "Generating embeddings"
-            self._notify_progress()
+    async def _track_streamed(
+        self,
+        files: AsyncIterable[FileInfo],
+        manifest: IngestionManifest,
+        count: bool
+    ) -> AsyncIterator[FileInfo]:
+        """Register streamed files that replace an earlier version as modified"""
+        async for file_info in files:
+            entry = manifest.get(file_info.path)
+            if entry and not entry.is_deleted:
+                self._run.modified[entry.path] = entry
+            if count:
+                self.progress.total_files += 1
+            yield file_info
+
+    async def _start_run(self, customer_id: Optional[str]) -> Optional[Dict]:
+        """Reset progress and per-customer components; returns the deployment context"""
+        # Phase 0: Read deployment context (if exists)
+        deployment_context = None
+        if customer_id:
+            deployment_context = await self._read_deployment_context(customer_id)
+            if deployment_context:
+                logger.info(f"📋 Read deployment context for {customer_id}")
+                logger.info(f"   Company: {deployment_context.get('company_name', 'Unknown')}")
+                logger.info(f"   Industry: {deployment_context.get('industry', 'Unknown')}")
+                logger.info(f"   Expected format: {deployment_context.get('source_format', 'Unknown')}")
 
-            embedded_docs = await self._embed_batch(processed_docs)
+        # Update crawler with customer_id for handler persistence
+        if customer_id and customer_id != self.crawler.customer_id:
+            self.crawler = FileCrawler(
+                claude_api_key=self.claude_api_key,
+                auto_generate_handlers=True,
+                customer_id=customer_id
+            )
+            logger.info(f"🎯 Initialized crawler for customer: {customer_id}")
 
-            # Phase 6: Load to lakehouse
-            self.progress.status = IngestionStatus.LOADING
-            self.progress.current_phase = "Loading to lakehouse"
-            self._notify_progress()
+        self.progress = IngestionProgress(
+            status=IngestionStatus.CRAWLING,
+            started_at=datetime.now()
+        )
+        if self.llm_cache:
+            self._llm_cache_baseline = (self.llm_cache.hits, self.llm_cache.misses)
+        self._notify_progress()
+        return deployment_context
 
-            await self._load_to_lakehouse(embedded_docs)
+    async def _run_pipeline(
+        self,
+        source,
+        manifest: IngestionManifest,
+        modified_entries: List[ManifestEntry],
+        deployment_context: Optional[Dict],
+        customer_id: Optional[str]
+    ):
+        """Phases 2-6 over ``source`` (list or async stream of files), then finalize"""
+        # extract → classify → [structure] → process → [graph] → embed → load
+        # run as overlapping stages connected by bounded queues
+        self._run = _IngestionRun(
+            manifest=manifest,
+            modified={entry.path: entry for entry in modified_entries if entry},
+            deployment_context=deployment_context
+        )
+        if self.entity_extractor and self.graph_loader:
+            if customer_id:
+                self.graph_loader.customer_id = customer_id
+            self._run.graph_writer = self.graph_loader.batch_writer()
 
-            # Complete
-            self.progress.status = IngestionStatus.COMPLETE
-            self.progress.completed_at = datetime.now()
-            self.progress.current_file = None
-            self.progress.current_phase = "Complete"
+        self.progress.status = IngestionStatus.PROCESSING
+        self.progress.current_phase = "Streaming pipeline"
+        self._notify_progress()
 
+        pipeline = StagePipeline(
+            self._build_stages(),
+            queue_size=self.pipeline_config.queue_size,
+            on_error=self._on_stage_error
+        )
+        stage_stats = await pipeline.run(source)
+
+        # Flush what is still buffered and bring the ANN index up to date once
+        await self._flush_structured(force=True)
+        if self._run.graph_writer:
+            await asyncio.to_thread(self._run.graph_writer.flush)
+        if self._run.loaded_docs:
+            await self.lance_loader.ensure_index()
+        manifest.save()
+        self.classifier.centroids.save()
+
+        logger.info(f"✓ Classification complete: {self._run.classifications}")
+        logger.info(f"  Classifier decisions: {dict(self.classifier.decisions)}")
+        if self._run.graph_entities or self._run.graph_relationships:
             logger.info(
-                f"Ingestion complete: {self.progress.processed_files} files, "
-                f"{self.progress.failed_files} failures"
+                f"✅ Graph extraction complete: {self._run.graph_entities} entities, "
+                f"{self._run.graph_relationships} relationships"
             )
+            self.progress.stats_by_mcp["graph_entities"] = self._run.graph_entities
+            self.progress.stats_by_mcp["graph_relationships"] = self._run.graph_relationships
+        logger.info(f"Pipeline stages: {stage_stats}")
+
+        # Complete
+        self.progress.status = IngestionStatus.COMPLETE
+        self.progress.completed_at = datetime.now()
+        self.progress.current_file = None
+        self.progress.current_phase = "Complete"
+
+        logger.info(
+            f"Ingestion complete: {self.progress.processed_files} files, "
+            f"{self.progress.failed_files} failures"
+        )
 
-        except Exception as e:
-            logger.error(f"Ingestion failed: {e}", exc_info=True)
-            self.progress.status = IngestionStatus.FAILED
-            self.progress.errors.append(str(e))
+    async def _tombstone(self, manifest: IngestionManifest, vanished: List[ManifestEntry]):
+        """Remove the documents of vanished files and mark them deleted"""
+        await self._remove_documents(vanished)
+        for entry in vanished:
+            manifest.tombstone(entry)
+        self.progress.deleted_files = len(vanished)
+        manifest.save()
+
+    async def _remove_documents(self, entries: List[ManifestEntry]):
+        """Delete previously loaded chunks and documents for manifest entries"""
+        entries = [e for e in entries if e and e.document_id]
+        if not entries:
+            return
 
-        self._notify_progress()
-        return self.progress
+        logger.info(f"🗑️  Removing {len(entries)} outdated documents from the lakehouse")
+
+        by_mcp: Dict[str, List[str]] = {}
+        for entry in entries:
+            self.lance_loader.delete_by_document_id(entry.document_id)
+            if entry.classification:
+                by_mcp.setdefault(entry.classification, []).append(entry.document_id)
+
+        for mcp, document_ids in by_mcp.items():
+            try:
+                self.delta_loader.delete_documents(mcp, document_ids)
+            except Exception as e:
+                logger.warning(f"Failed to delete {len(document_ids)} documents from {mcp}: {e}")
 
     async def _crawl_folders(self, folders: List[FolderConfig]) -> List[FileInfo]:
         """Crawl all configured folders"""
@@ -488,42 +583,202 @@ class IngestionOrchestrator:
 
         return all_files
 
-    async def _extract_batch(self, files: List[FileInfo]) -> List[FileInfo]:
-        """Extract text from all files"""
-        logger.info(f"Extracting text from {len(files)} files")
+    # =========================================================================
+    # PIPELINE STAGES
+    # =========================================================================
+
+    def _build_stages(self) -> List[Stage]:
+        """Assemble the per-run stage chain"""
+        cfg = self.pipeline_config
+        stages = [
+            Stage("extract", self._stage_extract, concurrency=cfg.extract_concurrency),
+            Stage("classify", self._stage_classify, concurrency=cfg.classify_concurrency),
+        ]
+        if self._run.deployment_context and self.intelligent_extractor:
+            stages.append(Stage("structure", self._stage_structure, concurrency=cfg.classify_concurrency))
+        stages.append(Stage("process", self._stage_process, concurrency=cfg.process_concurrency))
+        if self._run.graph_writer:
+            stages.append(Stage("graph", self._stage_graph))
+        stages.extend([
+            Stage(
+                "embed", self._embed_batch,
+                batch_size=cfg.embed_batch_chunks,
+                batch_weight=lambda doc: len(doc["chunks"])
+            ),
+            Stage("load", self._stage_load, batch_size=cfg.load_batch_docs),
+        ])
+        return stages
+
+    def _on_stage_error(self, stage: Stage, payload, error: Exception):
+        """Count failed items; they stay out of the manifest and are retried next run"""
+        items = payload if isinstance(payload, list) else [payload]
+        for item in items:
+            name = item.get("filename") if isinstance(item, dict) else getattr(item, "name", "?")
+            logger.error(f"  ✗ {stage.name} failed for {name}: {error}")
+            self.progress.failed_files += 1
+            self.progress.errors.append(f"{name}: {error}")
+            if isinstance(item, dict):
+                # Documents were already counted as processed
+                self.progress.processed_files -= 1
+                self._run.pending_files.pop(item["path"], None)
+        self._notify_progress()
 
-        def progress_cb(file_info: FileInfo):
-            self.progress.current_file = file_info.name
-            self._notify_progress()
+    async def _stage_extract(self, file_info: FileInfo) -> FileInfo:
+        """Extract text from a file"""
+        self.progress.current_file = file_info.name
+        self._notify_progress()
+        await self.crawler.extract_text(file_info)
+        return file_info
+
+    async def _stage_classify(self, file_info: FileInfo) -> FileInfo:
+        """Classify using extracted text or fallback to rule-based"""
+        self.progress.current_phase = f"🏷️ Klassifiziere: {file_info.name}"
+        self._notify_progress()
 
-        return await self.crawler.extract_batch(
-            files,
-            max_concurrent=self.max_workers,
-            progress_callback=progress_cb
+        file_info.classification = await self.classifier.classify(
+            file_info.path,
+            content_sample=file_info.extracted_text,
+            assigned_mcp=file_info.assigned_mcp
         )
+        category = file_info.classification or "unknown"
+        self._run.classifications[category] = self._run.classifications.get(category, 0) + 1
 
-    async def _classify_batch(self, files: List[FileInfo]) -> List[FileInfo]:
-        """Classify documents with real-time streaming"""
-        logger.info(f"Classifying {len(files)} documents with AI")
+        logger.info(f"  ✓ {file_info.name} → {file_info.classification}")
+        return file_info
 
-        for i, file_info in enumerate(files, 1):
-            # Stream current file being classified
-            self.progress.current_file = file_info.name
-            self.progress.current_phase = f"🤖 Claude analysiert: {file_info.name} ({i}/{len(files)})"
-            self._notify_progress()
+    async def _stage_structure(self, file_info: FileInfo) -> FileInfo:
+        """Claude extracts structured fields per deployment rules (buffered upserts)"""
+        if not file_info.extracted_text:
+            return file_info
 
-            # Classify using extracted text or fallback to rule-based
-            classification = await self.classifier.classify(
-                file_info.path,
-                content_sample=file_info.extracted_text,
-                assigned_mcp=file_info.assigned_mcp
+        self.progress.current_phase = f"📊 Extrahiere Struktur: {file_info.name}"
+        self._notify_progress()
+
+        try:
+            extracted = await self.intelligent_extractor.extract_to_standard_schema(
+                file_content=file_info.extracted_text,
+                deployment_context=self._run.deployment_context,
+                classification=file_info.classification,
+                filename=file_info.name
             )
-            file_info.classification = classification
+        except Exception as e:
+            logger.error(f"  ✗ Extraction failed for {file_info.name}: {e}")
+            return file_info
+
+        for table_name, records in self._run.structured.items():
+            records.extend(extracted.get(table_name, []))
+
+        if extracted.get("products"):
+            logger.info(f"  ✓ Extracted {len(extracted['products'])} products from {file_info.name}")
+
+        await self._flush_structured()
+        return file_info
+
+    async def _flush_structured(self, force: bool = False):
+        """Upsert buffered structured records once enough have accumulated"""
+        run = self._run
+        async with run.structured_lock:
+            if not run.structured["products"]:
+                return
+            if not force and len(run.structured["products"]) < self.pipeline_config.structured_flush_records:
+                return
+
+            batch = run.structured
+            run.structured = {name: [] for name in batch}
 
-            # Stream classification result
-            logger.info(f"  ✓ {file_info.name} → {classification}")
+            logger.info(f"💾 Saving {len(batch['products'])} products to standard schema")
+            try:
+                await self.multi_table_loader.upsert_products(batch["products"])
+                await self.multi_table_loader.upsert_syndication_products(batch["syndication_products"])
+                await self.multi_table_loader.upsert_data_quality(batch["data_quality"])
+
+                self.progress.stats_by_mcp["products_extracted"] = \
+                    self.progress.stats_by_mcp.get("products_extracted", 0) + len(batch["products"])
+            except Exception as e:
+                logger.error(f"Failed to save extracted data: {e}", exc_info=True)
+
+    async def _stage_process(self, file_info: FileInfo) -> Optional[dict]:
+        """Chunk a file; files without chunks are recorded and leave the pipeline"""
+        self.progress.current_file = file_info.name
+        self._notify_progress()
+
+        doc = await self._process_file(file_info)
+
+        # The document holds the text from here on
+        file_info.extracted_text = None
+
+        if not doc:
+            if file_info.extraction_status == "success":
+                # A modified file that no longer yields chunks: its old rows
+                # would be unreachable once the entry loses its document_id
+                previous = self._run.modified.pop(str(file_info.path), None)
+                if previous is not None:
+                    await self._remove_documents([previous])
+                self._run.manifest.record(file_info, None)
+            return None
+
+        self._run.pending_files[doc["path"]] = file_info
+        self.progress.processed_files += 1
+        mcp = doc.get("mcp", "unknown")
+        self.progress.stats_by_mcp[mcp] = self.progress.stats_by_mcp.get(mcp, 0) + 1
+        self._notify_progress()
+        return doc
+
+    async def _stage_graph(self, doc: dict) -> dict:
+        """Extract entities and relationships; Neo4j writes are batched across documents"""
+        full_text = doc.get("text", "")
+        if not full_text:
+            return doc
+
+        try:
+            def extract_and_load():
+                entities, relationships = self.entity_extractor.extract(
+                    text=full_text,
+                    doc_id=doc.get("id"),
+                    extract_relationships=True
+                )
+                if not entities:
+                    return None
+                return self._run.graph_writer.add(
+                    doc_id=doc.get("id"),
+                    filename=doc.get("filename"),
+                    mcp=doc.get("mcp", "general"),
+                    entities=[e.to_dict() for e in entities],
+                    relationships=[r.to_dict() for r in relationships]
+                )
+
+            stats = await asyncio.to_thread(extract_and_load)
+            if stats:
+                self._run.graph_entities += stats["entities"]
+                self._run.graph_relationships += stats["relationships"]
+                logger.info(f"  ✓ Queued {stats['entities']} entities, {stats['relationships']} relationships")
+
+        except Exception as e:
+            logger.error(f"  ✗ Entity extraction failed for {doc.get('filename')}: {e}")
+
+        return doc
+
+    async def _stage_load(self, docs: List[dict]) -> None:
+        """Flush a batch of embedded documents to Delta/Lance and record it"""
+        run = self._run
+        self.progress.status = IngestionStatus.LOADING
+        self.progress.current_phase = f"Loading {len(docs)} documents to lakehouse"
+        self._notify_progress()
+
+        # Drop old chunks of modified files before their new version is loaded
+        await self._remove_documents([run.modified[d["path"]] for d in docs if d["path"] in run.modified])
+
+        await self._load_to_lakehouse(docs, build_index=False)
+        run.loaded_docs += len(docs)
+
+        for doc in docs:
+            file_info = run.pending_files.pop(doc["path"], None)
+            if file_info is not None:
+                run.manifest.record(file_info, doc)
+        run.manifest.save()
 
-        return files
+        self.progress.status = IngestionStatus.PROCESSING
+        return None
 
     async def _process_file(self, file_info: FileInfo) -> Optional[dict]:
         """Process a single file through the pipeline"""
@@ -570,7 +825,7 @@ class IngestionOrchestrator:
             Dictionary of extracted metadata fields
         """
         # Only use Claude if API key is available
-        if not self.classifier.claude_client:
+        if not self.classifier.llm:
             return {}
 
         try:
@@ -593,15 +848,16 @@ Extract and return ONLY a JSON object with these fields (use null if not found):
 
 Respond with ONLY valid JSON, nothing else."""
 
-            response = self.classifier.claude_client.messages.create(
+            response_text = await self.classifier.llm.complete(
+                prompt,
                 model="claude-haiku-3-5-20250514",
                 max_tokens=200,
                 temperature=0.0,
-                messages=[{"role": "user", "content": prompt}]
+                cache=self.llm_cache
             )
 
             import json
-            metadata_json = response.content[0].text.strip()
+            metadata_json = response_text.strip()
             # Remove markdown code blocks if present
             if metadata_json.startswith("```"):
                 metadata_json = metadata_json.split("```")[1]
@@ -658,7 +914,7 @@ Respond with ONLY valid JSON, nothing else."""
 
         return docs
 
-    async def _load_to_lakehouse(self, docs: List[dict]):
+    async def _load_to_lakehouse(self, docs: List[dict], build_index: bool = True):
         """Load processed documents to Delta tables and Lance indices"""
         if not docs:
             return
@@ -680,7 +936,7 @@ Respond with ONLY valid JSON, nothing else."""
 
         # Load to Lance (vector index)
         logger.info(f"Loading embeddings to Lance")
-        await self.lance_loader.load_embeddings(docs)
+        await self.lance_loader.load_embeddings(docs, build_index=build_index)
 
         logger.info(f"Successfully loaded {len(docs)} documents to lakehouse")
 
@@ -691,7 +947,10 @@ Respond with ONLY valid JSON, nothing else."""
             "crawler_stats": self.crawler.get_statistics(
                 []  # Would need to store files list
             ),
-            "unknown_formats": list(self.crawler.get_unknown_formats())
+            "unknown_formats": list(self.crawler.get_unknown_formats()),
+            "embedding_cache": self.embedder.cache.stats() if self.embedder.cache else None,
+            "llm_cache": self.llm_cache.stats() if self.llm_cache else None,
+            "classifier": self.classifier.get_statistics()
         }
 
     async def _read_deployment_context(self, customer_id: str) -> Optional[Dict]:
@@ -0,0 +1,228 @@
+"""
+Stage Pipeline - Bounded-memory asyncio pipeline for ingestion
+
+Items flow through a chain of stages connected by bounded queues:
+
+    source → [extract ×8] → [classify ×4] → ... → [embed, batched] → [load, batched]
+
+Each stage runs ``concurrency`` workers. When a downstream stage falls
+behind, its input queue fills up and upstream workers block on ``put()``
+(backpressure), so the number of items in flight - and therefore memory - is
+bounded by queue sizes and batch sizes, not by corpus size. Stages overlap:
+the GPU embeds batch N while files for batch N+1 are still being extracted.
+
+Batched stages receive lists (flushed when ``batch_size`` is reached, the
+input has been idle for ``max_wait`` seconds, or the input is exhausted) and
+return a list whose items are passed on individually.
+
+Usage:
+    pipeline = StagePipeline([
+        Stage("extract", extract, concurrency=8),
+        Stage("embed", embed_many, batch_size=256, batch_weight=lambda d: len(d["chunks"])),
+        Stage("load", load_many, batch_size=100),
+    ])
+    stats = await pipeline.run(files)
+"""
+
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    """One step of the pipeline"""
+    name: str
+    fn: Callable[[Any], Awaitable[Any]]  # item -> item | None (batched: list -> list | None)
+    concurrency: int = 1
+    batch_size: Optional[int] = None  # Set for batched stages
+    batch_weight: Optional[Callable[[Any], int]] = None  # Item weight towards batch_size (default 1)
+    max_wait: float = 0.5  # Flush a partial batch after this much idle time
+
+    @property
+    def batched(self) -> bool:
+        return self.batch_size is not None
+
+
+@dataclass
+class StageStats:
+    """Per-stage counters"""
+    received: int = 0
+    emitted: int = 0
+    errors: int = 0
+    batches: int = 0
+    busy_seconds: float = 0.0
+    blocked_seconds: float = 0.0  # Time spent waiting on a full downstream queue
+
+    def to_dict(self) -> Dict[str, Union[int, float]]:
+        return {
+            "received": self.received,
+            "emitted": self.emitted,
+            "errors": self.errors,
+            "batches": self.batches,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "blocked_seconds": round(self.blocked_seconds, 3),
+        }
+
+
+class StagePipeline:
+    """
+    Runs items through stages connected by bounded queues.
+    """
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        queue_size: int = 32,
+        on_error: Optional[Callable[[Stage, Any, Exception], None]] = None
+    ):
+        """
+        Args:
+            stages: Stages in order
+            queue_size: Capacity of each inter-stage queue
+            on_error: Called with (stage, item or batch, exception) when a stage
+                fails; the item is dropped and the pipeline keeps going
+        """
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+
+        self.stages = stages
+        self.queue_size = queue_size
+        self.on_error = on_error
+        self.stats: Dict[str, StageStats] = {s.name: StageStats() for s in stages}
+        self._queues: List[asyncio.Queue] = []
+        self._remaining: List[int] = []
+
+    def queue_depths(self) -> Dict[str, int]:
+        """Current input queue depth per stage"""
+        return {s.name: q.qsize() for s, q in zip(self.stages, self._queues)}
+
+    async def run(self, source: Union[Iterable[Any], AsyncIterable[Any]]) -> Dict[str, Dict]:
+        """
+        Feed ``source`` through all stages and wait until everything drained.
+
+        Returns:
+            Per-stage statistics
+        """
+        self._queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        self._remaining = [stage.concurrency for stage in self.stages]
+
+        tasks = [asyncio.create_task(self._produce(source))]
+        for index, stage in enumerate(self.stages):
+            worker = self._batch_worker if stage.batched else self._worker
+            tasks.extend(
+                asyncio.create_task(worker(index)) for _ in range(stage.concurrency)
+            )
+
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        return {name: stats.to_dict() for name, stats in self.stats.items()}
+
+    async def _produce(self, source):
+        queue = self._queues[0]
+        if hasattr(source, "__aiter__"):
+            async for item in source:
+                await queue.put(item)
+        else:
+            for item in source:
+                await queue.put(item)
+        await queue.put(_DONE)
+
+    async def _emit(self, index: int, item: Any):
+        stats = self.stats[self.stages[index].name]
+        stats.emitted += 1
+        if index + 1 < len(self.stages):
+            started = time.perf_counter()
+            await self._queues[index + 1].put(item)
+            stats.blocked_seconds += time.perf_counter() - started
+
+    async def _finish(self, index: int):
+        """Last worker of a stage to exit signals the next stage."""
+        self._remaining[index] -= 1
+        if self._remaining[index] == 0 and index + 1 < len(self.stages):
+            await self._queues[index + 1].put(_DONE)
+
+    async def _call(self, index: int, payload: Any) -> Any:
+        stage = self.stages[index]
+        stats = self.stats[stage.name]
+        started = time.perf_counter()
+        try:
+            return await stage.fn(payload)
+        except Exception as e:
+            stats.errors += 1
+            if self.on_error:
+                self.on_error(stage, payload, e)
+            else:
+                logger.error(f"Stage '{stage.name}' failed: {e}")
+            return None
+        finally:
+            stats.busy_seconds += time.perf_counter() - started
+
+    async def _worker(self, index: int):
+        queue = self._queues[index]
+        stats = self.stats[self.stages[index].name]
+
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                # Let sibling workers see the sentinel too
+                await queue.put(_DONE)
+                break
+
+            stats.received += 1
+            result = await self._call(index, item)
+            if result is not None:
+                await self._emit(index, result)
+
+        await self._finish(index)
+
+    async def _batch_worker(self, index: int):
+        stage = self.stages[index]
+        queue = self._queues[index]
+        stats = self.stats[stage.name]
+        weight = stage.batch_weight or (lambda item: 1)
+        done = False
+
+        while not done:
+            batch, size = [], 0
+
+            while size < stage.batch_size:
+                try:
+                    if batch:
+                        item = await asyncio.wait_for(queue.get(), timeout=stage.max_wait)
+                    else:
+                        item = await queue.get()
+                except asyncio.TimeoutError:
+                    break  # Input idle: flush what we have
+
+                if item is _DONE:
+                    await queue.put(_DONE)
+                    done = True
+                    break
+
+                stats.received += 1
+                batch.append(item)
+                size += max(weight(item), 1)
+
+            if not batch:
+                continue
+
+            stats.batches += 1
+            results = await self._call(index, batch)
+            for result in results or []:
+                await self._emit(index, result)
+
+        await self._finish(index)
@@ -11,6 +11,8 @@ import numpy as np
 import logging
 from pathlib import Path
 
+from ingestion.processor.embedding_cache import EmbeddingCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,24 +21,28 @@ class Embedder:
     Generate embeddings using sentence-transformers.
 
     Uses multilingual-e5-large model for German/English support.
-    Handles batching and progress tracking.
+    Handles batching and progress tracking. With a cache, unchanged chunks
+    are looked up by content hash instead of being re-encoded.
     """
 
     def __init__(
         self,
         model_name: str = "intfloat/multilingual-e5-large",
         device: str = "cuda",
-        batch_size: int = 32
+        batch_size: int = 32,
+        cache: Optional[EmbeddingCache] = None
     ):
         """
         Args:
             model_name: HuggingFace model name
             device: 'cuda' or 'cpu'
             batch_size: Default batch size for encoding
+            cache: Optional persistent embedding cache
         """
         self.model_name = model_name
         self.device = device
         self.batch_size = batch_size
+        self.cache = cache
         self._model = None
         self._dimension = None
 
@@ -124,6 +130,10 @@ class Embedder:
             show_progress
         )
 
+    def _prefix(self, kind: str) -> str:
+        """E5 models expect 'passage: ' / 'query: ' prefixes"""
+        return f"{kind}: " if "e5" in self.model_name.lower() else ""
+
     def _embed_batch_sync(
         self,
         texts: List[str],
@@ -131,19 +141,23 @@ class Embedder:
         show_progress: bool
     ) -> List[np.ndarray]:
         """Synchronous batch embedding"""
-        # Add prefix for E5 models
-        if "e5" in self.model_name.lower():
-            texts = [f"passage: {t}" for t in texts]
-
-        logger.info(f"Embedding {len(texts)} texts with batch size {batch_size}")
-
-        embeddings = self.model.encode(
-            texts,
-            batch_size=batch_size,
-            normalize_embeddings=True,
-            show_progress_bar=show_progress,
-            convert_to_numpy=True
-        )
+        prefix = self._prefix("passage")
+
+        def encode(prefixed: List[str]) -> np.ndarray:
+            logger.info(f"Embedding {len(prefixed)} texts with batch size {batch_size}")
+            return self.model.encode(
+                prefixed,
+                batch_size=batch_size,
+                normalize_embeddings=True,
+                show_progress_bar=show_progress,
+                convert_to_numpy=True
+            )
+
+        if self.cache is not None:
+            embeddings = self.cache.encode_through(texts, prefix, encode)
+            logger.info(f"Embedding cache: {self.cache.stats()['hit_rate']:.0%} hit rate")
+        else:
+            embeddings = encode([f"{prefix}{t}" for t in texts])
 
         # Convert to list of arrays
         return [emb for emb in embeddings]
@@ -276,14 +290,18 @@ class Embedder:
     def _embed_query_sync(self, query: str) -> np.ndarray:
         """Synchronous query embedding"""
         # Use 'query:' prefix for E5 models
-        if "e5" in self.model_name.lower():
-            query = f"query: {query}"
-
-        return self.model.encode(
-            query,
-            normalize_embeddings=True,
-            show_progress_bar=False
-        )
+        prefix = self._prefix("query")
+
+        def encode(prefixed: List[str]) -> np.ndarray:
+            return self.model.encode(
+                prefixed,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+
+        if self.cache is not None:
+            return self.cache.encode_through([query], prefix, encode)[0]
+        return encode([f"{prefix}{query}"])[0]
 
     def save_embeddings(
         self,
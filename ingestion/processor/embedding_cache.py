@@ -0,0 +1,358 @@
+"""
+Embedding Cache - Content-addressed, persistent embedding store
+
+Embeddings are keyed by ``sha256(model_name, prefix, text)``, so an
+unchanged chunk (or a repeated query) is embedded once per model and
+prefix, no matter which file or request it comes from.
+
+Layout (one directory per model):
+    <cache_dir>/<model-slug>/meta.json      # model name, dimension
+    <cache_dir>/<model-slug>/keys.bin       # 32-byte digests, one per row
+    <cache_dir>/<model-slug>/vectors.f16    # float16 rows, memory-mapped
+
+Both files are append-only. Rows are written before their keys, so a crash
+can at worst leave an unreferenced vector at the tail. A bounded LRU of
+recently used vectors (float16-rounded, like the rows on disk) sits in front
+of the memory map.
+
+Writers append under an exclusive lock on ``<model-slug>/.lock`` and take
+row numbers from the files themselves, so several processes (ingestion
+workers, the embedding server) can share one directory; rows appended by
+others are picked up on the next write or miss. Within a process, use
+``EmbeddingCache.shared()`` to get one instance per directory.
+
+Usage:
+    cache = EmbeddingCache.shared("/data/lakehouse/embedding_cache", "intfloat/multilingual-e5-large")
+    vectors = cache.encode_through(texts, "passage: ", model_encode)
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within the process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+DIGEST_SIZE = 32
+DEFAULT_MEMORY_ENTRIES = 50_000
+
+
+def cache_key(model_name: str, prefix: str, text: str) -> bytes:
+    """sha256 over model, prefix and text (NUL-separated)"""
+    h = hashlib.sha256()
+    h.update(model_name.encode("utf-8"))
+    h.update(b"\0")
+    h.update(prefix.encode("utf-8"))
+    h.update(b"\0")
+    h.update(text.encode("utf-8"))
+    return h.digest()
+
+
+def _stored(vectors: np.ndarray) -> np.ndarray:
+    """Vectors as they read back from disk (float16-rounded float32)"""
+    return np.asarray(vectors, dtype=np.float16).astype(np.float32)
+
+
+_shared: Dict[Tuple[str, str], "EmbeddingCache"] = {}
+_shared_lock = threading.Lock()
+
+
+class EmbeddingCache:
+    """
+    Persistent float16 embedding store with an in-memory LRU front.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        model_name: str,
+        max_memory_entries: int = DEFAULT_MEMORY_ENTRIES
+    ):
+        """
+        Args:
+            cache_dir: Root cache directory (a sub-directory per model is used)
+            model_name: Embedding model name (part of every key)
+            max_memory_entries: Vectors kept decoded in RAM
+        """
+        self.model_name = model_name
+        self.path = Path(cache_dir) / re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.max_memory_entries = max_memory_entries
+
+        self._lock = threading.Lock()
+        self._lru: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._rows: Dict[bytes, int] = {}
+        self._synced_rows = 0  # Rows of the files already in _rows
+        self._dimension: Optional[int] = None
+        self._mmap: Optional[np.memmap] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self._file_lock():
+            self._open()
+
+    @classmethod
+    def shared(
+        cls,
+        cache_dir: Union[str, Path],
+        model_name: str,
+        max_memory_entries: int = DEFAULT_MEMORY_ENTRIES
+    ) -> "EmbeddingCache":
+        """The process-wide instance for ``cache_dir`` and ``model_name``"""
+        key = (str(Path(cache_dir).resolve()), model_name)
+        with _shared_lock:
+            cache = _shared.get(key)
+            if cache is None:
+                cache = _shared[key] = cls(cache_dir, model_name, max_memory_entries)
+            return cache
+
+    # =========================================================================
+    # STORAGE
+    # =========================================================================
+
+    @property
+    def _meta_file(self) -> Path:
+        return self.path / "meta.json"
+
+    @property
+    def _keys_file(self) -> Path:
+        return self.path / "keys.bin"
+
+    @property
+    def _vectors_file(self) -> Path:
+        return self.path / "vectors.f16"
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive across processes sharing the directory"""
+        if fcntl is None:
+            yield
+            return
+        with open(self.path / ".lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _read_meta(self) -> bool:
+        """Pick up the dimension; False if the directory has no usable meta"""
+        try:
+            with open(self._meta_file) as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+
+        if meta.get("model_name") != self.model_name:
+            logger.warning(f"Embedding cache at {self.path} belongs to {meta.get('model_name')}, ignoring")
+            return False
+
+        self._dimension = int(meta["dimension"])
+        return True
+
+    def _complete_rows(self) -> Tuple[int, int]:
+        """(rows with both key and vector written, key bytes on disk)"""
+        key_bytes = self._keys_file.stat().st_size if self._keys_file.exists() else 0
+        vector_bytes = self._vectors_file.stat().st_size if self._vectors_file.exists() else 0
+        return min(key_bytes // DIGEST_SIZE, vector_bytes // (self._dimension * 2)), key_bytes
+
+    def _catch_up(self) -> int:
+        """Index rows appended since the last sync (by any process)"""
+        rows, _ = self._complete_rows()
+        if rows > self._synced_rows:
+            with open(self._keys_file, "rb") as f:
+                f.seek(self._synced_rows * DIGEST_SIZE)
+                keys = f.read((rows - self._synced_rows) * DIGEST_SIZE)
+            for i in range(len(keys) // DIGEST_SIZE):
+                self._rows.setdefault(keys[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE], self._synced_rows + i)
+            self._synced_rows = rows
+        return rows
+
+    def _open(self):
+        """Load the key index; truncate a torn tail left by a crash (file lock held)."""
+        if not self._read_meta():
+            return
+
+        rows = self._catch_up()
+        self._truncate_tails(rows)
+        logger.info(f"Embedding cache {self.path}: {rows} vectors (dim={self._dimension})")
+
+    def _truncate_tails(self, rows: int):
+        """Drop partial writes so appends stay row-aligned (file lock held)"""
+        _, key_bytes = self._complete_rows()
+        if key_bytes != rows * DIGEST_SIZE:
+            os.truncate(self._keys_file, rows * DIGEST_SIZE)
+        row_bytes = self._dimension * 2
+        if self._vectors_file.exists() and self._vectors_file.stat().st_size != rows * row_bytes:
+            os.truncate(self._vectors_file, rows * row_bytes)
+
+    def _init_dimension(self, dimension: int):
+        """Set the dimension unless another writer already did (file lock held)"""
+        if self._read_meta():
+            return
+        self._dimension = dimension
+        tmp = self._meta_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"model_name": self.model_name, "dimension": dimension}, f)
+        os.replace(tmp, self._meta_file)
+
+    def _read_row(self, row: int) -> np.ndarray:
+        if self._mmap is None or row >= self._mmap.shape[0]:
+            # Remap after appends grew the file
+            rows = self._vectors_file.stat().st_size // (self._dimension * 2)
+            self._mmap = np.memmap(
+                self._vectors_file, dtype=np.float16, mode="r", shape=(rows, self._dimension)
+            )
+        return self._mmap[row].astype(np.float32)
+
+    def _remember(self, key: bytes, vector: np.ndarray):
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_memory_entries:
+            self._lru.popitem(last=False)
+
+    # =========================================================================
+    # PUBLIC API
+    # =========================================================================
+
+    def key(self, text: str, prefix: str = "") -> bytes:
+        return cache_key(self.model_name, prefix, text)
+
+    def get_many(self, texts: Sequence[str], prefix: str = "") -> List[Optional[np.ndarray]]:
+        """
+        Look up texts.
+
+        Returns:
+            One float32 vector or None (miss) per text
+        """
+        results: List[Optional[np.ndarray]] = []
+        with self._lock:
+            caught_up = False
+            for text in texts:
+                key = self.key(text, prefix)
+                vector = self._lru.get(key)
+                if vector is not None:
+                    self._lru.move_to_end(key)
+                else:
+                    if key not in self._rows and not caught_up and self._dimension is not None:
+                        # Another process may have written it since
+                        self._catch_up()
+                        caught_up = True
+                    row = self._rows.get(key)
+                    if row is not None:
+                        vector = self._read_row(row)
+                        self._remember(key, vector)
+
+                if vector is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                results.append(vector)
+        return results
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[np.ndarray], prefix: str = ""):
+        """Store vectors for texts (already cached keys are skipped)."""
+        if len(texts) == 0:
+            return
+
+        with self._lock, self._file_lock():
+            matrix = _stored(vectors)
+            if self._dimension is None:
+                self._init_dimension(matrix.shape[1])
+            if matrix.shape[1] != self._dimension:
+                raise ValueError(
+                    f"Embedding dimension {matrix.shape[1]} does not match cache dimension {self._dimension}"
+                )
+
+            # Row numbers come from the files, which other writers append to too
+            start = self._catch_up()
+            self._truncate_tails(start)
+
+            new_keys, new_rows = [], []
+            seen = set()
+            for text, vector in zip(texts, matrix):
+                key = self.key(text, prefix)
+                self._remember(key, vector)
+                if key in self._rows or key in seen:
+                    continue
+                seen.add(key)
+                new_keys.append(key)
+                new_rows.append(vector)
+
+            if not new_keys:
+                return
+
+            with open(self._vectors_file, "ab") as f:
+                f.write(np.asarray(new_rows, dtype=np.float16).tobytes())
+            with open(self._keys_file, "ab") as f:
+                f.write(b"".join(new_keys))
+
+            for i, key in enumerate(new_keys):
+                self._rows[key] = start + i
+            self._synced_rows = start + len(new_keys)
+            self.writes += len(new_keys)
+
+    def encode_through(
+        self,
+        texts: Sequence[str],
+        prefix: str,
+        encode_fn: Callable[[List[str]], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Return embeddings for texts, encoding only cache misses.
+
+        Args:
+            texts: Raw texts (without prefix)
+            prefix: Model prefix (e.g. "passage: ", "query: "); part of the key
+            encode_fn: Encodes a list of *prefixed* texts into a 2D array
+
+        Returns:
+            float32 matrix, one row per text (float16 precision, hit or miss)
+        """
+        cached = self.get_many(texts, prefix)
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+
+        if missing:
+            # Encode each distinct missing text once
+            unique = list(dict.fromkeys(texts[i] for i in missing))
+            encoded = _stored(encode_fn([f"{prefix}{t}" for t in unique]))
+            self.put_many(unique, encoded, prefix)
+            by_text = dict(zip(unique, encoded))
+            for i in missing:
+                cached[i] = by_text[texts[i]]
+
+        if not cached:
+            return np.empty((0, self._dimension or 0), dtype=np.float32)
+        return np.vstack(cached)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def stats(self) -> Dict[str, Union[int, float, str, None]]:
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "entries": len(self._rows),
+            "memory_entries": len(self._lru),
+            "dimension": self._dimension,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "writes": self.writes,
+        }
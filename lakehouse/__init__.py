@@ -71,6 +71,7 @@ class Lakehouse:
         # Lazy-loaded components
         self._delta_loader = None
         self._lance_loader = None
+        self._sql_engine = None
 
         logger.info(f"Lakehouse initialized at {self.path}")
 
@@ -82,6 +83,14 @@ class Lakehouse:
             self._delta_loader = DeltaLoader(self.delta_path)
         return self._delta_loader
 
+    @property
+    def sql(self):
+        """Lazy load the embedded SQL engine"""
+        if self._sql_engine is None:
+            from .delta.sql_engine import SQLEngine
+            self._sql_engine = SQLEngine(self.delta_path)
+        return self._sql_engine
+
     @property
     def lance(self):
         """Lazy load Lance loader"""
@@ -101,10 +110,15 @@ class Lakehouse:
         limit: int = 100
     ) -> List[Dict[str, Any]]:
         """
-        Query structured data using SQL-like syntax.
+        Query structured data using SQL.
+
+        Runs on the embedded SQL engine (see ``lakehouse.delta.sql_engine``):
+        projection, WHERE, ORDER BY and LIMIT execute inside the scan
+        instead of on a fully loaded table.
 
         Args:
-            query: SQL query (simplified - supports basic SELECT)
+            query: SQL query over Delta table names (``ctax_documents``, or
+                ``documents`` with ``mcp = 'ctax'``)
             customer_id: Filter by customer (REQUIRED for multi-tenancy)
             limit: Maximum rows to return
 
@@ -119,41 +133,48 @@ class Lakehouse:
 
         Note:
             All queries are automatically filtered by customer_id to ensure
-            data isolation between tenants.
+            data isolation between tenants (pushed into the scan).
         """
         # Warn if no customer_id provided
         if not customer_id:
             logger.warning("Query without customer_id - using 'default'. This should be avoided in production.")
             customer_id = "default"
 
-        # Parse table name from query (simplified)
-        query_lower = query.lower()
+        try:
+            reader = self.sql.execute(query, customer_id=customer_id, limit=limit)
+            rows = []
+            for batch in reader:
+                rows.extend(batch.to_pylist())
+                if len(rows) >= limit:
+                    break
+            return rows[:limit]
+        except Exception as e:
+            logger.error(f"Query failed: {e}")
+            return []
 
-        # Determine MCP/table from query
-        mcp = self._extract_mcp_from_query(query)
+    def query_arrow(
+        self,
+        query: str,
+        customer_id: str,
+        limit: Optional[int] = None
+    ):
+        """
+        Run SQL and stream the result as Arrow record batches.
 
-        if mcp:
-            try:
-                table = self.delta.query_documents(mcp)
-                # Convert PyArrow table to list of dicts
-                if hasattr(table, 'to_pylist'):
-                    results = table.to_pylist()
-                else:
-                    results = table.to_pandas().to_dict('records')
-
-                # CRITICAL: Filter by customer_id for multi-tenancy isolation
-                results = [
-                    r for r in results
-                    if r.get('customer_id') == customer_id or r.get('customer_id') is None
-                ]
-
-                # Apply limit
-                return results[:limit]
-            except Exception as e:
-                logger.error(f"Query failed: {e}")
-                return []
+        Same tenant scoping as ``query()``, without materializing rows.
+
+        Args:
+            query: SQL query over Delta table names
+            customer_id: Customer whose rows are visible
+            limit: Row limit appended if the query has none
+
+        Returns:
+            pyarrow.RecordBatchReader
 
-        return []
+        Raises:
+            QueryError: On unknown tables or invalid SQL
+        """
+        return self.sql.execute(query, customer_id=customer_id, limit=limit)
 
     def _extract_mcp_from_query(self, query: str) -> Optional[str]:
         """Extract MCP name from query"""
@@ -0,0 +1,420 @@
+"""
+Arrow Writer - Columnar, bounded-memory batches for Delta writes
+
+Record lists (dicts from parsers and extraction) are validated and
+converted one column at a time, ``batch_rows`` rows at a time, instead of
+one Pydantic model, one pandas row and one ``json.dumps`` apply per record.
+Type coercion is an Arrow cast per column; only columns Arrow cannot cast
+(mixed Python types, nested JSON) fall back to a per-value conversion.
+
+Batches are handed to Delta as a single RecordBatchReader, so a write or
+MERGE is one commit and holds at most one Arrow batch next to the input.
+
+The table specs mirror the Pydantic models in lakehouse/schemas/standard.py:
+required fields, defaults and the JSON-encoded nested columns. Rows that
+fail validation are dropped and counted, like invalid models were before.
+
+Usage:
+    from lakehouse.delta.arrow_writer import PRODUCTS, open_reader, write_batches
+
+    stats = WriteStats()
+    reader = open_reader(PRODUCTS.schema, PRODUCTS.batches(records, stats=stats))
+    if reader is not None:
+        write_batches(table_path, reader)
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from itertools import chain
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import inspect
+import json
+import logging
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from deltalake import write_deltalake
+
+logger = logging.getLogger(__name__)
+
+
+# Rows converted per Arrow batch
+DEFAULT_BATCH_ROWS = 10_000
+
+# Parquet file size handed to deltalake when the installed version supports it
+DEFAULT_TARGET_FILE_SIZE = 128 * 1024 * 1024
+
+# One encoder for all JSON columns; default=str keeps Decimal/datetime values
+# in metadata from failing the whole batch
+_encode_json = json.JSONEncoder(default=str, ensure_ascii=False).encode
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+def _isoformat(value: Any) -> str:
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+@dataclass
+class WriteStats:
+    """Rows written and dropped while a batch stream was consumed"""
+    rows: int = 0
+    dropped: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def reject(self, count: int, reason: str):
+        self.dropped += count
+        if len(self.errors) < 10:
+            self.errors.append(f"{count} rows: {reason}")
+
+
+@dataclass
+class TableSpec:
+    """
+    Columnar validation rules for one standard table.
+
+    Attributes:
+        name: Delta table name
+        schema: Arrow schema written to Delta (column order of the model)
+        required: Columns that must be present and non-null
+        defaults: Column → fill value for nulls (callables are evaluated once per batch)
+        json_columns: Column → container type (dict/list), stored JSON-encoded
+        timestamp_columns: Columns stored as ISO-8601 strings
+        ranges: Column → (min, max) inclusive bounds
+    """
+    name: str
+    schema: pa.Schema
+    required: Tuple[str, ...] = ()
+    defaults: Dict[str, Any] = field(default_factory=dict)
+    json_columns: Dict[str, type] = field(default_factory=dict)
+    timestamp_columns: Tuple[str, ...] = ()
+    ranges: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+
+    def column(self, records: Sequence[Dict[str, Any]], name: str) -> Tuple[pa.Array, pa.Array]:
+        """
+        Convert one column of ``records``.
+
+        Returns:
+            (array, invalid) - the typed column and a boolean mask of rows
+            whose non-null value could not be converted
+        """
+        values = [record.get(name) for record in records]
+        target = self.schema.field(name).type
+
+        if name in self.json_columns:
+            array, invalid = _json_array(values, self.json_columns[name])
+        elif name in self.timestamp_columns:
+            # Arrow's timestamp→string cast is not ISO-8601 ('T'), convert per value
+            array, invalid = _convert(values, target, _isoformat, cast=False)
+        else:
+            array, invalid = _convert(values, target, _CONVERTERS.get(target))
+
+        default = self.defaults.get(name)
+        if default is not None and array.null_count:
+            fill = default() if callable(default) else default
+            array = pc.fill_null(array, pa.scalar(fill, target))
+
+        return array, invalid
+
+    def batch(self, records: Sequence[Dict[str, Any]], stats: Optional[WriteStats] = None) -> pa.RecordBatch:
+        """Validate and convert ``records`` into one batch; invalid rows are dropped."""
+        stats = stats if stats is not None else WriteStats()
+        columns = []
+        valid = pa.array([True] * len(records), pa.bool_())
+
+        for schema_field in self.schema:
+            name = schema_field.name
+            array, invalid = self.column(records, name)
+
+            bad = invalid
+            if name in self.required:
+                bad = pc.or_(bad, pc.is_null(array))
+            if name in self.ranges:
+                low, high = self.ranges[name]
+                out_of_range = pc.or_(pc.less(array, low), pc.greater(array, high))
+                bad = pc.or_(bad, pc.fill_null(out_of_range, False))
+
+            rejected = pc.sum(pc.and_(valid, bad)).as_py() or 0
+            if rejected:
+                stats.reject(rejected, f"invalid or missing '{name}'")
+                valid = pc.and_not(valid, bad)
+
+            columns.append(array)
+
+        batch = pa.RecordBatch.from_arrays(columns, schema=self.schema)
+        if not pc.all(valid).as_py():
+            batch = batch.filter(valid)
+
+        stats.rows += batch.num_rows
+        return batch
+
+    def batches(
+        self,
+        records: Sequence[Dict[str, Any]],
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+        stats: Optional[WriteStats] = None
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Lazily convert ``records`` in slices of ``batch_rows``.
+
+        Args:
+            records: Input records
+            batch_rows: Rows per batch
+            stats: Accumulates written/dropped counts while the iterator is consumed
+        """
+        for start in range(0, len(records), batch_rows):
+            yield self.batch(records[start:start + batch_rows], stats)
+
+    def last_per_key(
+        self,
+        batches: Iterable[pa.RecordBatch],
+        keys: Sequence[str],
+        batch_rows: int = DEFAULT_BATCH_ROWS
+    ) -> List[pa.RecordBatch]:
+        """
+        Keep only the last validated row per key (MERGE rejects ambiguous sources).
+
+        Runs after validation, so an invalid later duplicate never hides a
+        valid earlier row. Batches are returned unchanged when there are no
+        duplicates.
+        """
+        batches = [batch for batch in batches if batch.num_rows]
+        table = pa.Table.from_batches(batches, self.schema)
+        rows = pa.array(range(table.num_rows), pa.int64())
+        last = (
+            pa.table({**{name: table[name] for name in keys}, "__row": rows})
+            .group_by(list(keys), use_threads=False)
+            .aggregate([("__row", "max")])
+        )
+        if last.num_rows == table.num_rows:
+            return batches
+
+        kept = pc.sort_indices(last["__row_max"])
+        return table.take(pc.take(last["__row_max"], kept)).to_batches(max_chunksize=batch_rows)
+
+def _convert(
+    values: List[Any],
+    target: pa.DataType,
+    converter: Optional[Callable[[Any], Any]],
+    cast: bool = True
+) -> Tuple[pa.Array, pa.Array]:
+    """
+    Build a typed array: direct conversion, then inferred type + Arrow cast
+    (unless ``cast`` is False), then per-value ``converter`` for mixed columns.
+    """
+    no_errors = pa.array([False] * len(values), pa.bool_())
+
+    try:
+        return pa.array(values, type=target), no_errors
+    except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+        pass
+
+    if cast:
+        try:
+            return pc.cast(pa.array(values), target), no_errors
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, OverflowError):
+            pass
+
+    converted = []
+    invalid = []
+    for value in values:
+        if value is None:
+            converted.append(None)
+            invalid.append(False)
+            continue
+        try:
+            converted.append(converter(value) if converter else value)
+            invalid.append(False)
+        except (TypeError, ValueError, ArithmeticError):
+            converted.append(None)
+            invalid.append(True)
+
+    try:
+        array = pa.array(converted, type=target)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+        array = pa.nulls(len(values), target)
+        invalid = [value is not None for value in values]
+
+    return array, pa.array(invalid, pa.bool_())
+
+
+def _json_array(values: List[Any], container: type) -> Tuple[pa.Array, pa.Array]:
+    """JSON-encode a nested column; values of the wrong container type are invalid."""
+    invalid = [value is not None and not isinstance(value, container) for value in values]
+    encoded = [
+        None if value is None or bad else _encode_json(value)
+        for value, bad in zip(values, invalid)
+    ]
+    array = pc.fill_null(pa.array(encoded, pa.string()), _encode_json(container()))
+    return array, pa.array(invalid, pa.bool_())
+
+
+def _to_str(value: Any) -> str:
+    if isinstance(value, (dict, list, tuple, set)):
+        raise TypeError(f"not a scalar: {type(value).__name__}")
+    return str(value)
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in ("true", "1", "yes"):
+            return True
+        if lowered in ("false", "0", "no", ""):
+            return False
+        raise ValueError(f"not a boolean: {value!r}")
+    return bool(value)
+
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"not an integer: {value!r}")
+    return int(value)
+
+
+# Per-value fallbacks for columns Arrow cannot cast in one go
+_CONVERTERS: Dict[pa.DataType, Callable[[Any], Any]] = {
+    pa.string(): _to_str,
+    pa.large_string(): _to_str,
+    pa.float64(): float,
+    pa.int64(): _to_int,
+    pa.int32(): _to_int,
+    pa.bool_(): _to_bool,
+}
+
+
+def open_reader(
+    schema: pa.Schema,
+    batches: Iterable[pa.RecordBatch]
+) -> Optional[pa.RecordBatchReader]:
+    """
+    Wrap a lazy batch iterator in a RecordBatchReader.
+
+    The iterator is advanced to the first non-empty batch so callers can
+    skip the commit entirely when nothing survived validation.
+
+    Returns:
+        Reader over all batches, or None if there are no rows
+    """
+    iterator = iter(batches)
+    for first in iterator:
+        if first.num_rows:
+            return pa.RecordBatchReader.from_batches(schema, chain([first], iterator))
+    return None
+
+
+@lru_cache(maxsize=1)
+def _write_parameters() -> frozenset:
+    return frozenset(inspect.signature(write_deltalake).parameters)
+
+
+def write_batches(
+    table_path: Union[str, Path],
+    reader: pa.RecordBatchReader,
+    mode: str = "append",
+    target_file_size: int = DEFAULT_TARGET_FILE_SIZE
+):
+    """
+    Stream ``reader`` into the Delta table at ``table_path`` as one commit.
+
+    ``target_file_size`` is passed on deltalake versions that accept it;
+    older versions use their own default file size.
+    """
+    options: Dict[str, Any] = {}
+    if "target_file_size" in _write_parameters():
+        options["target_file_size"] = target_file_size
+
+    write_deltalake(str(table_path), reader, mode=mode, schema_mode="merge", **options)
+
+
+# Standard tables (lakehouse/schemas/standard.py). Decimal prices are stored
+# as float64 and datetimes as ISO strings, as the previous pandas path did.
+
+PRODUCTS = TableSpec(
+    name="products",
+    schema=pa.schema([
+        ("gtin", pa.string()),
+        ("supplier_pid", pa.string()),
+        ("manufacturer_pid", pa.string()),
+        ("brand", pa.string()),
+        ("product_name", pa.string()),
+        ("short_description", pa.string()),
+        ("long_description", pa.string()),
+        ("price", pa.float64()),
+        ("currency", pa.string()),
+        ("etim_class", pa.string()),
+        ("eclass_id", pa.string()),
+        ("manufacturer_name", pa.string()),
+        ("product_type", pa.string()),
+        ("status", pa.string()),
+        ("source_document_id", pa.string()),
+        ("ingested_at", pa.string()),
+        ("metadata", pa.string()),
+    ]),
+    required=("gtin", "supplier_pid", "brand", "product_name"),
+    defaults={"currency": "EUR", "status": "active", "ingested_at": _now},
+    json_columns={"metadata": dict},
+    timestamp_columns=("ingested_at",),
+)
+
+SYNDICATION_PRODUCTS = TableSpec(
+    name="syndication_products",
+    schema=pa.schema([
+        ("id", pa.string()),
+        ("gtin", pa.string()),
+        ("supplier_pid", pa.string()),
+        ("product_name", pa.string()),
+        ("description", pa.string()),
+        ("price", pa.float64()),
+        ("currency", pa.string()),
+        ("etim_class", pa.string()),
+        ("eclass_id", pa.string()),
+        ("manufacturer", pa.string()),
+        ("brand", pa.string()),
+        ("images", pa.string()),
+        ("cad_files", pa.string()),
+        ("technical_specs", pa.string()),
+        ("compliance_data", pa.string()),
+        ("bmecat_ready", pa.bool_()),
+        ("etim_compliant", pa.bool_()),
+        ("last_updated", pa.string()),
+    ]),
+    required=("id", "gtin", "supplier_pid", "product_name", "description", "manufacturer", "brand"),
+    defaults={"currency": "EUR", "bmecat_ready": False, "etim_compliant": False, "last_updated": _now},
+    json_columns={"images": list, "cad_files": list, "technical_specs": dict, "compliance_data": dict},
+    timestamp_columns=("last_updated",),
+)
+
+DATA_QUALITY_AUDIT = TableSpec(
+    name="data_quality_audit",
+    schema=pa.schema([
+        ("document_id", pa.string()),
+        ("completeness_percentage", pa.int64()),
+        ("data_sources", pa.string()),
+        ("confidence_levels", pa.string()),
+        ("extraction_notes", pa.string()),
+        ("validation_errors", pa.string()),
+        ("verified", pa.bool_()),
+        ("verified_by", pa.string()),
+        ("verified_at", pa.string()),
+        ("created_at", pa.string()),
+    ]),
+    required=("document_id", "completeness_percentage"),
+    defaults={"verified": False, "created_at": _now},
+    json_columns={
+        "data_sources": dict,
+        "confidence_levels": dict,
+        "extraction_notes": list,
+        "validation_errors": list,
+    },
+    timestamp_columns=("verified_at", "created_at"),
+    ranges={"completeness_percentage": (0, 100)},
+)
+
+TABLE_SPECS: Dict[str, TableSpec] = {
+    spec.name: spec for spec in (PRODUCTS, SYNDICATION_PRODUCTS, DATA_QUALITY_AUDIT)
+}
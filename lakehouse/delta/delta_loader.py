@@ -6,30 +6,77 @@ for the structured data layer.
 """
 
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 import logging
 from datetime import datetime
 
+import numpy as np
 import pyarrow as pa
-from deltalake import DeltaTable, write_deltalake
+import pyarrow.compute as pc
+from deltalake import DeltaTable
+
+from lakehouse.delta.arrow_writer import (
+    DEFAULT_BATCH_ROWS,
+    DEFAULT_TARGET_FILE_SIZE,
+    WriteStats,
+    open_reader,
+    write_batches,
+)
+from lakehouse.delta.table_cache import get_table_cache, latest_log_version
 
 logger = logging.getLogger(__name__)
 
 
+DOCUMENTS_SCHEMA = pa.schema([
+    ("id", pa.string()),
+    ("path", pa.string()),
+    ("filename", pa.string()),
+    ("mcp", pa.string()),
+    ("text", pa.large_string()),
+    ("chunk_count", pa.int32()),
+    ("size_bytes", pa.int64()),
+    ("modified_at", pa.string()),
+    ("ingested_at", pa.string()),
+    ("mime_type", pa.string()),
+    ("extension", pa.string()),
+])
+
+CHUNKS_SCHEMA = pa.schema([
+    ("chunk_id", pa.string()),
+    ("document_id", pa.string()),
+    ("chunk_index", pa.int32()),
+    ("text", pa.large_string()),
+    ("mcp", pa.string()),
+    ("char_count", pa.int32()),
+    ("word_count", pa.int32()),
+])
+
+
 class DeltaLoader:
     """
     Loads processed documents to Delta Lake tables.
 
     Creates MCP-specific tables with appropriate schemas.
     Supports incremental loading and schema evolution.
+    Documents and chunks are streamed to Delta as Arrow batches, one commit
+    per table and call.
     """
 
-    def __init__(self, delta_path: Path):
+    def __init__(
+        self,
+        delta_path: Path,
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+        target_file_size: int = DEFAULT_TARGET_FILE_SIZE
+    ):
         """
         Args:
             delta_path: Path to Delta Lake storage
+            batch_rows: Documents converted per Arrow batch
+            target_file_size: Parquet file size for appended data
         """
         self.delta_path = Path(delta_path)
+        self.batch_rows = batch_rows
+        self.target_file_size = target_file_size
         self.delta_path.mkdir(parents=True, exist_ok=True)
 
     async def load_documents(self, mcp: str, documents: List[Dict[str, Any]]):
@@ -48,48 +95,8 @@ class DeltaLoader:
 
         logger.info(f"Loading {len(documents)} documents to {table_path}")
 
-        # Convert to records for Delta
-        records = []
-        for doc in documents:
-            records.append({
-                "id": doc["id"],
-                "path": doc["path"],
-                "filename": doc["filename"],
-                "mcp": doc["mcp"],
-                "text": doc["text"],
-                "chunk_count": len(doc.get("chunks", [])),
-                "size_bytes": doc["metadata"]["size"],
-                "modified_at": doc["metadata"]["modified"],
-                "ingested_at": datetime.utcnow().isoformat(),
-                "mime_type": doc["metadata"].get("mime_type", ""),
-                "extension": doc["metadata"].get("extension", "")
-            })
-
-        # Define schema
-        schema = pa.schema([
-            ("id", pa.string()),
-            ("path", pa.string()),
-            ("filename", pa.string()),
-            ("mcp", pa.string()),
-            ("text", pa.large_string()),
-            ("chunk_count", pa.int32()),
-            ("size_bytes", pa.int64()),
-            ("modified_at", pa.string()),
-            ("ingested_at", pa.string()),
-            ("mime_type", pa.string()),
-            ("extension", pa.string()),
-        ])
-
-        # Create PyArrow table
-        table = pa.Table.from_pylist(records, schema=schema)
-
-        # Write to Delta
-        write_deltalake(
-            str(table_path),
-            table,
-            mode="append",
-            schema_mode="merge"
-        )
+        reader = open_reader(DOCUMENTS_SCHEMA, self._document_batches(documents))
+        write_batches(table_path, reader, target_file_size=self.target_file_size)
 
         logger.info(f"✓ Loaded {len(documents)} documents to {mcp}_documents")
 
@@ -106,42 +113,109 @@ class DeltaLoader:
         """
         table_path = self.delta_path / f"{mcp}_chunks"
 
-        records = []
-        for doc in documents:
-            for i, chunk in enumerate(doc.get("chunks", [])):
-                records.append({
-                    "chunk_id": f"{doc['id']}_{i}",
-                    "document_id": doc["id"],
-                    "chunk_index": i,
-                    "text": chunk,
-                    "mcp": doc["mcp"],
-                    "char_count": len(chunk),
-                    "word_count": len(chunk.split())
-                })
-
-        if not records:
+        stats = WriteStats()
+        reader = open_reader(CHUNKS_SCHEMA, self._chunk_batches(documents, stats))
+        if reader is None:
             return
 
-        schema = pa.schema([
-            ("chunk_id", pa.string()),
-            ("document_id", pa.string()),
-            ("chunk_index", pa.int32()),
-            ("text", pa.large_string()),
-            ("mcp", pa.string()),
-            ("char_count", pa.int32()),
-            ("word_count", pa.int32()),
-        ])
+        write_batches(table_path, reader, target_file_size=self.target_file_size)
+
+        logger.info(f"✓ Loaded {stats.rows} chunks to {mcp}_chunks")
+
+    def _document_batches(self, documents: List[Dict[str, Any]]) -> Iterator[pa.RecordBatch]:
+        """Documents as Arrow batches of ``batch_rows``, built column by column"""
+        ingested_at = datetime.utcnow().isoformat()
+
+        for start in range(0, len(documents), self.batch_rows):
+            docs = documents[start:start + self.batch_rows]
+            metadata = [doc["metadata"] for doc in docs]
+
+            yield pa.RecordBatch.from_arrays([
+                pa.array([doc["id"] for doc in docs], pa.string()),
+                pa.array([doc["path"] for doc in docs], pa.string()),
+                pa.array([doc["filename"] for doc in docs], pa.string()),
+                pa.array([doc["mcp"] for doc in docs], pa.string()),
+                pa.array([doc["text"] for doc in docs], pa.large_string()),
+                pa.array([len(doc.get("chunks", [])) for doc in docs], pa.int32()),
+                pa.array([m["size"] for m in metadata], pa.int64()),
+                pa.array([m["modified"] for m in metadata], pa.string()),
+                pa.repeat(pa.scalar(ingested_at, pa.string()), len(docs)),
+                pa.array([m.get("mime_type", "") for m in metadata], pa.string()),
+                pa.array([m.get("extension", "") for m in metadata], pa.string()),
+            ], schema=DOCUMENTS_SCHEMA)
+
+    def _chunk_batches(
+        self,
+        documents: List[Dict[str, Any]],
+        stats: WriteStats
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Chunks as Arrow batches, one per ``batch_rows`` documents.
+
+        Chunk lists are flattened in Arrow; IDs, positions and counts are
+        computed per column rather than per chunk.
+        """
+        for start in range(0, len(documents), self.batch_rows):
+            docs = documents[start:start + self.batch_rows]
+            counts = np.array([len(doc.get("chunks", [])) for doc in docs], dtype=np.int64)
+            total = int(counts.sum())
+            if not total:
+                continue
+
+            texts = pa.array(
+                [doc.get("chunks", []) for doc in docs], pa.list_(pa.large_string())
+            ).flatten()
+            owner = np.repeat(np.arange(len(docs)), counts)
+            offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            chunk_index = pa.array(np.arange(total) - np.repeat(offsets, counts), pa.int32())
+
+            document_id = pa.array([doc["id"] for doc in docs], pa.string()).take(owner)
+            mcp = pa.array([doc["mcp"] for doc in docs], pa.string()).take(owner)
+
+            # str.split() semantics: no empty words from leading/trailing whitespace
+            trimmed = pc.utf8_trim_whitespace(texts)
+            words = pc.list_value_length(pc.utf8_split_whitespace(trimmed))
+            word_count = pc.if_else(pc.equal(pc.utf8_length(trimmed), 0), 0, words)
+
+            stats.rows += total
+            yield pa.RecordBatch.from_arrays([
+                pc.binary_join_element_wise(document_id, pc.cast(chunk_index, pa.string()), "_"),
+                document_id,
+                chunk_index,
+                texts,
+                mcp,
+                pc.cast(pc.utf8_length(texts), pa.int32()),
+                pc.cast(word_count, pa.int32()),
+            ], schema=CHUNKS_SCHEMA)
+
+    def delete_documents(self, mcp: str, document_ids: List[str]) -> int:
+        """
+        Delete documents and their chunks (re-ingested or vanished files).
+
+        Args:
+            mcp: MCP name
+            document_ids: Document IDs to delete
+
+        Returns:
+            Number of document rows deleted
+        """
+        if not document_ids:
+            return 0
 
-        table = pa.Table.from_pylist(records, schema=schema)
+        values = ", ".join("'" + doc_id.replace("'", "''") + "'" for doc_id in document_ids)
+        deleted = 0
 
-        write_deltalake(
-            str(table_path),
-            table,
-            mode="append",
-            schema_mode="merge"
-        )
+        for suffix, column in (("documents", "id"), ("chunks", "document_id")):
+            table_path = self.delta_path / f"{mcp}_{suffix}"
+            if latest_log_version(table_path) is None:
+                continue
 
-        logger.info(f"✓ Loaded {len(records)} chunks to {mcp}_chunks")
+            metrics = get_table_cache().get(table_path).delete(f"{column} IN ({values})")
+            if suffix == "documents":
+                deleted = metrics.get("num_deleted_rows", 0) or 0
+
+        logger.info(f"✓ Deleted {deleted} documents from {mcp}_documents")
+        return deleted
 
     def query_documents(
         self,
@@ -166,7 +240,7 @@ class DeltaLoader:
             logger.warning(f"Table does not exist: {table_path}")
             return pa.Table.from_pydict({})
 
-        dt = DeltaTable(str(table_path))
+        dt = get_table_cache().get(table_path)
 
         # Convert to PyArrow table
         table = dt.to_pyarrow_table()
@@ -222,12 +296,11 @@ class DeltaLoader:
         if not table_path.exists():
             return {"exists": False}
 
-        dt = DeltaTable(str(table_path))
-        table = dt.to_pyarrow_table()
+        dt = get_table_cache().get(table_path)
 
         return {
             "exists": True,
-            "num_documents": len(table),
+            "num_documents": dt.to_pyarrow_dataset().count_rows(),
             "num_files": dt.files(),
             "version": dt.version(),
             "size_bytes": sum(f["size_bytes"] for f in dt.file_uris()),
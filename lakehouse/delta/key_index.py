@@ -0,0 +1,312 @@
+"""
+Key Index - Sorted sidecar index for product identifier lookups
+
+Maps product identifiers (product_id, supplier_pid, ean_upc, gtin, sku) to
+the Parquet file and row group that hold them, so point lookups and
+"fetch these 500 SKUs" requests read a handful of row groups instead of
+scanning the table.
+
+Layout (next to the delta/ directory, so it never shows up as a table):
+    <lakehouse>/indexes/<table>/_meta.json       # indexed Delta version + files
+    <lakehouse>/indexes/<table>/<column>.arrow   # key, file, row_group (sorted by key)
+
+The index is maintained incrementally: on refresh only files added since the
+last indexed version are read, and entries for files removed by merges or
+compaction are dropped.
+"""
+
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from urllib.parse import unquote
+import json
+import logging
+import os
+import tempfile
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from lakehouse.delta.table_cache import get_table_cache, latest_log_version
+
+logger = logging.getLogger(__name__)
+
+
+# Identifier columns indexed when present in a table
+DEFAULT_KEY_COLUMNS = ("product_id", "supplier_pid", "ean_upc", "gtin", "sku")
+
+_INDEX_SCHEMA = pa.schema([
+    ("key", pa.string()),
+    ("file", pa.string()),
+    ("row_group", pa.int32()),
+])
+
+
+def _schema_names(dt) -> List[str]:
+    schema = dt.schema()
+    # deltalake >= 1.0 exposes to_arrow(), older releases to_pyarrow()
+    arrow = schema.to_arrow() if hasattr(schema, "to_arrow") else schema.to_pyarrow()
+    return pa.schema(arrow).names
+
+
+@contextmanager
+def _temp_file(path: Path, mode: str = "wb"):
+    """
+    Write to a uniquely named file next to ``path`` and move it into place.
+
+    Unique names keep concurrent refreshes (threads or processes) from
+    writing into each other's temp file; the last rename wins.
+    """
+    f = tempfile.NamedTemporaryFile(mode, dir=path.parent, prefix=f".{path.name}.", delete=False)
+    try:
+        with f:
+            yield f
+        os.replace(f.name, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(f.name)
+        raise
+
+
+def default_index_path(table_path: Union[str, Path]) -> Path:
+    """``<lakehouse>/delta/<table>`` → ``<lakehouse>/indexes/<table>``"""
+    table_path = Path(table_path)
+    return table_path.parent.parent / "indexes" / table_path.name
+
+
+class KeyIndex:
+    """
+    Persistent sorted key → (file, row_group) index for one Delta table.
+    """
+
+    def __init__(
+        self,
+        table_path: Union[str, Path],
+        columns: Sequence[str] = DEFAULT_KEY_COLUMNS,
+        index_path: Optional[Union[str, Path]] = None
+    ):
+        """
+        Args:
+            table_path: Delta table directory
+            columns: Candidate identifier columns (missing ones are ignored)
+            index_path: Where to keep the sidecar files
+        """
+        self.table_path = Path(table_path)
+        self.columns = tuple(columns)
+        self.index_path = Path(index_path) if index_path else default_index_path(self.table_path)
+
+        # column -> (version, sorted keys ndarray, files ndarray, row_groups ndarray)
+        self._loaded: Dict[str, Tuple[int, np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    # =========================================================================
+    # METADATA
+    # =========================================================================
+
+    def _meta_path(self) -> Path:
+        return self.index_path / "_meta.json"
+
+    def _column_path(self, column: str) -> Path:
+        return self.index_path / f"{column}.arrow"
+
+    def read_meta(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._meta_path()) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @property
+    def version(self) -> Optional[int]:
+        meta = self.read_meta()
+        return meta["version"] if meta else None
+
+    @property
+    def indexed_columns(self) -> List[str]:
+        meta = self.read_meta()
+        return meta["columns"] if meta else []
+
+    def is_fresh(self) -> bool:
+        """True if the index covers the latest committed table version."""
+        version = self.version
+        return version is not None and version == latest_log_version(self.table_path)
+
+    def covers(self, column: str) -> bool:
+        return column in self.indexed_columns
+
+    # =========================================================================
+    # MAINTENANCE
+    # =========================================================================
+
+    def refresh(self) -> bool:
+        """
+        Bring the index up to the table's current version.
+
+        Returns:
+            True if the index was rewritten, False if it was already fresh
+        """
+        dt = get_table_cache().get(self.table_path)
+        version = dt.version()
+        meta = self.read_meta()
+
+        if meta and meta["version"] == version:
+            return False
+
+        active = self._active_files(dt)
+        columns = [c for c in self.columns if c in _schema_names(dt)]
+
+        previous_files = set(meta["files"]) if meta and meta["columns"] == columns else set()
+        added = [f for f in active if f not in previous_files]
+        removed = previous_files - set(active)
+
+        new_entries = self._read_entries(added, columns)
+
+        self.index_path.mkdir(parents=True, exist_ok=True)
+        for column in columns:
+            parts = [new_entries[column]]
+            if previous_files:
+                existing = self._read_column_file(column)
+                if existing is not None:
+                    if removed:
+                        keep = pc.invert(pc.is_in(existing["file"], pa.array(sorted(removed))))
+                        existing = existing.filter(keep)
+                    parts.append(existing)
+
+            merged = pa.concat_tables(parts).sort_by([("key", "ascending")])
+            self._atomic_write_ipc(self._column_path(column), merged)
+
+        self._atomic_write_json(self._meta_path(), {
+            "version": version,
+            "columns": columns,
+            "files": active,
+        })
+        self._loaded.clear()
+
+        logger.info(
+            f"Key index for {self.table_path.name} at v{version}: "
+            f"+{len(added)} files, -{len(removed)} files, columns={columns}"
+        )
+        return True
+
+    @staticmethod
+    def _active_files(dt) -> List[str]:
+        actions = pa.table(dt.get_add_actions(flatten=True))
+        return sorted(actions["path"].to_pylist())
+
+    def _read_entries(self, files: Iterable[str], columns: List[str]) -> Dict[str, pa.Table]:
+        """Read key columns of new files, one entry per (key, file, row_group)."""
+        entries: Dict[str, List[pa.Table]] = {c: [] for c in columns}
+
+        for rel_path in files:
+            parquet = pq.ParquetFile(str(self.table_path / unquote(rel_path)))
+            present = [c for c in columns if c in parquet.schema_arrow.names]
+
+            for rg in range(parquet.num_row_groups):
+                data = parquet.read_row_group(rg, columns=present)
+                for column in present:
+                    keys = pc.unique(pc.cast(data[column], pa.string()).drop_null())
+                    keys = keys.filter(pc.not_equal(keys, ""))
+                    if len(keys) == 0:
+                        continue
+                    entries[column].append(pa.table({
+                        "key": keys,
+                        "file": pa.array([rel_path] * len(keys), pa.string()),
+                        "row_group": pa.array([rg] * len(keys), pa.int32()),
+                    }, schema=_INDEX_SCHEMA))
+
+        return {
+            c: pa.concat_tables(t) if t else _INDEX_SCHEMA.empty_table()
+            for c, t in entries.items()
+        }
+
+    def _read_column_file(self, column: str) -> Optional[pa.Table]:
+        path = self._column_path(column)
+        if not path.exists():
+            return None
+        # Buffers stay zero-copy views on the mapping
+        return pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+
+    @staticmethod
+    def _atomic_write_ipc(path: Path, table: pa.Table):
+        with _temp_file(path) as f:
+            with pa.ipc.new_file(f, table.schema) as writer:
+                writer.write_table(table)
+
+    @staticmethod
+    def _atomic_write_json(path: Path, data: Dict[str, Any]):
+        with _temp_file(path, "w") as f:
+            json.dump(data, f)
+
+    # =========================================================================
+    # LOOKUP
+    # =========================================================================
+
+    def _load(self, column: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        version = self.version
+        cached = self._loaded.get(column)
+        if cached and cached[0] == version:
+            return cached[1:]
+
+        table = self._read_column_file(column)
+        if table is None:
+            table = _INDEX_SCHEMA.empty_table()
+
+        loaded = (
+            version,
+            table["key"].to_numpy(zero_copy_only=False),
+            table["file"].to_numpy(zero_copy_only=False),
+            table["row_group"].to_numpy(),
+        )
+        self._loaded[column] = loaded
+        return loaded[1:]
+
+    def locate(self, column: str, keys: Iterable[Any]) -> Dict[str, List[int]]:
+        """
+        Binary-search keys in the index.
+
+        Returns:
+            Mapping of relative file path → sorted row groups containing any key
+        """
+        sorted_keys, files, row_groups = self._load(column)
+        locations: Dict[str, set] = {}
+
+        for key in {str(k) for k in keys if k is not None}:
+            lo = np.searchsorted(sorted_keys, key, side="left")
+            hi = np.searchsorted(sorted_keys, key, side="right")
+            for i in range(lo, hi):
+                locations.setdefault(files[i], set()).add(int(row_groups[i]))
+
+        return {f: sorted(rgs) for f, rgs in locations.items()}
+
+    def fetch(
+        self,
+        column: str,
+        keys: Sequence[Any],
+        columns: Optional[Sequence[str]] = None
+    ) -> Optional[pa.Table]:
+        """
+        Read only the row groups that contain ``keys`` and return matching rows.
+
+        Returns:
+            Matching rows, or None if none of the keys are in the index
+        """
+        wanted = sorted({str(k) for k in keys if k is not None})
+        locations = self.locate(column, wanted)
+        read_columns = list(columns) if columns else None
+        if read_columns and column not in read_columns:
+            read_columns.append(column)
+
+        parts = []
+        for rel_path, rgs in sorted(locations.items()):
+            parquet = pq.ParquetFile(str(self.table_path / unquote(rel_path)))
+            data = parquet.read_row_groups(rgs, columns=read_columns)
+            mask = pc.is_in(pc.cast(data[column], pa.string()), pa.array(wanted, pa.string()))
+            parts.append(data.filter(mask))
+
+        if not parts:
+            return None
+        table = pa.concat_tables(parts, promote_options="permissive")
+        if columns:
+            table = table.select(list(columns))
+        return table
@@ -3,27 +3,51 @@ Multi-Table Delta Loader
 
 Creates and updates multiple standard Delta tables from extracted data.
 Handles products, syndication_products, and data_quality_audit tables.
+
+Writes are key-based MERGEs (update matched rows, insert new ones), so
+re-ingesting a catalog replaces products instead of duplicating them.
+Tables are periodically Z-ordered on their merge key.
+
+Records are validated and converted to Arrow in columnar batches
+(lakehouse/delta/arrow_writer.py) and streamed into a single commit, so
+large feeds are written in bounded memory.
 """
 
 import logging
 from pathlib import Path
-from typing import List, Dict, Any
-from datetime import datetime
-import json
+from typing import List, Dict, Any, Optional
 
-import pandas as pd
 import pyarrow as pa
-from deltalake import DeltaTable, write_deltalake
-
-from lakehouse.schemas.standard import (
-    ProductRecord,
-    SyndicationProductRecord,
-    DataQualityAuditRecord,
+from deltalake import DeltaTable
+
+from lakehouse.delta.arrow_writer import (
+    DATA_QUALITY_AUDIT,
+    DEFAULT_BATCH_ROWS,
+    DEFAULT_TARGET_FILE_SIZE,
+    PRODUCTS,
+    SYNDICATION_PRODUCTS,
+    TableSpec,
+    WriteStats,
+    open_reader,
+    write_batches,
 )
+from lakehouse.delta.key_index import KeyIndex
+from lakehouse.delta.table_cache import get_table_cache
 
 logger = logging.getLogger(__name__)
 
 
+# Merge keys per standard table (see lakehouse/schemas/standard.py)
+DEFAULT_MERGE_KEYS: Dict[str, List[str]] = {
+    "products": ["gtin"],
+    "syndication_products": ["id"],
+    "data_quality_audit": ["document_id"],
+}
+
+# Z-order a table after this many commits without an OPTIMIZE
+DEFAULT_OPTIMIZE_INTERVAL = 20
+
+
 class MultiTableLoader:
     """
     Creates and updates multiple standard Delta tables.
@@ -32,17 +56,33 @@ class MultiTableLoader:
     alongside the existing general_documents and general_chunks tables.
     """
 
-    def __init__(self, lakehouse_path: Path):
+    def __init__(
+        self,
+        lakehouse_path: Path,
+        merge_keys: Optional[Dict[str, List[str]]] = None,
+        optimize_interval: int = DEFAULT_OPTIMIZE_INTERVAL,
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+        target_file_size: int = DEFAULT_TARGET_FILE_SIZE
+    ):
         """
         Initialize multi-table loader.
 
         Args:
             lakehouse_path: Path to lakehouse storage (e.g., /data/lakehouse)
+            merge_keys: Per-table merge key overrides (table name → key columns)
+            optimize_interval: Commits between Z-order OPTIMIZE runs (0 disables)
+            batch_rows: Records validated and converted per Arrow batch
+            target_file_size: Parquet file size for new tables and appends
         """
         self.lakehouse_path = Path(lakehouse_path)
         self.delta_path = self.lakehouse_path / "delta"
         self.delta_path.mkdir(parents=True, exist_ok=True)
 
+        self.merge_keys = {**DEFAULT_MERGE_KEYS, **(merge_keys or {})}
+        self.optimize_interval = optimize_interval
+        self.batch_rows = batch_rows
+        self.target_file_size = target_file_size
+
         logger.info(f"MultiTableLoader initialized with lakehouse: {self.lakehouse_path}")
 
     async def upsert_products(self, records: List[Dict[str, Any]]):
@@ -56,55 +96,11 @@ class MultiTableLoader:
             logger.debug("No product records to upsert")
             return
 
-        table_path = self.delta_path / "products"
-
         try:
-            # Validate records using Pydantic
-            validated_records = []
-            for i, record in enumerate(records):
-                try:
-                    # Create Pydantic model instance for validation
-                    product = ProductRecord(**record)
-                    # Convert back to dict for PyArrow
-                    validated_records.append(product.model_dump())
-                except Exception as e:
-                    logger.warning(f"Invalid product record {i}: {e}")
-                    logger.debug(f"Record was: {record}")
-                    continue
-
-            if not validated_records:
-                logger.warning("No valid product records after validation")
-                return
-
-            # Convert to DataFrame
-            df = pd.DataFrame(validated_records)
-
-            # Convert Decimal columns to float for PyArrow compatibility
-            if 'price' in df.columns:
-                df['price'] = df['price'].astype(float)
-
-            # Convert datetime columns to strings for Delta Lake
-            if 'ingested_at' in df.columns:
-                df['ingested_at'] = df['ingested_at'].apply(
-                    lambda x: x.isoformat() if hasattr(x, 'isoformat') else str(x)
-                )
-
-            # Convert metadata dict to JSON string for Delta Lake
-            if 'metadata' in df.columns:
-                df['metadata'] = df['metadata'].apply(json.dumps)
-
-            # Create PyArrow table
-            table = pa.Table.from_pandas(df)
-
-            # Write to Delta Lake
-            write_deltalake(
-                str(table_path),
-                table,
-                mode="append",
-                schema_mode="merge"  # Auto-add new columns if schema evolves
-            )
-
-            logger.info(f"✅ Upserted {len(validated_records)} records to products table")
+            written = self._upsert(PRODUCTS, records)
+            if written:
+                self._refresh_key_index(self.delta_path / PRODUCTS.name)
+                logger.info(f"✅ Upserted {written} records to products table")
 
         except Exception as e:
             logger.error(f"Failed to upsert products: {e}", exc_info=True)
@@ -121,54 +117,11 @@ class MultiTableLoader:
             logger.debug("No syndication product records to upsert")
             return
 
-        table_path = self.delta_path / "syndication_products"
-
         try:
-            # Validate records
-            validated_records = []
-            for i, record in enumerate(records):
-                try:
-                    product = SyndicationProductRecord(**record)
-                    validated_records.append(product.model_dump())
-                except Exception as e:
-                    logger.warning(f"Invalid syndication product record {i}: {e}")
-                    continue
-
-            if not validated_records:
-                logger.warning("No valid syndication product records after validation")
-                return
-
-            # Convert to DataFrame
-            df = pd.DataFrame(validated_records)
-
-            # Convert Decimal to float
-            if 'price' in df.columns:
-                df['price'] = df['price'].astype(float)
-
-            # Convert datetime columns
-            if 'last_updated' in df.columns:
-                df['last_updated'] = df['last_updated'].apply(
-                    lambda x: x.isoformat() if hasattr(x, 'isoformat') else str(x)
-                )
-
-            # Convert nested JSON fields to strings
-            json_columns = ['images', 'cad_files', 'technical_specs', 'compliance_data']
-            for col in json_columns:
-                if col in df.columns:
-                    df[col] = df[col].apply(json.dumps)
-
-            # Create PyArrow table
-            table = pa.Table.from_pandas(df)
-
-            # Write to Delta Lake
-            write_deltalake(
-                str(table_path),
-                table,
-                mode="append",
-                schema_mode="merge"
-            )
-
-            logger.info(f"✅ Upserted {len(validated_records)} records to syndication_products table")
+            written = self._upsert(SYNDICATION_PRODUCTS, records)
+            if written:
+                self._refresh_key_index(self.delta_path / SYNDICATION_PRODUCTS.name)
+                logger.info(f"✅ Upserted {written} records to syndication_products table")
 
         except Exception as e:
             logger.error(f"Failed to upsert syndication_products: {e}", exc_info=True)
@@ -185,56 +138,113 @@ class MultiTableLoader:
             logger.debug("No data quality records to upsert")
             return
 
-        table_path = self.delta_path / "data_quality_audit"
-
         try:
-            # Validate records
-            validated_records = []
-            for i, record in enumerate(records):
-                try:
-                    quality = DataQualityAuditRecord(**record)
-                    validated_records.append(quality.model_dump())
-                except Exception as e:
-                    logger.warning(f"Invalid data quality record {i}: {e}")
-                    continue
+            written = self._upsert(DATA_QUALITY_AUDIT, records)
+            if written:
+                logger.info(f"✅ Upserted {written} records to data_quality_audit table")
+
+        except Exception as e:
+            logger.error(f"Failed to upsert data_quality: {e}", exc_info=True)
+            raise
+
+    def _upsert(self, spec: TableSpec, records: List[Dict[str, Any]]) -> int:
+        """
+        Validate ``records`` in columnar batches and merge them as one commit.
+
+        Returns:
+            Number of rows written (0 if nothing survived validation)
+        """
+        table_path = self.delta_path / spec.name
+        stats = WriteStats()
+
+        keys = self.merge_keys.get(spec.name)
+        usable_keys = bool(keys) and all(k in spec.schema.names for k in keys)
+
+        batches = spec.batches(records, batch_rows=self.batch_rows, stats=stats)
+        if usable_keys:
+            # Deduplicate what survived validation, never the raw records
+            batches = spec.last_per_key(batches, keys, batch_rows=self.batch_rows)
+        reader = open_reader(spec.schema, batches)
+
+        if reader is None:
+            logger.warning(f"No valid {spec.name} records after validation")
+        elif not usable_keys:
+            logger.warning(f"No usable merge key for {spec.name}, appending")
+            write_batches(table_path, reader, target_file_size=self.target_file_size)
+        else:
+            self._merge(table_path, reader, keys)
+
+        if stats.dropped:
+            logger.warning(
+                f"Dropped {stats.dropped} invalid {spec.name} records: {'; '.join(stats.errors)}"
+            )
+        return stats.rows
+
+    def _merge(self, table_path: Path, reader: pa.RecordBatchReader, keys: List[str]):
+        """
+        Upsert the (key-deduplicated) batches in ``reader`` into ``table_path``.
 
-            if not validated_records:
-                logger.warning("No valid data quality records after validation")
+        Rows are matched on the table's merge keys: matches are updated,
+        everything else is inserted. The first write creates the table.
+        """
+        if not DeltaTable.is_deltatable(str(table_path)):
+            write_batches(table_path, reader, target_file_size=self.target_file_size)
+            return
+
+        predicate = " AND ".join(f"target.{k} = source.{k}" for k in keys)
+        metrics = (
+            DeltaTable(str(table_path))
+            .merge(
+                source=reader,
+                predicate=predicate,
+                source_alias="source",
+                target_alias="target",
+                merge_schema=True
+            )
+            .when_matched_update_all()
+            .when_not_matched_insert_all()
+            .execute()
+        )
+
+        logger.info(
+            f"Merged into {table_path.name}: "
+            f"{metrics.get('num_target_rows_updated', 0)} updated, "
+            f"{metrics.get('num_target_rows_inserted', 0)} inserted"
+        )
+
+        self._maybe_optimize(table_path, keys)
+
+    def _maybe_optimize(self, table_path: Path, keys: List[str]):
+        """Z-order on the merge key once enough commits piled up since the last OPTIMIZE."""
+        if self.optimize_interval <= 0:
+            return
+
+        try:
+            dt = DeltaTable(str(table_path))
+            history = dt.history(limit=self.optimize_interval)
+            if len(history) < self.optimize_interval:
+                return
+            if any(h.get("operation") == "OPTIMIZE" for h in history):
                 return
 
-            # Convert to DataFrame
-            df = pd.DataFrame(validated_records)
-
-            # Convert datetime columns
-            datetime_cols = ['created_at', 'verified_at']
-            for col in datetime_cols:
-                if col in df.columns:
-                    df[col] = df[col].apply(
-                        lambda x: x.isoformat() if x and hasattr(x, 'isoformat') else None
-                    )
-
-            # Convert nested JSON fields
-            json_columns = ['data_sources', 'confidence_levels', 'extraction_notes', 'validation_errors']
-            for col in json_columns:
-                if col in df.columns:
-                    df[col] = df[col].apply(json.dumps)
-
-            # Create PyArrow table
-            table = pa.Table.from_pandas(df)
-
-            # Write to Delta Lake
-            write_deltalake(
-                str(table_path),
-                table,
-                mode="append",
-                schema_mode="merge"
+            metrics = dt.optimize.z_order(keys)
+            logger.info(
+                f"Z-ordered {table_path.name} on {keys}: "
+                f"{metrics.get('numFilesRemoved', 0)} files → {metrics.get('numFilesAdded', 0)}"
             )
+        except Exception as e:
+            logger.warning(f"OPTIMIZE failed for {table_path.name}: {e}")
 
-            logger.info(f"✅ Upserted {len(validated_records)} records to data_quality_audit table")
+    def _refresh_key_index(self, table_path: Path):
+        """
+        Bring the product identifier index up to date after a write.
 
+        Failures are logged, not raised - readers fall back to scans.
+        """
+        try:
+            KeyIndex(table_path).refresh()
         except Exception as e:
-            logger.error(f"Failed to upsert data_quality: {e}", exc_info=True)
-            raise
+            logger.warning(f"Failed to refresh key index for {table_path.name}: {e}")
 
     async def load_all(self, extracted_data: Dict[str, List[Dict[str, Any]]]):
         """
@@ -282,11 +292,10 @@ class MultiTableLoader:
 
             if table_path.exists():
                 try:
-                    dt = DeltaTable(str(table_path))
-                    df = dt.to_pandas()
+                    dt = get_table_cache().get(table_path)
                     stats[table_name] = {
                         "exists": True,
-                        "row_count": len(df),
+                        "row_count": dt.to_pyarrow_dataset().count_rows(),
                         "version": dt.version()
                     }
                 except Exception as e:
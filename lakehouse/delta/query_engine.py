@@ -0,0 +1,752 @@
+"""
+Delta Query Engine - Pushdown-capable reads over Delta Lake tables
+
+Serves projections, predicates and limit/offset pages without materializing
+the whole table:
+- Partition pruning (filters on partition columns are applied to the file list)
+- File-level stats skipping (min/max stats from the Delta log are attached to
+  every fragment, so the Arrow scanner drops files that cannot match)
+- Row-group skipping and column projection via Arrow dataset scanners
+- Early termination once offset + limit rows have been produced
+
+Usage:
+    engine = DeltaQueryEngine("/data/lakehouse/delta")
+    result = engine.scan(
+        "syndication_products",
+        columns=["sku", "product_name"],
+        filters=[Filter.parse("sku:eq:5SC750")],
+        limit=1,
+    )
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import base64
+import hashlib
+import json
+import logging
+import math
+import threading
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from deltalake import DeltaTable
+
+from lakehouse.delta.key_index import KeyIndex
+from lakehouse.delta.table_cache import DeltaTableCache, get_table_cache, latest_log_version
+
+logger = logging.getLogger(__name__)
+
+
+# Supported filter operators (HTTP spelling → description)
+FILTER_OPS = {
+    "eq": "equal",
+    "ne": "not equal",
+    "lt": "less than",
+    "le": "less or equal",
+    "gt": "greater than",
+    "ge": "greater or equal",
+    "in": "in list (values separated by '|')",
+    "contains": "case-insensitive substring",
+    "startswith": "prefix match",
+    "isnull": "is null",
+    "notnull": "is not null",
+}
+
+# Operators that can be handed to DeltaTable partition pruning
+_PARTITION_OPS = {"eq": "=", "ne": "!=", "in": "in"}
+
+# Rows per Arrow record batch when streaming pages
+DEFAULT_BATCH_SIZE = 8192
+
+# Files sampled to estimate filtered totals for cursor pages
+DEFAULT_ESTIMATE_FILES = 4
+
+
+class QueryError(ValueError):
+    """Raised for invalid filters, unknown columns or unreadable tables."""
+
+
+@dataclass
+class Filter:
+    """
+    Typed column predicate.
+
+    Values are kept as given and coerced to the column's Arrow type when the
+    filter is bound to a table schema.
+    """
+    column: str
+    op: str
+    value: Any = None
+
+    def __post_init__(self):
+        if self.op not in FILTER_OPS:
+            raise QueryError(
+                f"Unsupported filter operator '{self.op}' "
+                f"(expected one of: {', '.join(FILTER_OPS)})"
+            )
+
+    @classmethod
+    def parse(cls, spec: str) -> "Filter":
+        """
+        Parse an HTTP filter spec of the form ``column:op:value``.
+
+        Examples:
+            "sku:eq:5SC750"
+            "price_eur:ge:100"
+            "color_temperature:in:3000K|4000K"
+            "product_name:contains:caleo"
+            "gtin:notnull"
+        """
+        parts = spec.split(":", 2)
+        if len(parts) < 2 or not parts[0]:
+            raise QueryError(f"Invalid filter '{spec}' (expected column:op:value)")
+
+        column, op = parts[0], parts[1].lower()
+        value = parts[2] if len(parts) == 3 else None
+
+        if op == "in" and value is not None:
+            value = [v for v in value.split("|") if v != ""]
+        elif op not in ("isnull", "notnull") and value is None:
+            raise QueryError(f"Filter '{spec}' requires a value")
+
+        return cls(column=column, op=op, value=value)
+
+
+@dataclass
+class ScanResult:
+    """Result page of a pushed-down scan."""
+    table: pa.Table
+    total: Optional[int] = None
+    source: Optional[str] = None
+    columns: List[str] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return self.table.num_rows
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Convert to JSON-safe row dicts (NaN/Inf become None)."""
+        return [_clean_record(r) for r in self.table.to_pylist()]
+
+
+@dataclass
+class PageResult(ScanResult):
+    """Cursor-paginated page with a total-count estimate."""
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
+
+
+def encode_cursor(position: Dict[str, Any]) -> str:
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(position, dict) or "f" not in position or "r" not in position:
+            raise ValueError("missing position")
+        return position
+    except (ValueError, TypeError) as e:
+        raise QueryError(f"Invalid cursor: {e}")
+
+
+def _clean_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        k: None if isinstance(v, float) and (math.isnan(v) or math.isinf(v)) else v
+        for k, v in record.items()
+    }
+
+
+def _coerce(value: Any, arrow_type: pa.DataType) -> Any:
+    """Coerce an HTTP string value to a scalar of the column's type."""
+    if value is None or not isinstance(value, str):
+        return value
+
+    try:
+        if pa.types.is_boolean(arrow_type):
+            lowered = value.lower()
+            if lowered in ("true", "1", "yes"):
+                return True
+            if lowered in ("false", "0", "no"):
+                return False
+            raise ValueError(value)
+        if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+            return value
+        if pa.types.is_dictionary(arrow_type):
+            return _coerce(value, arrow_type.value_type)
+        return pa.scalar(value).cast(arrow_type).as_py()
+    except (ValueError, pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+        raise QueryError(f"Cannot interpret '{value}' as {arrow_type}: {e}")
+
+
+def build_expression(
+    filters: Sequence[Filter],
+    schema: pa.Schema
+) -> Optional[ds.Expression]:
+    """
+    Build an Arrow dataset expression (AND of all filters) bound to a schema.
+
+    Raises:
+        QueryError: On unknown columns or values that don't fit the column type
+    """
+    expression = None
+
+    for f in filters:
+        if f.column not in schema.names:
+            raise QueryError(f"Unknown column '{f.column}'")
+
+        arrow_type = schema.field(f.column).type
+        col = pc.field(f.column)
+
+        if f.op == "isnull":
+            expr = col.is_null()
+        elif f.op == "notnull":
+            expr = col.is_valid()
+        elif f.op == "contains":
+            expr = pc.match_substring(col, str(f.value), ignore_case=True)
+        elif f.op == "startswith":
+            expr = pc.starts_with(col, str(f.value))
+        elif f.op == "in":
+            values = f.value if isinstance(f.value, (list, tuple)) else [f.value]
+            expr = col.isin([_coerce(v, arrow_type) for v in values])
+        else:
+            value = _coerce(f.value, arrow_type)
+            expr = {
+                "eq": col == value,
+                "ne": col != value,
+                "lt": col < value,
+                "le": col <= value,
+                "gt": col > value,
+                "ge": col >= value,
+            }[f.op]
+
+        expression = expr if expression is None else expression & expr
+
+    return expression
+
+
+def search_expression(
+    text: str,
+    columns: Sequence[str],
+    schema: pa.Schema
+) -> Optional[ds.Expression]:
+    """
+    Case-insensitive substring match of ``text`` in ANY of ``columns``.
+
+    Columns missing from the schema are skipped, so callers can pass the
+    union of column names used across customer tables.
+    """
+    expression = None
+    for column in columns:
+        if column not in schema.names:
+            continue
+        col = pc.field(column)
+        if not pa.types.is_string(schema.field(column).type) and \
+                not pa.types.is_large_string(schema.field(column).type):
+            col = col.cast(pa.string())
+        expr = pc.match_substring(col, text, ignore_case=True)
+        expression = expr if expression is None else expression | expr
+    return expression
+
+
+def _and(left: Optional[ds.Expression], right: Optional[ds.Expression]) -> Optional[ds.Expression]:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    return left & right
+
+
+class DeltaQueryEngine:
+    """
+    Pushdown query layer over the Delta tables of one lakehouse.
+
+    Tables without a ``_delta_log`` (raw Parquet drops) are read as plain
+    Parquet datasets with the same projection/predicate pushdown.
+
+    DeltaTable handles come from the process-wide DeltaTableCache; hot tables
+    configured there are scanned from their materialized Arrow copy.
+    """
+
+    def __init__(
+        self,
+        delta_path: Union[str, Path],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        table_cache: Optional[DeltaTableCache] = None
+    ):
+        """
+        Args:
+            delta_path: Directory containing one sub-directory per table
+            batch_size: Rows per streamed record batch
+            table_cache: Handle cache (defaults to the process-wide cache)
+        """
+        self.delta_path = Path(delta_path)
+        self.batch_size = batch_size
+        self.table_cache = table_cache or get_table_cache()
+        self._key_indexes: Dict[str, KeyIndex] = {}
+        # table -> Delta version whose index refresh failed (e.g. read-only mount)
+        self._index_refresh_failed: Dict[str, Optional[int]] = {}
+        self._index_refreshes: Dict[str, threading.Thread] = {}
+        self._index_lock = threading.Lock()
+
+    def table_path(self, table_name: str) -> Path:
+        return self.delta_path / table_name
+
+    def exists(self, table_name: str) -> bool:
+        path = self.table_path(table_name)
+        if not path.exists():
+            return False
+        return (path / "_delta_log").exists() or any(path.glob("*.parquet"))
+
+    def first_existing(self, candidates: Sequence[str]) -> Optional[str]:
+        """Return the first table name in ``candidates`` that holds data."""
+        for name in candidates:
+            if self.exists(name):
+                return name
+        return None
+
+    def open_table(self, table_name: str) -> DeltaTable:
+        """Get the (cached, up-to-date) DeltaTable handle for ``table_name``."""
+        return self.table_cache.get(self.table_path(table_name))
+
+    def dataset(
+        self,
+        table_name: str,
+        filters: Optional[Sequence[Filter]] = None,
+        version: Optional[int] = None
+    ) -> ds.Dataset:
+        """
+        Open an Arrow dataset for the table.
+
+        Equality/IN filters on partition columns are used to prune the file
+        list before the dataset is built.
+
+        Args:
+            table_name: Table to open
+            filters: Filters used for partition pruning
+            version: Pin a Delta version (defaults to the latest)
+        """
+        return self._open_dataset(table_name, filters, version)[0]
+
+    def _open_dataset(
+        self,
+        table_name: str,
+        filters: Optional[Sequence[Filter]] = None,
+        version: Optional[int] = None
+    ) -> Tuple[ds.Dataset, Optional[int]]:
+        """Dataset plus the Delta version it was built from (None for plain Parquet)."""
+        path = self.table_path(table_name)
+        if not path.exists():
+            raise QueryError(f"Table '{table_name}' not found")
+
+        if not (path / "_delta_log").exists():
+            return ds.dataset(str(path), format="parquet"), None
+
+        dt = self.open_table(table_name)
+        if version is not None and version != dt.version():
+            try:
+                dt = DeltaTable(str(path), version=version)
+            except Exception as e:
+                raise QueryError(f"Version {version} of '{table_name}' is no longer available: {e}")
+        elif self.table_cache.is_hot(path):
+            return ds.dataset(self.table_cache.get_arrow(path, handle=dt)), dt.version()
+
+        partitions = self._partition_filters(dt, filters or [])
+        return dt.to_pyarrow_dataset(partitions=partitions or None), dt.version()
+
+    def _partition_filters(self, dt: DeltaTable, filters: Sequence[Filter]) -> List[tuple]:
+        partition_columns = set(dt.metadata().partition_columns)
+        if not partition_columns:
+            return []
+
+        pruning = []
+        for f in filters:
+            if f.column in partition_columns and f.op in _PARTITION_OPS:
+                value = [str(v) for v in f.value] if f.op == "in" else str(f.value)
+                pruning.append((f.column, _PARTITION_OPS[f.op], value))
+        return pruning
+
+    def scan(
+        self,
+        table_name: str,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        count_total: bool = False,
+        search: Optional[str] = None,
+        search_columns: Sequence[str] = ()
+    ) -> ScanResult:
+        """
+        Read one page of a table with projection, predicate and limit pushdown.
+
+        Args:
+            table_name: Table to read
+            columns: Columns to return (None for all)
+            filters: Predicates ANDed together
+            limit: Maximum rows to return (None for all matching rows)
+            offset: Matching rows to skip before the page starts
+            count_total: Also count all matching rows (metadata-only when unfiltered)
+            search: Optional free text matched (OR) against ``search_columns``
+            search_columns: Columns for ``search``; missing ones are ignored
+
+        Returns:
+            ScanResult with the page and optional total
+        """
+        filters = list(filters or [])
+        dataset = self.dataset(table_name, filters)
+        schema = dataset.schema
+
+        columns = self._projection(columns, schema)
+        expression = self._expression(filters, schema, search, search_columns)
+
+        scanner = dataset.scanner(
+            columns=columns,
+            filter=expression,
+            batch_size=self.batch_size
+        )
+
+        page = self._read_page(scanner, limit, offset)
+
+        total = None
+        if count_total:
+            total = dataset.count_rows(filter=expression)
+
+        logger.debug(
+            f"Scanned {table_name}: {page.num_rows} rows "
+            f"(offset={offset}, limit={limit}, filters={len(filters)})"
+        )
+
+        return ScanResult(table=page, total=total, source=table_name, columns=columns)
+
+    @staticmethod
+    def _projection(columns: Optional[Sequence[str]], schema: pa.Schema) -> List[str]:
+        if not columns:
+            return list(schema.names)
+        unknown = [c for c in columns if c not in schema.names]
+        if unknown:
+            raise QueryError(f"Unknown column(s): {', '.join(unknown)}")
+        return list(columns)
+
+    @staticmethod
+    def _expression(
+        filters: Sequence[Filter],
+        schema: pa.Schema,
+        search: Optional[str] = None,
+        search_columns: Sequence[str] = ()
+    ) -> Optional[ds.Expression]:
+        expression = build_expression(filters, schema)
+        if search:
+            match = search_expression(search, search_columns, schema)
+            if match is None:
+                # None of the search columns exist - nothing can match
+                match = pc.scalar(False)
+            expression = _and(expression, match)
+        return expression
+
+    def page(
+        self,
+        table_name: str,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Sequence[Filter]] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        search: Optional[str] = None,
+        search_columns: Sequence[str] = (),
+        estimate_files: int = DEFAULT_ESTIMATE_FILES
+    ) -> PageResult:
+        """
+        Cursor-paginated scan.
+
+        The cursor pins the Delta version and records the position as
+        (file index, matching rows already returned from that file), so the
+        next page resumes inside one file instead of re-scanning from the
+        start. ``offset`` (ignored when a cursor is given) skips whole files
+        by their row counts. Only the first page computes a total: exact when unfiltered
+        (log stats) or when all candidate files fit in the sample, otherwise
+        extrapolated from the first ``estimate_files`` files.
+
+        Raises:
+            QueryError: On invalid filters or a cursor from different filters
+        """
+        filters = list(filters or [])
+        fingerprint = self._fingerprint(table_name, columns, filters, search, search_columns)
+
+        position = {"v": None, "f": 0, "r": 0}
+        if cursor:
+            position = decode_cursor(cursor)
+            if position.get("h") != fingerprint:
+                raise QueryError("Cursor does not match this query's filters")
+
+        # The cursor pins the version of the handle that produced this page
+        dataset, version = self._open_dataset(table_name, filters, version=position.get("v"))
+        schema = dataset.schema
+        columns = self._projection(columns, schema)
+        expression = self._expression(filters, schema, search, search_columns)
+
+        fragments = list(dataset.get_fragments(filter=expression))
+        if not cursor and offset > 0:
+            position["f"], position["r"] = self._seek(fragments, expression, offset)
+
+        page, next_position = self._read_from(
+            fragments, schema, columns, expression, limit, position["f"], position["r"]
+        )
+
+        next_cursor = None
+        if next_position is not None:
+            next_cursor = encode_cursor({
+                "v": version,
+                "f": next_position[0],
+                "r": next_position[1],
+                "h": fingerprint,
+            })
+
+        total, is_estimate = None, False
+        if not cursor:
+            total, is_estimate = self._estimate_total(dataset, fragments, expression, estimate_files)
+
+        return PageResult(
+            table=page,
+            total=total,
+            source=table_name,
+            columns=columns,
+            next_cursor=next_cursor,
+            total_is_estimate=is_estimate
+        )
+
+    def _read_from(
+        self,
+        fragments: List[ds.Fragment],
+        schema: pa.Schema,
+        columns: List[str],
+        expression: Optional[ds.Expression],
+        limit: int,
+        start_fragment: int,
+        skip_rows: int
+    ) -> Tuple[pa.Table, Optional[Tuple[int, int]]]:
+        """Read ``limit`` matching rows starting at a fragment position."""
+        projected = pa.schema([schema.field(c) for c in columns])
+        batches = []
+        remaining = limit
+
+        for index in range(start_fragment, len(fragments)):
+            emitted = 0
+            to_skip = skip_rows if index == start_fragment else 0
+
+            for batch in fragments[index].to_batches(
+                schema=schema,
+                columns=columns,
+                filter=expression,
+                batch_size=self.batch_size
+            ):
+                if to_skip:
+                    if batch.num_rows <= to_skip:
+                        to_skip -= batch.num_rows
+                        emitted += batch.num_rows
+                        continue
+                    batch = batch.slice(to_skip)
+                    emitted += to_skip
+                    to_skip = 0
+
+                batch = batch.slice(0, remaining)
+                if batch.num_rows:
+                    batches.append(batch)
+                emitted += batch.num_rows
+                remaining -= batch.num_rows
+
+                if remaining == 0:
+                    # Resume inside this fragment next time
+                    return pa.Table.from_batches(batches, schema=projected), (index, emitted)
+
+        return pa.Table.from_batches(batches, schema=projected), None
+
+    @staticmethod
+    def _seek(
+        fragments: List[ds.Fragment],
+        expression: Optional[ds.Expression],
+        offset: int
+    ) -> Tuple[int, int]:
+        """Translate a row offset into (fragment index, rows to skip in it)."""
+        for index, fragment in enumerate(fragments):
+            rows = fragment.count_rows(filter=expression)
+            if offset < rows:
+                return index, offset
+            offset -= rows
+        return len(fragments), 0
+
+    @staticmethod
+    def _estimate_total(
+        dataset: ds.Dataset,
+        fragments: List[ds.Fragment],
+        expression: Optional[ds.Expression],
+        estimate_files: int
+    ) -> Tuple[int, bool]:
+        if expression is None:
+            return dataset.count_rows(), False
+
+        sample = fragments[:estimate_files]
+        matched = sum(f.count_rows(filter=expression) for f in sample)
+        if len(sample) == len(fragments):
+            return matched, False
+
+        sampled_rows = sum(f.count_rows() for f in sample)
+        candidate_rows = sum(f.count_rows() for f in fragments)
+        if sampled_rows == 0:
+            return 0, True
+        return int(round(matched / sampled_rows * candidate_rows)), True
+
+    @staticmethod
+    def _fingerprint(table_name, columns, filters, search, search_columns) -> str:
+        spec = json.dumps(
+            [table_name, list(columns or []), [(f.column, f.op, f.value) for f in filters],
+             search, list(search_columns)],
+            default=str
+        )
+        return hashlib.sha1(spec.encode()).hexdigest()[:12]
+
+    def _read_page(
+        self,
+        scanner: ds.Scanner,
+        limit: Optional[int],
+        offset: int
+    ) -> pa.Table:
+        """Stream batches, skipping ``offset`` rows and stopping after ``limit``."""
+        batches = []
+        remaining = limit
+        to_skip = max(offset, 0)
+
+        if remaining is not None and remaining <= 0:
+            return scanner.projected_schema.empty_table()
+
+        for batch in scanner.to_batches():
+            if to_skip:
+                if batch.num_rows <= to_skip:
+                    to_skip -= batch.num_rows
+                    continue
+                batch = batch.slice(to_skip)
+                to_skip = 0
+
+            if remaining is not None:
+                batch = batch.slice(0, remaining)
+                remaining -= batch.num_rows
+
+            if batch.num_rows:
+                batches.append(batch)
+
+            if remaining == 0:
+                break
+
+        return pa.Table.from_batches(batches, schema=scanner.projected_schema)
+
+    def find_one(
+        self,
+        table_name: str,
+        column: str,
+        value: Any,
+        columns: Optional[Sequence[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Point lookup: first row where ``column == value``, or None."""
+        result = self.lookup(table_name, column, [value], columns=columns, limit=1)
+        records = result.to_records()
+        return records[0] if records else None
+
+    def key_index(self, table_name: str) -> KeyIndex:
+        if table_name not in self._key_indexes:
+            self._key_indexes[table_name] = KeyIndex(self.table_path(table_name))
+        return self._key_indexes[table_name]
+
+    def _fresh_index(self, table_name: str, column: str) -> Optional[KeyIndex]:
+        """
+        Return the table's key index if it is current and covers ``column``.
+
+        A stale index is refreshed incrementally in a background thread (one
+        per table) and None is returned meanwhile, so the lookup falls back
+        to a scan instead of waiting for the rebuild. A failed refresh
+        (read-only lakehouse mount) is not retried until the next commit.
+        """
+        path = self.table_path(table_name)
+        if not (path / "_delta_log").exists():
+            return None
+
+        index = self.key_index(table_name)
+        if not index.is_fresh():
+            self._start_index_refresh(table_name, index, latest_log_version(path))
+            return None
+
+        return index if index.covers(column) else None
+
+    def _start_index_refresh(self, table_name: str, index: KeyIndex, latest: Optional[int]):
+        with self._index_lock:
+            if table_name in self._index_refresh_failed and \
+                    self._index_refresh_failed[table_name] == latest:
+                return
+            running = self._index_refreshes.get(table_name)
+            if running is not None and running.is_alive():
+                return
+            thread = threading.Thread(
+                target=self._refresh_index,
+                args=(table_name, index, latest),
+                name=f"key-index-{table_name}",
+                daemon=True
+            )
+            self._index_refreshes[table_name] = thread
+            thread.start()
+
+    def _refresh_index(self, table_name: str, index: KeyIndex, latest: Optional[int]):
+        try:
+            index.refresh()
+            self._index_refresh_failed.pop(table_name, None)
+        except Exception as e:
+            logger.warning(f"Key index refresh failed for {table_name}: {e}")
+            self._index_refresh_failed[table_name] = latest
+
+    def lookup(
+        self,
+        table_name: str,
+        column: str,
+        keys: Sequence[Any],
+        columns: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None
+    ) -> ScanResult:
+        """
+        Fetch rows whose ``column`` is one of ``keys``.
+
+        Uses the table's KeyIndex (O(log n) per key, reads only the matching
+        row groups) and falls back to a pushed-down IN scan otherwise (also
+        while a stale index is being refreshed).
+        """
+        index = self._fresh_index(table_name, column)
+        if index is None:
+            return self.scan(
+                table_name,
+                columns=columns,
+                filters=[Filter(column, "in", list(keys))],
+                limit=limit
+            )
+
+        if columns:
+            schema_names = self.dataset(table_name).schema.names
+            unknown = [c for c in columns if c not in schema_names]
+            if unknown:
+                raise QueryError(f"Unknown column(s): {', '.join(unknown)}")
+
+        table = index.fetch(column, keys, columns=columns)
+        if table is None:
+            schema = self.dataset(table_name).schema
+            table = (schema if not columns else pa.schema([schema.field(c) for c in columns])).empty_table()
+        elif limit is not None:
+            table = table.slice(0, limit)
+
+        return ScanResult(table=table, source=table_name, columns=table.column_names)
+
+    def count(self, table_name: str, filters: Optional[Sequence[Filter]] = None) -> int:
+        """Count matching rows (served from Delta log stats when unfiltered)."""
+        filters = list(filters or [])
+        dataset = self.dataset(table_name, filters)
+        return dataset.count_rows(filter=build_expression(filters, dataset.schema))
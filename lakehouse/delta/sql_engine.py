@@ -0,0 +1,257 @@
+"""
+SQL Engine - Embedded SQL over the lakehouse Delta tables
+
+Runs real SQL (projection, WHERE, JOIN, GROUP BY, ORDER BY, LIMIT) on the
+Delta tables in-process via DataFusion (``deltalake.QueryBuilder``) and
+streams the result as Arrow record batches.
+
+Tenant isolation is part of the plan, not a post-filter: every table the
+statement references is replaced by a tenant-scoped view
+
+    WITH "ctax_documents" AS (
+        SELECT * FROM "__lh_3f9c0a1e_ctax_documents"
+        WHERE customer_id = 'acme' OR customer_id IS NULL
+    )
+    SELECT ... FROM ctax_documents WHERE ...
+
+which DataFusion pushes into the Delta scan together with the caller's own
+predicates (file skipping on statistics). The raw tables are only
+registered under internal names carrying a random token generated per
+registered table set, and statements mentioning the internal prefix at all
+are rejected, so no spelling of a statement can reach an unscoped table.
+
+Prepared statements (table resolution + rewritten SQL) are cached per
+statement text; registered table sets are cached per table version.
+
+Usage:
+    engine = SQLEngine(lakehouse_path / "delta")
+    reader = engine.execute("SELECT id, title FROM ctax_documents WHERE year = 2024",
+                            customer_id="acme", limit=50)
+    for batch in reader: ...
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+import logging
+import re
+import secrets
+
+import pyarrow as pa
+
+from lakehouse.delta.query_engine import QueryError
+from lakehouse.delta.table_cache import get_table_cache
+
+logger = logging.getLogger(__name__)
+
+
+TENANT_COLUMN = "customer_id"
+INTERNAL_PREFIX = "__lh_"
+
+_TABLE_REFERENCE = re.compile(r"\b(?:from|join)\s+\"?([A-Za-z_][\w]*)\"?", re.IGNORECASE)
+_TRAILING_LIMIT = re.compile(r"\blimit\s+\d+(\s+offset\s+\d+)?\s*$", re.IGNORECASE)
+_LEADING_WITH = re.compile(r"^\s*with\s+(recursive\s+)?", re.IGNORECASE)
+_MCP_LITERAL = re.compile(r"\b(?:mcp|category)\s*=\s*'(\w+)'", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class PreparedStatement:
+    """A statement with its table references resolved to Delta tables"""
+    sql: str  # Caller's statement, trailing ';' removed
+    tables: Tuple[Tuple[str, str], ...]  # (name as written in the SQL, Delta table)
+    has_limit: bool
+
+
+def _quote_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+class SQLEngine:
+    """
+    In-process SQL over the Delta tables of one lakehouse.
+    """
+
+    def __init__(self, delta_path: Union[str, Path], statement_cache_size: int = 256):
+        """
+        Args:
+            delta_path: Directory holding one sub-directory per Delta table
+            statement_cache_size: Prepared statements kept (LRU)
+        """
+        self.delta_path = Path(delta_path)
+        self.statement_cache_size = statement_cache_size
+        self._statements: "OrderedDict[str, PreparedStatement]" = OrderedDict()
+        self._builders: "OrderedDict[Tuple, object]" = OrderedDict()
+        self._schemas: Dict[Tuple[str, int], List[str]] = {}
+
+    # =========================================================================
+    # PREPARE
+    # =========================================================================
+
+    def _table_exists(self, name: str) -> bool:
+        return (self.delta_path / name / "_delta_log").is_dir()
+
+    def _resolve(self, name: str, sql: str) -> Optional[str]:
+        """
+        Delta table behind a table reference.
+
+        Besides exact names, accepts the MCP shorthand used by MCP authors:
+        ``FROM ctax`` → ``ctax_documents`` and ``FROM documents WHERE mcp = 'ctax'``
+        → ``ctax_documents``.
+        """
+        if self._table_exists(name):
+            return name
+        if self._table_exists(f"{name}_documents"):
+            return f"{name}_documents"
+        if name in ("documents", "docs"):
+            match = _MCP_LITERAL.search(sql)
+            if match and self._table_exists(f"{match.group(1).lower()}_documents"):
+                return f"{match.group(1).lower()}_documents"
+        return None
+
+    def prepare(self, sql: str) -> PreparedStatement:
+        """
+        Resolve the tables a statement reads (cached per statement text).
+
+        Raises:
+            QueryError: If the statement names an internal table or reads no
+                known table
+        """
+        sql = sql.strip().rstrip(";").strip()
+        cached = self._statements.get(sql)
+        if cached is not None:
+            self._statements.move_to_end(sql)
+            return cached
+
+        # Anywhere, in any case or quoting (comma joins, subqueries, strings)
+        if INTERNAL_PREFIX in sql.lower():
+            raise QueryError("Statement references an internal table")
+
+        tables = {}
+        for name in _TABLE_REFERENCE.findall(sql):
+            # Resolved case-insensitively, but the view keeps the spelling of
+            # the reference: QueryBuilder does not fold identifier case
+            resolved = self._resolve(name.lower(), sql)
+            if resolved:
+                tables[name] = resolved
+
+        if not tables:
+            raise QueryError("Query references no known table")
+
+        statement = PreparedStatement(
+            sql=sql,
+            tables=tuple(tables.items()),
+            has_limit=bool(_TRAILING_LIMIT.search(sql)),
+        )
+        self._statements[sql] = statement
+        while len(self._statements) > self.statement_cache_size:
+            self._statements.popitem(last=False)
+        return statement
+
+    # =========================================================================
+    # EXECUTE
+    # =========================================================================
+
+    def _columns(self, table: str, dt) -> List[str]:
+        key = (table, dt.version())
+        if key not in self._schemas:
+            schema = dt.schema()
+            arrow = schema.to_arrow() if hasattr(schema, "to_arrow") else schema.to_pyarrow()
+            self._schemas[key] = pa.schema(arrow).names
+        return self._schemas[key]
+
+    def _builder(self, tables: Dict[str, object]) -> Tuple[object, Dict[str, str]]:
+        """
+        QueryBuilder with the tables registered, reused while their versions hold.
+
+        Returns the builder and the internal name of each Delta table in it.
+        """
+        from deltalake import QueryBuilder
+
+        key = tuple(sorted((name, dt.version()) for name, dt in tables.items()))
+        entry = self._builders.get(key)
+        if entry is None:
+            token = secrets.token_hex(8)
+            sources = {name: f"{INTERNAL_PREFIX}{token}_{name}" for name in tables}
+            builder = QueryBuilder()
+            for name, dt in tables.items():
+                builder.register(sources[name], dt)
+            entry = (builder, sources)
+            self._builders[key] = entry
+            while len(self._builders) > 32:
+                self._builders.popitem(last=False)
+        else:
+            self._builders.move_to_end(key)
+        return entry
+
+    def render(
+        self,
+        statement: PreparedStatement,
+        customer_id: str,
+        limit: Optional[int],
+        sources: Optional[Dict[str, str]] = None
+    ) -> str:
+        """
+        SQL actually executed: tenant-scoped views in front of the statement.
+
+        ``sources`` maps Delta tables to their registered internal names
+        (default: ``__lh_<table>``, for display only).
+        """
+        cache = get_table_cache()
+        views = []
+        for name, table in statement.tables:
+            dt = cache.get(self.delta_path / table)
+            source = f'"{(sources or {}).get(table, INTERNAL_PREFIX + table)}"'
+            if TENANT_COLUMN in self._columns(table, dt):
+                predicate = f"{TENANT_COLUMN} = {_quote_literal(customer_id)} OR {TENANT_COLUMN} IS NULL"
+                views.append(f'"{name}" AS (SELECT * FROM {source} WHERE {predicate})')
+            else:
+                views.append(f'"{name}" AS (SELECT * FROM {source})')
+
+        sql = statement.sql
+        leading_with = _LEADING_WITH.match(sql)
+        if leading_with:
+            # Merge with the caller's own CTEs (one WITH clause per statement)
+            sql = f"WITH {leading_with.group(1) or ''}{', '.join(views)}, {sql[leading_with.end():]}"
+        else:
+            sql = f"WITH {', '.join(views)} {sql}"
+
+        if limit is not None and not statement.has_limit:
+            sql = f"{sql} LIMIT {int(limit)}"
+        return sql
+
+    def execute(
+        self,
+        sql: str,
+        customer_id: str,
+        limit: Optional[int] = None
+    ) -> pa.RecordBatchReader:
+        """
+        Run a statement for one tenant.
+
+        Args:
+            sql: SELECT statement over Delta table names
+            customer_id: Tenant whose rows (and shared rows without a
+                customer_id) are visible
+            limit: Row limit appended if the statement has none
+
+        Returns:
+            Streaming Arrow reader
+
+        Raises:
+            QueryError: On unknown tables, internal table access or SQL errors
+        """
+        if not customer_id:
+            raise QueryError("customer_id is required")
+
+        statement = self.prepare(sql)
+        cache = get_table_cache()
+        tables = {table: cache.get(self.delta_path / table) for _, table in statement.tables}
+        builder, sources = self._builder(tables)
+        rendered = self.render(statement, customer_id, limit, sources)
+
+        try:
+            reader = builder.execute(rendered)
+        except Exception as e:
+            raise QueryError(f"Query failed: {e}") from e
+        return pa.RecordBatchReader.from_stream(reader)
@@ -0,0 +1,240 @@
+"""
+Delta Table Cache - Process-wide, version-aware DeltaTable handles
+
+Opening a DeltaTable replays its ``_delta_log``. Tables only change at
+ingestion time, so handles are kept per table path and refreshed
+incrementally only when a newer log version appears on disk.
+
+Small, hot tables (product_images, categories, ...) can additionally be
+kept fully materialized as Arrow tables, evicted LRU by bytes.
+
+Usage:
+    from lakehouse.delta.table_cache import get_table_cache
+
+    dt = get_table_cache().get("/data/lakehouse/delta/products")
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+import logging
+import os
+import threading
+
+import pyarrow as pa
+from deltalake import DeltaTable
+
+logger = logging.getLogger(__name__)
+
+
+# Default budget for materialized hot tables
+DEFAULT_ARROW_CACHE_BYTES = 256 * 1024 * 1024
+
+# Tables materialized in memory unless overridden by LAKEHOUSE_HOT_TABLES
+DEFAULT_HOT_TABLES = ("product_images", "categories")
+
+
+def latest_log_version(table_path: Union[str, Path]) -> Optional[int]:
+    """
+    Return the newest commit version in ``_delta_log`` without replaying it.
+
+    Only the directory listing is read (``00000000000000000042.json`` → 42).
+    Returns None if the path is not a Delta table.
+    """
+    log_path = Path(table_path) / "_delta_log"
+    latest = None
+    try:
+        with os.scandir(log_path) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith(".json") and name[:-5].isdigit():
+                    version = int(name[:-5])
+                    if latest is None or version > latest:
+                        latest = version
+    except FileNotFoundError:
+        return None
+    return latest
+
+
+class ArrowTableCache:
+    """
+    LRU cache of materialized Arrow tables bounded by total bytes.
+
+    Keys include the Delta version, so a new commit naturally misses and the
+    stale entry ages out.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_ARROW_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, pa.Table]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Optional[pa.Table]:
+        with self._lock:
+            table = self._entries.get(key)
+            if table is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return table
+
+    def put(self, key: Tuple, table: pa.Table):
+        size = table.nbytes
+        if size > self.max_bytes:
+            logger.debug(f"Not caching {key}: {size} bytes exceeds budget {self.max_bytes}")
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+
+            self._entries[key] = table
+            self._bytes += size
+
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def get_or_load(self, key: Tuple, loader: Callable[[], pa.Table]) -> pa.Table:
+        table = self.get(key)
+        if table is None:
+            table = loader()
+            self.put(key, table)
+        return table
+
+    def invalidate(self, table_path: str):
+        """Drop all entries for a table path (any version)."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == table_path]:
+                self._bytes -= self._entries.pop(key).nbytes
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class DeltaTableCache:
+    """
+    Pool of DeltaTable handles keyed by table path.
+
+    ``get()`` compares the cached handle's version against the newest log
+    file on disk and calls ``update_incremental()`` only when they differ,
+    so unchanged tables cost one directory listing per request.
+    """
+
+    def __init__(
+        self,
+        hot_tables: Iterable[str] = DEFAULT_HOT_TABLES,
+        arrow_cache_bytes: int = DEFAULT_ARROW_CACHE_BYTES
+    ):
+        """
+        Args:
+            hot_tables: Table names (directory names) to keep materialized
+            arrow_cache_bytes: Byte budget for materialized hot tables
+        """
+        self.hot_tables = set(hot_tables)
+        self.arrow_cache = ArrowTableCache(arrow_cache_bytes)
+        self._handles: Dict[str, DeltaTable] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.refreshes = 0
+        self.opens = 0
+
+    def get(self, table_path: Union[str, Path]) -> DeltaTable:
+        """
+        Get an up-to-date DeltaTable handle for ``table_path``.
+
+        Raises:
+            deltalake exceptions if the path is not a Delta table
+        """
+        key = str(table_path)
+        latest = latest_log_version(key)
+
+        with self._lock:
+            handle = self._handles.get(key)
+
+            if handle is not None and latest is not None and handle.version() == latest:
+                self.hits += 1
+                return handle
+
+            if handle is not None and latest is not None and handle.version() < latest:
+                try:
+                    handle.update_incremental()
+                    self.refreshes += 1
+                    logger.debug(f"Refreshed {key} to version {handle.version()}")
+                    return handle
+                except Exception as e:
+                    logger.warning(f"Incremental refresh failed for {key}, reopening: {e}")
+
+            # First access, or table was recreated (version went backwards)
+            handle = DeltaTable(key)
+            self._handles[key] = handle
+            self.opens += 1
+            return handle
+
+    def is_hot(self, table_path: Union[str, Path]) -> bool:
+        return Path(table_path).name in self.hot_tables
+
+    def get_arrow(self, table_path: Union[str, Path], handle: Optional[DeltaTable] = None) -> pa.Table:
+        """
+        Materialized Arrow table for a hot table, cached per version.
+
+        ``handle`` materializes the version of an already opened handle
+        instead of the latest one.
+        """
+        handle = handle or self.get(table_path)
+        key = (str(table_path), handle.version())
+        return self.arrow_cache.get_or_load(key, handle.to_pyarrow_table)
+
+    def invalidate(self, table_path: Union[str, Path]):
+        """Forget the handle and any materialized copies (e.g. after overwrite/drop)."""
+        key = str(table_path)
+        with self._lock:
+            self._handles.pop(key, None)
+        self.arrow_cache.invalidate(key)
+
+    def clear(self):
+        with self._lock:
+            self._handles.clear()
+        self.arrow_cache = ArrowTableCache(self.arrow_cache.max_bytes)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "handles": len(self._handles),
+            "hits": self.hits,
+            "refreshes": self.refreshes,
+            "opens": self.opens,
+            "hot_tables": sorted(self.hot_tables),
+            "arrow_cache": self.arrow_cache.stats(),
+        }
+
+
+_table_cache: Optional[DeltaTableCache] = None
+
+
+def get_table_cache() -> DeltaTableCache:
+    """
+    Get the process-wide DeltaTableCache.
+
+    Configured via environment:
+        LAKEHOUSE_HOT_TABLES: comma-separated tables to materialize
+        LAKEHOUSE_ARROW_CACHE_MB: byte budget for materialized tables
+    """
+    global _table_cache
+    if _table_cache is None:
+        hot = os.getenv("LAKEHOUSE_HOT_TABLES")
+        hot_tables = [t.strip() for t in hot.split(",") if t.strip()] if hot is not None \
+            else DEFAULT_HOT_TABLES
+        cache_mb = int(os.getenv("LAKEHOUSE_ARROW_CACHE_MB", DEFAULT_ARROW_CACHE_BYTES // (1024 * 1024)))
+        _table_cache = DeltaTableCache(hot_tables=hot_tables, arrow_cache_bytes=cache_mb * 1024 * 1024)
+    return _table_cache
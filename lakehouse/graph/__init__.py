@@ -5,5 +5,6 @@ Provides entity extraction and graph storage for knowledge graphs.
 """
 
 from .neo4j_store import Neo4jStore, GraphConfig
+from .batch_writer import GraphBatchWriter
 
-__all__ = ["Neo4jStore", "GraphConfig"]
+__all__ = ["Neo4jStore", "GraphConfig", "GraphBatchWriter"]
@@ -18,6 +18,8 @@ try:
 except ImportError:
     raise ImportError("Neo4j driver not installed. Run: pip install neo4j")
 
+from .batch_writer import DEFAULT_MAX_PENDING_ENTITIES, GraphBatchWriter, entity_id_for
+
 logger = logging.getLogger(__name__)
 
 
@@ -149,10 +151,7 @@ class Neo4jStore:
             Neo4j node ID
         """
         # Generate entity ID (hash of text + type)
-        import hashlib
-        entity_id = hashlib.md5(
-            f"{entity['text']}:{entity['type']}".encode()
-        ).hexdigest()
+        entity_id = entity_id_for(entity)
 
         with self.driver.session(database=self.config.database) as session:
             result = session.run(
@@ -225,16 +224,16 @@ class Neo4jStore:
             entity_ids: List of entity IDs mentioned in document
         """
         with self.driver.session(database=self.config.database) as session:
-            for entity_id in entity_ids:
-                session.run(
-                    """
-                    MATCH (d:Document {id: $doc_id}), (e:Entity {id: $entity_id})
-                    MERGE (d)-[r:MENTIONS]->(e)
-                    ON CREATE SET r.created_at = datetime()
-                    """,
-                    doc_id=doc_id,
-                    entity_id=entity_id
-                )
+            session.run(
+                """
+                UNWIND $entity_ids AS entity_id
+                MATCH (d:Document {id: $doc_id}), (e:Entity {id: entity_id})
+                MERGE (d)-[r:MENTIONS]->(e)
+                ON CREATE SET r.created_at = datetime()
+                """,
+                doc_id=doc_id,
+                entity_ids=entity_ids
+            )
 
         logger.info(f"Linked document {doc_id} to {len(entity_ids)} entities")
 
@@ -249,6 +248,9 @@ class Neo4jStore:
         """
         Load complete extraction result into Neo4j.
 
+        Written in a single transaction with batched UNWIND statements; use
+        ``batch_writer()`` to also batch across documents.
+
         Args:
             doc_id: Document identifier
             filename: Original filename
@@ -259,45 +261,34 @@ class Neo4jStore:
         Returns:
             Statistics dict
         """
-        stats = {
-            "documents": 0,
-            "entities": 0,
-            "relationships": 0,
-            "doc_entity_links": 0
-        }
-
-        # Create document node
-        self.create_document_node(doc_id, filename, mcp)
-        stats["documents"] = 1
-
-        # Create entity nodes
-        entity_id_map = {}  # text -> neo4j_id
-        for entity in entities:
-            entity_id = self.create_entity_node(entity)
-            entity_id_map[entity['text']] = entity_id
-            stats["entities"] += 1
-
-        # Link document to entities
-        self.link_document_to_entities(doc_id, list(entity_id_map.values()))
-        stats["doc_entity_links"] = len(entity_id_map)
-
-        # Create relationships between entities
-        for rel in relationships:
-            source_text = rel['source']['text']
-            target_text = rel['target']['text']
-
-            if source_text in entity_id_map and target_text in entity_id_map:
-                self.create_relationship(
-                    source_id=entity_id_map[source_text],
-                    target_id=entity_id_map[target_text],
-                    rel_type=rel['type'],
-                    properties={"confidence": rel.get('confidence', 0.8)}
-                )
-                stats["relationships"] += 1
+        writer = self.batch_writer()
+        stats = writer.add(doc_id, filename, mcp, entities, relationships)
+        writer.flush()
 
         logger.info(f"Loaded {stats['entities']} entities, {stats['relationships']} relationships")
         return stats
 
+    def batch_writer(self, max_pending_entities: int = DEFAULT_MAX_PENDING_ENTITIES) -> GraphBatchWriter:
+        """
+        Create a writer that accumulates extractions across documents.
+
+        Everything buffered is written with UNWIND in one transaction per
+        flush (on ``flush()``, on context exit, or when
+        ``max_pending_entities`` is reached).
+
+        Args:
+            max_pending_entities: Auto-flush threshold (distinct entities)
+
+        Returns:
+            GraphBatchWriter bound to this store's driver and customer
+        """
+        return GraphBatchWriter(
+            self.driver,
+            database=self.config.database,
+            customer_id=self.customer_id,
+            max_pending_entities=max_pending_entities
+        )
+
     # =======================
     # Query Methods
     # =======================
@@ -5,21 +5,29 @@ Serves Delta Lake tables and LanceDB vectors over HTTP.
 Mounts customer-specific lakehouse at /data/lakehouse/
 """
 
+import asyncio
 import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Query
 from pydantic import BaseModel
-import pyarrow.parquet as pq
-import pandas as pd
+
+from lakehouse.delta.query_engine import DeltaQueryEngine, Filter, QueryError
+from lakehouse.delta.table_cache import get_table_cache, latest_log_version
+from lakehouse.vector.chunk_text import attach_chunk_text, attach_text_to_rows
+from lakehouse.vector.index_manager import VectorIndexManager, default_state_path
+from lakehouse.vector.text_index import (
+    ChunkTextIndex, default_index_path, is_part_number_query, reciprocal_rank_fusion
+)
 
 logger = logging.getLogger(__name__)
 
 
 # Startup: Load lakehouse location
 lakehouse_path = None
+_query_engine = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -51,6 +59,33 @@ async def lifespan(app: FastAPI):
 app = FastAPI(title="0711 Lakehouse Service", lifespan=lifespan)
 
 
+def get_query_engine() -> DeltaQueryEngine:
+    """Get or create the pushdown query engine for the mounted lakehouse"""
+    global _query_engine
+    if _query_engine is None or _query_engine.delta_path != lakehouse_path / "delta":
+        _query_engine = DeltaQueryEngine(lakehouse_path / "delta")
+    return _query_engine
+
+
+def parse_filters(specs: Optional[List[str]]) -> List[Filter]:
+    """Parse ``column:op:value`` query parameters into typed filters (400 on error)"""
+    try:
+        return [Filter.parse(spec) for spec in specs or []]
+    except QueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def parse_columns(columns: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated projection list"""
+    if not columns:
+        return None
+    return [c.strip() for c in columns.split(",") if c.strip()]
+
+
+FILTER_HELP = "Typed filter column:op:value (ops: eq, ne, lt, le, gt, ge, in, contains, startswith, isnull, notnull). Repeatable."
+COLUMNS_HELP = "Comma-separated list of columns to return"
+
+
 class HealthResponse(BaseModel):
     status: str
     lakehouse_path: str
@@ -108,7 +143,12 @@ async def list_delta_tables():
 
 
 @app.get("/delta/query/syndication_products")
-async def query_syndication_products_specific(limit: int = Query(default=200, le=50000)):
+async def query_syndication_products_specific(
+    limit: int = Query(default=200, le=50000),
+    offset: int = Query(default=0, ge=0),
+    columns: Optional[str] = Query(default=None, description=COLUMNS_HELP),
+    filter: Optional[List[str]] = Query(default=None, description=FILTER_HELP)
+):
     """
     Syndication products endpoint - auto-maps to available product table.
 
@@ -119,43 +159,56 @@ async def query_syndication_products_specific(limit: int = Query(default=200, le
     if not lakehouse_path or not lakehouse_path.exists():
         raise HTTPException(status_code=404, detail="Lakehouse not found")
 
-    delta_path = lakehouse_path / "delta"
-    table_candidates = ["syndication_products", "products", "products_documents"]
-
-    for table_name in table_candidates:
-        table_path = delta_path / table_name
-        if table_path.exists():
-            parquet_files = list(table_path.glob("*.parquet"))
-            if parquet_files:
-                logger.info(f"Using {table_name} for syndication_products query (limit={limit})")
-                table = pq.read_table(parquet_files[0])
-                df = table.to_pandas()
-                total_count = len(df)
-                df = df.head(limit)  # Apply limit AFTER getting total count
-
-                return {
-                    "table": "syndication_products",
-                    "rows": df.to_dict(orient="records"),
-                    "count": len(df),
-                    "total": total_count,
-                    "source_table": table_name
-                }
+    engine = get_query_engine()
+    table_name = engine.first_existing(["syndication_products", "products", "products_documents"])
+
+    if table_name is None:
+        # No data found
+        return {"rows": [], "count": 0, "source_table": None}
+
+    logger.info(f"Using {table_name} for syndication_products query (limit={limit})")
+
+    try:
+        result = engine.scan(
+            table_name,
+            columns=parse_columns(columns),
+            filters=parse_filters(filter),
+            limit=limit,
+            offset=offset,
+            count_total=True
+        )
+    except QueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    # No data found
-    return {"rows": [], "count": 0, "source_table": None}
+    return {
+        "table": "syndication_products",
+        "rows": result.to_records(),
+        "count": result.count,
+        "total": result.total,
+        "source_table": table_name
+    }
 
 
 @app.get("/delta/query/{table_name}")
 async def query_delta_table(
     table_name: str,
-    limit: int = Query(default=10, le=1000)
+    limit: int = Query(default=10, le=1000),
+    offset: int = Query(default=0, ge=0),
+    columns: Optional[str] = Query(default=None, description=COLUMNS_HELP),
+    filter: Optional[List[str]] = Query(default=None, description=FILTER_HELP)
 ):
     """
     Query a Delta Lake table.
 
+    Projection, filters and limit/offset are pushed down to the scan, so only
+    the files, row groups and columns needed for the page are read.
+
     Args:
         table_name: Name of table to query
         limit: Maximum rows to return
+        offset: Matching rows to skip
+        columns: Comma-separated projection
+        filter: Typed filters (column:op:value), ANDed together
 
     Returns:
         Table data as JSON
@@ -163,34 +216,30 @@ async def query_delta_table(
     if not lakehouse_path or not lakehouse_path.exists():
         raise HTTPException(status_code=404, detail="Lakehouse not found")
 
-    table_path = lakehouse_path / "delta" / table_name
-    if not table_path.exists():
+    engine = get_query_engine()
+    if not engine.table_path(table_name).exists():
         raise HTTPException(status_code=404, detail=f"Table '{table_name}' not found")
 
-    # Try Delta Lake first (reads ALL parquet files), fallback to single parquet
+    if not engine.exists(table_name):
+        return {"rows": [], "count": 0}
+
     try:
-        from deltalake import DeltaTable
-        dt = DeltaTable(str(table_path))
-        df = dt.to_pandas()
-        total = len(df)
-        df = df.head(limit)
-        logger.info(f"Read Delta table {table_name}: {total} rows total, returning {len(df)}")
-    except:
-        # Fallback: Read parquet files directly
-        parquet_files = list(table_path.glob("*.parquet"))
-        if not parquet_files:
-            return {"rows": [], "count": 0}
-
-        table = pq.read_table(parquet_files[0])
-        df = table.to_pandas()
-        total = len(df)
-        df = df.head(limit)
-        logger.warning(f"Fallback to Parquet for {table_name}: {total} rows")
+        result = engine.scan(
+            table_name,
+            columns=parse_columns(columns),
+            filters=parse_filters(filter),
+            limit=limit,
+            offset=offset
+        )
+    except QueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    logger.info(f"Read Delta table {table_name}: returning {result.count} rows")
 
     return {
         "table": table_name,
-        "rows": df.to_dict(orient="records"),
-        "count": len(df)
+        "rows": result.to_records(),
+        "count": result.count
     }
 
 
@@ -217,57 +266,54 @@ async def list_lance_datasets():
 
 
 @app.get("/products")
-async def list_products(limit: int = Query(default=100, le=50000)):
+async def list_products(
+    limit: int = Query(default=100, le=50000),
+    offset: int = Query(default=0, ge=0),
+    columns: Optional[str] = Query(default=None, description=COLUMNS_HELP),
+    filter: Optional[List[str]] = Query(default=None, description=FILTER_HELP)
+):
     """
     Smart products endpoint - auto-detects product table.
 
     Tries in order:
-    1. products (structured catalog)
-    2. products_documents (document-based)
-    3. general_documents filtered by mcp=products
+    1. syndication_products (export-ready catalog)
+    2. products (structured catalog)
+    3. products_documents (document-based)
+    4. general_documents
     """
     if not lakehouse_path or not lakehouse_path.exists():
         raise HTTPException(status_code=404, detail="Lakehouse not found")
 
-    delta_path = lakehouse_path / "delta"
+    engine = get_query_engine()
 
     # Try different table names (syndication_products first for Lightnet!)
-    table_candidates = ["syndication_products", "products", "products_documents", "general_documents"]
-
-    for table_name in table_candidates:
-        table_path = delta_path / table_name
-        if table_path.exists():
-            parquet_files = list(table_path.glob("*.parquet"))
-            if parquet_files:
-                logger.info(f"Using {table_name} table for /products endpoint")
-
-                # Try Delta Lake first, fallback to Parquet
-                try:
-                    from deltalake import DeltaTable
-                    dt = DeltaTable(str(table_path))
-                    df = dt.to_pandas()
-                    total = len(df)
-                    df = df.head(limit)
-                    logger.info(f"Using Delta table {table_name} ({total} rows)")
-                except:
-                    # Fallback to Parquet
-                    table = pq.read_table(parquet_files[0])
-                    df = table.to_pandas()
-                    total = len(df)
-                    df = df.head(limit)
-                    logger.info(f"Using Parquet {table_name} ({total} rows)")
-
-                # Convert to product format
-                products = df.to_dict(orient="records")
-
-                return {
-                    "products": products,
-                    "total": total,
-                    "source_table": table_name
-                }
+    table_name = engine.first_existing(
+        ["syndication_products", "products", "products_documents", "general_documents"]
+    )
 
-    # No product data found
-    return {"products": [], "total": 0, "source_table": None}
+    if table_name is None:
+        # No product data found
+        return {"products": [], "total": 0, "source_table": None}
+
+    logger.info(f"Using {table_name} table for /products endpoint")
+
+    try:
+        result = engine.scan(
+            table_name,
+            columns=parse_columns(columns),
+            filters=parse_filters(filter),
+            limit=limit,
+            offset=offset,
+            count_total=True
+        )
+    except QueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "products": result.to_records(),
+        "total": result.total,
+        "source_table": table_name
+    }
 
 
 @app.get("/stats")
@@ -301,22 +347,89 @@ async def get_stats():
     )
     stats["total_size_mb"] = round(total_size / (1024 * 1024), 2)
 
+    # DeltaTable handle / hot table cache effectiveness
+    stats["table_cache"] = get_table_cache().stats()
+
+    # ANN index freshness (unindexed tail, drift, background retrain)
+    if (lance_path / "embeddings.lance").exists():
+        try:
+            import lancedb
+
+            table = lancedb.connect(str(lance_path)).open_table("embeddings")
+            manager = VectorIndexManager(default_state_path(lance_path, "embeddings"))
+            stats["vector_index"] = await asyncio.to_thread(manager.freshness, table)
+        except Exception as e:
+            stats["vector_index"] = {"error": str(e)}
+
     return stats
 
 
 class VectorSearchRequest(BaseModel):
     query: str
     limit: int = 5
-    mcp_filter: Optional[str] = None
+    mcp_filter: Optional[Union[str, List[str]]] = None  # One MCP or any of several
+    vector: Optional[List[float]] = None  # Precomputed query embedding (skips the embed call)
+
+
+def _mcp_where(mcp_filter: Union[str, List[str]]) -> str:
+    """SQL predicate on the Lance ``mcp`` column"""
+    values = [mcp_filter] if isinstance(mcp_filter, str) else mcp_filter
+    quoted = ", ".join("'" + v.replace("'", "''") + "'" for v in values)
+    return f"mcp IN ({quoted})"
+
+
+_text_indexes: Dict[Path, ChunkTextIndex] = {}
+_text_index_refreshes: Dict[Path, asyncio.Task] = {}
+_text_index_lock = asyncio.Lock()
+
+
+def _resolve_chunk_text(chunks):
+    """Chunk text for Lance tables stored without it (text lives in Delta)"""
+    return attach_chunk_text(chunks, lakehouse_path / "delta")
+
+
+async def _refresh_text_index(index: ChunkTextIndex, table):
+    try:
+        async with _text_index_lock:
+            await asyncio.to_thread(index.refresh, table, _resolve_chunk_text)
+    except Exception as e:
+        logger.error(f"Text index refresh failed: {e}")
+
+
+async def get_text_index(table) -> Optional[ChunkTextIndex]:
+    """
+    Full-text index of the Lance embeddings table.
+
+    Only the very first build runs on the request. After that, a newer Lance
+    version starts a background refresh and the current (stale) index keeps
+    answering until it lands.
+    """
+    index_path = default_index_path(lakehouse_path / "lance", "embeddings")
+    index = _text_indexes.setdefault(index_path, ChunkTextIndex(index_path))
+    if index.version == table.version:
+        return index
+
+    if index.version is None:
+        await _refresh_text_index(index, table)
+        return index if index.version is not None else None
+
+    refresh = _text_index_refreshes.get(index_path)
+    if refresh is None or refresh.done():
+        _text_index_refreshes[index_path] = asyncio.create_task(_refresh_text_index(index, table))
+    return index
 
 
 @app.post("/lance/search")
 async def vector_search(request: VectorSearchRequest):
     """
-    Semantic search using LanceDB vector embeddings.
-
-    Converts query text to vector via embeddings service,
-    then searches all embeddings in lakehouse.
+    Hybrid search over the Lance chunk embeddings.
+
+    Runs BM25 on the persistent full-text index and ANN on the vectors and
+    merges both with reciprocal-rank fusion; exact part-number matches are
+    boosted to the top. The query is embedded via the embeddings service
+    unless the caller sends ``vector``. If the service is down - or the
+    query is only part numbers that matched exactly - the text side answers
+    alone.
     """
     if not lakehouse_path or not lakehouse_path.exists():
         raise HTTPException(status_code=404, detail="Lakehouse not found")
@@ -329,6 +442,7 @@ async def vector_search(request: VectorSearchRequest):
         import lancedb
         import httpx
         import os
+        from lakehouse.vector.lance_store import DEFAULT_REFINE_FACTOR
 
         # Connect to Lance database
         db = lancedb.connect(str(lance_path))
@@ -343,70 +457,94 @@ async def vector_search(request: VectorSearchRequest):
             f"http://{customer_id}-embeddings:8001"  # Internal Docker network
         )
 
-        # Convert query to vector via embeddings service
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                embed_response = await client.post(
-                    f"{embedding_url}/v1/embeddings",
-                    json={"input": [request.query], "model": "multilingual-e5-large"}
-                )
-
-                if embed_response.status_code != 200:
-                    # Fallback to text search if embeddings service unavailable
-                    logger.warning(f"Embeddings service unavailable, using text search")
-                    results_df = table.to_pandas()
-                    query_lower = request.query.lower()
-                    mask = results_df['text'].str.lower().str.contains(query_lower, na=False)
-                    filtered = results_df[mask].head(request.limit)
-
-                    if request.mcp_filter:
-                        filtered = filtered[filtered['mcp'] == request.mcp_filter]
-
-                    return {
-                        "query": request.query,
-                        "results": filtered[['filename', 'text', 'mcp', 'chunk_index']].to_dict(orient="records"),
-                        "count": len(filtered),
-                        "search_type": "text",
-                        "note": "Embeddings service unavailable, used text search"
-                    }
+        candidates = request.limit * 2
+        text_index = await get_text_index(table)
+        text_hits = []
+        if text_index is not None:
+            text_hits = await asyncio.to_thread(
+                text_index.search, request.query, candidates, request.mcp_filter
+            )
 
-                embed_data = embed_response.json()
-                # OpenAI format: {"data": [{"embedding": [...]}]}
-                query_vector = embed_data['data'][0]['embedding']
+        # Bare part numbers with exact hits need no vectors
+        sku_answered = is_part_number_query(request.query) and any(h["sku_matches"] for h in text_hits)
+
+        # Convert query to vector via embeddings service (unless precomputed)
+        query_vector = request.vector
+        note = None
+        if query_vector is None and not sku_answered:
+            try:
+                async with httpx.AsyncClient(timeout=30.0) as client:
+                    embed_response = await client.post(
+                        f"{embedding_url}/v1/embeddings",
+                        json={"input": [request.query], "model": "multilingual-e5-large"}
+                    )
+                    embed_response.raise_for_status()
+                    # OpenAI format: {"data": [{"embedding": [...]}]}
+                    query_vector = embed_response.json()['data'][0]['embedding']
+
+            except Exception as e:
+                logger.warning(f"Embeddings service unavailable, using text search only: {e}")
+                note = "Embeddings service unavailable, used text search"
+
+        vector_hits = []
+        if query_vector is not None and not sku_answered:
+            search_query = table.search(query_vector).limit(candidates)
+
+            # Apply MCP filter if specified
+            if request.mcp_filter:
+                # Prefilter so top-k is taken among matching rows, not cut down afterwards
+                search_query = search_query.where(_mcp_where(request.mcp_filter), prefilter=True)
+
+            # PQ candidates are re-ranked with exact distances on the stored vectors
+            search_query = search_query.refine_factor(DEFAULT_REFINE_FACTOR)
+
+            rows = await asyncio.to_thread(search_query.to_list)
+            # Tables stored without text reference the Delta chunk tables
+            if "text" not in table.schema.names:
+                rows = await asyncio.to_thread(attach_text_to_rows, rows, lakehouse_path / "delta")
+
+            # Drop the vector field, it's huge
+            vector_hits = [
+                {
+                    "filename": r.get("filename"),
+                    "text": r.get("text"),
+                    "mcp": r.get("mcp"),
+                    "chunk_index": r.get("chunk_index"),
+                    "score": r.get("_distance", 0.0)  # LanceDB returns _distance
+                }
+                for r in rows
+            ]
 
-        except Exception as e:
-            logger.error(f"Embedding service error: {e}")
-            raise HTTPException(status_code=503, detail=f"Embeddings service unavailable: {str(e)}")
-
-        # Perform vector search
-        search_query = table.search(query_vector).limit(request.limit * 2)
-
-        # Apply MCP filter if specified
-        if request.mcp_filter:
-            search_query = search_query.where(f"mcp = '{request.mcp_filter}'")
-
-        results = search_query.to_list()
-
-        # Format results (remove vector field, it's huge)
-        formatted_results = []
-        for r in results[:request.limit]:
-            formatted_results.append({
-                "filename": r.get("filename"),
-                "text": r.get("text"),
-                "mcp": r.get("mcp"),
-                "chunk_index": r.get("chunk_index"),
-                "score": r.get("_distance", 0.0)  # LanceDB returns _distance
-            })
+        if text_index is None and query_vector is None:
+            raise HTTPException(status_code=503, detail="Neither text index nor embeddings service available")
 
-        return {
+        results = reciprocal_rank_fusion(vector_hits, text_hits, request.limit)
+
+        if sku_answered:
+            search_type = "sku"
+        elif vector_hits and text_index is not None:
+            search_type = "hybrid"
+        elif query_vector is not None:
+            search_type = "semantic"
+        else:
+            search_type = "text"
+
+        response = {
             "query": request.query,
-            "results": formatted_results,
-            "count": len(formatted_results),
+            "results": results,
+            "count": len(results),
             "total_searched": table.count_rows(),
-            "search_type": "semantic",
+            "search_type": search_type,
             "embedding_service": embedding_url
         }
+        if note:
+            response["note"] = note
+        if text_index is not None:
+            response["text_index_version"] = text_index.version
+        return response
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Vector search failed: {e}")
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
@@ -427,52 +565,26 @@ async def list_products(
         raise HTTPException(status_code=404, detail="Lakehouse not found")
 
     # Try syndication_products first, then eaton_products as fallback
-    table_path = lakehouse_path / "delta" / "syndication_products"
-    if not table_path.exists():
-        table_path = lakehouse_path / "delta" / "eaton_products"
+    engine = get_query_engine()
+    table_name = engine.first_existing(["syndication_products", "eaton_products"])
 
-    if not table_path.exists():
+    if table_name is None:
         return {"products": [], "total": 0}
 
     try:
-        from deltalake import DeltaTable
-        dt = DeltaTable(str(table_path))
-        df = dt.to_pandas()
-
         # Search filter if provided (work with whatever columns exist)
-        if search:
-            search_cols = []
-            for col in ['product_name', 'sku', 'short_description', 'long_description', 'supplier_pid']:
-                if col in df.columns:
-                    search_cols.append(df[col].astype(str).str.contains(search, case=False, na=False))
-
-            if search_cols:
-                mask = search_cols[0]
-                for s in search_cols[1:]:
-                    mask = mask | s
-                df = df[mask]
-
-        total = len(df)
-        df = df.iloc[offset:offset+limit]
-
-        # Convert to records with NaN handling
-        import math
-        records = []
-        for _, row in df.iterrows():
-            record = {}
-            for key, value in row.items():
-                # Handle NaN, None, Inf
-                if pd.isna(value) or value is None:
-                    record[key] = None
-                elif isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
-                    record[key] = None
-                else:
-                    record[key] = value
-            records.append(record)
+        result = engine.scan(
+            table_name,
+            limit=limit,
+            offset=offset,
+            count_total=True,
+            search=search,
+            search_columns=['product_name', 'sku', 'short_description', 'long_description', 'supplier_pid']
+        )
 
         return {
-            "products": records,
-            "total": total,
+            "products": result.to_records(),
+            "total": result.total,
             "limit": limit,
             "offset": offset
         }
@@ -495,16 +607,20 @@ async def get_product_categories():
         raise HTTPException(status_code=404, detail="Lakehouse not found")
 
     try:
-        from deltalake import DeltaTable
         from collections import defaultdict
 
         # Get products table
-        products_path = lakehouse_path / "delta" / "syndication_products"
-        if not products_path.exists():
+        engine = get_query_engine()
+        if not engine.exists("syndication_products"):
             raise HTTPException(status_code=404, detail="Products table not found")
 
-        dt = DeltaTable(str(products_path))
-        df = dt.to_pandas()
+        # Only the columns the hierarchy needs are read
+        wanted = ['sku', 'product_name', 'short_description', 'color_temperature', 'price_eur']
+        schema = engine.dataset("syndication_products").schema
+        result = engine.scan(
+            "syndication_products",
+            columns=[c for c in wanted if c in schema.names]
+        )
 
         # Build 2-level hierarchy (Familie → Farbtemperatur)
         # SKIP light_distribution - die Spalte enthält falsche Daten (ISO-Zertifikate)
@@ -534,7 +650,7 @@ async def get_product_categories():
         # Categorize products and collect top 10 per family
         family_products = defaultdict(list)
 
-        for _, row in df.iterrows():
+        for row in result.to_records():
             product_name = row.get('product_name', '') or ''
             short_desc = row.get('short_description', '') or ''
             family = extract_family(product_name, short_desc)
@@ -596,11 +712,137 @@ async def get_product_categories():
             "total_families": len(categories)
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to generate categories: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+class ProductLookupRequest(BaseModel):
+    keys: List[str]
+    key: str = "product_id"
+    table: Optional[str] = None
+    columns: Optional[List[str]] = None
+
+
+@app.post("/products/lookup")
+async def lookup_products(request: ProductLookupRequest):
+    """
+    Bulk fetch products by identifier (product_id, supplier_pid, ean_upc, gtin, sku).
+
+    Served from the table's key index when available, so fetching a few
+    hundred SKUs reads only the row groups that contain them.
+    """
+    if not lakehouse_path or not lakehouse_path.exists():
+        raise HTTPException(status_code=404, detail="Lakehouse not found")
+
+    if len(request.keys) > 5000:
+        raise HTTPException(status_code=400, detail="At most 5000 keys per lookup")
+
+    engine = get_query_engine()
+    table_name = request.table or engine.first_existing(
+        ["syndication_products", "products", "eaton_products"]
+    )
+
+    if table_name is None or not engine.exists(table_name):
+        return {"products": [], "count": 0, "source_table": None}
+
+    try:
+        result = engine.lookup(table_name, request.key, request.keys, columns=request.columns)
+    except QueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "products": result.to_records(),
+        "count": result.count,
+        "source_table": table_name
+    }
+
+
+@app.get("/products/page")
+async def page_products(
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    offset: int = Query(default=0, ge=0, description="Row offset for the first page (ignored with cursor)"),
+    product_family: Optional[str] = Query(default=None),
+    color_temperature: Optional[str] = Query(default=None),
+    columns: Optional[str] = Query(default=None, description=COLUMNS_HELP),
+    filter: Optional[List[str]] = Query(default=None, description=FILTER_HELP)
+):
+    """
+    Filtered, cursor-paginated product listing.
+
+    Filters are pushed into the scan and each call returns only one page.
+    Pass ``next_cursor`` back as ``cursor`` for the following page; the
+    cursor pins the table version so pages stay consistent during ingestion.
+    ``total`` is returned on the first page only (estimated for filtered
+    queries on large tables, see ``total_is_estimate``).
+    """
+    if not lakehouse_path or not lakehouse_path.exists():
+        raise HTTPException(status_code=404, detail="Lakehouse not found")
+
+    engine = get_query_engine()
+    table_name = engine.first_existing(
+        ["syndication_products", "products", "products_documents", "general_documents"]
+    )
+
+    if table_name is None:
+        return {"products": [], "count": 0, "total": 0, "next_cursor": None, "source_table": None}
+
+    filters = parse_filters(filter)
+    if color_temperature and color_temperature != "Other":
+        if "color_temperature" not in engine.dataset(table_name).schema.names:
+            # Catalog has no color temperatures - nothing can match
+            return {"products": [], "count": 0, "total": 0, "next_cursor": None, "source_table": table_name}
+        filters.append(Filter("color_temperature", "eq", color_temperature))
+
+    try:
+        result = engine.page(
+            table_name,
+            columns=parse_columns(columns),
+            filters=filters,
+            limit=limit,
+            cursor=cursor,
+            offset=offset,
+            # Family names appear in product name / short description (see /products/categories)
+            search=product_family,
+            search_columns=["product_name", "short_description"]
+        )
+    except QueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "products": result.to_records(),
+        "count": result.count,
+        "total": result.total,
+        "total_is_estimate": result.total_is_estimate,
+        "next_cursor": result.next_cursor,
+        "source_table": table_name
+    }
+
+
+@app.get("/products/version")
+async def products_version():
+    """
+    Current Delta version of the product table read by /products/page.
+
+    Clients that cache derived data (e.g. the tender product matcher) compare
+    this against the version they built from; only the log directory is listed.
+    """
+    if not lakehouse_path or not lakehouse_path.exists():
+        raise HTTPException(status_code=404, detail="Lakehouse not found")
+
+    engine = get_query_engine()
+    table_name = engine.first_existing(
+        ["syndication_products", "products", "products_documents", "general_documents"]
+    )
+    if table_name is None:
+        return {"table": None, "version": None}
+
+    return {"table": table_name, "version": latest_log_version(engine.table_path(table_name))}
+
+
 @app.get("/products/search/{sku}")
 async def search_product_by_sku(sku: str):
     """
@@ -611,36 +853,18 @@ async def search_product_by_sku(sku: str):
         raise HTTPException(status_code=404, detail="Lakehouse not found")
 
     try:
-        from deltalake import DeltaTable
-
-        products_path = lakehouse_path / "delta" / "syndication_products"
-        if not products_path.exists():
+        engine = get_query_engine()
+        if not engine.exists("syndication_products"):
             raise HTTPException(status_code=404, detail="Products table not found")
 
-        dt = DeltaTable(str(products_path))
-        df = dt.to_pandas()
-
-        # Find by SKU
-        matches = df[df['sku'] == sku]
+        # Find by SKU (point lookup - stats skipping prunes non-matching files)
+        product = engine.find_one("syndication_products", "sku", sku)
 
-        if len(matches) == 0:
+        if product is None:
             raise HTTPException(status_code=404, detail=f"Product {sku} not found")
 
-        product = matches.iloc[0].to_dict()
-
-        # Clean NaN values
-        import math
-        cleaned = {}
-        for key, value in product.items():
-            if pd.isna(value) or value is None:
-                cleaned[key] = None
-            elif isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
-                cleaned[key] = None
-            else:
-                cleaned[key] = value
-
         return {
-            "product": cleaned,
+            "product": product,
             "sku": sku
         }
 
@@ -665,30 +889,24 @@ async def get_product_with_images(product_id: str):
         raise HTTPException(status_code=404, detail="Lakehouse not found")
 
     try:
-        from deltalake import DeltaTable
+        engine = get_query_engine()
 
         # Get product
-        products_path = lakehouse_path / "delta" / "eaton_products"
-        if not products_path.exists():
+        if not engine.exists("eaton_products"):
             raise HTTPException(status_code=404, detail="Products table not found")
 
-        dt = DeltaTable(str(products_path))
-        df = dt.to_pandas()
-        product = df[df['supplier_pid'] == product_id]
+        product_data = engine.find_one("eaton_products", "supplier_pid", product_id)
 
-        if len(product) == 0:
+        if product_data is None:
             raise HTTPException(status_code=404, detail=f"Product {product_id} not found")
 
-        product_data = product.iloc[0].to_dict()
-
         # Get linked images
-        images_path = lakehouse_path / "delta" / "product_images"
         images = []
-        if images_path.exists():
-            img_dt = DeltaTable(str(images_path))
-            img_df = img_dt.to_pandas()
-            product_images = img_df[img_df['product_id'] == product_id]
-            images = product_images.to_dict(orient="records")
+        if engine.exists("product_images"):
+            images = engine.scan(
+                "product_images",
+                filters=[Filter("product_id", "eq", product_id)]
+            ).to_records()
 
         return {
             "product": product_data,
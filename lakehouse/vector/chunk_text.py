@@ -0,0 +1,92 @@
+"""
+Chunk Text - Resolve Lance rows to their text in the Delta chunk tables
+
+Lance tables created with ``store_text=False`` keep only ``chunk_id`` and
+``mcp`` as a reference; the text lives once, in ``{mcp}_chunks`` written by
+DeltaLoader. Readers that need text (search results, the BM25 index) attach
+it here with one filtered Delta scan per MCP.
+
+Usage:
+    from lakehouse.vector.chunk_text import attach_chunk_text
+
+    chunks = attach_chunk_text(chunks, lakehouse_path / "delta")
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Union
+import logging
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+logger = logging.getLogger(__name__)
+
+
+def _lookup(delta_path: Path, mcp: str, chunk_ids: pa.Array) -> pa.Table:
+    """chunk_id → text for ``chunk_ids`` from ``{mcp}_chunks`` (last write wins)"""
+    import pyarrow.dataset as ds
+    from lakehouse.delta.table_cache import get_table_cache, latest_log_version
+
+    table_path = delta_path / f"{mcp}_chunks"
+    if latest_log_version(table_path) is None:
+        return pa.table({"chunk_id": pa.array([], pa.string()), "text": pa.array([], pa.large_string())})
+
+    found = get_table_cache().get(table_path).to_pyarrow_dataset().to_table(
+        columns=["chunk_id", "text"],
+        filter=ds.field("chunk_id").isin(chunk_ids)
+    )
+    if found.num_rows > pc.count_distinct(found["chunk_id"]).as_py():
+        last = found.group_by("chunk_id", use_threads=False).aggregate([("text", "last")])
+        found = pa.table({"chunk_id": last["chunk_id"], "text": last["text_last"]})
+    return found.cast(pa.schema([("chunk_id", pa.string()), ("text", pa.large_string())]))
+
+
+def attach_chunk_text(chunks: pa.Table, delta_path: Union[str, Path]) -> pa.Table:
+    """
+    Add a ``text`` column to Lance rows that were stored without text.
+
+    Args:
+        chunks: Rows with ``chunk_id`` and ``mcp`` columns
+        delta_path: Delta storage holding the ``{mcp}_chunks`` tables
+
+    Returns:
+        ``chunks`` with ``text`` appended in the same row order (null where
+        the chunk is missing from Delta); unchanged if it already has text
+    """
+    if "text" in chunks.column_names or "chunk_id" not in chunks.column_names:
+        return chunks
+
+    delta_path = Path(delta_path)
+    lookups = []
+    for mcp in pc.unique(chunks["mcp"]).to_pylist():
+        if mcp is None:
+            continue
+        ids = chunks.filter(pc.equal(chunks["mcp"], mcp))["chunk_id"].combine_chunks()
+        try:
+            lookups.append(_lookup(delta_path, mcp, ids))
+        except Exception as e:
+            logger.warning(f"Failed to read chunk text from {mcp}_chunks: {e}")
+
+    if not lookups:
+        return chunks.append_column("text", pa.nulls(chunks.num_rows, pa.large_string()))
+
+    lookup = pa.concat_tables(lookups)
+    indexed = chunks.append_column("__row", pa.array(range(chunks.num_rows), pa.int64()))
+    joined = indexed.join(lookup, "chunk_id", join_type="left outer", use_threads=False)
+    return joined.sort_by("__row").drop_columns(["__row"])
+
+
+def attach_text_to_rows(rows: List[Dict[str, Any]], delta_path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """Fill ``text`` in search result dicts that came back without it (in place)."""
+    missing = [row for row in rows if row.get("text") is None and row.get("chunk_id")]
+    if not missing:
+        return rows
+
+    resolved = attach_chunk_text(pa.table({
+        "chunk_id": pa.array([row["chunk_id"] for row in missing], pa.string()),
+        "mcp": pa.array([row.get("mcp") for row in missing], pa.string()),
+    }), delta_path)
+
+    for row, text in zip(missing, resolved["text"].to_pylist()):
+        row["text"] = text
+    return rows
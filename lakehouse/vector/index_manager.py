@@ -0,0 +1,438 @@
+"""
+Vector Index Manager - Incremental upkeep of the Lance IVF-PQ index
+
+Training an IVF-PQ index (k-means over all vectors) is the expensive part of
+an ingest; assigning new vectors to the existing partitions is cheap. After
+each load the manager therefore:
+
+    1. skips tables below ``min_rows`` (flat search is fine there)
+    2. folds the unindexed tail into the existing partitions
+       (Lance ``optimize_indices``) - no retraining
+    3. retrains in a background thread only when the index has gone stale:
+       the unindexed tail is a large fraction of the table, the table grew
+       well past the size the partitions were sized for, or the mean
+       direction of vectors added since training drifted from the training
+       sample
+
+Training state (rows, partitions, mean training vector, appends since) is
+kept in a JSON sidecar next to the text index, so freshness survives
+restarts and can be reported by the lakehouse server's /stats.
+
+Usage:
+    manager = VectorIndexManager(default_state_path(lance_path, "embeddings"))
+    manager.record_append(new_vectors)
+    manager.maintain(table)
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+
+# Below this many rows the index is not built (IVF training needs data)
+DEFAULT_MIN_ROWS = 256
+
+# Retrain when the unindexed tail exceeds this fraction of the table
+DEFAULT_RETRAIN_UNINDEXED = 0.25
+
+# Retrain when the table grew by this fraction since training
+DEFAULT_RETRAIN_GROWTH = 1.0
+
+# Retrain when appended vectors' mean direction moved this far (cosine distance)
+DEFAULT_RETRAIN_DRIFT = 0.05
+
+# Appended rows needed before drift is trusted
+DEFAULT_MIN_DRIFT_ROWS = 256
+
+# Vectors sampled at training time for the drift baseline
+DEFAULT_SAMPLE_ROWS = 4096
+
+
+def default_state_path(lance_path: Union[str, Path], table_name: str = "embeddings") -> Path:
+    """``<lakehouse>/lance`` → ``<lakehouse>/indexes/lance_<table>_ann.json``"""
+    return Path(lance_path).parent / "indexes" / f"lance_{table_name}_ann.json"
+
+
+def index_parameters(row_count: int, embedding_dim: int) -> Tuple[int, int]:
+    """
+    IVF-PQ sizing: ``(num_partitions, num_sub_vectors)``.
+
+    sqrt(N) partitions; sub-vectors that divide the dimension evenly.
+    """
+    num_partitions = max(int(np.sqrt(row_count)), 8)
+
+    # Common divisors for 1024: 128, 64, 32, 16, 8
+    # Common divisors for 768: 96, 64, 48, 32, 16, 8
+    if embedding_dim == 1024:
+        return num_partitions, 128  # 1024 / 128 = 8
+    if embedding_dim == 768:
+        return num_partitions, 96   # 768 / 96 = 8
+
+    # Generic: find largest divisor <= 128
+    num_sub_vectors = 16
+    for candidate in [128, 64, 32, 16, 8]:
+        if embedding_dim % candidate == 0:
+            num_sub_vectors = candidate
+            break
+    return num_partitions, num_sub_vectors
+
+
+def _get(obj: Any, key: str, default: Any = None) -> Any:
+    """Attribute or dict access (lancedb returns either, depending on version)"""
+    if isinstance(obj, dict):
+        return obj.get(key, default)
+    return getattr(obj, key, default)
+
+
+def _unit_rows(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def vectors_to_numpy(column: Union[pa.Array, pa.ChunkedArray]) -> np.ndarray:
+    """FixedSizeList vector column → (rows, dim) float32 matrix"""
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks()
+    if len(column) == 0:
+        return np.zeros((0, 0), dtype=np.float32)
+    dim = column.type.list_size
+    values = column.flatten().to_numpy(zero_copy_only=False)
+    return values.astype(np.float32, copy=False).reshape(-1, dim)
+
+
+class VectorIndexManager:
+    """
+    Decides between doing nothing, an incremental index append and a
+    (background) retrain for one Lance table.
+    """
+
+    def __init__(
+        self,
+        state_path: Union[str, Path],
+        min_rows: int = DEFAULT_MIN_ROWS,
+        retrain_unindexed: float = DEFAULT_RETRAIN_UNINDEXED,
+        retrain_growth: float = DEFAULT_RETRAIN_GROWTH,
+        retrain_drift: float = DEFAULT_RETRAIN_DRIFT,
+        background: bool = True
+    ):
+        """
+        Args:
+            state_path: JSON sidecar with the training state
+            min_rows: Rows needed before an index is built
+            retrain_unindexed: Unindexed fraction that triggers a retrain
+            retrain_growth: Growth since training that triggers a retrain
+            retrain_drift: Mean-direction drift that triggers a retrain
+            background: Retrain in a background thread (False: inline)
+        """
+        self.state_path = Path(state_path)
+        self.min_rows = min_rows
+        self.retrain_unindexed = retrain_unindexed
+        self.retrain_growth = retrain_growth
+        self.retrain_drift = retrain_drift
+        self.background = background
+
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    # =========================================================================
+    # STATE
+    # =========================================================================
+
+    def read_state(self) -> Dict[str, Any]:
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_state(self, state: Dict[str, Any]):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.state_path)
+
+    def _update_state(self, **changes):
+        with self._lock:
+            state = self.read_state()
+            state.update(changes)
+            self._write_state(state)
+
+    def record_append(self, vectors: np.ndarray):
+        """Account vectors added since the last training (drift baseline)."""
+        if vectors is None or len(vectors) == 0:
+            return
+
+        added = _unit_rows(vectors).sum(axis=0)
+        with self._lock:
+            state = self.read_state()
+            previous = state.get("appended_sum")
+            if previous is not None and len(previous) == len(added):
+                added = added + np.asarray(previous, dtype=np.float32)
+            state["appended_rows"] = state.get("appended_rows", 0) + len(vectors)
+            state["appended_sum"] = added.tolist()
+            self._write_state(state)
+
+    @property
+    def retraining(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def drift(self, state: Optional[Dict[str, Any]] = None) -> Optional[float]:
+        """Cosine distance between the training mean and the mean of appended vectors"""
+        state = state if state is not None else self.read_state()
+        mean = state.get("mean")
+        appended = state.get("appended_sum")
+        if mean is None or appended is None or state.get("appended_rows", 0) < DEFAULT_MIN_DRIFT_ROWS:
+            return None
+        mean = np.asarray(mean, dtype=np.float32)
+        appended = np.asarray(appended, dtype=np.float32)
+        denominator = float(np.linalg.norm(mean) * np.linalg.norm(appended))
+        if denominator == 0.0:
+            return None
+        return 1.0 - float(mean @ appended) / denominator
+
+    # =========================================================================
+    # INDEX INSPECTION
+    # =========================================================================
+
+    @staticmethod
+    def index_counts(table) -> Optional[Tuple[int, int]]:
+        """
+        ``(indexed_rows, unindexed_rows)`` of the vector index, or None if
+        the table has no vector index.
+        """
+        try:
+            indices = table.list_indices() or []
+        except Exception:
+            return None
+
+        for index in indices:
+            columns = _get(index, "columns") or _get(index, "fields") or []
+            if "vector" not in columns:
+                continue
+            name = _get(index, "name")
+
+            stats = None
+            try:
+                stats = table.index_stats(name)
+            except Exception:
+                try:
+                    stats = table.to_lance().stats.index_stats(name)
+                except Exception as e:
+                    logger.debug(f"Index stats unavailable for {name}: {e}")
+
+            if stats is None:
+                rows = table.count_rows()
+                return rows, 0
+            return (
+                int(_get(stats, "num_indexed_rows", 0) or 0),
+                int(_get(stats, "num_unindexed_rows", 0) or 0)
+            )
+
+        return None
+
+    def retrain_reason(self, rows: int, unindexed: int, state: Dict[str, Any]) -> Optional[str]:
+        """Why the index should be retrained, or None if appending is enough"""
+        if rows and unindexed / rows > self.retrain_unindexed:
+            return "unindexed"
+
+        trained_rows = state.get("trained_rows")
+        if trained_rows and (rows - trained_rows) / trained_rows > self.retrain_growth:
+            return "growth"
+
+        drift = self.drift(state)
+        if drift is not None and drift > self.retrain_drift:
+            return "drift"
+
+        return None
+
+    def freshness(self, table) -> Dict[str, Any]:
+        """Index freshness for /stats"""
+        state = self.read_state()
+        rows = table.count_rows()
+        counts = self.index_counts(table)
+        indexed, unindexed = counts if counts is not None else (0, rows)
+
+        return {
+            "indexed": counts is not None,
+            "rows": rows,
+            "indexed_rows": indexed,
+            "unindexed_rows": unindexed,
+            "unindexed_fraction": round(unindexed / rows, 4) if rows else 0.0,
+            "table_version": table.version,
+            "trained_version": state.get("trained_version"),
+            "trained_rows": state.get("trained_rows"),
+            "trained_at": state.get("trained_at"),
+            "num_partitions": state.get("num_partitions"),
+            "appended_since_training": state.get("appended_rows", 0),
+            "drift": self.drift(state),
+            "retraining": self.retraining or bool(state.get("retrain_started_at")),
+            "last_retrain_reason": state.get("last_retrain_reason"),
+        }
+
+    # =========================================================================
+    # MAINTENANCE
+    # =========================================================================
+
+    def maintain(self, table, embedding_dim: Optional[int] = None) -> str:
+        """
+        Bring the index up to date after a load.
+
+        Returns:
+            "skipped", "fresh", "appended" or "retraining"
+        """
+        rows = table.count_rows()
+        if rows < self.min_rows:
+            logger.info(f"⏭️  Skipping index (only {rows} rows, need {self.min_rows}+)")
+            return "skipped"
+
+        if self.retraining:
+            return "retraining"
+
+        counts = self.index_counts(table)
+        if counts is None:
+            self._schedule_train(table, embedding_dim, "initial")
+            return "retraining"
+
+        _, unindexed = counts
+        reason = self.retrain_reason(rows, unindexed, self.read_state())
+        if reason:
+            self._schedule_train(table, embedding_dim, reason)
+            return "retraining"
+
+        if not unindexed:
+            return "fresh"
+
+        try:
+            self.append(table)
+        except Exception as e:
+            logger.warning(f"Incremental index update failed, retraining: {e}")
+            self._schedule_train(table, embedding_dim, "append_failed")
+            return "retraining"
+
+        logger.info(f"🔍 Added {unindexed} vectors to existing index partitions")
+        return "appended"
+
+    @staticmethod
+    def append(table):
+        """Assign unindexed rows to the existing partitions (no retraining)."""
+        try:
+            dataset = table.to_lance()
+            dataset.optimize.optimize_indices()
+        except (AttributeError, ImportError):
+            table.optimize()
+
+    def _schedule_train(self, table, embedding_dim: Optional[int], reason: str):
+        if not self.background:
+            self.train(table, embedding_dim, reason)
+            return
+
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._train_quietly,
+                args=(table, embedding_dim, reason),
+                name="lance-index-train",
+                daemon=True
+            )
+            self._thread.start()
+        logger.info(f"🔍 Retraining vector index in background ({reason})")
+
+    def _train_quietly(self, table, embedding_dim: Optional[int], reason: str):
+        try:
+            self.train(table, embedding_dim, reason)
+        except Exception as e:
+            logger.error(f"❌ Failed to create index: {e}")
+            logger.info("⚠️  Index skipped - search will still work, just slower")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until a background retrain finishes; False on timeout."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    def train(self, table, embedding_dim: Optional[int] = None, reason: str = "manual"):
+        """
+        (Re)train the IVF-PQ index over the whole table, synchronously.
+
+        Appends recorded while training runs stay pending for the next
+        drift check.
+        """
+        row_count = table.count_rows()
+        if embedding_dim is None:
+            embedding_dim = table.schema.field("vector").type.list_size
+
+        started = self.read_state()
+        self._update_state(retrain_started_at=datetime.utcnow().isoformat())
+
+        num_partitions, num_sub_vectors = index_parameters(row_count, embedding_dim)
+        logger.info(
+            f"🔍 Creating index ({row_count} rows, dim={embedding_dim}): "
+            f"{num_partitions} partitions, {num_sub_vectors} sub_vectors"
+        )
+
+        try:
+            table.create_index(
+                metric="cosine",
+                num_partitions=num_partitions,
+                num_sub_vectors=num_sub_vectors,
+                replace=True
+            )
+            mean = self._sample_mean(table)
+        finally:
+            self._update_state(retrain_started_at=None)
+
+        with self._lock:
+            state = self.read_state()
+            appended_rows = state.get("appended_rows", 0) - started.get("appended_rows", 0)
+            appended_sum = state.get("appended_sum")
+            if appended_rows > 0 and appended_sum is not None and started.get("appended_sum") is not None:
+                appended_sum = (np.asarray(appended_sum) - np.asarray(started["appended_sum"])).tolist()
+            elif appended_rows <= 0:
+                appended_rows, appended_sum = 0, None
+
+            state.update({
+                "trained_rows": row_count,
+                "trained_version": table.version,
+                "trained_at": datetime.utcnow().isoformat(),
+                "num_partitions": num_partitions,
+                "num_sub_vectors": num_sub_vectors,
+                "mean": mean,
+                "appended_rows": appended_rows,
+                "appended_sum": appended_sum,
+                "last_retrain_reason": reason,
+            })
+            self._write_state(state)
+
+        logger.info(f"✅ INDEX CREATED: {num_partitions} partitions, {num_sub_vectors} sub_vectors")
+
+    @staticmethod
+    def _sample_mean(table, rows: int = DEFAULT_SAMPLE_ROWS) -> Optional[list]:
+        """Mean unit vector of a sample - the drift baseline"""
+        try:
+            dataset = table.to_lance()
+            try:
+                sample = dataset.sample(rows, columns=["vector"])
+            except (AttributeError, TypeError, ValueError):
+                sample = dataset.head(rows, columns=["vector"])
+        except Exception as e:
+            logger.debug(f"Could not sample vectors for drift baseline: {e}")
+            return None
+
+        vectors = vectors_to_numpy(sample["vector"])
+        if not len(vectors):
+            return None
+        return _unit_rows(vectors).mean(axis=0).tolist()
@@ -3,19 +3,45 @@ Lance Loader - Load embeddings to Lance vector database
 
 Lance provides fast vector search with filtering capabilities.
 Optimized for similarity search and hybrid search (vector + metadata).
+
+Tables are built Arrow-natively (vectors as a FixedSizeList over the NumPy
+buffer). New tables store float16 vectors and no chunk text by default:
+``chunk_id`` references the text in the Delta ``{mcp}_chunks`` table, which
+readers attach via lakehouse/vector/chunk_text.py.
 """
 
 from pathlib import Path
 from typing import List, Dict, Any, Optional
+import asyncio
 import logging
+import os
 import numpy as np
 
 import pyarrow as pa
+import pyarrow.compute as pc
 import lancedb
 
+from lakehouse.vector.chunk_text import attach_text_to_rows
+from lakehouse.vector.index_manager import VectorIndexManager, default_state_path, vectors_to_numpy
+
 logger = logging.getLogger(__name__)
 
 
+# Vector column types for new tables. float16 halves storage; ANN candidates
+# are rescored against the stored vectors (refine_factor), and float16's
+# precision does not change cosine rankings in practice. Lance indexes need
+# float vectors, so there is no int8 storage option.
+VECTOR_TYPES = {
+    "float16": pa.float16(),
+    "float32": pa.float32(),
+}
+
+DEFAULT_VECTOR_DTYPE = "float16"
+
+# ANN candidates per result re-ranked with exact distances
+DEFAULT_REFINE_FACTOR = 5
+
+
 class LanceLoader:
     """
     Loads embeddings to Lance vector database.
@@ -27,14 +53,37 @@ class LanceLoader:
     - Disk-based storage (doesn't require everything in RAM)
     """
 
-    def __init__(self, lance_path: Path):
+    def __init__(
+        self,
+        lance_path: Path,
+        vector_dtype: Optional[str] = None,
+        store_text: Optional[bool] = None,
+        delta_path: Optional[Path] = None
+    ):
         """
         Args:
             lance_path: Path to Lance database storage
+            vector_dtype: Vector type for new tables, "float16" or "float32"
+                (default: LANCE_VECTOR_DTYPE or float16)
+            store_text: Keep chunk text in new tables instead of referencing
+                the Delta chunk tables (default: LANCE_STORE_TEXT or False)
+            delta_path: Delta storage holding ``{mcp}_chunks`` (default:
+                ``delta`` next to ``lance_path``)
         """
         self.lance_path = Path(lance_path)
         self.lance_path.mkdir(parents=True, exist_ok=True)
+        self.delta_path = Path(delta_path) if delta_path else self.lance_path.parent / "delta"
         self._db = None
+        self._index_managers: Dict[str, VectorIndexManager] = {}
+
+        self.vector_dtype = vector_dtype or os.getenv("LANCE_VECTOR_DTYPE", DEFAULT_VECTOR_DTYPE)
+        if self.vector_dtype not in VECTOR_TYPES:
+            raise ValueError(f"Unsupported vector dtype: {self.vector_dtype} (use {', '.join(VECTOR_TYPES)})")
+
+        if store_text is None:
+            store_text = os.getenv("LANCE_STORE_TEXT", "false").lower() in ("1", "true", "yes")
+        self.store_text = store_text
+        self.refine_factor = DEFAULT_REFINE_FACTOR
 
     @property
     def db(self):
@@ -44,7 +93,7 @@ class LanceLoader:
             logger.info(f"Connected to Lance database at {self.lance_path}")
         return self._db
 
-    async def load_embeddings(self, documents: List[Dict[str, Any]]):
+    async def load_embeddings(self, documents: List[Dict[str, Any]], build_index: bool = True):
         """
         Load chunk embeddings to Lance.
 
@@ -52,130 +101,197 @@ class LanceLoader:
 
         Args:
             documents: List of processed documents with embeddings
+            build_index: (Re)build the ANN index after loading; streaming
+                loaders pass False per batch and build once at the end
         """
         if not documents:
             logger.info("No documents to load to Lance")
             return
 
-        records = []
-        embedding_dim = None
+        table_name = "embeddings"
 
-        for doc in documents:
-            embeddings = doc.get("chunk_embeddings", [])
-            chunks = doc.get("chunks", [])
+        try:
+            table = self.db.open_table(table_name)
+        except Exception:
+            table = None
 
-            for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-                if embedding is None:
-                    continue
+        # An existing table keeps the layout it was created with
+        schema = table.schema if table is not None else None
+        data = self._embedding_table(documents, schema)
 
-                # Convert embedding to list if numpy array
-                if isinstance(embedding, np.ndarray):
-                    embedding = embedding.tolist()
-
-                # Detect embedding dimension
-                if embedding_dim is None and len(embedding) > 0:
-                    embedding_dim = len(embedding)
-                    logger.info(f"📊 Detected embedding dimension: {embedding_dim}")
-
-                records.append({
-                    "chunk_id": f"{doc['id']}_{i}",
-                    "document_id": doc["id"],
-                    "filename": doc["filename"],
-                    "mcp": doc["mcp"],
-                    "text": chunk,
-                    "vector": embedding,
-                    "chunk_index": i,
-                    "char_count": len(chunk)
-                })
-
-        if not records:
+        if data is None:
             logger.warning("No embeddings to load")
             return
 
-        logger.info(f"💾 Loading {len(records)} embeddings to Lance (dim={embedding_dim})")
-
-        # Create or open table
-        table_name = "embeddings"
-
-        try:
-            # Try to open existing table
-            table = self.db.open_table(table_name)
-            # Add new records
-            table.add(records)
-            logger.info(f"✅ SAVED: Added {len(records)} embeddings to existing table '{table_name}'")
+        vector_type = data.schema.field("vector").type
+        embedding_dim = getattr(vector_type, "list_size", None)
+        logger.info(
+            f"💾 Loading {data.num_rows} embeddings to Lance "
+            f"(dim={embedding_dim}, {vector_type.value_type})"
+        )
+
+        if table is not None:
+            table.add(data)
+            # Drift baseline for the index manager
+            self.index_manager(table_name).record_append(vectors_to_numpy(data["vector"]))
+            logger.info(f"✅ SAVED: Added {data.num_rows} embeddings to existing table '{table_name}'")
             logger.info(f"✅ Total rows in table: {table.count_rows()}")
-
-        except Exception as e:
-            # Create new table
-            logger.info(f"Creating new table '{table_name}' with {len(records)} records...")
-            table = self.db.create_table(table_name, data=records, mode="overwrite")
-            logger.info(f"✅ SAVED: Created new table with {len(records)} embeddings")
+        else:
+            logger.info(f"Creating new table '{table_name}' with {data.num_rows} records...")
+            table = self.db.create_table(table_name, data=data, mode="overwrite")
+            logger.info(f"✅ SAVED: Created new table with {data.num_rows} embeddings")
             logger.info(f"✅ Table location: {self.lance_path}/{table_name}.lance")
 
         # Create index for fast search (if table is large enough)
-        row_count = table.count_rows()
-        if row_count >= 256:
-            logger.info(f"🔍 Creating index for {row_count} embeddings...")
-            await self.create_index(table_name, embedding_dim)
-        else:
-            logger.info(f"⏭️  Skipping index (only {row_count} rows, need 256+)")
+        if build_index:
+            await self.ensure_index(table_name, embedding_dim)
 
         logger.info(f"✅ COMPLETE: Lakehouse saved at {self.lance_path}")
 
+    def embedding_schema(self, embedding_dim: int) -> pa.Schema:
+        """Schema for a new embeddings table with this loader's vector type and text setting"""
+        fields = [
+            ("chunk_id", pa.string()),
+            ("document_id", pa.string()),
+            ("filename", pa.string()),
+            ("mcp", pa.string()),
+        ]
+        if self.store_text:
+            fields.append(("text", pa.string()))
+        fields += [
+            ("vector", pa.list_(VECTOR_TYPES[self.vector_dtype], embedding_dim)),
+            ("chunk_index", pa.int32()),
+            ("char_count", pa.int32()),
+        ]
+        return pa.schema(fields)
+
+    def _embedding_table(
+        self,
+        documents: List[Dict[str, Any]],
+        schema: Optional[pa.Schema] = None
+    ) -> Optional[pa.Table]:
+        """
+        Build the Arrow table for all embedded chunks of ``documents``.
+
+        Vectors go from one stacked NumPy buffer straight into a
+        FixedSizeList column; metadata columns are built per document and
+        repeated per chunk, so no per-chunk Python dicts or lists exist.
+
+        Args:
+            documents: Documents with ``chunks`` and ``chunk_embeddings``
+            schema: Target schema (an existing table's); None for a new table
+
+        Returns:
+            Table in ``schema`` order, or None if no chunk has an embedding
+        """
+        owners, positions, vectors = [], [], []
+
+        for d, doc in enumerate(documents):
+            embeddings = doc.get("chunk_embeddings", [])
+            chunks = doc.get("chunks", [])
+            for i, embedding in enumerate(embeddings[:len(chunks)]):
+                if embedding is None:
+                    continue
+                owners.append(d)
+                positions.append(i)
+                vectors.append(embedding)
+
+        if not vectors:
+            return None
+
+        value_type = schema.field("vector").type.value_type if schema is not None \
+            else VECTOR_TYPES[self.vector_dtype]
+        matrix = np.ascontiguousarray(np.asarray(vectors), dtype=value_type.to_pandas_dtype())
+        embedding_dim = matrix.shape[1]
+        if schema is None:
+            schema = self.embedding_schema(embedding_dim)
+
+        owner = np.asarray(owners, dtype=np.int64)
+        chunk_index = pa.array(np.asarray(positions, dtype=np.int32))
+        document_id = pa.array([doc["id"] for doc in documents], pa.string()).take(owner)
+
+        columns = {
+            "chunk_id": pc.binary_join_element_wise(
+                document_id, pc.cast(chunk_index, pa.string()), "_"
+            ),
+            "document_id": document_id,
+            "filename": pa.array([doc["filename"] for doc in documents], pa.string()).take(owner),
+            "mcp": pa.array([doc["mcp"] for doc in documents], pa.string()).take(owner),
+            "vector": pa.FixedSizeListArray.from_arrays(pa.array(matrix.reshape(-1)), embedding_dim),
+            "chunk_index": chunk_index,
+        }
+
+        if "text" in schema.names or "char_count" in schema.names:
+            texts = self._chunk_texts(documents, owner, chunk_index)
+            columns["text"] = texts
+            columns["char_count"] = pc.cast(pc.utf8_length(texts), pa.int32())
+
+        return pa.table({name: columns[name] for name in schema.names}).cast(schema)
+
+    @staticmethod
+    def _chunk_texts(documents: List[Dict[str, Any]], owner: np.ndarray, chunk_index: pa.Array) -> pa.Array:
+        """Texts of the embedded chunks, picked from the flattened chunk lists"""
+        chunk_lists = pa.array([doc.get("chunks", []) for doc in documents], pa.list_(pa.string()))
+        offsets = chunk_lists.offsets.to_numpy()[:-1]
+        return chunk_lists.flatten().take(offsets[owner] + chunk_index.to_numpy())
+
+    def index_manager(self, table_name: str = "embeddings") -> VectorIndexManager:
+        """ANN index manager for a table (one per table, kept for background retrains)"""
+        manager = self._index_managers.get(table_name)
+        if manager is None:
+            manager = VectorIndexManager(default_state_path(self.lance_path, table_name))
+            self._index_managers[table_name] = manager
+        return manager
+
+    async def ensure_index(
+        self,
+        table_name: str = "embeddings",
+        embedding_dim: int = None,
+        wait: bool = False
+    ) -> str:
+        """
+        Keep the ANN index current without paying for a rebuild per ingest.
+
+        New vectors are appended to the existing partitions; a full retrain
+        runs in the background once the unindexed tail, table growth or
+        drift crosses the manager's thresholds (see index_manager.py).
+
+        Args:
+            table_name: Name of the table
+            embedding_dim: Embedding dimension (read from the schema if None)
+            wait: Block until a background retrain finishes
+
+        Returns:
+            Action taken ("skipped", "fresh", "appended" or "retraining")
+        """
+        manager = self.index_manager(table_name)
+        try:
+            table = self.db.open_table(table_name)
+            action = await asyncio.to_thread(manager.maintain, table, embedding_dim)
+        except Exception as e:
+            logger.error(f"❌ Failed to update index: {e}")
+            logger.info("⚠️  Index skipped - search will still work, just slower")
+            return "failed"
+
+        if wait:
+            await asyncio.to_thread(manager.wait)
+        return action
+
     async def create_index(self, table_name: str = "embeddings", embedding_dim: int = None):
         """
         Create vector index for fast search.
 
         Uses IVF-PQ (Inverted File Index with Product Quantization)
-        for fast approximate nearest neighbor search.
+        for fast approximate nearest neighbor search. Always a full,
+        synchronous retrain - ingestion uses ensure_index() instead.
 
         Args:
             table_name: Name of the table
-            embedding_dim: Embedding dimension (auto-detected if None)
+            embedding_dim: Embedding dimension (read from the schema if None)
         """
         try:
             table = self.db.open_table(table_name)
-            row_count = table.count_rows()
-
-            # Auto-detect dimension if not provided
-            if embedding_dim is None:
-                first_row = table.to_pandas().head(1)
-                if len(first_row) > 0:
-                    embedding_dim = len(first_row.iloc[0]['vector'])
-                else:
-                    logger.warning("Cannot detect embedding dimension, skipping index")
-                    return
-
-            logger.info(f"🔍 Creating index for {table_name} ({row_count} rows, dim={embedding_dim})")
-
-            # Create IVF-PQ index
-            # num_partitions: sqrt(N) is a good heuristic
-            num_partitions = max(int(np.sqrt(row_count)), 8)
-
-            # Calculate num_sub_vectors that divides embedding_dim evenly
-            # Common divisors for 1024: 128, 64, 32, 16, 8
-            # Common divisors for 768: 96, 64, 48, 32, 16, 8
-            if embedding_dim == 1024:
-                num_sub_vectors = 128  # 1024 / 128 = 8
-            elif embedding_dim == 768:
-                num_sub_vectors = 96   # 768 / 96 = 8
-            else:
-                # Generic: find largest divisor <= 128
-                num_sub_vectors = 16
-                for candidate in [128, 64, 32, 16, 8]:
-                    if embedding_dim % candidate == 0:
-                        num_sub_vectors = candidate
-                        break
-
-            logger.info(f"📐 Index config: {num_partitions} partitions, {num_sub_vectors} sub_vectors")
-
-            table.create_index(
-                metric="cosine",
-                num_partitions=num_partitions,
-                num_sub_vectors=num_sub_vectors
-            )
-
-            logger.info(f"✅ INDEX CREATED: {num_partitions} partitions, {num_sub_vectors} sub_vectors")
+            await asyncio.to_thread(self.index_manager(table_name).train, table, embedding_dim)
 
         except Exception as e:
             logger.error(f"❌ Failed to create index: {e}")
@@ -203,8 +319,8 @@ class LanceLoader:
         try:
             table = self.db.open_table(table_name)
 
-            # Build query
-            query = table.search(query_vector).limit(top_k)
+            # Build query; PQ candidates are re-ranked with exact distances
+            query = table.search(query_vector).limit(top_k).refine_factor(self.refine_factor)
 
             # Add MCP filter if specified
             if mcp_filter:
@@ -213,7 +329,7 @@ class LanceLoader:
             # Execute search
             results = query.to_list()
 
-            return results
+            return attach_text_to_rows(results, self.delta_path)
 
         except Exception as e:
             logger.error(f"Search failed: {e}")
@@ -276,7 +392,7 @@ class LanceLoader:
             # Sort by chunk index
             results.sort(key=lambda x: x.get("chunk_index", 0))
 
-            return results
+            return attach_text_to_rows(results, self.delta_path)
 
         except Exception as e:
             logger.error(f"Failed to get chunks for document {document_id}: {e}")
@@ -298,19 +414,21 @@ class LanceLoader:
             # Get row count
             row_count = table.count_rows()
 
-            # Count by MCP
-            # Note: Lance doesn't have built-in aggregation, so we query all
-            all_records = table.to_pandas()
+            # Count by MCP (only the mcp column is read, never the vectors)
+            mcps = table.to_lance().to_table(columns=["mcp"])["mcp"]
+            mcp_counts = {
+                entry["values"]: entry["counts"]
+                for entry in pc.value_counts(mcps).to_pylist()
+            }
 
-            mcp_counts = {}
-            if not all_records.empty:
-                mcp_counts = all_records['mcp'].value_counts().to_dict()
+            index = self.index_manager(table_name).freshness(table)
 
             return {
                 "exists": True,
                 "total_chunks": row_count,
                 "by_mcp": mcp_counts,
-                "has_index": table.list_indices() is not None
+                "has_index": index["indexed"],
+                "index": index
             }
 
         except Exception as e:
@@ -331,7 +449,8 @@ class LanceLoader:
         """
         try:
             table = self.db.open_table(table_name)
-            table.delete(f"document_id = '{document_id}'")
+            escaped = document_id.replace("'", "''")
+            table.delete(f"document_id = '{escaped}'")
             logger.info(f"Deleted chunks for document {document_id}")
 
         except Exception as e:
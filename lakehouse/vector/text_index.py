@@ -0,0 +1,398 @@
+"""
+Chunk Text Index - Persistent BM25 full-text index over Lance chunks
+
+Keyword side of the hybrid ``/lance/search``: an inverted index over the
+``text`` column of the Lance embeddings table, so text queries (and queries
+while the embeddings service is down) no longer load the whole table.
+
+Part numbers get special treatment: SKU-like tokens ("5SC750", "5SC-750i",
+"FRCDM-40/4/03-G") are indexed a second time in normalized form (lower case,
+separators dropped) and an exact match on one of them boosts the chunk
+above everything that only matches on words or vectors.
+
+Layout (next to the lance/ directory, like the Delta key indexes):
+    <lakehouse>/indexes/lance_<table>/_meta.json      # indexed Lance version
+    <lakehouse>/indexes/lance_<table>/chunks.arrow    # filename, mcp, chunk_index, text
+    <lakehouse>/indexes/lance_<table>/terms.arrow     # term, idf, postings offset
+    <lakehouse>/indexes/lance_<table>/postings.arrow  # chunk, BM25 weight (by term)
+
+The index is rebuilt when the Lance table's data changes (chunks can be
+deleted or replaced in place, so appends cannot be assumed). Version bumps
+that leave the data fragments as they were (ANN index optimize/retrain) only
+move the recorded version. The search server runs rebuilds in the background
+and keeps answering from the previous index meanwhile.
+
+Usage:
+    index = ChunkTextIndex(default_index_path(lance_path, "embeddings"))
+    index.refresh(lance_table)
+    hits = index.search("5SC750 Batterie", limit=10, mcp_filter=["products"])
+    results = reciprocal_rank_fusion(vector_hits, hits, limit=10)
+"""
+
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+import json
+import logging
+import os
+import re
+
+import numpy as np
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+
+RRF_K = 60
+SKU_BOOST = 1.0  # Larger than any RRF sum, so exact part numbers rank first
+CHUNK_COLUMNS = ("filename", "mcp", "chunk_index", "text")
+
+_WORD = re.compile(r"[^\W_]{2,}", re.UNICODE)
+_SKU_CANDIDATE = re.compile(r"[A-Za-z0-9]+(?:[-./][A-Za-z0-9]+)*")
+_SKU_SEPARATORS = re.compile(r"[-./]")
+_SKU_PREFIX = "#"  # Normalized SKU terms share the vocabulary with words
+
+
+def words(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+def sku_tokens(text: str) -> List[str]:
+    """
+    Normalized part numbers in a text: tokens with letters and digits,
+    4+ characters once separators are dropped ("5SC-750i" → "5sc750i").
+    """
+    tokens = []
+    for candidate in _SKU_CANDIDATE.findall(text):
+        normalized = _SKU_SEPARATORS.sub("", candidate).lower()
+        if len(normalized) >= 4 and not normalized.isdigit() and not normalized.isalpha():
+            tokens.append(normalized)
+    return tokens
+
+
+def terms(text: str) -> List[str]:
+    return words(text) + [_SKU_PREFIX + t for t in sku_tokens(text)]
+
+
+def is_part_number_query(query: str) -> bool:
+    """True if every token of the query is a part number"""
+    candidates = _SKU_CANDIDATE.findall(query)
+    return bool(candidates) and len(sku_tokens(query)) == len(candidates)
+
+
+def default_index_path(lance_path: Union[str, Path], table_name: str = "embeddings") -> Path:
+    """``<lakehouse>/lance`` → ``<lakehouse>/indexes/lance_<table>``"""
+    return Path(lance_path).parent / "indexes" / f"lance_{table_name}"
+
+
+class ChunkTextIndex:
+    """
+    Persistent BM25 index over the chunks of one Lance table.
+    """
+
+    def __init__(self, index_path: Union[str, Path], k1: float = 1.2, b: float = 0.75):
+        """
+        Args:
+            index_path: Where to keep the sidecar files
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+        """
+        self.index_path = Path(index_path)
+        self.k1 = k1
+        self.b = b
+
+        # (version, chunk columns, vocab, idf, indptr, posting chunks, posting weights)
+        self._loaded: Optional[Tuple] = None
+
+    # =========================================================================
+    # METADATA
+    # =========================================================================
+
+    def _meta_path(self) -> Path:
+        return self.index_path / "_meta.json"
+
+    def read_meta(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._meta_path()) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @property
+    def version(self) -> Optional[int]:
+        meta = self.read_meta()
+        return meta["version"] if meta else None
+
+    # =========================================================================
+    # MAINTENANCE
+    # =========================================================================
+
+    def refresh(self, table, resolve_text: Optional[Callable[[pa.Table], pa.Table]] = None) -> bool:
+        """
+        Bring the index up to the Lance table's current version.
+
+        Args:
+            table: lancedb table
+            resolve_text: Adds ``text`` to chunk rows of tables stored
+                without it (see lakehouse/vector/chunk_text.py)
+
+        Returns:
+            True if the index was rebuilt, False if it was already fresh
+        """
+        version = table.version
+        meta = self.read_meta()
+        if meta and meta["version"] == version:
+            return False
+
+        # Searches during the rebuild keep using the current index
+        self._load()
+
+        signature = self._data_signature(table)
+        if meta and signature is not None and meta.get("signature") == signature:
+            self._atomic_write_json(self._meta_path(), {**meta, "version": version})
+            if self._loaded:
+                self._loaded = (version,) + self._loaded[1:]
+            logger.debug(f"Text index moved to Lance v{version} (data unchanged)")
+            return False
+
+        chunks = self._read_chunks(table)
+        if "text" not in chunks.column_names and resolve_text is not None:
+            chunks = resolve_text(chunks)
+        self.build(chunks, version, signature)
+        return True
+
+    @staticmethod
+    def _data_signature(table) -> Optional[List[List[int]]]:
+        """(fragment id, live rows) per data fragment; None if not a Lance dataset"""
+        try:
+            return [[f.fragment_id, f.count_rows()] for f in table.to_lance().get_fragments()]
+        except Exception:
+            return None
+
+    @staticmethod
+    def _read_chunks(table) -> pa.Table:
+        """Chunk columns only - the vectors are never read"""
+        names = table.schema.names
+        columns = [c for c in CHUNK_COLUMNS if c in names]
+        if "text" not in names and "chunk_id" in names:
+            columns.append("chunk_id")
+        try:
+            return table.to_lance().to_table(columns=columns)
+        except (AttributeError, ImportError):
+            return table.to_arrow().select(columns)
+
+    def build(self, chunks: pa.Table, version: int, signature: Optional[List[List[int]]] = None):
+        """
+        Index chunks (``text`` plus optional filename/mcp/chunk_index) as ``version``.
+
+        ``signature`` identifies the data fragments the chunks were read from.
+        """
+        texts = chunks["text"].to_pylist() if "text" in chunks.column_names else []
+        vocab: Dict[str, int] = {}
+        term_ids: List[int] = []
+        chunk_ids: List[int] = []
+        tfs: List[int] = []
+
+        for chunk, text in enumerate(texts):
+            for term, tf in Counter(terms(text or "")).items():
+                term_ids.append(vocab.setdefault(term, len(vocab)))
+                chunk_ids.append(chunk)
+                tfs.append(tf)
+
+        n_chunks = max(len(texts), 1)
+        term_arr = np.asarray(term_ids, dtype=np.int64)
+        chunk_arr = np.asarray(chunk_ids, dtype=np.int32)
+        tf = np.asarray(tfs, dtype=np.float32)
+
+        length = np.bincount(chunk_arr, weights=tf, minlength=n_chunks).astype(np.float32)
+        avg_length = float(length.mean()) or 1.0
+        df = np.bincount(term_arr, minlength=len(vocab)).astype(np.float32)
+        idf = np.log(1.0 + (n_chunks - df + 0.5) / (df + 0.5)).astype(np.float32)
+        weights = idf[term_arr] * tf * (self.k1 + 1) / (
+            tf + self.k1 * (1 - self.b + self.b * length[chunk_arr] / avg_length)
+        )
+
+        order = np.argsort(term_arr, kind="stable")
+        indptr = np.concatenate(([0], np.cumsum(df.astype(np.int64))))
+
+        present = [c for c in CHUNK_COLUMNS if c in chunks.column_names]
+        self.index_path.mkdir(parents=True, exist_ok=True)
+        self._atomic_write_ipc(self.index_path / "chunks.arrow", chunks.select(present))
+        self._atomic_write_ipc(self.index_path / "terms.arrow", pa.table({
+            "term": pa.array(list(vocab), pa.string()),
+            "idf": pa.array(idf, pa.float32()),
+            "start": pa.array(indptr[:-1], pa.int64()),
+            "end": pa.array(indptr[1:], pa.int64()),
+        }))
+        self._atomic_write_ipc(self.index_path / "postings.arrow", pa.table({
+            "chunk": pa.array(chunk_arr[order], pa.int32()),
+            "weight": pa.array(weights[order].astype(np.float32), pa.float32()),
+        }))
+        # Meta last: readers see either the old or the complete new index
+        self._atomic_write_json(self._meta_path(), {
+            "version": version,
+            "chunks": len(texts),
+            "terms": len(vocab),
+            "signature": signature,
+        })
+        self._loaded = None
+
+        logger.info(
+            f"📇 Text index at Lance v{version}: {len(texts)} chunks, "
+            f"{len(vocab)} terms, {len(chunk_arr)} postings"
+        )
+
+    @staticmethod
+    def _read_ipc(path: Path) -> pa.Table:
+        # Buffers stay zero-copy views on the mapping
+        return pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+
+    @staticmethod
+    def _atomic_write_ipc(path: Path, table: pa.Table):
+        tmp = path.with_suffix(".tmp")
+        with pa.OSFile(str(tmp), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _atomic_write_json(path: Path, data: Dict[str, Any]):
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    # =========================================================================
+    # SEARCH
+    # =========================================================================
+
+    def _load(self) -> Optional[Tuple]:
+        version = self.version
+        if version is None:
+            return None
+        if self._loaded and self._loaded[0] == version:
+            return self._loaded
+
+        chunks = self._read_ipc(self.index_path / "chunks.arrow")
+        term_table = self._read_ipc(self.index_path / "terms.arrow")
+        postings = self._read_ipc(self.index_path / "postings.arrow")
+
+        vocab = {term: i for i, term in enumerate(term_table["term"].to_pylist())}
+        self._loaded = (
+            version,
+            chunks,
+            vocab,
+            term_table["idf"].to_numpy(),
+            term_table["start"].to_numpy(),
+            term_table["end"].to_numpy(),
+            postings["chunk"].to_numpy(),
+            postings["weight"].to_numpy(),
+        )
+        return self._loaded
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        mcp_filter: Optional[Union[str, Sequence[str]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        BM25 search; chunks with an exact part-number match come first.
+
+        Args:
+            query: Free text and/or part numbers
+            limit: Maximum hits
+            mcp_filter: One MCP or any of several
+
+        Returns:
+            Hits (filename, mcp, chunk_index, text, ``relevance`` in [0, 1]
+            relative to the query's ideal score, ``sku_matches``), best first
+        """
+        loaded = self._load()
+        if loaded is None:
+            return []
+        _, chunks, vocab, idf, start, end, posting_chunks, posting_weights = loaded
+        n_chunks = chunks.num_rows
+
+        query_terms = sorted({vocab[t] for t in terms(query) if t in vocab})
+        query_skus = [vocab[_SKU_PREFIX + t] for t in set(sku_tokens(query)) if _SKU_PREFIX + t in vocab]
+        if not query_terms or not n_chunks:
+            return []
+
+        def gather(term_ids):
+            if not term_ids:
+                return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+            return (
+                np.concatenate([posting_chunks[start[t]:end[t]] for t in term_ids]),
+                np.concatenate([posting_weights[start[t]:end[t]] for t in term_ids]),
+            )
+
+        hit_chunks, hit_weights = gather(query_terms)
+        scores = np.bincount(hit_chunks, weights=hit_weights, minlength=n_chunks)
+        sku_chunks, _ = gather(query_skus)
+        sku_matches = np.bincount(sku_chunks, minlength=n_chunks)
+
+        candidates = np.flatnonzero(scores > 0)
+        if mcp_filter and "mcp" in chunks.column_names:
+            allowed = [mcp_filter] if isinstance(mcp_filter, str) else list(mcp_filter)
+            mcps = chunks["mcp"].to_numpy(zero_copy_only=False)[candidates]
+            candidates = candidates[np.isin(mcps, allowed)]
+
+        order = candidates[np.lexsort((-scores[candidates], -sku_matches[candidates]))][:limit]
+
+        ideal = float(idf[query_terms].sum()) or 1.0
+        rows = chunks.take(pa.array(order, pa.int64())).to_pylist()
+        for row, i in zip(rows, order):
+            row["relevance"] = min(float(scores[i]) / ideal, 1.0)
+            row["sku_matches"] = int(sku_matches[i])
+        return rows
+
+
+def _chunk_key(hit: Dict[str, Any]) -> Tuple[Any, Any]:
+    return hit.get("filename"), hit.get("chunk_index")
+
+
+def reciprocal_rank_fusion(
+    vector_hits: List[Dict[str, Any]],
+    text_hits: List[Dict[str, Any]],
+    limit: int,
+    k: int = RRF_K,
+    sku_boost: float = SKU_BOOST
+) -> List[Dict[str, Any]]:
+    """
+    Merge ANN and BM25 hits (same chunk = same filename + chunk_index).
+
+    Each list contributes ``1 / (k + rank)``; every exact part-number match
+    adds ``sku_boost``. Fused hits keep ``score`` as a distance (vector
+    distance if the chunk was an ANN hit, else ``1 - relevance``) for
+    existing callers, with the fused value in ``rank_score``.
+
+    Returns:
+        Up to ``limit`` hits, best first, with ``match`` naming the source(s)
+    """
+    fused: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+
+    for rank, hit in enumerate(vector_hits, start=1):
+        entry = fused.setdefault(_chunk_key(hit), {**hit, "rank_score": 0.0, "sources": []})
+        entry["rank_score"] += 1.0 / (k + rank)
+        entry["sources"].append("vector")
+
+    for rank, hit in enumerate(text_hits, start=1):
+        entry = fused.setdefault(_chunk_key(hit), {**hit, "rank_score": 0.0, "sources": []})
+        entry["rank_score"] += 1.0 / (k + rank) + sku_boost * hit.get("sku_matches", 0)
+        entry["sources"].append("sku" if hit.get("sku_matches") else "text")
+        entry.setdefault("score", 1.0 - hit.get("relevance", 0.0))
+
+    results = sorted(fused.values(), key=lambda e: e["rank_score"], reverse=True)[:limit]
+    return [
+        {
+            "filename": e.get("filename"),
+            "text": e.get("text"),
+            "mcp": e.get("mcp"),
+            "chunk_index": e.get("chunk_index"),
+            "score": e.get("score", 0.0),
+            "rank_score": round(e["rank_score"], 6),
+            "match": "+".join(e["sources"]),
+        }
+        for e in results
+    ]
@@ -43,6 +43,12 @@ class CTAXMCP(BaseMCP):
     # Metadata
     description = "German Tax Engine - VAT, corporate tax, ELSTER, compliance"
     category = "finance"
+    routing_examples = [
+        "Wie hoch ist unsere Umsatzsteuer-Zahllast für Q4?",
+        "Calculate VAT and input tax for this invoice",
+        "ELSTER Voranmeldung beim Finanzamt einreichen",
+        "Welche Steuererklärung ist bis wann fällig?",
+    ]
 
     # System prompt for tax queries
     SYSTEM_PROMPT = """Du bist CTAX, ein spezialisierter KI-Assistent für deutsches Steuerrecht.
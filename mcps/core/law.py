@@ -42,6 +42,12 @@ class LAWMCP(BaseMCP):
     # Metadata
     description = "Legal & Contract Analysis - German law, GDPR, contracts"
     category = "legal"
+    routing_examples = [
+        "Prüfe diesen Vertrag auf Haftungsklauseln",
+        "Summarize the termination terms of our supplier contracts",
+        "Are we GDPR / DSGVO compliant with this data processing?",
+        "Welche Kündigungsfrist gilt für diesen Vertrag?",
+    ]
 
     # System prompt for legal queries
     SYSTEM_PROMPT = """Du bist LAW, ein spezialisierter KI-Assistent für deutsches Recht und Vertragsanalyse.
@@ -13,13 +13,14 @@ Capabilities:
 - Strategic positioning recommendations
 """
 
+import asyncio
 import logging
 import os
 from typing import Any, Dict, Optional, List
 from pathlib import Path
 import anthropic
 
-from mcps.sdk import BaseMCP, MCPContext, MCPResponse
+from mcps.sdk import BaseMCP, MCPContext, MCPResponse, fan_out
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +45,20 @@ class MarketMCP(BaseMCP):
     version = "1.0.0"
     description = "Market Intelligence & Competitive Analysis Engine"
     category = "intelligence"
+    routing_examples = [
+        "How does our pricing compare to ABB, Siemens and Schneider?",
+        "Welche Wettbewerber bieten Alternativen zu diesem Produkt?",
+        "Where are the gaps in our distributor coverage?",
+        "What is our market share and positioning in this category?",
+    ]
+
+    # Per-branch timeouts (seconds) for fan-out sub-tasks; a branch that
+    # overruns is dropped and the analysis continues without it
+    branch_timeouts = {
+        "internal": 15.0,
+        "web": 60.0,
+        "competitors": 60.0,
+    }
 
     # Anthropic client for web search
     def __init__(self):
@@ -104,21 +119,30 @@ class MarketMCP(BaseMCP):
             }
         """
         product_code = data.get("product_code", "")
-        include_web = data.get("include_web", True)
-        include_competitors = data.get("include_competitors", True)
-
-        # 1. Get internal data from customer lakehouse
-        internal_data = await self._get_internal_data(product_code, context)
-
-        # 2. Get external web intelligence
-        web_data = {}
-        if include_web and self.anthropic:
-            web_data = await self._search_web(product_code, context)
-
-        # 3. Get competitor data
-        competitor_data = {}
-        if include_competitors and self.anthropic:
-            competitor_data = await self._get_competitor_intel(product_code, context)
+        include_web = data.get("include_web", True) and self.anthropic
+        include_competitors = data.get("include_competitors", True) and self.anthropic
+
+        # 1-3. Internal data, web intelligence and competitor data are
+        # independent - fetch them concurrently
+        gathered = await fan_out(
+            {
+                "internal": lambda: self._get_internal_data(product_code, context),
+                "web": (lambda: self._search_web(product_code, context)) if include_web else None,
+                "competitors": (
+                    (lambda: self._get_competitor_intel(product_code, context))
+                    if include_competitors else None
+                ),
+            },
+            timeouts=self.branch_timeouts,
+            defaults={
+                "internal": {"documents": [], "count": 0},
+                "web": {"results": [], "enabled": False},
+                "competitors": {"products": [], "enabled": False},
+            },
+        )
+        internal_data = gathered.value("internal")
+        web_data = gathered.value("web")
+        competitor_data = gathered.value("competitors")
 
         # 4. Synthesize with Claude
         analysis = await self._synthesize_analysis(
@@ -136,10 +160,12 @@ class MarketMCP(BaseMCP):
                     "internal": len(internal_data.get("documents", [])),
                     "web": len(web_data.get("results", [])),
                     "competitors": len(competitor_data.get("products", []))
-                }
+                },
+                "degraded": gathered.degraded,
             },
-            confidence=0.85,
-            model_used="market-mcp-v1.0"
+            confidence=0.85 if gathered.ok else 0.7,
+            model_used="market-mcp-v1.0",
+            metadata={"fan_out": gathered.summary()}
         )
 
     async def _get_internal_data(
@@ -149,19 +175,19 @@ class MarketMCP(BaseMCP):
     ) -> Dict[str, Any]:
         """
         Query customer's lakehouse for internal product data.
+
+        Errors propagate; the fan-out degrades this branch to its default.
         """
-        # Query lakehouse via context
-        query = f"SELECT * FROM documents WHERE text LIKE '%{product_code}%' LIMIT 10"
+        # Query lakehouse via context (product_code is caller input: quote it)
+        pattern = product_code.replace("'", "''")
+        query = f"SELECT * FROM documents WHERE text LIKE '%{pattern}%' LIMIT 10"
 
-        try:
-            documents = self.query_data(query)
-            return {
-                "documents": documents,
-                "count": len(documents)
-            }
-        except Exception as e:
-            logger.error(f"Error querying internal data: {e}")
-            return {"documents": [], "count": 0}
+        # query_data blocks - keep the event loop free for sibling branches
+        documents = await asyncio.to_thread(self.query_data, query)
+        return {
+            "documents": documents,
+            "count": len(documents)
+        }
 
     async def _search_web(
         self,
@@ -170,22 +196,18 @@ class MarketMCP(BaseMCP):
     ) -> Dict[str, Any]:
         """
         Search web for product information using Anthropic web search.
+
+        Errors propagate; the fan-out degrades this branch to its default.
         """
         if not self.anthropic:
             return {"results": [], "enabled": False}
 
-        try:
-            # Construct search query
-            manufacturer = self._extract_manufacturer(context)
-            search_query = f"{manufacturer} {product_code} specifications datasheet pricing"
+        # Construct search query
+        manufacturer = self._extract_manufacturer(context)
+        search_query = f"{manufacturer} {product_code} specifications datasheet pricing"
 
-            # Use Claude with web search tool
-            response = self.anthropic.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=2000,
-                messages=[{
-                    "role": "user",
-                    "content": f"""Search the web for information about: {search_query}
+        # Use Claude with web search tool
+        response = await self._web_search(f"""Search the web for information about: {search_query}
 
 Find:
 1. Official product datasheet or technical specs
@@ -194,26 +216,16 @@ Find:
 4. Customer reviews or ratings
 5. Technical documentation
 
-Summarize findings in structured format."""
-                }],
-                tools=[{
-                    "type": "web_search_20241111",
-                    "name": "web_search"
-                }]
-            )
-
-            # Extract web search results
-            web_results = self._parse_web_results(response)
+Summarize findings in structured format.""")
 
-            return {
-                "results": web_results,
-                "enabled": True,
-                "query": search_query
-            }
+        # Extract web search results
+        web_results = self._parse_web_results(response)
 
-        except Exception as e:
-            logger.error(f"Web search error: {e}", exc_info=True)
-            return {"results": [], "enabled": False, "error": str(e)}
+        return {
+            "results": web_results,
+            "enabled": True,
+            "query": search_query
+        }
 
     async def _get_competitor_intel(
         self,
@@ -222,20 +234,16 @@ Summarize findings in structured format."""
     ) -> Dict[str, Any]:
         """
         Get competitor product information via web search.
+
+        Errors propagate; the fan-out degrades this branch to its default.
         """
         if not self.anthropic:
             return {"products": [], "enabled": False}
 
-        try:
-            # Search for alternatives
-            search_query = f"{product_code} alternatives competitors equivalent products ABB Siemens Schneider"
+        # Search for alternatives
+        search_query = f"{product_code} alternatives competitors equivalent products ABB Siemens Schneider"
 
-            response = self.anthropic.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=2000,
-                messages=[{
-                    "role": "user",
-                    "content": f"""Find competitor products similar to: {product_code}
+        response = await self._web_search(f"""Find competitor products similar to: {product_code}
 
 Search for:
 1. Direct competitors (ABB, Siemens, Schneider Electric, etc.)
@@ -244,24 +252,35 @@ Search for:
 4. Feature/specification comparison
 5. Market share or positioning
 
-Return structured data with competitor products and key differentiators."""
-                }],
-                tools=[{
-                    "type": "web_search_20241111",
-                    "name": "web_search"
-                }]
-            )
+Return structured data with competitor products and key differentiators.""")
 
-            competitors = self._parse_competitor_results(response)
+        competitors = self._parse_competitor_results(response)
 
-            return {
-                "products": competitors,
-                "enabled": True
-            }
+        return {
+            "products": competitors,
+            "enabled": True
+        }
 
-        except Exception as e:
-            logger.error(f"Competitor intel error: {e}", exc_info=True)
-            return {"products": [], "enabled": False, "error": str(e)}
+    async def _web_search(self, prompt: str, max_tokens: int = 2000):
+        """
+        Run a Claude web-search request off the event loop.
+
+        The Anthropic client is synchronous; running it in a worker thread
+        lets concurrent branches overlap their network time.
+        """
+        return await asyncio.to_thread(
+            self.anthropic.messages.create,
+            model="claude-sonnet-4-20250514",
+            max_tokens=max_tokens,
+            messages=[{
+                "role": "user",
+                "content": prompt
+            }],
+            tools=[{
+                "type": "web_search_20241111",
+                "name": "web_search"
+            }]
+        )
 
     async def _synthesize_analysis(
         self,
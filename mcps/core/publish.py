@@ -137,6 +137,12 @@ class PublishMCP(BaseMCP):
     version = "1.0.0"
     description = "Multi-Channel Content Publishing Engine"
     category = "content"
+    routing_examples = [
+        "Generate an Amazon listing for this product",
+        "Erstelle ein Datenblatt und eine SEO-Produktbeschreibung",
+        "Write a LinkedIn post about our new product line",
+        "Create marketing copy for the catalog",
+    ]
 
     async def process(
         self,
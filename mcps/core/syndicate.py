@@ -44,6 +44,11 @@ class SyndicateMCP(BaseMCP):
     version = "1.0.0"
     description = "Multi-Channel Content Syndication Engine"
     category = "syndication"
+    routing_examples = [
+        "Export our products as a BMEcat catalog",
+        "Erzeuge einen Produktfeed für den Großhandel mit ETIM-Klassen",
+        "Syndicate product data to distributor channels",
+    ]
 
     # Supported output formats
     SUPPORTED_FORMATS = [
@@ -1096,29 +1101,25 @@ Generate complete AMER Vendor XML for all {len(products_data)} products.
 
         try:
             async with httpx.AsyncClient(timeout=30.0) as client:
-                # Query syndication_products table
-                params = {}
-
-                if product_ids:
-                    # For now, get all and filter (TODO: support WHERE clause in lakehouse API)
-                    params["limit"] = 200
-                else:
-                    params["limit"] = 100
-
-                response = await client.get(
-                    f"{lakehouse_url}/delta/query/syndication_products",
-                    params=params
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                all_products = data.get("rows", [])
-
-                # Filter by product_ids if specified
                 if product_ids:
-                    products = [p for p in all_products if p.get("product_id") in product_ids]
+                    # Indexed bulk lookup - only row groups holding these IDs are read
+                    response = await client.post(
+                        f"{lakehouse_url}/products/lookup",
+                        json={
+                            "keys": list(product_ids),
+                            "key": "product_id"
+                        }
+                    )
+                    response.raise_for_status()
+                    products = response.json().get("products", [])
                 else:
-                    products = all_products
+                    # Query syndication_products table
+                    response = await client.get(
+                        f"{lakehouse_url}/delta/query/syndication_products",
+                        params={"limit": 100}
+                    )
+                    response.raise_for_status()
+                    products = response.json().get("rows", [])
 
                 logger.info(f"Retrieved {len(products)} products from syndication_products table")
                 return products
@@ -43,6 +43,12 @@ class TenderEngineMCP(BaseMCP):
     # Metadata
     description = "Tender Engine - RFP processing, bid generation, VOB/VOL compliance"
     category = "procurement"
+    routing_examples = [
+        "Analysiere diese Ausschreibung und das Leistungsverzeichnis",
+        "Draft a bid for this RFP",
+        "Welche VOB/VOL Anforderungen gelten für die Vergabe?",
+        "Which of our products match the tender positions?",
+    ]
 
     # System prompt for tender queries
     SYSTEM_PROMPT = """Du bist TENDER, ein spezialisierter KI-Assistent für Ausschreibungen und Vergabeverfahren.
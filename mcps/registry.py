@@ -38,7 +38,7 @@ Usage:
 """
 
 import logging
-from typing import Dict, List, Optional, Type
+from typing import Any, Callable, Dict, List, Optional, Type, Union
 from pathlib import Path
 import importlib.util
 
@@ -62,6 +62,24 @@ class MCPRegistry:
         self._mcps: Dict[str, BaseMCP] = {}
         self._mcp_classes: Dict[str, Type[BaseMCP]] = {}
         self._loaded_core = False
+        self._listeners: List[Callable[[str, Any], None]] = []
+
+    def add_listener(self, callback: Callable[[str, Any], None]) -> None:
+        """
+        Get notified when MCPs are installed or removed.
+
+        Args:
+            callback: Called with (mcp_id, instance or class), or
+                (mcp_id, None) when the MCP was unregistered
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, mcp_id: str, definition: Any) -> None:
+        for callback in self._listeners:
+            try:
+                callback(mcp_id, definition)
+            except Exception as e:
+                logger.error(f"Registry listener failed for '{mcp_id}': {e}")
 
     def register(self, mcp: BaseMCP) -> None:
         """
@@ -75,6 +93,7 @@ class MCPRegistry:
 
         self._mcps[mcp.name] = mcp
         logger.info(f"Registered MCP: {mcp.name} v{mcp.version}")
+        self._notify(mcp.name, mcp)
 
     def register_class(self, name: str, mcp_class: Type[BaseMCP]) -> None:
         """
@@ -86,6 +105,7 @@ class MCPRegistry:
         """
         self._mcp_classes[name] = mcp_class
         logger.debug(f"Registered MCP class: {name}")
+        self._notify(name, mcp_class)
 
     def get(self, mcp_id: str) -> Optional[BaseMCP]:
         """
@@ -124,6 +144,10 @@ class MCPRegistry:
         all_mcps = set(self._mcps.keys()) | set(self._mcp_classes.keys())
         return sorted(list(all_mcps))
 
+    def definitions(self) -> Dict[str, Union[BaseMCP, Type[BaseMCP]]]:
+        """Registered MCPs by ID: the instance if created, otherwise the class"""
+        return {**self._mcp_classes, **self._mcps}
+
     def list_core(self) -> List[str]:
         """List core MCP IDs"""
         return CORE_MCPS.copy()
@@ -150,16 +174,20 @@ class MCPRegistry:
         Returns:
             True if unregistered, False if not found
         """
+        removed = False
         if mcp_id in self._mcps:
             del self._mcps[mcp_id]
             logger.info(f"Unregistered MCP: {mcp_id}")
-            return True
+            removed = True
 
-        if mcp_id in self._mcp_classes:
+        elif mcp_id in self._mcp_classes:
             del self._mcp_classes[mcp_id]
-            return True
+            removed = True
 
-        return False
+        if removed:
+            # A registered class keeps the MCP available (lazily re-created)
+            self._notify(mcp_id, self._mcp_classes.get(mcp_id))
+        return removed
 
     def load_core_mcps(self) -> int:
         """
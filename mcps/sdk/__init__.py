@@ -26,6 +26,9 @@ from .types import ModelSpec, ModelType, MCPMetadata, TaskInput, TaskOutput, Usa
 # Decorators
 from .decorators import mcp_endpoint, requires_model, track_usage
 
+# Structured concurrency for sub-tasks
+from .concurrency import fan_out, FanOutResult, BranchResult
+
 # Legacy base class (deprecated - use base.BaseMCP)
 from .base_mcp import BaseMCP as LegacyBaseMCP
 
@@ -48,4 +51,8 @@ __all__ = [
     "mcp_endpoint",
     "requires_model",
     "track_usage",
+    # Concurrency
+    "fan_out",
+    "FanOutResult",
+    "BranchResult",
 ]
@@ -102,6 +102,7 @@ class BaseMCP(ABC):
         lora_adapter: str   - Path to LoRA adapter (.safetensors)
         description: str    - Human-readable description
         category: str       - Category (e.g., "finance", "legal")
+        routing_examples    - Typical questions (steer Platform query routing)
 
     Core Provides (just use these):
         generate()          - Text generation with your LoRA
@@ -118,6 +119,7 @@ class BaseMCP(ABC):
     lora_adapter: Optional[str] = None  # Path to .safetensors
     description: str = ""
     category: str = "general"
+    routing_examples: List[str] = []  # Typical user questions for query routing
 
     def __init__(self):
         """Initialize MCP"""
@@ -248,7 +250,10 @@ class BaseMCP(ABC):
         """
         Query customer's lakehouse using SQL.
 
-        Access Delta tables with customer's ingested data.
+        Access Delta tables with customer's ingested data. The query runs
+        in the lakehouse's embedded SQL engine: filters, ordering and the
+        limit are applied in the scan, and only this customer's rows are
+        visible.
 
         Args:
             query: SQL query
@@ -0,0 +1,151 @@
+"""
+Structured fan-out / fan-in for MCP sub-tasks
+
+Runs independent branches of an MCP task (lakehouse lookup, web research,
+competitor intel, ...) concurrently and joins them into one result. Each
+branch has its own timeout; a branch that fails or times out degrades to
+its default instead of failing the whole task, so the caller can still
+answer from whatever came back.
+
+All branches live inside the awaiting call: if the caller is cancelled,
+every branch still running is cancelled with it.
+
+Usage:
+    from mcps.sdk import fan_out
+
+    result = await fan_out(
+        {
+            "internal": lambda: self._get_internal_data(code, context),
+            "web": lambda: self._search_web(code, context),
+        },
+        timeouts={"internal": 10, "web": 45},
+        defaults={"internal": {"documents": []}, "web": {"results": []}},
+    )
+    web = result.value("web")
+    if result.degraded: ...
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+Branch = Union[Callable[[], Awaitable[Any]], Awaitable[Any]]
+
+
+@dataclass
+class BranchResult:
+    """Outcome of one branch"""
+    name: str
+    value: Any = None
+    error: Optional[str] = None
+    timed_out: bool = False
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.timed_out
+
+
+@dataclass
+class FanOutResult:
+    """Joined outcome of all branches"""
+    branches: Dict[str, BranchResult] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    def value(self, name: str, default: Any = None) -> Any:
+        """Branch value (its default if it failed or timed out)"""
+        branch = self.branches.get(name)
+        if branch is None or branch.value is None:
+            return default
+        return branch.value
+
+    @property
+    def degraded(self) -> List[str]:
+        """Names of branches that failed or timed out"""
+        return [name for name, branch in self.branches.items() if not branch.ok]
+
+    @property
+    def ok(self) -> bool:
+        return not self.degraded
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "elapsed": round(self.elapsed, 3),
+            "branches": {
+                name: {
+                    "ok": branch.ok,
+                    "elapsed": round(branch.elapsed, 3),
+                    "timed_out": branch.timed_out,
+                    "error": branch.error,
+                }
+                for name, branch in self.branches.items()
+            },
+        }
+
+
+async def _run_branch(
+    name: str,
+    branch: Branch,
+    timeout: Optional[float],
+    default: Any
+) -> BranchResult:
+    result = BranchResult(name=name, value=default)
+    start = time.perf_counter()
+    try:
+        awaitable = branch() if callable(branch) else branch
+        result.value = await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError:
+        result.timed_out = True
+        logger.warning(f"⏱️ Branch '{name}' timed out after {timeout}s - continuing without it")
+    except Exception as e:
+        result.error = str(e) or type(e).__name__
+        logger.warning(f"⚠️ Branch '{name}' failed - continuing without it: {result.error}")
+    finally:
+        result.elapsed = time.perf_counter() - start
+    return result
+
+
+async def fan_out(
+    branches: Dict[str, Branch],
+    timeout: Optional[float] = None,
+    timeouts: Optional[Dict[str, float]] = None,
+    defaults: Optional[Dict[str, Any]] = None
+) -> FanOutResult:
+    """
+    Run named branches concurrently and wait for all of them.
+
+    Args:
+        branches: name -> coroutine function (or awaitable); ``None`` entries
+            are skipped, which keeps optional branches inline at the call site
+        timeout: Default per-branch timeout in seconds (None = no limit)
+        timeouts: Per-branch overrides of ``timeout``
+        defaults: Value a branch degrades to if it fails or times out
+
+    Returns:
+        FanOutResult in the order the branches were given. Branch errors
+        never propagate; cancellation of the caller does.
+    """
+    timeouts = timeouts or {}
+    defaults = defaults or {}
+    active = {name: branch for name, branch in branches.items() if branch is not None}
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        _run_branch(name, branch, timeouts.get(name, timeout), defaults.get(name))
+        for name, branch in active.items()
+    ))
+
+    by_name = {r.name: r for r in results}
+    return FanOutResult(
+        # Skipped branches resolve to their defaults
+        branches={
+            name: by_name.get(name) or BranchResult(name=name, value=defaults.get(name))
+            for name in branches
+        },
+        elapsed=time.perf_counter() - start,
+    )
@@ -1,20 +1,47 @@
 """
 Model Manager
-Smart loading/unloading of models with LRU eviction
+Smart loading/unloading of models with cost-aware eviction
+
+Loads are tracked as per-model in-flight tasks: a request for a loaded model
+never waits, and concurrent requests for a model that is being loaded share
+one load. Only the short memory bookkeeping step (reserve, pick and unload
+victims) is serialized, not the load itself.
+
+Eviction is GreedyDual-Size-Frequency: every loaded model has a priority
+
+    H = L + uses * reload_cost / size
+
+where reload_cost is the measured load time and L is an inflation value set
+to the priority of the last victim. Large models that load quickly go first;
+small, slow-to-reload, frequently used models stay. ``eviction_policy="lru"``
+restores plain LRU.
+
+Usage patterns (which model is requested after which) drive optional
+predictive preloading into free memory - a prediction never evicts anything.
 """
 
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from collections import OrderedDict
+from collections import Counter, OrderedDict, defaultdict
 import asyncio
 import logging
+import time
 
 from mcps.sdk.types import ModelSpec
 
 logger = logging.getLogger(__name__)
 
 
+# Reload cost estimates until a model's load has been measured
+DEFAULT_LORA_LOAD_SECONDS = 2.0
+DEFAULT_LOAD_SECONDS_PER_GB = 1.5
+
+# Predictive preloading: successor share and observations needed
+DEFAULT_PRELOAD_THRESHOLD = 0.6
+DEFAULT_PRELOAD_MIN_OBSERVATIONS = 5
+
+
 @dataclass
 class LoadedModel:
     """A model currently loaded in GPU memory"""
@@ -24,6 +51,9 @@ class LoadedModel:
     memory_gb: float
     request_count: int = 0
     vllm_model_id: Optional[str] = None
+    load_seconds: float = 0.0
+    priority: float = 0.0
+    preloaded: bool = False
 
 
 class ModelManager:
@@ -32,10 +62,10 @@ class ModelManager:
 
     Strategy:
     - Load models on-demand when MCPs need them
-    - Keep frequently-used models in memory (hot models)
-    - Evict least-recently-used models when memory is full (LRU)
+    - Cache hits never wait; concurrent loads of one model coalesce
+    - Evict by GreedyDual-Size-Frequency (size, reload cost, use) when memory is full
     - Use LoRA for fast model swapping (~1-2 seconds vs ~10 seconds for full models)
-    - Track usage patterns to pre-warm popular models
+    - Track usage patterns to pre-warm the model most likely needed next
 
     Example:
         manager = ModelManager(
@@ -56,7 +86,12 @@ class ModelManager:
         vllm_url: str,
         gpu_memory_gb: float = 80.0,
         reserved_memory_gb: float = 8.0,
-        enable_lru_eviction: bool = True
+        enable_lru_eviction: bool = True,
+        eviction_policy: str = "gdsf",
+        enable_predictive_preload: bool = True,
+        preload_threshold: float = DEFAULT_PRELOAD_THRESHOLD,
+        preload_min_observations: int = DEFAULT_PRELOAD_MIN_OBSERVATIONS,
+        http_client: Optional[Any] = None
     ):
         """
         Initialize Model Manager
@@ -65,19 +100,45 @@ class ModelManager:
             vllm_url: URL of vLLM server
             gpu_memory_gb: Total GPU memory available
             reserved_memory_gb: Memory to reserve for KV cache
-            enable_lru_eviction: Enable automatic LRU eviction
+            enable_lru_eviction: Enable automatic eviction when memory is full
+            eviction_policy: "gdsf" (size/cost/frequency aware) or "lru"
+            enable_predictive_preload: Preload the likely next model into free memory
+            preload_threshold: Share of observed successors a prediction needs
+            preload_min_observations: Successor observations before predicting
+            http_client: httpx.AsyncClient for the vLLM admin API (default: one per call)
         """
+        if eviction_policy not in ("gdsf", "lru"):
+            raise ValueError(f"Unknown eviction policy: {eviction_policy}")
+
         self.vllm_url = vllm_url
         self.gpu_memory_gb = gpu_memory_gb
         self.reserved_memory_gb = reserved_memory_gb
         self.available_memory_gb = gpu_memory_gb - reserved_memory_gb
         self.enable_lru_eviction = enable_lru_eviction
+        self.eviction_policy = eviction_policy
+        self.enable_predictive_preload = enable_predictive_preload
+        self.preload_threshold = preload_threshold
+        self.preload_min_observations = preload_min_observations
+        self._client = http_client
 
-        # Loaded models (OrderedDict for LRU)
+        # Loaded models (OrderedDict keeps recency for LRU)
         self.loaded_models: OrderedDict[str, LoadedModel] = OrderedDict()
 
-        # Lock for thread-safe operations
-        self._load_lock = asyncio.Lock()
+        # Loads in progress (name → task) and the memory they hold
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._reserved: Dict[str, float] = {}
+        self._preloading: Set[str] = set()
+
+        # Serializes memory decisions (reserve/evict), never the load itself
+        self._memory_lock = asyncio.Lock()
+
+        # GreedyDual inflation value
+        self._inflation = 0.0
+
+        # Usage: specs seen and successor counts per model
+        self._specs: Dict[str, ModelSpec] = {}
+        self._transitions: Dict[str, Counter] = defaultdict(Counter)
+        self._last_requested: Optional[str] = None
 
         # Statistics
         self.stats = {
@@ -85,12 +146,16 @@ class ModelManager:
             "models_evicted": 0,
             "total_requests": 0,
             "cache_hits": 0,
-            "cache_misses": 0
+            "cache_misses": 0,
+            "coalesced_loads": 0,
+            "preloads": 0,
+            "preload_hits": 0
         }
 
         logger.info(
             f"ModelManager initialized: {self.available_memory_gb}GB available "
-            f"({gpu_memory_gb}GB total, {reserved_memory_gb}GB reserved)"
+            f"({gpu_memory_gb}GB total, {reserved_memory_gb}GB reserved, "
+            f"{eviction_policy} eviction)"
         )
 
     async def ensure_loaded(self, spec: ModelSpec) -> bool:
@@ -106,59 +171,101 @@ class ModelManager:
         Raises:
             MemoryError: If cannot free enough memory
         """
-        async with self._load_lock:
-            # Already loaded?
-            if spec.name in self.loaded_models:
-                model = self.loaded_models[spec.name]
-                model.last_used = datetime.now(timezone.utc)
-                model.request_count += 1
+        self._specs[spec.name] = spec
+        self.stats["total_requests"] += 1
+        self._record_usage(spec.name)
+
+        # Already loaded?
+        model = self.loaded_models.get(spec.name)
+        if model is not None:
+            self.stats["cache_hits"] += 1
+            if model.preloaded:
+                self.stats["preload_hits"] += 1
+                model.preloaded = False
+            self._touch(model)
+
+            logger.debug(f"Model {spec.name} already loaded (cache hit)")
+            self._maybe_preload(spec.name)
+            return True
 
-                # Move to end (most recently used)
-                self.loaded_models.move_to_end(spec.name)
+        # Being loaded? Share that load
+        task = self._inflight.get(spec.name)
+        if task is not None:
+            self.stats["coalesced_loads"] += 1
+            logger.debug(f"Model {spec.name} is loading, waiting for it")
+
+            # A preload may lose the memory race; it must not fail a real request
+            if spec.name in self._preloading:
+                try:
+                    await asyncio.shield(task)
+                except MemoryError:
+                    pass
+                task = self._inflight.get(spec.name)
+                if task is None and spec.name not in self.loaded_models:
+                    task = self._start_load(spec, allow_evict=self.enable_lru_eviction)
+        else:
+            self.stats["cache_misses"] += 1
+            task = self._start_load(spec, allow_evict=self.enable_lru_eviction)
 
-                self.stats["cache_hits"] += 1
-                self.stats["total_requests"] += 1
+        # Shielded: a cancelled caller does not cancel the load for the others
+        success = await asyncio.shield(task) if task is not None else True
 
-                logger.debug(f"Model {spec.name} already loaded (cache hit)")
-                return True
+        model = self.loaded_models.get(spec.name)
+        if success and model is not None:
+            model.preloaded = False
+            self._touch(model)
+            self._maybe_preload(spec.name)
 
-            # Not loaded - need to load
-            self.stats["cache_misses"] += 1
-            self.stats["total_requests"] += 1
+        return success
 
-            memory_needed = spec.memory_required_gb()
-            logger.info(f"Loading model {spec.name} ({memory_needed:.1f}GB)")
+    def _start_load(self, spec: ModelSpec, allow_evict: bool) -> asyncio.Task:
+        """Start loading ``spec`` and register it as the model's in-flight load"""
+        task = asyncio.create_task(self._load(spec, allow_evict))
+        self._inflight[spec.name] = task
+        return task
+
+    async def _load(self, spec: ModelSpec, allow_evict: bool) -> bool:
+        """Reserve memory (evicting if allowed), then load without holding any lock"""
+        memory_needed = spec.memory_required_gb()
 
-            # Check if we have enough memory
-            if not self._has_memory(memory_needed):
-                if not self.enable_lru_eviction:
-                    raise MemoryError(
-                        f"Insufficient GPU memory for {spec.name} "
-                        f"({memory_needed:.1f}GB needed, "
-                        f"{self._available_memory():.1f}GB free)"
+        try:
+            async with self._memory_lock:
+                if not self._has_memory(memory_needed):
+                    if not allow_evict:
+                        raise MemoryError(
+                            f"Insufficient GPU memory for {spec.name} "
+                            f"({memory_needed:.1f}GB needed, "
+                            f"{self._available_memory():.1f}GB free)"
+                        )
+
+                    # Evict lowest-priority models until we have space
+                    evicted = await self._evict_until_space(memory_needed)
+                    logger.info(
+                        f"Evicted {len(evicted)} models to load {spec.name}: "
+                        f"{', '.join(evicted)}"
                     )
 
-                # Evict LRU models until we have space
-                evicted = await self._evict_until_space(memory_needed)
-                logger.info(
-                    f"Evicted {len(evicted)} models to load {spec.name}: "
-                    f"{', '.join(evicted)}"
-                )
+                self._reserved[spec.name] = memory_needed
 
-            # Load the model
+            logger.info(f"Loading model {spec.name} ({memory_needed:.1f}GB)")
+            started = time.monotonic()
             success = await self._load_model(spec)
 
             if success:
-                self.loaded_models[spec.name] = LoadedModel(
+                now = datetime.now(timezone.utc)
+                model = LoadedModel(
                     spec=spec,
-                    loaded_at=datetime.now(timezone.utc),
-                    last_used=datetime.now(timezone.utc),
-                    memory_gb=memory_needed
+                    loaded_at=now,
+                    last_used=now,
+                    memory_gb=memory_needed,
+                    load_seconds=time.monotonic() - started
                 )
+                model.priority = self._priority(model)
+                self.loaded_models[spec.name] = model
                 self.stats["models_loaded"] += 1
 
                 logger.info(
-                    f"✓ Loaded {spec.name} "
+                    f"✓ Loaded {spec.name} in {model.load_seconds:.1f}s "
                     f"({memory_needed:.1f}GB, "
                     f"{self._memory_used():.1f}/{self.available_memory_gb:.1f}GB used, "
                     f"{len(self.loaded_models)} models loaded)"
@@ -166,6 +273,35 @@ class ModelManager:
 
             return success
 
+        finally:
+            self._reserved.pop(spec.name, None)
+            self._inflight.pop(spec.name, None)
+
+    def _touch(self, model: LoadedModel):
+        """Record a use: recency for LRU, priority refresh for GreedyDual"""
+        model.last_used = datetime.now(timezone.utc)
+        model.request_count += 1
+        model.priority = self._priority(model)
+        self.loaded_models.move_to_end(model.spec.name)
+
+    def _reload_cost(self, model: LoadedModel) -> float:
+        """Seconds to load the model again (measured, else estimated)"""
+        if model.load_seconds > 0:
+            return model.load_seconds
+        if model.spec.lora_adapter:
+            return DEFAULT_LORA_LOAD_SECONDS
+        return model.spec.size_gb * DEFAULT_LOAD_SECONDS_PER_GB
+
+    def _priority(self, model: LoadedModel) -> float:
+        """GreedyDual-Size-Frequency priority (lowest is evicted first)"""
+        uses = max(model.request_count, 1)
+        return self._inflation + uses * self._reload_cost(model) / max(model.memory_gb, 0.1)
+
+    def _select_victim(self) -> str:
+        if self.eviction_policy == "lru":
+            return next(iter(self.loaded_models))
+        return min(self.loaded_models.values(), key=lambda m: m.priority).spec.name
+
     def _has_memory(self, required_gb: float) -> bool:
         """Check if we have enough GPU memory"""
         available = self._available_memory()
@@ -177,12 +313,15 @@ class ModelManager:
         return self.available_memory_gb - used
 
     def _memory_used(self) -> float:
-        """Total GPU memory used by loaded models"""
-        return sum(m.memory_gb for m in self.loaded_models.values())
+        """GPU memory used by loaded models and held by loads in progress"""
+        return (
+            sum(m.memory_gb for m in self.loaded_models.values())
+            + sum(self._reserved.values())
+        )
 
     async def _evict_until_space(self, required_gb: float) -> List[str]:
         """
-        Evict LRU models until we have enough space
+        Evict models until we have enough space
 
         Args:
             required_gb: Memory needed
@@ -190,27 +329,46 @@ class ModelManager:
         Returns:
             List of evicted model names
 
+        In-flight preloads are waited out before giving up.
+
         Raises:
             MemoryError: If cannot free enough space
         """
         evicted = []
 
-        while not self._has_memory(required_gb) and self.loaded_models:
-            # Get least recently used (first in OrderedDict)
-            lru_name = next(iter(self.loaded_models))
-            lru_model = self.loaded_models[lru_name]
-
-            # Unload
-            await self._unload_model(lru_model.spec)
-            del self.loaded_models[lru_name]
-
-            evicted.append(lru_name)
+        while not self._has_memory(required_gb):
+            if not self.loaded_models:
+                # Preloads hold reservations that cannot be evicted mid-load:
+                # let them land (they need no lock to finish), then they are
+                # ordinary loaded models and can go like any other
+                preloads = [
+                    self._inflight[name] for name in self._preloading
+                    if name in self._reserved and name in self._inflight
+                ]
+                if not preloads:
+                    break
+                await asyncio.wait(preloads)
+                continue
+
+            victim_name = self._select_victim()
+            victim = self.loaded_models[victim_name]
+
+            # Drop it from the cache first: hits don't lock, so none may be
+            # served from a model whose weights are being freed
+            del self.loaded_models[victim_name]
+            await self._unload_model(victim.spec)
+
+            if self.eviction_policy == "gdsf":
+                self._inflation = victim.priority
+
+            evicted.append(victim_name)
             self.stats["models_evicted"] += 1
 
             logger.info(
-                f"Evicted LRU model: {lru_name} "
-                f"(loaded {lru_model.loaded_at.isoformat()}, "
-                f"used {lru_model.request_count} times)"
+                f"Evicted model: {victim_name} "
+                f"(loaded {victim.loaded_at.isoformat()}, "
+                f"used {victim.request_count} times, "
+                f"priority {victim.priority:.2f})"
             )
 
         # Check if we have enough space now
@@ -222,6 +380,77 @@ class ModelManager:
 
         return evicted
 
+    # =========================================================================
+    # PREDICTIVE PRELOADING
+    # =========================================================================
+
+    def _record_usage(self, name: str):
+        """Count ``name`` as the successor of the previously requested model"""
+        if self._last_requested is not None and self._last_requested != name:
+            self._transitions[self._last_requested][name] += 1
+        self._last_requested = name
+
+    def predict_next(self, name: str) -> Optional[str]:
+        """
+        Model most likely requested after ``name``, if the usage history is
+        confident enough
+        """
+        successors = self._transitions.get(name)
+        if not successors:
+            return None
+
+        total = sum(successors.values())
+        candidate, count = successors.most_common(1)[0]
+        if total < self.preload_min_observations or count / total < self.preload_threshold:
+            return None
+        return candidate
+
+    def _maybe_preload(self, name: str):
+        """Start loading the predicted next model if it fits in free memory"""
+        if not self.enable_predictive_preload:
+            return
+
+        candidate = self.predict_next(name)
+        if candidate is None or candidate in self.loaded_models or candidate in self._inflight:
+            return
+
+        spec = self._specs.get(candidate)
+        if spec is None or not self._has_memory(spec.memory_required_gb()):
+            return
+
+        logger.info(f"Preloading {candidate} (usually requested after {name})")
+        self.stats["preloads"] += 1
+        self._preloading.add(candidate)
+        task = self._start_load(spec, allow_evict=False)
+        task.add_done_callback(lambda t: self._preload_done(candidate, t))
+
+    def _preload_done(self, name: str, task: asyncio.Task):
+        self._preloading.discard(name)
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.debug(f"Preload of {name} skipped: {task.exception()}")
+            return
+        model = self.loaded_models.get(name)
+        if task.result() and model is not None and model.request_count == 0:
+            model.preloaded = True
+
+    # =========================================================================
+    # vLLM ADMIN API
+    # =========================================================================
+
+    async def _post(self, path: str, payload: Dict[str, Any], timeout: float):
+        """POST to the vLLM admin API and raise on HTTP errors"""
+        import httpx
+
+        if self._client is not None:
+            response = await self._client.post(f"{self.vllm_url}{path}", json=payload, timeout=timeout)
+        else:
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                response = await client.post(f"{self.vllm_url}{path}", json=payload)
+        response.raise_for_status()
+        return response
+
     async def _load_model(self, spec: ModelSpec) -> bool:
         """
         Load a model into vLLM
@@ -250,50 +479,38 @@ class ModelManager:
 
     async def _load_lora(self, spec: ModelSpec):
         """Load LoRA adapter (fast path)"""
-        import httpx
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{self.vllm_url}/v1/lora/load",
-                json={
-                    "lora_name": spec.name,
-                    "lora_path": spec.lora_adapter,
-                    "base_model": spec.base_model
-                }
-            )
-            response.raise_for_status()
+        await self._post(
+            "/v1/lora/load",
+            {
+                "lora_name": spec.name,
+                "lora_path": spec.lora_adapter,
+                "base_model": spec.base_model
+            },
+            timeout=30.0
+        )
 
-            logger.debug(f"LoRA {spec.name} loaded successfully")
+        logger.debug(f"LoRA {spec.name} loaded successfully")
 
     async def _load_full_model(self, spec: ModelSpec):
         """Load full model (slower path)"""
-        import httpx
-
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                f"{self.vllm_url}/v1/models/load",
-                json={
-                    "model_name": spec.name,
-                    "model_path": spec.file_path,
-                    "quantization": spec.quantization,
-                    "gpu_memory_utilization": 0.9,
-                    "max_model_len": spec.context_length
-                }
-            )
-            response.raise_for_status()
+        await self._post(
+            "/v1/models/load",
+            {
+                "model_name": spec.name,
+                "model_path": spec.file_path,
+                "quantization": spec.quantization,
+                "gpu_memory_utilization": 0.9,
+                "max_model_len": spec.context_length
+            },
+            timeout=120.0
+        )
 
-            logger.debug(f"Model {spec.name} loaded successfully")
+        logger.debug(f"Model {spec.name} loaded successfully")
 
     async def _unload_model(self, spec: ModelSpec):
         """Unload a model to free GPU memory"""
-        import httpx
-
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                await client.post(
-                    f"{self.vllm_url}/v1/models/unload",
-                    json={"model_name": spec.name}
-                )
+            await self._post("/v1/models/unload", {"model_name": spec.name}, timeout=30.0)
 
             logger.debug(f"Model {spec.name} unloaded")
 
@@ -315,7 +532,11 @@ class ModelManager:
                 "requests": model.request_count,
                 "loaded_at": model.loaded_at.isoformat(),
                 "last_used": model.last_used.isoformat(),
-                "is_lora": model.spec.lora_adapter is not None
+                "is_lora": model.spec.lora_adapter is not None,
+                "load_seconds": round(model.load_seconds, 3),
+                "priority": round(model.priority, 3),
+                "preloaded": model.preloaded,
+                "predicted_next": self.predict_next(name)
             })
 
         return {
@@ -328,8 +549,10 @@ class ModelManager:
             },
             "models": {
                 "loaded": len(self.loaded_models),
+                "loading": sorted(self._inflight),
                 "details": models_info
             },
+            "eviction_policy": self.eviction_policy,
             "stats": self.stats,
             "cache_hit_rate": (
                 self.stats["cache_hits"] / self.stats["total_requests"] * 100
@@ -343,8 +566,13 @@ class ModelManager:
         logger.info(f"Pre-loading {len(specs)} models...")
 
         for spec in specs:
+            self._specs[spec.name] = spec
+            if spec.name in self.loaded_models:
+                continue
             try:
-                await self.ensure_loaded(spec)
+                task = self._inflight.get(spec.name) or \
+                    self._start_load(spec, allow_evict=self.enable_lru_eviction)
+                await asyncio.shield(task)
             except Exception as e:
                 logger.warning(f"Failed to preload {spec.name}: {e}")
 
@@ -352,9 +580,13 @@ class ModelManager:
         """Shutdown and cleanup"""
         logger.info("Shutting down ModelManager...")
 
+        # Let loads in progress finish so their models get unloaded too
+        if self._inflight:
+            await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+
         # Unload all models
-        for spec in list(self.loaded_models.values()):
-            await self._unload_model(spec.spec)
+        for model in list(self.loaded_models.values()):
+            await self._unload_model(model.spec)
 
         self.loaded_models.clear()
         logger.info("ModelManager shutdown complete")
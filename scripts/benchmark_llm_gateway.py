@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark the ingestion LLM gateway against a local stub of the Messages API.
+
+The stub answers POST /v1/messages after a fixed latency and returns 429 for
+a fraction of requests, so concurrency, rate limiting and retries can be
+measured without spending tokens.
+
+Usage:
+    python scripts/benchmark_llm_gateway.py --requests 500 --latency 0.4 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ingestion.llm_gateway import LLMGateway
+
+
+def start_stub(port: int, latency: float, error_rate: float):
+    """Serve a minimal /v1/messages stub in a background thread."""
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(latency)
+
+            if random.random() < error_rate:
+                status, payload = 429, {
+                    "type": "error",
+                    "error": {"type": "rate_limit_error", "message": "stub"}
+                }
+            else:
+                status, payload = 200, {
+                    "id": "msg_stub",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": body["model"],
+                    "content": [{"type": "text", "text": '{"category": "general"}'}],
+                    "stop_reason": "end_turn",
+                    "stop_sequence": None,
+                    "usage": {"input_tokens": 10, "output_tokens": 5},
+                }
+
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+
+async def run(args):
+    gateway = LLMGateway(
+        api_key="stub",
+        base_url=f"http://127.0.0.1:{args.port}",
+        max_concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+        base_backoff=0.1
+    )
+
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        # Every 10th prompt repeats, to exercise coalescing
+        gateway.complete(f"Classify document {i % max(1, args.requests - args.requests // 10)}",
+                         model="claude-haiku-3-5-20250514", max_tokens=50)
+        for i in range(args.requests)
+    ])
+    elapsed = time.perf_counter() - started
+
+    serial = args.requests * args.latency
+    print(f"{args.requests} requests in {elapsed:.2f}s ({args.requests / elapsed:.1f} req/s)")
+    print(f"Serial baseline would take ~{serial:.1f}s ({serial / elapsed:.1f}x slower)")
+    print(f"Gateway metrics: {gateway.get_metrics()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the LLM gateway against a local stub")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.3, help="Stub latency per request (s)")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Fraction of 429 responses")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rpm", type=float, default=6000, help="Requests per minute limit")
+    parser.add_argument("--port", type=int, default=8799)
+    args = parser.parse_args()
+
+    start_stub(args.port, args.latency, args.error_rate)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -27,6 +27,7 @@ def create_master_json(product_id: str, lakehouse_path: Path, output_path: Path
     import lancedb
     import pandas as pd
     from deltalake import DeltaTable
+    from lakehouse.vector.chunk_text import attach_chunk_text
 
     print(f"Creating Master JSON for: {product_id}")
     print("="*70)
@@ -110,8 +111,10 @@ def create_master_json(product_id: str, lakehouse_path: Path, output_path: Path
         lance_path = lakehouse_path / "lance"
         db = lancedb.connect(str(lance_path))
         table = db.open_table('embeddings')
-
-        df = table.to_pandas()
+        columns = [c for c in table.schema.names if c != 'vector']
+        chunks = table.to_lance().to_table(columns=columns)
+        # Tables stored without text reference the Delta chunk tables
+        df = attach_chunk_text(chunks, lakehouse_path / "delta").to_pandas()
 
         # Search for product mentions
         import pandas as pd
@@ -0,0 +1,214 @@
+"""
+Object Storage Tests
+
+Tests for on-the-fly hashing, the streaming MinIO uploader and the
+concurrent downloader that feeds ingestion.
+"""
+
+import asyncio
+import hashlib
+import io
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+
+PART = 5 * 1024 * 1024
+
+
+def _s3_etag(data: bytes, part_size: int = PART) -> str:
+    """ETag S3 assigns: md5 for a single PUT, md5-of-part-md5s for multipart"""
+    if len(data) <= part_size:
+        return hashlib.md5(data).hexdigest()
+    parts = [hashlib.md5(data[i:i + part_size]).digest() for i in range(0, len(data), part_size)]
+    return f"{hashlib.md5(b''.join(parts)).hexdigest()}-{len(parts)}"
+
+
+class _RecordingClient:
+    """Consumes put_object streams part by part, like the MinIO client does"""
+
+    def __init__(self):
+        self.objects = {}
+        self.metadata = {}
+        self.threads = set()
+
+    def put_object(self, bucket_name, object_name, data, length, part_size, **kwargs):
+        self.threads.add(threading.current_thread().name)
+        body = b""
+        while chunk := data.read(part_size):
+            body += chunk
+        self.objects[object_name] = body
+        return SimpleNamespace(etag=f'"{_s3_etag(body, part_size)}"')
+
+    def copy_object(self, bucket_name, object_name, source, sse=None, metadata=None, tags=None,
+                    retention=None, legal_hold=False, metadata_directive=None, tagging_directive=None):
+        self.metadata[object_name] = (metadata, metadata_directive)
+
+
+class TestHashingReader:
+    """Tests for HashingReader."""
+
+    @pytest.mark.parametrize("size", [0, 100, PART, PART + 1, 3 * PART - 7])
+    def test_expected_etag_matches_s3(self, size):
+        from api.utils.object_storage import HashingReader
+
+        data = bytes(range(256)) * (size // 256) + b"x" * (size % 256)
+        reader = HashingReader(io.BytesIO(data), PART)
+        while reader.read(1024 * 1024):
+            pass
+
+        assert reader.expected_etag == _s3_etag(data)
+        assert reader.sha256 == hashlib.sha256(data).hexdigest()
+        assert reader.bytes_read == size
+
+
+class TestStreamingUploader:
+    """Tests for StreamingUploader."""
+
+    @pytest.mark.asyncio
+    async def test_upload_streams_off_the_event_loop_and_verifies(self):
+        from api.utils.object_storage import StreamingUploader
+
+        client = _RecordingClient()
+        uploader = StreamingUploader(client, part_size=PART)
+        data = b"catalog" * (PART // 3)
+
+        info = await uploader.upload(io.BytesIO(data), "bucket", "catalog.csv")
+
+        assert client.objects["catalog.csv"] == data
+        assert info["size"] == len(data)
+        assert info["sha256"] == hashlib.sha256(data).hexdigest()
+        assert info["verified"] is True
+        assert threading.main_thread().name not in client.threads
+        assert client.metadata["catalog.csv"] == (
+            {"sha256": info["sha256"], "Content-Type": "application/octet-stream"}, "REPLACE"
+        )
+
+    @pytest.mark.asyncio
+    async def test_concurrent_files_are_bounded(self):
+        from api.utils.object_storage import StreamingUploader
+
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        class _SlowClient(_RecordingClient):
+            def put_object(self, *args, **kwargs):
+                nonlocal active, peak
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                threading.Event().wait(0.02)
+                try:
+                    return super().put_object(*args, **kwargs)
+                finally:
+                    with lock:
+                        active -= 1
+
+        uploader = StreamingUploader(_SlowClient(), part_size=PART, max_concurrent_files=2)
+        await asyncio.gather(*(uploader.upload(io.BytesIO(b"x"), "b", f"{i}") for i in range(6)))
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_known_hashes_reads_object_metadata(self):
+        from api.utils.object_storage import StreamingUploader
+
+        client = SimpleNamespace(list_objects=lambda **kwargs: [
+            SimpleNamespace(object_name="a.pdf", metadata={"X-Amz-Meta-Sha256": "abc"}),
+            SimpleNamespace(object_name="b.pdf", metadata=None),
+        ])
+
+        assert await StreamingUploader(client).known_hashes("bucket") == {"abc": "a.pdf"}
+
+
+def _listed(name, etag="e1", size=10):
+    return SimpleNamespace(object_name=name, etag=etag, size=size)
+
+
+class _DownloadClient:
+    """fget_object that takes longer for earlier objects and fails on demand"""
+
+    def __init__(self, delays, fail=()):
+        self.delays = delays
+        self.fail = set(fail)
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def fget_object(self, bucket_name, object_name, file_path):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            threading.Event().wait(self.delays.get(object_name, 0.01))
+            if object_name in self.fail:
+                raise OSError("connection reset")
+            with open(file_path, "w") as f:
+                f.write(object_name)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class TestObjectDownloader:
+    """Tests for ObjectDownloader, select_changed() and staging_lock()."""
+
+    def test_select_changed_skips_ingested_etags(self, temp_dir):
+        from api.utils.object_storage import select_changed
+
+        objects = [_listed("a.pdf", "e1"), _listed("b.pdf", "e2"), _listed("c.pdf"), _listed("dir/")]
+        ingested = {str(temp_dir.resolve() / "a.pdf"): "e1", str(temp_dir.resolve() / "b.pdf"): "old"}
+
+        changed, unchanged = select_changed(objects, ingested, temp_dir)
+
+        assert [o.object_name for o in changed] == ["b.pdf", "c.pdf"]
+        assert [o.object_name for o in unchanged] == ["a.pdf"]
+
+    @pytest.mark.asyncio
+    async def test_yields_in_completion_order_with_bounded_workers(self, temp_dir):
+        from api.utils.object_storage import ObjectDownloader
+
+        client = _DownloadClient({"slow.pdf": 0.2})
+        objects = [_listed("slow.pdf")] + [_listed(f"sub/{i}.pdf") for i in range(5)]
+        downloader = ObjectDownloader(client, workers=3)
+
+        names = [item.object_name async for item in downloader.download("b", objects, temp_dir)]
+
+        assert names[-1] == "slow.pdf"  # Others were handed over before it finished
+        assert sorted(names) == sorted(o.object_name for o in objects)
+        assert client.peak <= 3
+        assert (temp_dir / "sub" / "0.pdf").read_text() == "sub/0.pdf"
+
+    @pytest.mark.asyncio
+    async def test_failed_and_unsafe_objects_are_skipped(self, temp_dir):
+        from api.utils.object_storage import ObjectDownloader
+
+        downloader = ObjectDownloader(_DownloadClient({}, fail={"bad.pdf"}))
+        objects = [_listed("ok.pdf"), _listed("bad.pdf"), _listed("../escape.pdf")]
+
+        names = [item.object_name async for item in downloader.download("b", objects, temp_dir / "dl")]
+
+        assert names == ["ok.pdf"]
+        assert sorted(name for name, _ in downloader.failed) == ["../escape.pdf", "bad.pdf"]
+        assert not (temp_dir / "escape.pdf").exists()
+
+    @pytest.mark.asyncio
+    async def test_staging_lock_serializes_runs(self, temp_dir):
+        from api.utils.object_storage import staging_lock
+
+        staging_dir = temp_dir / "staging" / "uploads"
+        order = []
+
+        async def run(name):
+            async with staging_lock(staging_dir, poll_seconds=0.01):
+                order.append(f"{name}:start")
+                await asyncio.sleep(0.05)
+                order.append(f"{name}:end")
+
+        await asyncio.gather(run("a"), run("b"))
+
+        assert order in (["a:start", "a:end", "b:start", "b:end"], ["b:start", "b:end", "a:start", "a:end"])
+        assert (temp_dir / "staging" / "uploads.lock").exists()
+
@@ -0,0 +1,226 @@
+"""
+Product Matching Tests
+
+Tests for the BM25 inverted index, vectorized requirement matching and
+the per-version matcher cache (against a mock lakehouse API).
+"""
+
+import asyncio
+
+import httpx
+import numpy as np
+import pytest
+
+
+CATALOG = [
+    {"supplier_pid": "5SC1000", "product_name": "Eaton 5SC UPS", "short_description": "Line-interactive UPS tower",
+     "keyword": "unterbrechungsfreie stromversorgung", "etim_class": "EC000352", "price": "420.00"},
+    {"supplier_pid": "LED-200", "product_name": "Panel light", "short_description": "Recessed LED panel 4000K",
+     "keyword": "beleuchtung", "etim_class": "EC001744"},
+    {"supplier_pid": "CAB-1", "product_name": "Power cable", "short_description": "Cable 3x2.5 copper",
+     "keyword": "kabel", "etim_class": "EC000000"},
+    {"supplier_pid": "RCD-40", "product_name": "Residual current device", "short_description": "RCD 40A 30mA",
+     "keyword": "fehlerstromschutzschalter", "etim_class": "EC000003"},
+]
+
+
+class TestProductIndex:
+    """Tests for BM25 scoring and match()."""
+
+    def test_bm25_ranks_matching_product_first(self):
+        from core.product_matching import ProductIndex
+
+        index = ProductIndex(CATALOG)
+        scores = index.bm25(["Unterbrechungsfreie Stromversorgung gefordert", "Kabel aus Kupfer"])
+
+        assert scores.shape == (2, len(CATALOG))
+        assert scores[0].argmax() == 0
+        assert scores[1].argmax() == 2
+        assert scores.max() <= 1.0
+        assert scores[0, 1] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_match_confidence_and_reasons(self):
+        from core.product_matching import ProductIndex
+
+        index = ProductIndex(CATALOG)
+        matches = await index.match(
+            muss=["Unterbrechungsfreie Stromversorgung", "Fehlerstromschutzschalter 30mA"],
+            soll=["Recessed panel beleuchtung"]
+        )
+        by_pid = {index.products[m.index]["supplier_pid"]: m for m in matches}
+
+        assert by_pid["5SC1000"].confidence == pytest.approx(0.8)  # ETIM + Muss + UPS
+        assert by_pid["RCD-40"].confidence == pytest.approx(0.7)  # ETIM + Muss
+        assert by_pid["LED-200"].confidence == pytest.approx(0.6)  # ETIM + Soll + Lighting
+        assert "CAB-1" not in by_pid  # No ETIM, no requirement met
+        assert [index.products[m.index]["supplier_pid"] for m in matches] == ["5SC1000", "RCD-40", "LED-200"]
+        assert by_pid["RCD-40"].reasons == ["ETIM: EC000003", "Muss: Fehlerstromschutzschalter 30mA"]
+
+    @pytest.mark.asyncio
+    async def test_any_word_hit_meets_requirement(self):
+        from core.product_matching import ProductIndex
+
+        index = ProductIndex(CATALOG)
+        matches = await index.match(
+            # Part of a compound, a long requirement with one shared word, punctuation
+            muss=["Schutzschalter", "Angebot inkl. Lieferung, Montage und Kabel nach Norm"],
+            soll=["Leistung 30ma,"]
+        )
+        by_pid = {index.products[m.index]["supplier_pid"]: m for m in matches}
+
+        assert by_pid["RCD-40"].reasons == ["ETIM: EC000003", "Muss: Schutzschalter", "Soll: Leistung 30ma,"]
+        assert "CAB-1" not in by_pid  # Muss 0.4 + nothing else < 0.5
+        assert index.keyword_hits(["Kabel nach Norm"]).tolist() == [[False, False, True, False]]
+        assert index.keyword_hits(["ups,"]).tolist() == [[False, False, False, False]]
+
+    @pytest.mark.asyncio
+    async def test_blocks_give_same_result(self):
+        from core.product_matching import ProductIndex
+
+        index = ProductIndex(CATALOG)
+        muss = ["stromversorgung", "kabel", "fehlerstromschutzschalter", "beleuchtung", "copper cable"]
+
+        whole = await index.match(muss, [], block_size=64)
+        blocked = await index.match(muss, [], block_size=2)
+
+        assert [(m.index, m.confidence, m.reasons) for m in whole] == \
+            [(m.index, m.confidence, m.reasons) for m in blocked]
+
+    @pytest.mark.asyncio
+    async def test_embeddings_match_without_shared_terms(self):
+        from core.product_matching import ProductIndex
+
+        # Axis 0 = power, axis 1 = light, axis 2 = cable, axis 3 = protection
+        axes = {"ups": 0, "batterie": 0, "light": 1, "leuchte": 1, "cable": 2, "rcd": 3}
+
+        async def embed(texts):
+            vectors = []
+            for text in texts:
+                v = np.full(4, 0.05)
+                for word, axis in axes.items():
+                    if word in text.lower():
+                        v[axis] += 1
+                vectors.append(v.tolist())
+            return vectors
+
+        index = ProductIndex(CATALOG)
+        await index.embed(embed, batch_size=2)
+
+        lexical = await index.match(muss=["Batteriegepufferte Notstromanlage"], soll=[])
+        hybrid = await index.match(muss=["Batteriegepufferte Notstromanlage"], soll=[], embed=embed)
+
+        assert all("Muss" not in " ".join(m.reasons) for m in lexical)
+        assert index.products[hybrid[0].index]["supplier_pid"] == "5SC1000"
+        assert "Muss: Batteriegepufferte Notstromanl" in hybrid[0].reasons
+
+    @pytest.mark.asyncio
+    async def test_unrelated_embeddings_meet_nothing(self):
+        from core.product_matching import ProductIndex
+
+        rng = np.random.default_rng(0)
+        # ETIM 0.3 alone is below MIN_CONFIDENCE; a met Muss would surface the product
+        catalog = [
+            {"supplier_pid": f"P{i}", "product_name": f"Artikel {i}", "etim_class": "EC000352"}
+            for i in range(300)
+        ]
+        requirements = [f"Anforderung{i}" for i in range(60)]
+
+        async def embed(texts):
+            return rng.normal(size=(len(texts), 64)).tolist()
+
+        index = ProductIndex(catalog)
+        await index.embed(embed)
+        matches = await index.match(muss=requirements, soll=[], embed=embed)
+
+        # Each requirement still has a top-ranked product, but none is related
+        assert index.similarity(np.asarray(await embed(requirements))).max() == pytest.approx(1.0)
+        assert matches == []
+
+    @pytest.mark.asyncio
+    async def test_embedding_failure_falls_back_to_bm25(self):
+        from core.product_matching import ProductIndex
+
+        async def embed(texts):
+            if len(texts) == 1:
+                raise httpx.ConnectError("embeddings down")
+            return [[1.0, float(i)] for i in range(len(texts))]
+
+        index = ProductIndex(CATALOG)
+        await index.embed(embed)
+        matches = await index.match(muss=["stromversorgung"], soll=[], embed=embed)
+
+        assert index.products[matches[0].index]["supplier_pid"] == "5SC1000"
+
+
+class TestMatcherCache:
+    """Tests for catalog fetching and the per-version cache."""
+
+    def _lakehouse(self, state):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/products/version":
+                return httpx.Response(200, json={"table": "products", "version": state["version"]})
+            state["pages"] += 1
+            cursor = request.url.params.get("cursor")
+            start = int(cursor) if cursor else 0
+            limit = int(request.url.params["limit"])
+            page = CATALOG[start:start + limit]
+            next_cursor = str(start + limit) if start + limit < len(CATALOG) else None
+            return httpx.Response(200, json={"products": page, "next_cursor": next_cursor})
+
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="http://lakehouse")
+
+    @pytest.mark.asyncio
+    async def test_fetch_catalog_follows_cursor(self):
+        from core.product_matching import fetch_catalog
+
+        state = {"version": 3, "pages": 0}
+        async with self._lakehouse(state) as client:
+            products = await fetch_catalog(client, "http://lakehouse", page_size=3)
+
+        assert [p["supplier_pid"] for p in products] == [p["supplier_pid"] for p in CATALOG]
+        assert state["pages"] == 2
+
+    @pytest.mark.asyncio
+    async def test_index_rebuilt_only_on_new_version(self):
+        from core.product_matching import MatcherCache, ProductIndex, catalog_version, fetch_catalog
+
+        state = {"version": 3, "pages": 0}
+        cache = MatcherCache()
+
+        async def get(client):
+            version = await catalog_version(client, "http://lakehouse")
+
+            async def build():
+                return ProductIndex(await fetch_catalog(client, "http://lakehouse"), version=version)
+
+            return await cache.get("eaton", version, build)
+
+        async with self._lakehouse(state) as client:
+            first, second = await asyncio.gather(get(client), get(client))
+            assert first is second
+            assert cache.builds == 1
+
+            state["version"] = 4
+            third = await get(client)
+
+        assert third is not first
+        assert third.version == 4
+        assert cache.builds == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_version_uses_ttl(self):
+        from core.product_matching import MatcherCache, ProductIndex
+
+        async def build():
+            return ProductIndex(CATALOG, version=None)
+
+        cache = MatcherCache()
+        first = await cache.get("eaton", None, build)
+        assert await cache.get("eaton", None, build) is first
+        assert cache.builds == 1
+
+        expired = MatcherCache(unknown_version_ttl=0.0)
+        await expired.get("eaton", None, build)
+        await expired.get("eaton", None, build)
+        assert expired.builds == 2
@@ -0,0 +1,132 @@
+"""
+Context Retrieval Tests
+
+Tests for re-ranking, token-budget packing and the retrieval flow
+(against a mock embeddings service and lakehouse API).
+"""
+
+import json
+
+import httpx
+import pytest
+
+
+def _chunk(filename, text, chunk_index=0):
+    from core.retrieval import RetrievedChunk
+
+    return RetrievedChunk(filename=filename, text=text, chunk_index=chunk_index)
+
+
+class TestRerankAndPack:
+    """Tests for rerank() and pack()."""
+
+    def test_keyword_overlap_lifts_exact_matches(self):
+        from core.retrieval import rerank
+
+        chunks = [
+            _chunk("a.pdf", "general catalogue introduction"),
+            _chunk("b.pdf", "unrelated text about shipping"),
+            _chunk("c.pdf", "datasheet for SKU 5SY6106 circuit breaker"),
+        ]
+        ranked = rerank("specs of 5sy6106", chunks)
+
+        assert ranked[0].filename == "c.pdf"
+
+    def test_pack_respects_budget_and_document_cap(self):
+        from core.retrieval import pack
+
+        chunks = [_chunk("a.pdf", "x" * 400, i) for i in range(5)]  # 100 tokens each
+        chunks += [_chunk("b.pdf", "y" * 400)]
+
+        packed = pack(chunks, token_budget=350, max_chunks_per_document=2)
+
+        assert [c.filename for c in packed] == ["a.pdf", "a.pdf", "b.pdf"]
+        assert sum(c.tokens for c in packed) <= 350
+
+    def test_pack_truncates_oversized_first_chunk(self):
+        from core.retrieval import pack
+
+        packed = pack([_chunk("a.pdf", "x" * 10_000)], token_budget=100, max_chunks_per_document=3)
+
+        assert len(packed) == 1
+        assert packed[0].tokens <= 100
+
+    def test_as_documents_groups_chunks_in_document_order(self):
+        from core.retrieval import RetrievalResult
+
+        result = RetrievalResult(chunks=[
+            _chunk("a.pdf", "second", 4),
+            _chunk("b.pdf", "other", 0),
+            _chunk("a.pdf", "first", 1),
+        ])
+        documents = result.as_documents()
+
+        assert [d["filename"] for d in documents] == ["a.pdf", "b.pdf"]
+        assert documents[0]["text"] == "first\n\n[...]\n\nsecond"
+        assert documents[0]["chunk_indices"] == [1, 4]
+
+
+class TestContextRetriever:
+    """Tests for ContextRetriever.retrieve()."""
+
+    def _retriever(self, results_by_filter, **kwargs):
+        from core.retrieval import ContextRetriever
+
+        requests = []
+
+        def handler(request: httpx.Request):
+            body = json.loads(request.content)
+            requests.append((request.url.path, body))
+            if request.url.path == "/v1/embeddings":
+                return httpx.Response(200, json={"data": [{"embedding": [0.1, 0.2]}]})
+            key = tuple(body["mcp_filter"]) if body["mcp_filter"] else None
+            return httpx.Response(200, json={"results": results_by_filter.get(key, [])})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return ContextRetriever(client=client, **kwargs), requests
+
+    @pytest.mark.asyncio
+    async def test_embeds_searches_with_mcp_filter_and_packs(self):
+        rows = [
+            {"filename": "ust.pdf", "text": "Umsatzsteuer Q4 " * 10, "mcp": "tax", "chunk_index": i, "score": 0.1 * i}
+            for i in range(4)
+        ]
+        retriever, requests = self._retriever({("ctax", "tax", "general"): rows}, max_chunks_per_document=2)
+
+        result = await retriever.retrieve("Umsatzsteuer Q4?", "http://lh", "http://emb", mcp="ctax")
+
+        assert [path for path, _ in requests] == ["/v1/embeddings", "/lance/search"]
+        assert requests[1][1]["vector"] == [0.1, 0.2]
+        assert result.filtered is True
+        assert result.candidates == 4
+        assert len(result.chunks) == 2
+        assert result.query_vector == [0.1, 0.2]
+
+    @pytest.mark.asyncio
+    async def test_widens_search_when_filter_finds_too_little(self):
+        rows = [{"filename": f"{i}.pdf", "text": "text", "mcp": "products", "chunk_index": 0} for i in range(5)]
+        retriever, requests = self._retriever({None: rows})
+
+        result = await retriever.retrieve("question", "http://lh", "http://emb", mcp="law")
+
+        assert len([p for p, _ in requests if p == "/lance/search"]) == 2
+        assert result.filtered is False
+        assert len(result.chunks) == 5
+
+    @pytest.mark.asyncio
+    async def test_reuses_precomputed_query_vector(self):
+        retriever, requests = self._retriever({})
+
+        await retriever.retrieve("question", "http://lh", "http://emb", query_vector=[1.0])
+
+        assert [path for path, _ in requests] == ["/lance/search"]
+
+    @pytest.mark.asyncio
+    async def test_failure_returns_empty_result(self):
+        from core.retrieval import ContextRetriever
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(503)))
+        result = await ContextRetriever(client=client).retrieve("q", "http://lh", "http://emb")
+
+        assert result.chunks == []
+        assert result.error
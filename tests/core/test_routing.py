@@ -0,0 +1,182 @@
+"""
+Query Routing Tests
+
+Tests for the embedding-centroid router and its registry integration.
+"""
+
+import pytest
+
+
+TOPICS = ["steuer", "vertrag", "wettbewerb", "listing"]
+
+
+class _FakeEmbedder:
+    """Embeds text as topic-keyword counts (one dimension per topic, plus a bias)"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [
+            [float(t.lower().count(topic)) for topic in TOPICS] + [0.1]
+            for t in texts
+        ]
+
+
+def _mcp_class(mcp_name, mcp_description, examples=()):
+    from mcps.sdk.base import BaseMCP
+
+    class _MCP(BaseMCP):
+        name = mcp_name
+        version = "1.0.0"
+        description = mcp_description
+        routing_examples = list(examples)
+
+        async def process(self, input, context=None):
+            return input
+
+    return _MCP
+
+
+def _registry():
+    from mcps.registry import MCPRegistry
+
+    registry = MCPRegistry()
+    registry.register_class("ctax", _mcp_class("ctax", "Steuer engine", ["Steuer Frage"]))
+    registry.register_class("law", _mcp_class("law", "Vertrag analysis", ["Vertrag prüfen"]))
+    return registry
+
+
+class TestEmbeddingRouter:
+    """Tests for EmbeddingRouter."""
+
+    @pytest.mark.asyncio
+    async def test_routes_to_closest_centroid(self):
+        from core.routing import EmbeddingRouter
+
+        router = EmbeddingRouter(min_similarity=0.5)
+        router.attach(_registry())
+        embed = _FakeEmbedder()
+
+        decision = await router.route("Wie hoch ist die Steuer?", embed)
+
+        assert decision.mcp == "ctax"
+        assert decision.scores["ctax"] > decision.scores["law"]
+        assert len(decision.query_vector) == len(TOPICS) + 1
+
+    @pytest.mark.asyncio
+    async def test_profiles_embedded_once_in_one_batch(self):
+        from core.routing import EmbeddingRouter
+
+        router = EmbeddingRouter(min_similarity=0.5)
+        router.attach(_registry())
+        embed = _FakeEmbedder()
+
+        await router.route("Steuer", embed)
+        await router.route("Vertrag", embed)
+
+        # question, profiles (batched), question
+        assert [len(c) for c in embed.calls] == [1, 4, 1]
+
+    @pytest.mark.asyncio
+    async def test_unclear_question_is_not_routed(self):
+        from core.routing import EmbeddingRouter
+
+        router = EmbeddingRouter(min_similarity=0.5)
+        router.attach(_registry())
+
+        decision = await router.route("Hallo", _FakeEmbedder())
+
+        assert decision.mcp is None
+
+    @pytest.mark.asyncio
+    async def test_reuses_precomputed_vector(self):
+        from core.routing import EmbeddingRouter
+
+        router = EmbeddingRouter(min_similarity=0.5)
+        router.attach(_registry())
+        embed = _FakeEmbedder()
+
+        decision = await router.route("ignored", embed, query_vector=[0, 1, 0, 0, 0.1])
+
+        assert decision.mcp == "law"
+        assert all(len(c) != 1 for c in embed.calls)
+
+    @pytest.mark.asyncio
+    async def test_registering_mcp_refreshes_centroids(self):
+        from core.routing import EmbeddingRouter
+
+        registry = _registry()
+        router = EmbeddingRouter(min_similarity=0.5)
+        router.attach(registry)
+        embed = _FakeEmbedder()
+        assert (await router.route("Wettbewerb Analyse", embed)).mcp is None
+
+        registry.register(_mcp_class("market", "Wettbewerb intelligence")())
+
+        assert (await router.route("Wettbewerb Analyse", embed)).mcp == "market"
+        assert embed.calls[-1] == ["Wettbewerb intelligence"]  # Only the new profile
+
+        registry.unregister("market")
+        assert "market" not in router.mcps
+
+    @pytest.mark.asyncio
+    async def test_history_shifts_centroid_and_persists(self, temp_dir):
+        from core.routing import EmbeddingRouter
+
+        path = temp_dir / "history.npz"
+        router = EmbeddingRouter(min_similarity=0.4, history_path=path, save_every=1)
+        router.attach(_registry())
+        embed = _FakeEmbedder()
+
+        question = [0.0, 0.0, 1.0, 0.0, 0.1]  # Closest to neither profile
+        before = await router.route("q", embed, query_vector=question)
+        for _ in range(5):
+            router.record("law", question)
+        after = await router.route("q", embed, query_vector=question)
+
+        assert after.scores["law"] > before.scores["law"]
+        assert after.mcp == "law"
+
+        reloaded = EmbeddingRouter(min_similarity=0.4, history_path=path)
+        reloaded.attach(_registry())
+        assert (await reloaded.route("q", embed, query_vector=question)).mcp == "law"
+
+    @pytest.mark.asyncio
+    async def test_history_cannot_outvote_profile(self):
+        from core.routing import EmbeddingRouter
+
+        router = EmbeddingRouter(min_similarity=0.5)
+        router.attach(_registry())
+        embed = _FakeEmbedder()
+
+        for _ in range(1000):
+            router.record("law", [1.0, 0.0, 0.0, 0.0, 0.1])  # Tax questions forced onto law
+
+        assert (await router.route("Vertrag prüfen", embed)).mcp == "law"
+        assert (await router.route("Steuer Frage", embed)).mcp == "ctax"
+
+    def test_unregistering_instance_keeps_class_profile(self):
+        from core.routing import EmbeddingRouter
+
+        registry = _registry()
+        router = EmbeddingRouter()
+        router.attach(registry)
+        registry.get("law")  # Instantiates the class
+
+        registry.unregister("law")
+
+        assert "law" in router.mcps
+
+
+class TestPlatformRouting:
+    """Tests for Platform routing fallbacks."""
+
+    @pytest.mark.asyncio
+    async def test_keyword_fallback_without_registry(self, lakehouse_path):
+        from core.platform import Platform
+
+        platform = Platform(lakehouse_path=lakehouse_path)
+
+        assert await platform._route("Vertrag prüfen", "http://emb") == ("law", None)
@@ -0,0 +1,67 @@
+"""
+Micro-Batcher Tests
+
+Tests for coalescing concurrent embedding requests.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("torch")  # inference package imports the embedding model stack
+
+
+def _fake_encode(calls):
+    def encode(texts):
+        calls.append((list(texts), threading.current_thread().name))
+        return [[float(len(t))] for t in texts]
+    return encode
+
+
+class TestMicroBatcher:
+    """Tests for MicroBatcher."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_batch(self):
+        from inference.batcher import MicroBatcher
+
+        calls = []
+        batcher = MicroBatcher(_fake_encode(calls), max_batch_texts=64, max_wait_ms=50)
+        await batcher.start()
+
+        results = await asyncio.gather(*[batcher.submit(["x" * i]) for i in range(1, 9)])
+        await batcher.stop()
+
+        assert results == [[[float(i)]] for i in range(1, 9)]
+        assert len(calls) == 1
+        assert calls[0][1] != threading.current_thread().name  # Encoded off the event loop
+        assert batcher.get_metrics()["avg_requests_per_batch"] == 8
+
+    @pytest.mark.asyncio
+    async def test_flushes_at_max_batch_texts(self):
+        from inference.batcher import MicroBatcher
+
+        calls = []
+        batcher = MicroBatcher(_fake_encode(calls), max_batch_texts=4, max_wait_ms=50)
+
+        results = await asyncio.gather(*[batcher.submit(["a", "bb"]) for _ in range(4)])
+        await batcher.stop()
+
+        assert all(r == [[1.0], [2.0]] for r in results)
+        assert [len(texts) for texts, _ in calls] == [4, 4]
+
+    @pytest.mark.asyncio
+    async def test_encode_error_propagates(self):
+        from inference.batcher import MicroBatcher
+
+        def failing(texts):
+            raise ValueError("boom")
+
+        batcher = MicroBatcher(failing, max_wait_ms=1)
+
+        with pytest.raises(ValueError):
+            await batcher.submit(["x"])
+        await batcher.stop()
+
+        assert batcher.get_metrics()["errors"] == 1
@@ -0,0 +1,184 @@
+"""
+Classifier Cascade Tests
+
+Tests for the single-pass rule matcher, embedding centroids and the
+rules → centroids → LLM escalation order.
+"""
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+
+_noise = np.random.default_rng(0)
+
+
+def _vector(seed, dim=16, noise=0.02):
+    """Fixed direction per seed, plus a little per-call noise"""
+    base = np.random.default_rng(seed).normal(size=dim)
+    return base + _noise.normal(scale=noise * np.linalg.norm(base) / np.sqrt(dim), size=dim)
+
+
+class _FakeEmbedder:
+    """Embeds text by topic keyword: 'datasheet' and 'memo' map to distinct directions"""
+
+    async def embed_batch(self, texts):
+        return [_vector(1 if "datasheet" in t else 2) for t in texts]
+
+
+class _FakeMessages:
+    def __init__(self, category):
+        self.category = category
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0)
+        text = f'{{"category": "{self.category}", "confidence": "high"}}'
+        return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
+class TestMultiPatternMatcher:
+    """Tests for MultiPatternMatcher."""
+
+    def test_reports_distinct_patterns_per_category(self):
+        from ingestion.classifier.rules import MultiPatternMatcher
+
+        matcher = MultiPatternMatcher({
+            "a": [r"alpha", r"beta"],
+            "b": [r"gamma", r"beta"],
+        })
+        hits = matcher.match("Alpha alpha BETA gamma")
+
+        assert len(hits["a"]) == 2  # alpha (twice, counted once), beta
+        assert len(hits["b"]) == 2  # gamma, shared beta
+
+    def test_classify_text_uses_path_and_content(self):
+        from ingestion.classifier.rules import RuleBasedClassifier
+
+        rules = RuleBasedClassifier()
+        category, confidence = rules.classify_text(
+            Path("/shares/Produkte/Katalog/sheet.pdf"),
+            "Artikelnummer 4711, EAN 4001234567890, Produktdaten, Material: Stahl"
+        )
+
+        assert category == "products"
+        assert confidence >= 0.6
+
+    def test_single_keyword_is_not_confident(self):
+        from ingestion.classifier.rules import RuleBasedClassifier
+
+        category, confidence = RuleBasedClassifier().classify_text(Path("/x/scan.pdf"), "Bitte Gehalt prüfen")
+
+        assert category == "hr"
+        assert confidence < 0.6
+
+
+class TestCentroidClassifier:
+    """Tests for CentroidClassifier."""
+
+    def test_needs_min_examples(self):
+        from ingestion.classifier.centroids import CentroidClassifier
+
+        centroids = CentroidClassifier(min_examples=3)
+        centroids.add("products", _vector(1))
+        centroids.add("products", _vector(1))
+
+        assert centroids.predict(_vector(1)) == (None, 0.0)
+
+    def test_predicts_nearest_centroid(self):
+        from ingestion.classifier.centroids import CentroidClassifier
+
+        centroids = CentroidClassifier(min_examples=3)
+        for _ in range(5):
+            centroids.add("products", _vector(1))
+            centroids.add("hr", _vector(2))
+
+        category, confidence = centroids.predict(_vector(1))
+        assert category == "products"
+        assert confidence > 0.9
+
+    def test_rejects_documents_outside_radius(self):
+        from ingestion.classifier.centroids import CentroidClassifier
+
+        centroids = CentroidClassifier(min_examples=3)
+        for _ in range(5):
+            centroids.add("products", _vector(1))
+
+        assert centroids.predict(_vector(3)) == (None, 0.0)
+
+    def test_persists(self, temp_dir):
+        from ingestion.classifier.centroids import CentroidClassifier
+
+        path = temp_dir / "centroids.npz"
+        centroids = CentroidClassifier(path, min_examples=3)
+        for _ in range(3):
+            centroids.add("products", _vector(1))
+        centroids.save()
+
+        reloaded = CentroidClassifier(path, min_examples=3)
+        assert reloaded.stats()["products"]["examples"] == 3
+        assert reloaded.predict(_vector(1))[0] == "products"
+
+
+class TestDocumentClassifierCascade:
+    """Tests for DocumentClassifier escalation."""
+
+    def _classifier(self, category="products"):
+        from ingestion.classifier.centroids import CentroidClassifier
+        from ingestion.classifier.document_classifier import DocumentClassifier
+        from ingestion.llm_gateway import LLMGateway
+
+        classifier = DocumentClassifier(
+            embedder=_FakeEmbedder(),
+            centroids=CentroidClassifier(min_examples=3)
+        )
+        messages = _FakeMessages(category)
+        classifier.llm = LLMGateway(client=SimpleNamespace(messages=messages))
+        return classifier, messages
+
+    @pytest.mark.asyncio
+    async def test_confident_rules_skip_llm(self):
+        classifier, messages = self._classifier()
+
+        result = await classifier.classify_with_confidence(
+            Path("/shares/produkte/katalog/a.pdf"),
+            "Artikelnummer, EAN, GTIN, Stammdaten"
+        )
+
+        assert result.category == "products"
+        assert result.source == "rules"
+        assert messages.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_centroids_learn_from_llm_labels(self):
+        classifier, messages = self._classifier()
+
+        results = [
+            await classifier.classify_with_confidence(Path(f"/share/{i}.pdf"), f"datasheet number {i}")
+            for i in range(20)
+        ]
+
+        assert {r.category for r in results} == {"products"}
+        assert messages.calls == 3  # Until the centroid has min_examples
+        assert classifier.get_statistics()["decisions"] == {"llm": 3, "centroid": 17}
+
+    @pytest.mark.asyncio
+    async def test_unfamiliar_content_escalates(self):
+        classifier, messages = self._classifier()
+        for i in range(3):
+            await classifier.classify(Path(f"/share/{i}.pdf"), f"datasheet {i}")
+
+        await classifier.classify(Path("/share/x.pdf"), "internal memo")
+
+        assert messages.calls == 4
+
+    @pytest.mark.asyncio
+    async def test_assigned_mcp_wins(self):
+        classifier, messages = self._classifier()
+
+        assert await classifier.classify(Path("/a/steuer.pdf"), "Vertrag", assigned_mcp="hr") == "hr"
+        assert messages.calls == 0
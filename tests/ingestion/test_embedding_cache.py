@@ -0,0 +1,106 @@
+"""
+Embedding Cache Tests
+
+Tests for the content-hash embedding store.
+"""
+
+import numpy as np
+
+
+def _encoder(calls):
+    def encode(texts):
+        calls.append(list(texts))
+        return np.array([[len(t), 1.0, -0.5] for t in texts], dtype=np.float32)
+    return encode
+
+
+class TestEmbeddingCache:
+    """Tests for EmbeddingCache."""
+
+    def test_encodes_only_misses(self, temp_dir):
+        from ingestion.processor.embedding_cache import EmbeddingCache
+
+        calls = []
+        cache = EmbeddingCache(temp_dir, "e5-test")
+
+        first = cache.encode_through(["a", "bb", "a"], "passage: ", _encoder(calls))
+        second = cache.encode_through(["bb", "ccc"], "passage: ", _encoder(calls))
+
+        assert calls == [["passage: a", "passage: bb"], ["passage: ccc"]]
+        assert first.shape == (3, 3)
+        np.testing.assert_array_equal(first[0], first[2])
+        np.testing.assert_array_equal(second[0], first[1])
+        assert len(cache) == 3
+
+    def test_prefix_and_model_are_part_of_key(self, temp_dir):
+        from ingestion.processor.embedding_cache import EmbeddingCache
+
+        calls = []
+        cache = EmbeddingCache(temp_dir, "e5-test")
+        cache.encode_through(["a"], "passage: ", _encoder(calls))
+        cache.encode_through(["a"], "query: ", _encoder(calls))
+        EmbeddingCache(temp_dir, "other-model").encode_through(["a"], "passage: ", _encoder(calls))
+
+        assert len(calls) == 3
+
+    def test_persists_across_instances(self, temp_dir):
+        from ingestion.processor.embedding_cache import EmbeddingCache
+
+        calls = []
+        EmbeddingCache(temp_dir, "e5-test").encode_through(["x", "yy"], "", _encoder(calls))
+
+        reopened = EmbeddingCache(temp_dir, "e5-test", max_memory_entries=1)
+        vectors = reopened.get_many(["x", "yy", "zzz"])
+
+        assert vectors[2] is None
+        np.testing.assert_allclose(vectors[1], [2.0, 1.0, -0.5])
+        assert reopened.stats()["hits"] == 2
+
+    def test_torn_tail_is_dropped(self, temp_dir):
+        from ingestion.processor.embedding_cache import EmbeddingCache
+
+        cache = EmbeddingCache(temp_dir, "e5-test")
+        cache.put_many(["x", "y"], np.ones((2, 3), dtype=np.float32))
+        with open(cache.path / "vectors.f16", "ab") as f:
+            f.write(b"\x00\x01")  # Partial row from an interrupted write
+
+        reopened = EmbeddingCache(temp_dir, "e5-test")
+        reopened.put_many(["z"], np.full((1, 3), 2.0, dtype=np.float32))
+
+        assert len(reopened) == 3
+        np.testing.assert_allclose(EmbeddingCache(temp_dir, "e5-test").get_many(["z"])[0], [2.0] * 3)
+
+    def test_two_writers_share_a_directory(self, temp_dir):
+        from ingestion.processor.embedding_cache import EmbeddingCache
+
+        a = EmbeddingCache(temp_dir, "e5-test")
+        b = EmbeddingCache(temp_dir, "e5-test")
+        a.put_many(["alpha"], np.full((1, 3), 1.0, dtype=np.float32))
+        b.put_many(["beta"], np.full((1, 3), 2.0, dtype=np.float32))
+        b._lru.clear()
+        a._lru.clear()
+
+        np.testing.assert_allclose(b.get_many(["beta"])[0], [2.0] * 3)
+        np.testing.assert_allclose(a.get_many(["beta"])[0], [2.0] * 3)  # Written by b
+        np.testing.assert_allclose(EmbeddingCache(temp_dir, "e5-test").get_many(["alpha"])[0], [1.0] * 3)
+
+    def test_shared_instance_per_directory(self, temp_dir):
+        from ingestion.processor.embedding_cache import EmbeddingCache
+
+        assert EmbeddingCache.shared(temp_dir, "e5-test") is EmbeddingCache.shared(temp_dir, "e5-test")
+        assert EmbeddingCache.shared(temp_dir, "e5-test") is not EmbeddingCache.shared(temp_dir, "other")
+
+    def test_hits_and_misses_return_same_precision(self, temp_dir):
+        from ingestion.processor.embedding_cache import EmbeddingCache
+
+        def encode(texts):
+            return np.full((len(texts), 3), 0.1, dtype=np.float32)
+
+        cache = EmbeddingCache(temp_dir, "e5-test")
+        miss = cache.encode_through(["t"], "", encode)
+        memory_hit = cache.get_many(["t"])[0]
+        cache._lru.clear()
+        disk_hit = cache.get_many(["t"])[0]
+
+        np.testing.assert_array_equal(miss[0], memory_hit)
+        np.testing.assert_array_equal(memory_hit, disk_hit)
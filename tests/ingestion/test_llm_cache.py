@@ -0,0 +1,115 @@
+"""
+LLM Response Cache Tests
+
+Tests for fingerprinting, TTL and size eviction, and gateway integration.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+
+class _FakeMessages:
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0)
+        text = kwargs["messages"][0]["content"].upper()
+        return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
+class TestLLMResponseCache:
+    """Tests for LLMResponseCache."""
+
+    def test_hit_and_miss(self, temp_dir):
+        from ingestion.llm_cache import LLMResponseCache, prompt_fingerprint
+
+        cache = LLMResponseCache(temp_dir)
+        key = prompt_fingerprint("prompt", "model", 100, 0.0)
+
+        assert cache.get(key) is None
+        cache.put(key, "response", model="model")
+        assert cache.get(key) == "response"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_fingerprint_covers_request_parameters(self):
+        from ingestion.llm_cache import prompt_fingerprint
+
+        base = prompt_fingerprint("prompt", "model", 100, 0.0)
+        assert base == prompt_fingerprint("prompt", "model", 100, 0)
+        assert base != prompt_fingerprint("prompt", "other-model", 100, 0.0)
+        assert base != prompt_fingerprint("prompt", "model", 200, 0.0)
+        assert base != prompt_fingerprint("prompt", "model", 100, 0.0, system="be brief")
+
+    def test_persists_across_instances(self, temp_dir):
+        from ingestion.llm_cache import LLMResponseCache
+
+        cache = LLMResponseCache(temp_dir)
+        cache.put("k", "v")
+        cache.close()
+
+        reopened = LLMResponseCache(temp_dir)
+        assert reopened.get("k") == "v"
+        assert reopened.stats()["entries"] == 1
+
+    def test_expired_entries_are_misses(self, temp_dir):
+        from ingestion.llm_cache import LLMResponseCache
+
+        cache = LLMResponseCache(temp_dir, ttl_seconds=-1)
+        cache.put("k", "v")
+
+        assert cache.get("k") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_evicts_least_recently_used(self, temp_dir):
+        from ingestion.llm_cache import LLMResponseCache
+
+        cache = LLMResponseCache(temp_dir, max_bytes=300)
+        cache.put("a", "x" * 100)
+        cache.put("b", "x" * 100)
+        cache.get("a")  # b is now least recently used
+        cache.put("c", "x" * 150)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.stats()["bytes"] <= 300
+        assert cache.evictions == 1
+
+
+class TestGatewayCaching:
+    """Tests for LLMGateway with a response cache."""
+
+    @pytest.mark.asyncio
+    async def test_deterministic_requests_hit_cache(self, temp_dir):
+        from ingestion.llm_cache import LLMResponseCache
+        from ingestion.llm_gateway import LLMGateway
+
+        messages = _FakeMessages()
+        gateway = LLMGateway(client=SimpleNamespace(messages=messages))
+        cache = LLMResponseCache(temp_dir)
+
+        first = await gateway.complete("hello", model="m", max_tokens=10, cache=cache)
+        second = await gateway.complete("hello", model="m", max_tokens=10, cache=cache)
+
+        assert first == second == "HELLO"
+        assert messages.calls == 1
+        assert gateway.get_metrics()["cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_sampled_requests_bypass_cache(self, temp_dir):
+        from ingestion.llm_cache import LLMResponseCache
+        from ingestion.llm_gateway import LLMGateway
+
+        messages = _FakeMessages()
+        gateway = LLMGateway(client=SimpleNamespace(messages=messages))
+        cache = LLMResponseCache(temp_dir)
+
+        await gateway.complete("hello", model="m", max_tokens=10, temperature=0.7, cache=cache)
+        await gateway.complete("hello", model="m", max_tokens=10, temperature=0.7, cache=cache)
+
+        assert messages.calls == 2
+        assert cache.stats()["entries"] == 0
@@ -0,0 +1,106 @@
+"""
+LLM Gateway Tests
+
+Tests for concurrency limits, coalescing and retries (against a fake async client).
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+
+class _FakeMessages:
+    def __init__(self, latency=0.01, fail_times=0, status_code=429):
+        self.latency = latency
+        self.fail_times = fail_times
+        self.status_code = status_code
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if self.fail_times > 0:
+                self.fail_times -= 1
+                error = RuntimeError("rate limited")
+                error.status_code = self.status_code
+                error.response = None
+                raise error
+            text = kwargs["messages"][0]["content"].upper()
+            return SimpleNamespace(content=[SimpleNamespace(text=text)])
+        finally:
+            self.in_flight -= 1
+
+
+def _gateway(messages, **kwargs):
+    from ingestion.llm_gateway import LLMGateway
+
+    return LLMGateway(client=SimpleNamespace(messages=messages), base_backoff=0.001, **kwargs)
+
+
+class TestLLMGateway:
+    """Tests for LLMGateway."""
+
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency(self):
+        messages = _FakeMessages()
+        gateway = _gateway(messages, max_concurrency=3, requests_per_minute=60_000)
+
+        results = await asyncio.gather(*[
+            gateway.complete(f"p{i}", model="m", max_tokens=10) for i in range(12)
+        ])
+
+        assert results == [f"P{i}" for i in range(12)]
+        assert messages.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_identical_requests_are_coalesced(self):
+        messages = _FakeMessages()
+        gateway = _gateway(messages)
+
+        results = await asyncio.gather(*[
+            gateway.complete("same", model="m", max_tokens=10) for _ in range(5)
+        ])
+
+        assert results == ["SAME"] * 5
+        assert messages.calls == 1
+        assert gateway.get_metrics()["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_retries_retryable_errors(self):
+        messages = _FakeMessages(fail_times=2, status_code=529)
+        gateway = _gateway(messages, max_retries=3)
+
+        assert await gateway.complete("x", model="m", max_tokens=10) == "X"
+        assert gateway.get_metrics()["retries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_raises(self):
+        messages = _FakeMessages(fail_times=1, status_code=400)
+        gateway = _gateway(messages)
+
+        with pytest.raises(RuntimeError):
+            await gateway.complete("x", model="m", max_tokens=10)
+        assert messages.calls == 1
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    @pytest.mark.asyncio
+    async def test_rate_is_enforced(self):
+        from ingestion.llm_gateway import TokenBucket
+
+        bucket = TokenBucket(rate=100.0, capacity=1.0)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for _ in range(6):
+            await bucket.acquire()
+
+        # First token is free, the next five take ~10ms each
+        assert loop.time() - started >= 0.04
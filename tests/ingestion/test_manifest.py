@@ -0,0 +1,139 @@
+"""
+Ingestion Manifest Tests
+
+Tests for incremental change detection.
+"""
+
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+
+@dataclass
+class _File:
+    """Minimal stand-in for the crawler's FileInfo."""
+    path: Path
+    size_bytes: int
+    modified: datetime
+    classification: Optional[str] = "tax"
+    extraction_status: str = "success"
+
+
+def _scan(folder: Path):
+    return [
+        _File(p, p.stat().st_size, datetime.fromtimestamp(p.stat().st_mtime))
+        for p in sorted(folder.iterdir())
+    ]
+
+
+def _doc(file, chunks=2):
+    return {"id": str(file.path), "chunks": ["c"] * chunks}
+
+
+class TestIngestionManifest:
+    """Tests for IngestionManifest."""
+
+    @pytest.fixture
+    def share(self, temp_dir):
+        folder = temp_dir / "share"
+        folder.mkdir()
+        for name in ("a.txt", "b.txt", "c.txt"):
+            (folder / name).write_text(f"content of {name}")
+        return folder
+
+    async def _first_run(self, temp_dir, share):
+        from ingestion.manifest import IngestionManifest
+
+        manifest = IngestionManifest.for_customer(temp_dir, "acme")
+        diff = await manifest.diff(_scan(share), [share])
+        for f in diff.changed:
+            manifest.record(f, _doc(f))
+        manifest.save()
+        return diff
+
+    @pytest.mark.asyncio
+    async def test_first_run_everything_new(self, temp_dir, share):
+        diff = await self._first_run(temp_dir, share)
+
+        assert diff.summary() == {"new": 3, "modified": 0, "unchanged": 0, "vanished": 0}
+        assert (temp_dir / "manifests" / "acme.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_detects_modified_unchanged_and_vanished(self, temp_dir, share):
+        from ingestion.manifest import IngestionManifest
+
+        await self._first_run(temp_dir, share)
+
+        (share / "a.txt").write_text("edited content, different size")
+        os.utime(share / "b.txt", (1, 1))  # Touched, same bytes
+        (share / "c.txt").unlink()
+        (share / "d.txt").write_text("new")
+
+        manifest = IngestionManifest.for_customer(temp_dir, "acme")
+        diff = await manifest.diff(_scan(share), [share])
+
+        assert [f.path.name for f in diff.modified] == ["a.txt"]
+        assert [f.path.name for f in diff.new] == ["d.txt"]
+        assert [f.path.name for f in diff.unchanged] == ["b.txt"]
+        assert [Path(e.path).name for e in diff.vanished] == ["c.txt"]
+        assert diff.vanished[0].chunk_ids == [f"{share / 'c.txt'}_0", f"{share / 'c.txt'}_1"]
+
+    @pytest.mark.asyncio
+    async def test_tombstones_are_persisted(self, temp_dir, share):
+        from ingestion.manifest import IngestionManifest
+
+        await self._first_run(temp_dir, share)
+        (share / "c.txt").unlink()
+
+        manifest = IngestionManifest.for_customer(temp_dir, "acme")
+        diff = await manifest.diff(_scan(share), [share])
+        manifest.tombstone(diff.vanished[0])
+        manifest.save()
+
+        reopened = IngestionManifest.for_customer(temp_dir, "acme")
+        assert reopened.get(share / "c.txt").is_deleted
+        assert reopened.stats()["tombstones"] == 1
+        assert (await reopened.diff(_scan(share), [share])).vanished == []
+
+    @pytest.mark.asyncio
+    async def test_files_outside_crawled_roots_do_not_vanish(self, temp_dir, share):
+        from ingestion.manifest import IngestionManifest
+
+        await self._first_run(temp_dir, share)
+        other = temp_dir / "other"
+        other.mkdir()
+
+        manifest = IngestionManifest.for_customer(temp_dir, "acme")
+        diff = await manifest.diff([], [other])
+
+        assert diff.vanished == []
+
+    @pytest.mark.asyncio
+    async def test_etags_of_downloaded_files_persist(self, temp_dir, share):
+        from ingestion.manifest import IngestionManifest
+
+        manifest = IngestionManifest.for_customer(temp_dir, "acme")
+        files = _scan(share)
+        files[0].source_etag = "abc123"
+        for f in files:
+            manifest.record(f, _doc(f))
+        manifest.save()
+
+        reopened = IngestionManifest.for_customer(temp_dir, "acme")
+        assert reopened.etags() == {str(files[0].path): "abc123"}
+
+    @pytest.mark.asyncio
+    async def test_vanished_from_listing(self, temp_dir, share):
+        from ingestion.manifest import IngestionManifest
+
+        await self._first_run(temp_dir, share)
+
+        # Bucket listing without c.txt; the staged copies are already gone
+        manifest = IngestionManifest.for_customer(temp_dir, "acme")
+        vanished = manifest.vanished([share / "a.txt", share / "b.txt"], [share])
+
+        assert [Path(e.path).name for e in vanished] == ["c.txt"]
@@ -0,0 +1,110 @@
+"""
+Stage Pipeline Tests
+
+Tests for bounded, overlapping ingestion stages.
+"""
+
+import asyncio
+
+import pytest
+
+
+class TestStagePipeline:
+    """Tests for StagePipeline."""
+
+    @pytest.mark.asyncio
+    async def test_all_items_flow_through_stages(self):
+        from ingestion.pipeline import Stage, StagePipeline
+
+        loaded = []
+
+        async def double(x):
+            await asyncio.sleep(0)
+            return x * 2
+
+        async def drop_odd(x):
+            return x if x % 4 == 0 else None
+
+        async def load(batch):
+            loaded.extend(batch)
+
+        stats = await StagePipeline([
+            Stage("double", double, concurrency=3),
+            Stage("filter", drop_odd, concurrency=2),
+            Stage("load", load, batch_size=5),
+        ], queue_size=2).run(range(20))
+
+        assert sorted(loaded) == [x * 2 for x in range(0, 20, 2)]
+        assert stats["double"]["emitted"] == 20
+        assert stats["filter"]["emitted"] == 10
+        assert stats["load"]["batches"] == 2
+
+    @pytest.mark.asyncio
+    async def test_backpressure_bounds_items_in_flight(self):
+        from ingestion.pipeline import Stage, StagePipeline
+
+        produced, consumed = [], []
+        max_in_flight = 0
+
+        async def source():
+            for i in range(50):
+                produced.append(i)
+                yield i
+
+        async def passthrough(x):
+            return x
+
+        async def slow_load(batch):
+            nonlocal max_in_flight
+            max_in_flight = max(max_in_flight, len(produced) - len(consumed))
+            await asyncio.sleep(0.001)
+            consumed.extend(batch)
+
+        await StagePipeline([
+            Stage("a", passthrough),
+            Stage("b", passthrough),
+            Stage("load", slow_load, batch_size=4),
+        ], queue_size=3).run(source())
+
+        assert len(consumed) == 50
+        # 3 queues of 3 + one item per worker + one batch; never the whole source
+        assert max_in_flight <= 3 * 3 + 2 + 4
+
+    @pytest.mark.asyncio
+    async def test_batch_weight_and_idle_flush(self):
+        from ingestion.pipeline import Stage, StagePipeline
+
+        batches = []
+
+        async def embed(batch):
+            batches.append([len(doc) for doc in batch])
+            return batch
+
+        await StagePipeline([
+            Stage("embed", embed, batch_size=6, batch_weight=len, max_wait=0.01),
+        ]).run([[1, 2, 3], [1, 2], [1, 2, 3, 4], [1]])
+
+        assert batches == [[3, 2, 4], [1]]
+
+    @pytest.mark.asyncio
+    async def test_errors_drop_item_and_continue(self):
+        from ingestion.pipeline import Stage, StagePipeline
+
+        failures, loaded = [], []
+
+        async def flaky(x):
+            if x == 3:
+                raise ValueError("bad file")
+            return x
+
+        async def load(batch):
+            loaded.extend(batch)
+
+        stats = await StagePipeline(
+            [Stage("extract", flaky, concurrency=2), Stage("load", load, batch_size=10)],
+            on_error=lambda stage, item, e: failures.append((stage.name, item, str(e)))
+        ).run(range(6))
+
+        assert sorted(loaded) == [0, 1, 2, 4, 5]
+        assert failures == [("extract", 3, "bad file")]
+        assert stats["extract"]["errors"] == 1
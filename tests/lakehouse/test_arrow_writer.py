@@ -0,0 +1,144 @@
+"""
+Arrow Writer Tests
+
+Tests for columnar validation of standard table records and the streaming
+Delta writes in DeltaLoader and MultiTableLoader.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+import json
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+deltalake = pytest.importorskip("deltalake")
+
+
+def _product(gtin, **overrides):
+    record = {
+        "gtin": gtin,
+        "supplier_pid": f"SP{gtin}",
+        "brand": "Bosch",
+        "product_name": f"Product {gtin}",
+    }
+    record.update(overrides)
+    return record
+
+
+class TestTableSpec:
+    """Tests for columnar validation and coercion."""
+
+    def test_coercion_and_defaults(self):
+        from lakehouse.delta.arrow_writer import PRODUCTS
+
+        batch = PRODUCTS.batch([
+            _product("1", price=Decimal("43.00"), metadata={"weight": Decimal("1.5")}),
+            _product(2, price="12.5", ingested_at=datetime(2024, 1, 2, 3, 4, 5)),
+            _product("3", price=7),
+        ])
+        rows = batch.to_pylist()
+
+        assert batch.schema == PRODUCTS.schema
+        assert [r["gtin"] for r in rows] == ["1", "2", "3"]
+        assert [r["price"] for r in rows] == [43.0, 12.5, 7.0]
+        assert {r["currency"] for r in rows} == {"EUR"}
+        assert {r["status"] for r in rows} == {"active"}
+        assert rows[1]["ingested_at"] == "2024-01-02T03:04:05"
+        assert json.loads(rows[0]["metadata"]) == {"weight": "1.5"}
+        assert rows[1]["metadata"] == "{}"
+
+    def test_invalid_rows_dropped(self):
+        from lakehouse.delta.arrow_writer import DATA_QUALITY_AUDIT, PRODUCTS, WriteStats
+
+        stats = WriteStats()
+        batch = PRODUCTS.batch([
+            _product("1"),
+            {"gtin": "2", "brand": "Bosch"},            # missing required fields
+            _product("3", price="not a price"),
+            _product("4", metadata=["not", "a", "dict"]),
+        ], stats)
+
+        assert batch.column("gtin").to_pylist() == ["1"]
+        assert stats.rows == 1
+        assert stats.dropped == 3
+
+        batch = DATA_QUALITY_AUDIT.batch([
+            {"document_id": "a", "completeness_percentage": 80},
+            {"document_id": "b", "completeness_percentage": 120},
+        ])
+        assert batch.column("document_id").to_pylist() == ["a"]
+
+    def test_batches_and_last_per_key(self):
+        from lakehouse.delta.arrow_writer import PRODUCTS, open_reader
+
+        records = [_product(str(i % 3), price=i) for i in range(7)]
+        batches = PRODUCTS.last_per_key(PRODUCTS.batches(records, batch_rows=2), ["gtin"], batch_rows=2)
+        prices = {r["gtin"]: r["price"] for b in batches for r in b.to_pylist()}
+
+        assert prices == {"0": 6.0, "1": 4.0, "2": 5.0}
+        assert sum(b.num_rows for b in batches) == 3
+        assert open_reader(PRODUCTS.schema, PRODUCTS.batches([{"gtin": "x"}])) is None
+
+    def test_invalid_last_duplicate_keeps_valid_row(self):
+        from lakehouse.delta.arrow_writer import PRODUCTS, WriteStats
+
+        stats = WriteStats()
+        records = [_product("111", price=1), {**_product("111"), "price": "n/a"}]
+        batches = PRODUCTS.last_per_key(PRODUCTS.batches(records, stats=stats), ["gtin"])
+
+        assert [r["price"] for b in batches for r in b.to_pylist()] == [1.0]
+        assert stats.dropped == 1
+
+
+class TestStreamingLoaders:
+    """Tests for batched, single-commit Delta writes."""
+
+    @pytest.mark.asyncio
+    async def test_upsert_many_batches_single_commit(self, lakehouse_path):
+        from deltalake import DeltaTable
+        from lakehouse.delta.multi_table_loader import MultiTableLoader
+
+        loader = MultiTableLoader(lakehouse_path, batch_rows=10)
+        await loader.upsert_products([_product(str(i), price=i) for i in range(55)])
+        await loader.upsert_products([_product(str(i), price=i + 100) for i in range(50, 60)])
+
+        dt = DeltaTable(str(lakehouse_path / "delta" / "products"))
+        rows = dt.to_pyarrow_table().to_pylist()
+        prices = {r["gtin"]: r["price"] for r in rows}
+
+        assert dt.version() == 1
+        assert len(rows) == 60
+        assert prices["49"] == 49.0
+        assert prices["55"] == 155.0
+
+    @pytest.mark.asyncio
+    async def test_load_chunks_columns(self, temp_dir):
+        from deltalake import DeltaTable
+        from lakehouse.delta.delta_loader import DeltaLoader
+
+        loader = DeltaLoader(temp_dir / "delta", batch_rows=1)
+        documents = [
+            {
+                "id": doc_id,
+                "path": f"/data/{doc_id}.pdf",
+                "filename": f"{doc_id}.pdf",
+                "mcp": "ctax",
+                "text": " ".join(chunks),
+                "chunks": chunks,
+                "metadata": {"size": 100, "modified": "2024-01-01T00:00:00"},
+            }
+            for doc_id, chunks in (("a", ["eins zwei", "  drei  "]), ("b", []), ("c", ["", "vier fünf sechs"]))
+        ]
+        await loader.load_documents("ctax", documents)
+
+        docs = DeltaTable(str(temp_dir / "delta" / "ctax_documents"))
+        chunks = DeltaTable(str(temp_dir / "delta" / "ctax_chunks"))
+        rows = sorted(chunks.to_pyarrow_table().to_pylist(), key=lambda r: r["chunk_id"])
+
+        assert docs.version() == 0
+        assert chunks.version() == 0
+        assert [r["chunk_id"] for r in rows] == ["a_0", "a_1", "c_0", "c_1"]
+        assert [r["chunk_index"] for r in rows] == [0, 1, 0, 1]
+        assert [r["word_count"] for r in rows] == [2, 1, 0, 3]
+        assert [r["char_count"] for r in rows] == [9, 8, 0, 15]
@@ -0,0 +1,101 @@
+"""
+Graph Batch Writer Tests
+
+Tests for UNWIND-batched Neo4j writes (recorded against a fake driver).
+"""
+
+import pytest
+
+pytest.importorskip("neo4j")  # lakehouse.graph imports the driver
+
+
+class _RecordingTx:
+    def __init__(self, log):
+        self.log = log
+
+    def run(self, query, **params):
+        self.log.append((query, params))
+
+
+class _RecordingSession:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_write(self, fn):
+        self.driver.transactions += 1
+        fn(_RecordingTx(self.driver.queries))
+
+
+class _RecordingDriver:
+    def __init__(self):
+        self.queries = []
+        self.transactions = 0
+
+    def session(self, database=None):
+        return _RecordingSession(self)
+
+
+def _entity(text, type_="ORG"):
+    return {"text": text, "type": type_, "confidence": 0.9}
+
+
+def _rel(source, target, type_):
+    return {"source": _entity(source), "target": _entity(target), "type": type_, "confidence": 0.7}
+
+
+class TestGraphBatchWriter:
+    """Tests for GraphBatchWriter."""
+
+    def test_one_transaction_per_flush(self):
+        from lakehouse.graph.batch_writer import GraphBatchWriter
+
+        driver = _RecordingDriver()
+        with GraphBatchWriter(driver, "neo4j", customer_id="acme") as writer:
+            stats = writer.add(
+                "doc1", "a.pdf", "products",
+                [_entity("Eaton"), _entity("Moeller"), _entity("Eaton")],
+                [_rel("Eaton", "Moeller", "RELATED_TO"), _rel("Eaton", "Moeller", "PRODUCED_BY")]
+            )
+            writer.add("doc2", "b.pdf", "products", [_entity("Eaton")], [])
+
+        assert stats == {"documents": 1, "entities": 3, "relationships": 2, "doc_entity_links": 2}
+        assert driver.transactions == 1
+        # documents, entities, mentions + one statement per relationship type
+        assert len(driver.queries) == 5
+        assert all("UNWIND $rows" in q for q, _ in driver.queries)
+
+        entities = driver.queries[1][1]["rows"]
+        assert {e["text"]: e["occurrences"] for e in entities} == {"Eaton": 3, "Moeller": 1}
+        assert len(driver.queries[2][1]["rows"]) == 3  # doc1→Eaton, doc1→Moeller, doc2→Eaton
+        assert ":PRODUCED_BY]" in driver.queries[3][0] and ":RELATED_TO]" in driver.queries[4][0]
+
+    def test_auto_flush_when_buffer_full(self):
+        from lakehouse.graph.batch_writer import GraphBatchWriter
+
+        driver = _RecordingDriver()
+        writer = GraphBatchWriter(driver, "neo4j", max_pending_entities=2)
+        writer.add("doc1", "a", "general", [_entity("A"), _entity("B")], [])
+        writer.add("doc2", "b", "general", [_entity("C")], [])
+
+        assert driver.transactions == 1
+        writer.flush()
+        assert driver.transactions == 2
+        assert writer.flush() == {}
+
+    def test_rejects_unsafe_relationship_type(self):
+        from lakehouse.graph.batch_writer import GraphBatchWriter
+
+        driver = _RecordingDriver()
+        writer = GraphBatchWriter(driver, "neo4j")
+        stats = writer.add("doc1", "a", "general", [_entity("A"), _entity("B")],
+                           [_rel("A", "B", "X]->() DETACH DELETE (n")])
+        writer.flush()
+
+        assert stats["relationships"] == 0
+        assert len(driver.queries) == 3
@@ -0,0 +1,129 @@
+"""
+Vector Index Manager Tests
+
+Tests for the incremental-append vs. background-retrain decisions of the
+Lance ANN index manager.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pa = pytest.importorskip("pyarrow")
+
+
+class _Dataset:
+    """Just enough of a lance dataset for append and sampling"""
+
+    def __init__(self, table):
+        self.table = table
+        self.optimize = self
+
+    def optimize_indices(self):
+        self.table.appends += 1
+        self.table.indexed = self.table.rows
+
+    def sample(self, rows, columns):
+        vectors = np.tile(self.table.direction, (min(rows, self.table.rows), 1)).astype(np.float32)
+        return pa.table({"vector": pa.FixedSizeListArray.from_arrays(pa.array(vectors.reshape(-1)), 4)})
+
+
+class _LanceTable:
+    """Just enough of a lancedb table for VectorIndexManager"""
+
+    def __init__(self, rows, direction=(1.0, 0.0, 0.0, 0.0)):
+        self.rows = rows
+        self.indexed = None
+        self.version = 1
+        self.trains = 0
+        self.appends = 0
+        self.direction = np.asarray(direction, dtype=np.float32)
+        self.schema = pa.schema([("vector", pa.list_(pa.float32(), 4))])
+
+    def count_rows(self):
+        return self.rows
+
+    def list_indices(self):
+        return [] if self.indexed is None else [{"name": "vector_idx", "columns": ["vector"]}]
+
+    def index_stats(self, name):
+        return {"num_indexed_rows": self.indexed, "num_unindexed_rows": self.rows - self.indexed}
+
+    def create_index(self, **kwargs):
+        self.trains += 1
+        self.indexed = self.rows
+
+    def to_lance(self):
+        return _Dataset(self)
+
+    def add(self, count):
+        self.rows += count
+        self.version += 1
+
+
+def _manager(temp_dir, **kwargs):
+    from lakehouse.vector.index_manager import VectorIndexManager, default_state_path
+
+    return VectorIndexManager(default_state_path(temp_dir / "lance"), background=False, **kwargs)
+
+
+class TestVectorIndexManager:
+    """Tests for VectorIndexManager."""
+
+    def test_small_table_skipped(self, temp_dir):
+        table = _LanceTable(100)
+        assert _manager(temp_dir).maintain(table) == "skipped"
+        assert table.trains == 0
+
+    def test_small_tail_appended_not_retrained(self, temp_dir):
+        manager = _manager(temp_dir)
+        table = _LanceTable(1000)
+
+        assert manager.maintain(table) == "retraining"   # initial build
+        assert table.trains == 1
+
+        table.add(50)
+        manager.record_append(np.tile(table.direction, (50, 1)))
+        assert manager.maintain(table) == "appended"
+        assert manager.maintain(table) == "fresh"
+        assert (table.trains, table.appends) == (1, 1)
+
+        freshness = manager.freshness(table)
+        assert freshness["indexed"] and freshness["unindexed_rows"] == 0
+        assert freshness["trained_rows"] == 1000
+        assert freshness["appended_since_training"] == 50
+
+    def test_large_tail_and_growth_retrain(self, temp_dir):
+        manager = _manager(temp_dir)
+        table = _LanceTable(1000)
+        manager.maintain(table)
+
+        table.add(500)   # 33% unindexed
+        assert manager.maintain(table) == "retraining"
+        assert table.trains == 2
+        assert manager.read_state()["last_retrain_reason"] == "unindexed"
+
+        for _ in range(8):   # 8 x 200 appended: small tails, but the table doubles
+            table.add(200)
+            manager.maintain(table)
+        assert table.trains == 3
+        assert manager.read_state()["last_retrain_reason"] == "growth"
+
+    def test_drift_retrains(self, temp_dir):
+        manager = _manager(temp_dir)
+        table = _LanceTable(10_000)
+        manager.maintain(table)
+
+        table.add(300)
+        manager.record_append(np.tile([0.0, 1.0, 0.0, 0.0], (300, 1)))
+
+        assert manager.drift() == pytest.approx(1.0)
+        assert manager.maintain(table) == "retraining"
+        assert manager.read_state()["last_retrain_reason"] == "drift"
+        assert manager.read_state()["appended_rows"] == 0
+
+    def test_index_parameters(self):
+        from lakehouse.vector.index_manager import index_parameters
+
+        assert index_parameters(10_000, 1024) == (100, 128)
+        assert index_parameters(100, 768) == (10, 96)
+        assert index_parameters(16, 384) == (8, 128)
@@ -0,0 +1,95 @@
+"""
+Key Index Tests
+
+Tests for the sorted product identifier sidecar index.
+"""
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+deltalake = pytest.importorskip("deltalake")
+
+
+def _append(path, start, count):
+    from deltalake import write_deltalake
+
+    write_deltalake(
+        str(path),
+        pa.table({
+            "product_id": [f"P{i:05d}" for i in range(start, start + count)],
+            "price": [float(i) for i in range(start, start + count)],
+        }),
+        mode="append"
+    )
+
+
+class TestKeyIndex:
+    """Tests for KeyIndex."""
+
+    def test_refresh_and_fetch(self, lakehouse_path):
+        from lakehouse.delta.key_index import KeyIndex
+
+        table_path = lakehouse_path / "delta" / "products"
+        _append(table_path, 0, 100)
+        _append(table_path, 100, 100)
+
+        index = KeyIndex(table_path)
+        assert index.refresh() is True
+        assert index.refresh() is False
+        assert index.is_fresh()
+        assert index.covers("product_id")
+        assert index.index_path == lakehouse_path / "indexes" / "products"
+
+        located = index.locate("product_id", ["P00150"])
+        assert len(located) == 1
+
+        rows = index.fetch("product_id", ["P00003", "P00150", "missing"], columns=["price"])
+        assert sorted(rows["price"].to_pylist()) == [3.0, 150.0]
+
+    def test_incremental_refresh_drops_removed_files(self, lakehouse_path):
+        from deltalake import write_deltalake
+        from lakehouse.delta.key_index import KeyIndex
+
+        table_path = lakehouse_path / "delta" / "products"
+        _append(table_path, 0, 10)
+
+        index = KeyIndex(table_path)
+        index.refresh()
+
+        write_deltalake(
+            str(table_path),
+            pa.table({"product_id": ["X1"], "price": [1.0]}),
+            mode="overwrite"
+        )
+        assert not index.is_fresh()
+        index.refresh()
+
+        assert index.fetch("product_id", ["P00001"]) is None
+        assert index.fetch("product_id", ["X1"]).num_rows == 1
+
+    def test_engine_lookup_uses_index(self, lakehouse_path):
+        from lakehouse.delta.query_engine import DeltaQueryEngine
+
+        _append(lakehouse_path / "delta" / "products", 0, 50)
+
+        engine = DeltaQueryEngine(lakehouse_path / "delta")
+        first = engine.lookup("products", "product_id", ["P00007", "P00042"])  # Scan, index builds
+        engine._index_refreshes["products"].join()
+        result = engine.lookup("products", "product_id", ["P00007", "P00042"])
+
+        assert sorted(first.table["product_id"].to_pylist()) == ["P00007", "P00042"]
+        assert sorted(result.table["product_id"].to_pylist()) == ["P00007", "P00042"]
+        assert engine.key_index("products").is_fresh()
+        assert engine.find_one("products", "price", 7.0)["product_id"] == "P00007"
+
+    def test_refresh_leaves_no_temp_files(self, lakehouse_path):
+        from lakehouse.delta.key_index import KeyIndex
+
+        table_path = lakehouse_path / "delta" / "products"
+        _append(table_path, 0, 10)
+        index = KeyIndex(table_path)
+        index.refresh()
+        _append(table_path, 10, 20)
+        index.refresh()
+
+        assert sorted(p.name for p in index.index_path.iterdir()) == ["_meta.json", "product_id.arrow"]
@@ -80,3 +80,52 @@ class TestLakehouseStats:
         mcps = lh.list_mcps()
 
         assert isinstance(mcps, list)
+
+
+class TestMultiTableLoader:
+    """Tests for key-based MERGE upserts."""
+
+    @staticmethod
+    def _product(gtin, price):
+        return {
+            "gtin": gtin,
+            "supplier_pid": f"SP{gtin}",
+            "brand": "Bosch",
+            "product_name": f"Product {gtin}",
+            "price": price,
+        }
+
+    @pytest.mark.asyncio
+    async def test_reingest_does_not_duplicate(self, lakehouse_path):
+        """Re-upserting the same catalog updates rows instead of appending."""
+        pytest.importorskip("deltalake")
+        from deltalake import DeltaTable
+        from lakehouse.delta.multi_table_loader import MultiTableLoader
+
+        loader = MultiTableLoader(lakehouse_path)
+        await loader.upsert_products([self._product("1", 10), self._product("2", 20)])
+        await loader.upsert_products([
+            self._product("2", 25),
+            self._product("3", 30),
+            self._product("3", 35),  # Duplicate in batch - last wins
+        ])
+
+        rows = DeltaTable(str(lakehouse_path / "delta" / "products")).to_pyarrow_table().to_pylist()
+        prices = {r["gtin"]: r["price"] for r in rows}
+
+        assert len(rows) == 3
+        assert prices == {"1": 10.0, "2": 25.0, "3": 35.0}
+
+    @pytest.mark.asyncio
+    async def test_optimize_after_interval(self, lakehouse_path):
+        """Tables are Z-ordered once optimize_interval commits accumulate."""
+        pytest.importorskip("deltalake")
+        from deltalake import DeltaTable
+        from lakehouse.delta.multi_table_loader import MultiTableLoader
+
+        loader = MultiTableLoader(lakehouse_path, optimize_interval=3)
+        for i in range(3):
+            await loader.upsert_products([self._product(str(i), i)])
+
+        history = DeltaTable(str(lakehouse_path / "delta" / "products")).history()
+        assert any(h["operation"] == "OPTIMIZE" for h in history)
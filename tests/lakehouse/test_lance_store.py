@@ -0,0 +1,111 @@
+"""
+Lance Store Tests
+
+Tests for the Arrow-native embedding load path (float16 vectors, text by
+reference) and resolving chunk text from the Delta chunk tables.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pa = pytest.importorskip("pyarrow")
+
+
+def _documents(dim=8):
+    rng = np.random.default_rng(0)
+    return [
+        {
+            "id": "doc_a",
+            "filename": "a.pdf",
+            "mcp": "ctax",
+            "path": "/data/a.pdf",
+            "text": "eins zwei drei",
+            "chunks": ["eins", "zwei", "drei"],
+            "chunk_embeddings": [rng.random(dim, dtype=np.float32), None, rng.random(dim, dtype=np.float32)],
+            "metadata": {"size": 10, "modified": "2024-01-01T00:00:00"},
+        },
+        {
+            "id": "doc_b",
+            "filename": "b.pdf",
+            "mcp": "legal",
+            "path": "/data/b.pdf",
+            "text": "vier",
+            "chunks": ["vier"],
+            "chunk_embeddings": np.ones((1, dim), dtype=np.float32),
+            "metadata": {"size": 4, "modified": "2024-01-01T00:00:00"},
+        },
+    ]
+
+
+class TestEmbeddingTable:
+    """Tests for LanceLoader's Arrow table builder."""
+
+    def test_float16_without_text(self, temp_dir):
+        pytest.importorskip("lancedb")
+        from lakehouse.vector.lance_store import LanceLoader
+
+        loader = LanceLoader(temp_dir / "lance", vector_dtype="float16", store_text=False)
+        data = loader._embedding_table(_documents())
+
+        assert "text" not in data.column_names
+        assert data.schema.field("vector").type == pa.list_(pa.float16(), 8)
+        assert data["chunk_id"].to_pylist() == ["doc_a_0", "doc_a_2", "doc_b_0"]
+        assert data["chunk_index"].to_pylist() == [0, 2, 0]
+        assert data["mcp"].to_pylist() == ["ctax", "ctax", "legal"]
+        assert data["char_count"].to_pylist() == [4, 4, 4]
+        assert data["vector"].to_pylist()[2] == [1.0] * 8
+
+    def test_existing_layout_wins(self, temp_dir):
+        pytest.importorskip("lancedb")
+        from lakehouse.vector.lance_store import LanceLoader
+
+        legacy = LanceLoader(temp_dir / "lance", vector_dtype="float32", store_text=True)
+        schema = legacy.embedding_schema(8)
+
+        loader = LanceLoader(temp_dir / "lance", vector_dtype="float16", store_text=False)
+        data = loader._embedding_table(_documents(), schema)
+
+        assert data.schema == schema
+        assert data["text"].to_pylist() == ["eins", "drei", "vier"]
+
+    def test_no_embeddings(self, temp_dir):
+        pytest.importorskip("lancedb")
+        from lakehouse.vector.lance_store import LanceLoader
+
+        docs = [{**_documents()[0], "chunk_embeddings": [None, None, None]}]
+        assert LanceLoader(temp_dir / "lance")._embedding_table(docs) is None
+
+    def test_invalid_dtype(self, temp_dir):
+        pytest.importorskip("lancedb")
+        from lakehouse.vector.lance_store import LanceLoader
+
+        with pytest.raises(ValueError):
+            LanceLoader(temp_dir / "lance", vector_dtype="int8")
+
+
+class TestChunkText:
+    """Tests for attaching text from {mcp}_chunks."""
+
+    @pytest.mark.asyncio
+    async def test_attach_chunk_text(self, temp_dir):
+        pytest.importorskip("deltalake")
+        from lakehouse.delta.delta_loader import DeltaLoader
+        from lakehouse.vector.chunk_text import attach_chunk_text, attach_text_to_rows
+
+        delta_path = temp_dir / "delta"
+        loader = DeltaLoader(delta_path)
+        for doc in _documents():
+            await loader.load_documents(doc["mcp"], [doc])
+
+        chunks = pa.table({
+            "chunk_id": ["doc_b_0", "doc_a_2", "missing_0", "doc_a_0"],
+            "mcp": ["legal", "ctax", "ctax", "ctax"],
+        })
+        resolved = attach_chunk_text(chunks, delta_path)
+
+        assert resolved["chunk_id"].to_pylist() == chunks["chunk_id"].to_pylist()
+        assert resolved["text"].to_pylist() == ["vier", "drei", None, "eins"]
+
+        rows = [{"chunk_id": "doc_a_2", "mcp": "ctax"}, {"chunk_id": "x", "mcp": "ctax", "text": "kept"}]
+        attach_text_to_rows(rows, delta_path)
+        assert [r["text"] for r in rows] == ["drei", "kept"]
@@ -0,0 +1,179 @@
+"""
+Delta Query Engine Tests
+
+Tests for projection, predicate and limit/offset pushdown.
+"""
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+deltalake = pytest.importorskip("deltalake")
+
+
+@pytest.fixture
+def products_delta(lakehouse_path):
+    """Three-file products table (one file per append)."""
+    from deltalake import write_deltalake
+
+    delta_path = lakehouse_path / "delta"
+    for i in range(3):
+        write_deltalake(
+            str(delta_path / "syndication_products"),
+            pa.table({
+                "sku": [f"S{i}{j:03d}" for j in range(100)],
+                "product_name": [f"Caleo {j}" if j % 2 else f"Matric {j}" for j in range(100)],
+                "price_eur": [float(i * 100 + j) for j in range(100)],
+            }),
+            mode="append"
+        )
+    return delta_path
+
+
+class TestFilterParsing:
+    """Tests for HTTP filter specs."""
+
+    def test_parse_eq(self):
+        from lakehouse.delta.query_engine import Filter
+
+        f = Filter.parse("sku:eq:5SC750")
+        assert (f.column, f.op, f.value) == ("sku", "eq", "5SC750")
+
+    def test_parse_in_and_value_with_colon(self):
+        from lakehouse.delta.query_engine import Filter
+
+        assert Filter.parse("temp:in:3000K|4000K").value == ["3000K", "4000K"]
+        assert Filter.parse("url:eq:http://x").value == "http://x"
+
+    def test_parse_invalid(self):
+        from lakehouse.delta.query_engine import Filter, QueryError
+
+        with pytest.raises(QueryError):
+            Filter.parse("sku:like:x")
+        with pytest.raises(QueryError):
+            Filter.parse("sku:eq")
+
+
+class TestDeltaQueryEngine:
+    """Tests for DeltaQueryEngine scans."""
+
+    def test_projection_and_limit(self, products_delta):
+        from lakehouse.delta.query_engine import DeltaQueryEngine
+
+        engine = DeltaQueryEngine(products_delta)
+        result = engine.scan("syndication_products", columns=["sku"], limit=5, count_total=True)
+
+        assert result.table.column_names == ["sku"]
+        assert result.count == 5
+        assert result.total == 300
+
+    def test_typed_filter_and_offset(self, products_delta):
+        from lakehouse.delta.query_engine import DeltaQueryEngine, Filter
+
+        engine = DeltaQueryEngine(products_delta)
+        result = engine.scan(
+            "syndication_products",
+            filters=[Filter.parse("price_eur:ge:250")],
+            limit=10,
+            offset=5,
+            count_total=True
+        )
+
+        assert result.total == 50
+        assert [r["price_eur"] for r in result.to_records()] == [float(p) for p in range(255, 265)]
+
+    def test_search_across_columns(self, products_delta):
+        from lakehouse.delta.query_engine import DeltaQueryEngine
+
+        engine = DeltaQueryEngine(products_delta)
+        result = engine.scan(
+            "syndication_products",
+            search="caleo",
+            search_columns=["product_name", "missing_column"],
+            count_total=True
+        )
+
+        assert result.total == 150
+
+    def test_find_one(self, products_delta):
+        from lakehouse.delta.query_engine import DeltaQueryEngine
+
+        engine = DeltaQueryEngine(products_delta)
+
+        assert engine.find_one("syndication_products", "sku", "S2005")["price_eur"] == 205.0
+        assert engine.find_one("syndication_products", "sku", "missing") is None
+
+    def test_invalid_value_type(self, products_delta):
+        from lakehouse.delta.query_engine import DeltaQueryEngine, Filter, QueryError
+
+        engine = DeltaQueryEngine(products_delta)
+
+        with pytest.raises(QueryError):
+            engine.scan("syndication_products", filters=[Filter.parse("price_eur:gt:cheap")])
+        with pytest.raises(QueryError):
+            engine.scan("syndication_products", columns=["nope"])
+
+
+class TestCursorPages:
+    """Tests for cursor-paginated scans."""
+
+    def test_cursor_walks_all_matching_rows(self, products_delta):
+        from lakehouse.delta.query_engine import DeltaQueryEngine
+
+        engine = DeltaQueryEngine(products_delta, batch_size=16)
+        seen, cursor = [], None
+
+        while True:
+            page = engine.page(
+                "syndication_products",
+                columns=["sku"],
+                limit=40,
+                cursor=cursor,
+                search="caleo",
+                search_columns=["product_name"]
+            )
+            if cursor is None:
+                assert page.total == 150
+            seen.extend(page.table["sku"].to_pylist())
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert len(seen) == len(set(seen)) == 150
+
+    def test_offset_matches_cursor(self, products_delta):
+        from lakehouse.delta.query_engine import DeltaQueryEngine
+
+        engine = DeltaQueryEngine(products_delta)
+        first = engine.page("syndication_products", columns=["sku"], limit=150)
+        second = engine.page("syndication_products", columns=["sku"], limit=10, cursor=first.next_cursor)
+        by_offset = engine.page("syndication_products", columns=["sku"], limit=10, offset=150)
+
+        assert second.table["sku"].to_pylist() == by_offset.table["sku"].to_pylist()
+
+    def test_cursor_pins_version_of_the_read_handle(self, products_delta, monkeypatch):
+        from deltalake import DeltaTable
+        from lakehouse.delta.query_engine import DeltaQueryEngine, decode_cursor
+
+        engine = DeltaQueryEngine(products_delta)
+        table_path = products_delta / "syndication_products"
+        # A commit lands after the first page's handle was opened
+        read_handle = DeltaTable(str(table_path), version=1)
+        monkeypatch.setattr(engine, "open_table", lambda name: read_handle)
+
+        page = engine.page("syndication_products", columns=["sku"], limit=10)
+
+        assert decode_cursor(page.next_cursor)["v"] == 1
+        assert page.total == 200
+
+    def test_cursor_rejected_for_other_filters(self, products_delta):
+        from lakehouse.delta.query_engine import DeltaQueryEngine, Filter, QueryError
+
+        engine = DeltaQueryEngine(products_delta)
+        cursor = engine.page("syndication_products", limit=5).next_cursor
+
+        with pytest.raises(QueryError):
+            engine.page(
+                "syndication_products",
+                filters=[Filter.parse("price_eur:gt:10")],
+                cursor=cursor
+            )
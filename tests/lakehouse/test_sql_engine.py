@@ -0,0 +1,147 @@
+"""
+SQL Engine Tests
+
+Tests for embedded SQL over Delta tables: tenant scoping, MCP shorthand,
+limits and statement caching.
+"""
+
+import pytest
+
+
+@pytest.fixture
+def delta_tables(lakehouse_path):
+    """ctax_documents (tenant-scoped) and products (no customer_id column)"""
+    pytest.importorskip("deltalake")
+    import pyarrow as pa
+    from deltalake import write_deltalake
+
+    delta = lakehouse_path / "delta"
+    write_deltalake(str(delta / "ctax_documents"), pa.table({
+        "id": [1, 2, 3, 4, 5],
+        "customer_id": ["acme", "acme", "globex", None, "acme"],
+        "mcp": ["ctax"] * 5,
+        "category": ["tax", "law", "tax", "tax", "tax"],
+        "year": [2023, 2024, 2024, 2024, 2024],
+    }))
+    write_deltalake(str(delta / "products"), pa.table({
+        "supplier_pid": ["A", "B", "C"],
+        "price": [10.0, 20.0, 30.0],
+    }))
+    return delta
+
+
+class TestSQLEngine:
+    """Tests for SQLEngine."""
+
+    def test_tenant_rows_only(self, delta_tables):
+        from lakehouse.delta.sql_engine import SQLEngine
+
+        engine = SQLEngine(delta_tables)
+        rows = engine.execute(
+            "SELECT id FROM ctax_documents WHERE category = 'tax' ORDER BY id", customer_id="acme"
+        ).read_all().to_pylist()
+
+        assert [r["id"] for r in rows] == [1, 4, 5]  # Shared row 4 included, globex excluded
+
+    @pytest.mark.parametrize("table", ["CTAX_DOCUMENTS", "Ctax_Documents", '"ctax_documents"'])
+    def test_table_names_in_any_case(self, delta_tables, table):
+        from lakehouse.delta.sql_engine import SQLEngine
+
+        rows = SQLEngine(delta_tables).execute(
+            f"SELECT id FROM {table} WHERE category = 'tax' ORDER BY id", customer_id="acme"
+        ).read_all().to_pylist()
+
+        assert [r["id"] for r in rows] == [1, 4, 5]
+
+    def test_aggregates_cannot_see_other_tenants(self, delta_tables):
+        from lakehouse.delta.sql_engine import SQLEngine
+
+        engine = SQLEngine(delta_tables)
+        total = engine.execute(
+            "WITH t AS (SELECT * FROM ctax_documents) SELECT count(*) AS n FROM t", customer_id="globex"
+        ).read_all().to_pylist()
+
+        assert total == [{"n": 2}]
+
+    def test_internal_tables_are_rejected(self, delta_tables):
+        from lakehouse.delta.query_engine import QueryError
+        from lakehouse.delta.sql_engine import SQLEngine
+
+        with pytest.raises(QueryError):
+            SQLEngine(delta_tables).execute("SELECT * FROM __lh_ctax_documents", customer_id="acme")
+
+    @pytest.mark.parametrize("sql", [
+        "SELECT t2.id FROM ctax_documents t1, __lh_ctax_documents t2",
+        'SELECT t2.id FROM ctax_documents t1, "__LH_ctax_documents" t2',
+        "SELECT id FROM ctax_documents WHERE id IN (SELECT id FROM __Lh_ctax_documents)",
+    ])
+    def test_internal_tables_rejected_anywhere(self, delta_tables, sql):
+        from lakehouse.delta.query_engine import QueryError
+        from lakehouse.delta.sql_engine import SQLEngine
+
+        with pytest.raises(QueryError):
+            SQLEngine(delta_tables).execute(sql, customer_id="acme")
+
+    def test_comma_join_stays_tenant_scoped(self, delta_tables):
+        from lakehouse.delta.sql_engine import SQLEngine
+
+        rows = SQLEngine(delta_tables).execute(
+            "SELECT t1.id AS a, t2.id AS b FROM ctax_documents t1, ctax_documents t2",
+            customer_id="globex"
+        ).read_all().to_pylist()
+
+        assert len(rows) == 4
+        assert {r["a"] for r in rows} | {r["b"] for r in rows} == {3, 4}
+
+    def test_registered_names_are_random(self, delta_tables):
+        from lakehouse.delta.sql_engine import SQLEngine
+
+        engine = SQLEngine(delta_tables)
+        engine.execute("SELECT id FROM ctax_documents", customer_id="acme").read_all()
+        (builder, sources), = engine._builders.values()
+
+        # Registered names are not guessable from the table name
+        assert sources["ctax_documents"] != "__lh_ctax_documents"
+        assert sources["ctax_documents"].startswith("__lh_")
+
+    def test_limit_appended_unless_present(self, delta_tables):
+        from lakehouse.delta.sql_engine import SQLEngine
+
+        engine = SQLEngine(delta_tables)
+
+        assert engine.execute("SELECT * FROM products", "acme", limit=2).read_all().num_rows == 2
+        assert engine.execute("SELECT * FROM products LIMIT 1", "acme", limit=2).read_all().num_rows == 1
+
+    def test_statements_are_cached(self, delta_tables):
+        from lakehouse.delta.sql_engine import SQLEngine
+
+        engine = SQLEngine(delta_tables)
+        first = engine.prepare("SELECT * FROM products;")
+        second = engine.prepare("SELECT * FROM products")
+
+        assert first is second
+        assert first.tables == (("products", "products"),)
+
+
+class TestLakehouseQuery:
+    """Tests for Lakehouse.query() on the SQL engine."""
+
+    def test_mcp_shorthand_and_projection(self, lakehouse_path, delta_tables):
+        from lakehouse import Lakehouse
+
+        lh = Lakehouse(lakehouse_path)
+        rows = lh.query(
+            "SELECT id, year FROM documents WHERE mcp = 'ctax' AND year = 2024 ORDER BY id DESC",
+            customer_id="acme",
+            limit=2
+        )
+
+        assert rows == [{"id": 5, "year": 2024}, {"id": 4, "year": 2024}]
+
+    def test_invalid_query_returns_empty(self, lakehouse_path, delta_tables):
+        from lakehouse import Lakehouse
+
+        lh = Lakehouse(lakehouse_path)
+
+        assert lh.query("SELECT * FROM unknown_table", customer_id="acme") == []
+        assert lh.query("SELECT nope FROM ctax_documents", customer_id="acme") == []
@@ -0,0 +1,83 @@
+"""
+Delta Table Cache Tests
+
+Tests for version-aware DeltaTable handle reuse and the hot table LRU.
+"""
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+deltalake = pytest.importorskip("deltalake")
+
+
+def _append(path, values):
+    from deltalake import write_deltalake
+
+    write_deltalake(str(path), pa.table({"id": values}), mode="append")
+
+
+class TestDeltaTableCache:
+    """Tests for DeltaTableCache."""
+
+    def test_latest_log_version(self, temp_dir):
+        from lakehouse.delta.table_cache import latest_log_version
+
+        path = temp_dir / "t"
+        assert latest_log_version(path) is None
+
+        _append(path, ["a"])
+        _append(path, ["b"])
+
+        assert latest_log_version(path) == 1
+
+    def test_handle_reused_until_new_commit(self, temp_dir):
+        from lakehouse.delta.table_cache import DeltaTableCache
+
+        path = temp_dir / "t"
+        _append(path, ["a"])
+
+        cache = DeltaTableCache(hot_tables=())
+        first = cache.get(path)
+        assert cache.get(path) is first
+        assert cache.hits == 1
+
+        _append(path, ["b"])
+        refreshed = cache.get(path)
+
+        assert refreshed.version() == 1
+        assert cache.opens == 1
+        assert refreshed.to_pyarrow_table().num_rows == 2
+
+    def test_hot_table_materialized_per_version(self, temp_dir):
+        from lakehouse.delta.table_cache import DeltaTableCache
+
+        path = temp_dir / "product_images"
+        _append(path, ["a"])
+
+        cache = DeltaTableCache(hot_tables=["product_images"])
+        assert cache.is_hot(path)
+        assert cache.get_arrow(path).num_rows == 1
+        cache.get_arrow(path)
+        assert cache.arrow_cache.hits == 1
+
+        _append(path, ["b"])
+        assert cache.get_arrow(path).num_rows == 2
+
+
+class TestArrowTableCache:
+    """Tests for byte-bounded LRU eviction."""
+
+    def test_evicts_least_recently_used(self):
+        from lakehouse.delta.table_cache import ArrowTableCache
+
+        table = pa.table({"x": list(range(1000))})
+        cache = ArrowTableCache(max_bytes=table.nbytes * 2)
+
+        cache.put(("a", 0), table)
+        cache.put(("b", 0), table)
+        cache.get(("a", 0))
+        cache.put(("c", 0), table)
+
+        assert cache.get(("b", 0)) is None
+        assert cache.get(("a", 0)) is not None
+        assert cache.stats()["bytes"] <= cache.max_bytes
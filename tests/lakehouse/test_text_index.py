@@ -0,0 +1,209 @@
+"""
+Chunk Text Index Tests
+
+Tests for the persistent BM25 index behind hybrid /lance/search, part-number
+boosting and reciprocal-rank fusion with ANN hits.
+"""
+
+import pyarrow as pa
+import pytest
+
+
+CHUNKS = pa.table({
+    "filename": ["ups.pdf", "ups.pdf", "led.pdf", "rcd.pdf", "catalog.pdf"],
+    "mcp": ["products", "products", "products", "ctax", "products"],
+    "chunk_index": [0, 1, 0, 0, 0],
+    "text": [
+        "Eaton 5SC UPS mit Batterie für Serverräume",
+        "Technische Daten 5SC750i: 750 VA, 525 W, Batterie austauschbar",
+        "LED Panel 4000K für Büroräume",
+        "Fehlerstromschutzschalter FRCDM-40/4/03-G, 30mA",
+        "Übersicht: 5SC1000, 5SC1500 und weitere UPS Modelle mit Batterie",
+    ],
+})
+
+
+class _LanceTable:
+    """Just enough of a lancedb table for refresh()"""
+
+    def __init__(self, data, version):
+        self.data = data
+        self.version = version
+        self.reads = 0
+
+    @property
+    def schema(self):
+        return self.data.schema
+
+    def to_arrow(self):
+        self.reads += 1
+        return self.data
+
+
+class _Fragment:
+    def __init__(self, fragment_id, rows):
+        self.fragment_id = fragment_id
+        self.rows = rows
+
+    def count_rows(self):
+        return self.rows
+
+
+class _LanceDataset(_LanceTable):
+    """A lancedb table whose Lance dataset exposes its data fragments"""
+
+    def __init__(self, data, version, fragments):
+        super().__init__(data, version)
+        self.fragments = fragments
+
+    def to_lance(self):
+        return self
+
+    def get_fragments(self):
+        return [_Fragment(i, rows) for i, rows in self.fragments]
+
+    def to_table(self, columns):
+        self.reads += 1
+        return self.data.select(columns)
+
+
+class TestTokens:
+    """Tests for part-number tokenization."""
+
+    @pytest.mark.parametrize("text,expected", [
+        ("5SC750i", ["5sc750i"]),
+        ("FRCDM-40/4/03-G", ["frcdm40403g"]),
+        ("Batterie 750 VA", []),
+        ("5SC-750 und 9PX", ["5sc750"]),
+    ])
+    def test_sku_tokens(self, text, expected):
+        from lakehouse.vector.text_index import sku_tokens
+
+        assert sku_tokens(text) == expected
+
+    def test_part_number_query(self):
+        from lakehouse.vector.text_index import is_part_number_query
+
+        assert is_part_number_query("5SC750i")
+        assert is_part_number_query("5SC750i 5SC1000")
+        assert not is_part_number_query("5SC750i Batterie")
+
+
+class TestChunkTextIndex:
+    """Tests for ChunkTextIndex."""
+
+    def _index(self, temp_dir):
+        from lakehouse.vector.text_index import ChunkTextIndex
+
+        index = ChunkTextIndex(temp_dir / "indexes" / "lance_embeddings")
+        index.build(CHUNKS, version=1)
+        return index
+
+    def test_exact_part_number_ranks_first(self, temp_dir):
+        index = self._index(temp_dir)
+
+        hits = index.search("5SC-750i", limit=3)
+
+        assert (hits[0]["filename"], hits[0]["chunk_index"]) == ("ups.pdf", 1)
+        assert hits[0]["sku_matches"] == 1
+        assert "text" in hits[0]
+
+    def test_part_number_beats_keyword_overlap(self, temp_dir):
+        index = self._index(temp_dir)
+
+        # "UPS Batterie" alone favors the catalog chunk; the part number decides
+        hits = index.search("FRCDM-40/4/03-G UPS Batterie", limit=5)
+
+        assert hits[0]["filename"] == "rcd.pdf"
+        assert all(h["sku_matches"] == 0 for h in hits[1:])
+
+    def test_mcp_filter(self, temp_dir):
+        index = self._index(temp_dir)
+
+        assert [h["filename"] for h in index.search("Fehlerstromschutzschalter", mcp_filter=["products"])] == []
+        assert [h["filename"] for h in index.search("Fehlerstromschutzschalter", mcp_filter="ctax")] == ["rcd.pdf"]
+
+    def test_persists_and_reloads(self, temp_dir):
+        from lakehouse.vector.text_index import ChunkTextIndex
+
+        self._index(temp_dir)
+        reopened = ChunkTextIndex(temp_dir / "indexes" / "lance_embeddings")
+
+        assert reopened.version == 1
+        assert reopened.search("Büroräume")[0]["filename"] == "led.pdf"
+
+    def test_refresh_rebuilds_only_on_new_version(self, temp_dir):
+        from lakehouse.vector.text_index import ChunkTextIndex, default_index_path
+
+        table = _LanceTable(CHUNKS, version=4)
+        index = ChunkTextIndex(default_index_path(temp_dir / "lance"))
+
+        assert index.refresh(table)
+        assert not index.refresh(table)
+        assert table.reads == 1
+
+        table.data = CHUNKS.slice(2)
+        table.version = 5
+        assert index.refresh(table)
+        assert index.search("5SC750i") == []
+        assert index.version == 5
+
+    def test_version_bump_without_data_change_skips_rebuild(self, temp_dir):
+        from lakehouse.vector.text_index import ChunkTextIndex, default_index_path
+
+        table = _LanceDataset(CHUNKS, version=4, fragments=[(0, 5)])
+        index = ChunkTextIndex(default_index_path(temp_dir / "lance"))
+        assert index.refresh(table)
+
+        table.version = 5  # e.g. optimize_indices
+        assert not index.refresh(table)
+        assert table.reads == 1
+        assert index.version == 5
+        assert index.search("Büroräume")[0]["filename"] == "led.pdf"
+
+        table.data = CHUNKS.slice(2)
+        table.fragments = [(0, 3)]  # rows deleted
+        table.version = 6
+        assert index.refresh(table)
+        assert table.reads == 2
+        assert index.search("5SC750i") == []
+
+    def test_empty_index_returns_nothing(self, temp_dir):
+        from lakehouse.vector.text_index import ChunkTextIndex
+
+        assert ChunkTextIndex(temp_dir / "missing").search("5SC750i") == []
+
+
+class TestReciprocalRankFusion:
+    """Tests for reciprocal_rank_fusion()."""
+
+    def test_chunks_in_both_lists_win(self):
+        from lakehouse.vector.text_index import reciprocal_rank_fusion
+
+        vector = [
+            {"filename": "a.pdf", "chunk_index": 0, "text": "a", "score": 0.1},
+            {"filename": "b.pdf", "chunk_index": 0, "text": "b", "score": 0.2},
+        ]
+        text = [
+            {"filename": "c.pdf", "chunk_index": 0, "text": "c", "relevance": 0.9, "sku_matches": 0},
+            {"filename": "b.pdf", "chunk_index": 0, "text": "b", "relevance": 0.5, "sku_matches": 0},
+        ]
+
+        results = reciprocal_rank_fusion(vector, text, limit=3)
+
+        assert [r["filename"] for r in results] == ["b.pdf", "a.pdf", "c.pdf"]
+        assert results[0]["match"] == "vector+text"
+        assert results[0]["score"] == 0.2  # Vector distance kept for existing callers
+        assert results[2]["score"] == pytest.approx(0.1)
+
+    def test_sku_match_outranks_vectors(self):
+        from lakehouse.vector.text_index import reciprocal_rank_fusion
+
+        vector = [{"filename": f"{i}.pdf", "chunk_index": 0, "score": 0.1} for i in range(5)]
+        text = [{"filename": "sku.pdf", "chunk_index": 2, "relevance": 0.3, "sku_matches": 1}]
+
+        results = reciprocal_rank_fusion(vector, text, limit=2)
+
+        assert results[0]["filename"] == "sku.pdf"
+        assert results[0]["match"] == "sku"
+        assert len(results) == 2
@@ -0,0 +1,164 @@
+"""
+MCP Fan-out Tests
+
+Tests for the SDK's structured fan-out helper and its use in MarketMCP.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+
+async def _sleep_then(value, delay=0.05):
+    await asyncio.sleep(delay)
+    return value
+
+
+async def _fail():
+    raise RuntimeError("lakehouse unavailable")
+
+
+class TestFanOut:
+    """Tests for fan_out()."""
+
+    @pytest.mark.asyncio
+    async def test_branches_run_concurrently(self):
+        from mcps.sdk import fan_out
+
+        start = time.perf_counter()
+        result = await fan_out({
+            "a": lambda: _sleep_then(1, 0.1),
+            "b": lambda: _sleep_then(2, 0.1),
+            "c": lambda: _sleep_then(3, 0.1),
+        })
+
+        assert time.perf_counter() - start < 0.25
+        assert [result.value(n) for n in ("a", "b", "c")] == [1, 2, 3]
+        assert result.ok
+
+    @pytest.mark.asyncio
+    async def test_timeout_and_error_degrade_to_defaults(self):
+        from mcps.sdk import fan_out
+
+        result = await fan_out(
+            {
+                "fast": lambda: _sleep_then("ok"),
+                "slow": lambda: _sleep_then("late", 5),
+                "broken": _fail,
+            },
+            timeouts={"slow": 0.05},
+            defaults={"slow": {}, "broken": []},
+        )
+
+        assert result.value("fast") == "ok"
+        assert result.value("slow") == {}
+        assert result.value("broken") == []
+        assert result.degraded == ["slow", "broken"]
+        assert result.branches["slow"].timed_out
+        assert "lakehouse unavailable" in result.branches["broken"].error
+
+    @pytest.mark.asyncio
+    async def test_skipped_branches_resolve_to_defaults(self):
+        from mcps.sdk import fan_out
+
+        result = await fan_out({"a": lambda: _sleep_then(1), "b": None}, defaults={"b": {}})
+
+        assert list(result.branches) == ["a", "b"]
+        assert result.value("b") == {}
+        assert result.ok
+
+    @pytest.mark.asyncio
+    async def test_cancelling_caller_cancels_branches(self):
+        from mcps.sdk import fan_out
+
+        cancelled = asyncio.Event()
+
+        async def branch():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        task = asyncio.create_task(fan_out({"a": branch}))
+        await asyncio.sleep(0.01)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert cancelled.is_set()
+
+
+class TestMarketFanOut:
+    """Tests for MarketMCP sub-task fan-out."""
+
+    def _market(self, monkeypatch):
+        from mcps.core.market import MarketMCP
+
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        market = MarketMCP()
+        market.anthropic = object()  # Enables the web branches
+
+        async def internal(code, context):
+            return await _sleep_then({"documents": [{"filename": "a.pdf", "text": code}], "count": 1}, 0.1)
+
+        async def web(code, context):
+            return await _sleep_then({"results": [{}, {}], "enabled": True}, 0.1)
+
+        async def competitors(code, context):
+            raise RuntimeError("rate limited")
+
+        async def synthesize(**kwargs):
+            return f"analysis of {kwargs['product_code']}"
+
+        monkeypatch.setattr(market, "_get_internal_data", internal)
+        monkeypatch.setattr(market, "_search_web", web)
+        monkeypatch.setattr(market, "_get_competitor_intel", competitors)
+        monkeypatch.setattr(market, "_synthesize_analysis", synthesize)
+        return market
+
+    @pytest.mark.asyncio
+    async def test_analyze_product_fans_out_and_degrades(self, monkeypatch):
+        market = self._market(monkeypatch)
+
+        start = time.perf_counter()
+        response = await market._analyze_product({"product_code": "FRCDM-40"}, None)
+
+        assert time.perf_counter() - start < 0.18  # max(branches), not their sum
+        assert response.data["sources"] == {"internal": 1, "web": 2, "competitors": 0}
+        assert response.data["degraded"] == ["competitors"]
+        assert response.confidence < 0.85
+
+    @pytest.mark.asyncio
+    async def test_web_branches_skipped_without_client(self, monkeypatch):
+        market = self._market(monkeypatch)
+        market.anthropic = None
+
+        response = await market._analyze_product({"product_code": "FRCDM-40"}, None)
+
+        assert response.data["sources"]["web"] == 0
+        assert response.data["degraded"] == []
+
+    @pytest.mark.asyncio
+    async def test_branch_errors_reach_fan_out(self, monkeypatch):
+        from types import SimpleNamespace
+        from mcps.core.market import MarketMCP
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("unavailable")
+
+        async def synthesize(**kwargs):
+            return "analysis"
+
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+        market = MarketMCP()
+        market.anthropic = SimpleNamespace(messages=SimpleNamespace(create=fail))
+        monkeypatch.setattr(market, "query_data", fail)
+        monkeypatch.setattr(market, "_synthesize_analysis", synthesize)
+
+        response = await market._analyze_product({"product_code": "FRCDM-40"}, None)
+
+        assert response.data["degraded"] == ["internal", "web", "competitors"]
+        assert response.data["sources"] == {"internal": 0, "web": 0, "competitors": 0}
+        assert response.confidence < 0.85
@@ -0,0 +1,222 @@
+"""
+Model Manager Tests
+
+Tests for non-blocking cache hits, coalesced loads, cost-aware eviction and
+predictive preloading against a stub vLLM admin API.
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from mcps.sdk.types import ModelSpec, ModelType
+
+
+def _stub_vllm(delays, calls):
+    """vLLM admin API stub: records calls, sleeps delays[model] per load"""
+    async def handler(request):
+        payload = json.loads(request.content)
+        name = payload.get("lora_name") or payload.get("model_name")
+        calls.append((request.url.path, name))
+        if request.url.path == "/v1/models/unload":
+            await asyncio.sleep(delays.get(f"unload:{name}", 0.0))
+        else:
+            await asyncio.sleep(delays.get(name, 0.0))
+        return httpx.Response(200, json={"status": "ok"})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _full(name, size_gb):
+    return ModelSpec(name=name, type=ModelType.TEXT, size_gb=size_gb, file_path=f"/models/{name}")
+
+
+def _lora(name, size_gb=1.0):
+    return ModelSpec(
+        name=name, type=ModelType.TEXT, size_gb=size_gb,
+        base_model="base", lora_adapter=f"/adapters/{name}"
+    )
+
+
+def _manager(delays, calls, **kwargs):
+    from orchestrator.mcp.model_manager import ModelManager
+
+    kwargs.setdefault("gpu_memory_gb", 80.0)
+    kwargs.setdefault("reserved_memory_gb", 0.0)
+    return ModelManager("http://vllm", http_client=_stub_vllm(delays, calls), **kwargs)
+
+
+def _loads(calls, name):
+    return sum(1 for path, n in calls if n == name and path != "/v1/models/unload")
+
+
+class TestLoading:
+    """Tests for in-flight load tracking."""
+
+    @pytest.mark.asyncio
+    async def test_hit_does_not_wait_for_other_load(self):
+        calls = []
+        manager = _manager({"big": 0.5}, calls)
+        await manager.ensure_loaded(_lora("adapter"))
+
+        slow = asyncio.create_task(manager.ensure_loaded(_full("big", 10)))
+        await asyncio.sleep(0.05)
+
+        started = time.monotonic()
+        assert await manager.ensure_loaded(_lora("adapter"))
+        assert time.monotonic() - started < 0.1
+        assert not slow.done()
+
+        assert await slow
+        assert manager.stats["cache_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_duplicate_loads_coalesce(self):
+        calls = []
+        manager = _manager({"big": 0.1}, calls)
+
+        results = await asyncio.gather(*(manager.ensure_loaded(_full("big", 10)) for _ in range(3)))
+
+        assert results == [True, True, True]
+        assert _loads(calls, "big") == 1
+        assert manager.stats["cache_misses"] == 1
+        assert manager.stats["coalesced_loads"] == 2
+        assert manager.get_stats()["models"]["loading"] == []
+
+    @pytest.mark.asyncio
+    async def test_failed_load(self):
+        from orchestrator.mcp.model_manager import ModelManager
+
+        def handler(request):
+            return httpx.Response(500)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        manager = ModelManager("http://vllm", http_client=client)
+
+        assert not await manager.ensure_loaded(_full("big", 10))
+        assert manager.get_loaded_models() == []
+        assert manager._memory_used() == 0
+
+
+class TestEviction:
+    """Tests for eviction policies."""
+
+    async def _fill(self, policy, calls):
+        # slow LoRA (0.8GB, 0.2s) loaded first, fast full model (12GB) second
+        manager = _manager(
+            {"adapter": 0.2, "fast": 0.0}, calls,
+            gpu_memory_gb=24.0, eviction_policy=policy, enable_predictive_preload=False
+        )
+        await manager.ensure_loaded(_lora("adapter"))
+        await manager.ensure_loaded(_full("fast", 10))
+        await manager.ensure_loaded(_full("next", 10))
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_gdsf_keeps_costly_small_model(self):
+        calls = []
+        manager = await self._fill("gdsf", calls)
+
+        assert manager.get_loaded_models() == ["adapter", "next"]
+        assert ("/v1/models/unload", "fast") in calls
+        assert manager._inflation > 0
+
+    @pytest.mark.asyncio
+    async def test_lru_evicts_oldest(self):
+        calls = []
+        manager = await self._fill("lru", calls)
+
+        assert manager.get_loaded_models() == ["fast", "next"]
+
+    @pytest.mark.asyncio
+    async def test_no_hit_on_model_being_evicted(self):
+        calls = []
+        manager = _manager(
+            {"unload:a": 0.2}, calls,
+            gpu_memory_gb=13.0, eviction_policy="lru", enable_predictive_preload=False
+        )
+        await manager.ensure_loaded(_full("a", 5))
+        await manager.ensure_loaded(_full("b", 5))
+
+        evicting = asyncio.create_task(manager.ensure_loaded(_full("c", 5)))
+        await asyncio.sleep(0.05)
+        assert "a" not in manager.get_loaded_models()
+
+        # Not a hit: reloaded only after its unload (and a new eviction)
+        assert await manager.ensure_loaded(_full("a", 5))
+        assert await evicting
+        assert manager.stats["cache_hits"] == 0
+        assert calls.index(("/v1/models/unload", "a")) < calls.index(("/v1/models/load", "a"), 1)
+
+    @pytest.mark.asyncio
+    async def test_eviction_disabled(self):
+        manager = _manager({}, [], gpu_memory_gb=11.0, enable_lru_eviction=False)
+        await manager.ensure_loaded(_full("a", 5))
+
+        with pytest.raises(MemoryError):
+            await manager.ensure_loaded(_full("b", 5))
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError):
+            _manager({}, [], eviction_policy="fifo")
+
+
+class TestPredictivePreload:
+    """Tests for usage-based preloading."""
+
+    async def _train(self, manager):
+        for name in ("a", "b", "a", "b"):
+            await manager.ensure_loaded(_full(name, 5))
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_preloads_likely_next_model(self):
+        calls = []
+        manager = _manager({}, calls, preload_min_observations=2)
+        await self._train(manager)
+        assert manager.predict_next("a") == "b"
+
+        await manager.ensure_loaded(_full("a", 5))
+        await asyncio.gather(*manager._inflight.values())
+
+        assert "b" in manager.get_loaded_models()
+        assert manager.stats["preloads"] == 1
+
+        await manager.ensure_loaded(_full("b", 5))
+        assert manager.stats["preload_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_preload_never_evicts(self):
+        calls = []
+        manager = _manager({}, calls, gpu_memory_gb=7.0, preload_min_observations=2)
+        await self._train(manager)
+
+        await manager.ensure_loaded(_full("a", 5))
+
+        assert manager.stats["preloads"] == 0
+        assert manager.get_loaded_models() == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_real_load_waits_out_preload_reservation(self):
+        calls = []
+        manager = _manager({"b": 0.2}, calls, gpu_memory_gb=13.0, preload_min_observations=2)
+        await self._train(manager)
+
+        await manager.ensure_loaded(_full("a", 5))
+        assert "b" in manager._inflight  # Preload holds 6 of the 7 free GB
+
+        assert await manager.ensure_loaded(_full("c", 10))
+        assert manager.get_loaded_models() == ["c"]
+        assert manager._memory_used() == pytest.approx(12.0)
+
+    @pytest.mark.asyncio
+    async def test_no_prediction_below_threshold(self):
+        manager = _manager({}, [], preload_min_observations=2)
+        for name in ("a", "b", "a", "c"):
+            await manager.ensure_loaded(_full(name, 1))
+
+        assert manager.predict_next("a") is None